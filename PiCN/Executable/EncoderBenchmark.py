@@ -0,0 +1,51 @@
+"""PiCN Encoder Benchmark: compare the throughput of the NDN TLV encoders"""
+
+import argparse
+import timeit
+
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder, NdnTlvFastEncoder
+from PiCN.Packets import Content, Interest, Nack, NackReason, Name
+
+
+def measure(func, count: int, repeat: int) -> float:
+    """best time of a call in microseconds"""
+    return min(timeit.repeat(func, number=count, repeat=repeat)) / count * 1e6
+
+
+def main(args):
+    name = Name(args.name)
+    payload = b"x" * args.payload_size
+    encoders = [NdnTlvEncoder(log_level=255), NdnTlvFastEncoder(log_level=255)]
+
+    interest = Interest(name)
+    nack = Nack(name, NackReason.NO_ROUTE, Interest(name, encoders[0].encode_interest(name)))
+    content = Content(name, payload)
+    wire_interest = encoders[0].encode(interest)
+    wire_content = encoders[0].encode(content)
+    wire_nack = encoders[0].encode(nack)
+
+    operations = [
+        ("encode interest", lambda e: lambda: e.encode(interest)),
+        ("encode content", lambda e: lambda: e.encode(content)),
+        ("encode nack", lambda e: lambda: e.encode(nack)),
+        ("decode interest", lambda e: lambda: e.decode(wire_interest)),
+        ("decode content", lambda e: lambda: e.decode(wire_content)),
+        ("decode nack", lambda e: lambda: e.decode(wire_nack)),
+    ]
+
+    print("name: %s, payload: %d bytes, %d calls (best of %d)" % (name, args.payload_size, args.count, args.repeat))
+    print("%-16s %14s %14s %8s" % ("operation", "NdnTlvEncoder", "NdnTlvFast", "speedup"))
+    for label, operation in operations:
+        times = [measure(operation(e), args.count, args.repeat) for e in encoders]
+        print("%-16s %11.2f us %11.2f us %7.1fx" % (label, times[0], times[1], times[0] / times[1]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='PiCN Encoder Benchmark')
+    parser.add_argument('-c', '--count', type=int, default=10000, help="Calls per measurement (default: 10000)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="Measurements per operation (default: 3)")
+    parser.add_argument('-s', '--payload-size', type=int, default=1000, help="Payload size in bytes (default: 1000)")
+    parser.add_argument('name', type=str, nargs='?', default='/picn/benchmark/data/chunk0',
+                        help="Name of the packets (default: /picn/benchmark/data/chunk0)")
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,66 @@
+"""Queue replacement handing data directly to the adjacent layer, used by an in-process LayerStack"""
+
+import queue
+from multiprocessing.connection import Connection
+
+from PiCN.Processes import LayerProcess
+
+
+class InProcessQueue(object):
+    """
+    Queue between two layers of a LayerStack running in a single process. Instead of pickling the data and passing it
+    through a pipe, put() hands the object to the LayerStack (or its AsyncioRuntime), which calls data_from_lower/data_from_higher of the
+    receiving layer. Data is not copied, a layer must not modify an object after passing it on.
+    The queue never contains data, so the process loops of the layers never read from it. Its _reader becomes readable
+    when the LayerStack is stopped, empty() and get() then raise EOFError to terminate the process loops.
+    """
+
+    def __init__(self, dispatcher, stop_reader: Connection):
+        """
+        :param dispatcher: LayerStack or AsyncioRuntime delivering the data
+        :param stop_reader: Connection which becomes readable when the LayerStack is stopped
+        """
+        self._dispatcher = dispatcher
+        self._reader: Connection = stop_reader
+        self.layer: LayerProcess = None
+        self.from_lower: bool = False
+
+    def connect(self, layer: LayerProcess, from_lower: bool):
+        """
+        Set the layer receiving the data put into this queue.
+        :param layer: The receiving layer
+        :param from_lower: True if the data is passed to data_from_lower, False for data_from_higher
+        """
+        self.layer = layer
+        self.from_lower = from_lower
+
+    def put(self, data, block=True, timeout=None):
+        if self.layer is None:
+            raise queue.Full('Queue is not connected to a layer')
+        self._dispatcher.dispatch(self.layer, self.from_lower, data)
+
+    def put_nowait(self, data):
+        self.put(data)
+
+    @property
+    def _closed(self) -> bool:
+        """same as multiprocessing.Queue._closed, used by layers to detect that they were stopped"""
+        return self._reader.closed or self._reader.poll()
+
+    def empty(self) -> bool:
+        if self._closed:
+            raise EOFError('LayerStack was stopped')
+        return True
+
+    def get(self, block=True, timeout=None):
+        self.empty()
+        raise queue.Empty()
+
+    def get_nowait(self):
+        return self.get()
+
+    def close(self):
+        pass
+
+    def join_thread(self):
+        pass
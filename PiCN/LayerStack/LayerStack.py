@@ -1,9 +1,14 @@
 """Data Structure for managing LayerProcesses and their queues"""
 
+import collections
 import multiprocessing
+import threading
+from multiprocessing.connection import wait
 from typing import List
 
-from PiCN.Processes import LayerProcess
+from PiCN.LayerStack.InProcessQueue import InProcessQueue
+from PiCN.LayerStack.SharedMemoryQueue import SharedMemoryQueue
+from PiCN.Processes import LayerProcess, AsyncioRuntime
 
 
 class LayerStack(object):
@@ -11,13 +16,32 @@ class LayerStack(object):
     Data structure for managing LayerProcesses and their queues
     """
 
-    def __init__(self, layers: List[LayerProcess]):
+    def __init__(self, layers: List[LayerProcess], in_process: bool = False, max_batch_size: int = 1,
+                 use_asyncio: bool = False):
         """
         Create a layer stack from a list of layers, where the topmost layer is the first element in the list.
         :param layers: List of layers to stack onto each other.
+        :param in_process: If true, all layers run in the current process instead of a process per layer. Adjacent
+                           layers are connected by InProcessQueues, which hand the data over without serialisation.
+                           The queues to the outside of the stack remain multiprocessing queues.
+        :param max_batch_size: Maximum number of packets a layer handles per wakeup and passes to an adjacent layer as
+                               a single PacketBatch. 1 disables batches. Data leaving the stack is never batched.
+        :param use_asyncio: If true, the layers run on an asyncio event loop instead of the select/poll loops, see
+                            AsyncioRuntime. In the in-process mode all layers share one event loop, running in a thread
+                            of the current process.
         """
         self.layers: List[LayerProcess] = []
         self.queues: List[multiprocessing.Queue] = []
+        self.in_process: bool = in_process
+        self.max_batch_size: int = max_batch_size
+        self.use_asyncio: bool = use_asyncio
+        self._runtime: AsyncioRuntime = AsyncioRuntime() if in_process and use_asyncio else None
+        if in_process:
+            # Becomes readable when the stack is stopped, terminating the threads running the layers
+            self._stop_reader, self._stop_writer = multiprocessing.Pipe(duplex=False)
+            self._pending: collections.deque = collections.deque()
+            self._dispatch_lock: threading.Lock = threading.Lock()
+            self._threads: List[threading.Thread] = []
         self._queue_to_higher = multiprocessing.Queue()
         self._queue_from_higher = multiprocessing.Queue()
         self._queue_to_lower = multiprocessing.Queue()
@@ -30,8 +54,8 @@ class LayerStack(object):
             upper = layers[i]
             lower = layers[i + 1]
             # Create two queues for communication
-            q_to_upper = multiprocessing.Queue()
-            q_to_lower = multiprocessing.Queue()
+            q_to_upper = self.__new_queue()
+            q_to_lower = self.__new_queue()
             upper.queue_to_lower = q_to_lower
             upper.queue_from_lower = q_to_upper
             lower.queue_to_higher = q_to_upper
@@ -82,6 +106,35 @@ class LayerStack(object):
                 return
         raise ValueError('Reference layer is not in the layer stack.')
 
+    def use_shared_memory(self, upper: LayerProcess, capacity: int = 1 << 20):
+        """
+        Connect a layer and the layer beneath it by SharedMemoryQueues instead of multiprocessing queues, e.g. the
+        packet encoding layer and the link layer, which exchange wire format packets that are then not pickled.
+        Both layers must not be passed data by other processes, e.g. timers of the parent process.
+        :param upper: The upper one of the two layers.
+        :param capacity: Size of the ring buffer of each direction in bytes.
+        :raises multiprocessing.ProcessError if this method is called after the layer stack was started.
+        :raises ValueError if upper is not a layer in this LayerStack, is the lowest layer, or the stack runs in-process.
+        """
+        if self.__started:
+            raise multiprocessing.ProcessError('LayerStack should not be changed after its processes were started.')
+        if self.in_process:
+            raise ValueError('Layers of an in-process LayerStack hand over data directly.')
+        if upper not in self.layers or upper == self.layers[len(self.layers) - 1]:
+            raise ValueError('Layer is not in the layer stack or has no layer beneath it.')
+        lower = self.layers[self.layers.index(upper) + 1]
+        for q in [upper.queue_to_lower, upper.queue_from_lower]:
+            self.queues.remove(q)
+            q.close()
+        q_to_upper = SharedMemoryQueue(capacity)
+        q_to_lower = SharedMemoryQueue(capacity)
+        upper.queue_to_lower = q_to_lower
+        upper.queue_from_lower = q_to_upper
+        lower.queue_to_higher = q_to_upper
+        lower.queue_from_higher = q_to_lower
+        self.queues.append(q_to_upper)
+        self.queues.append(q_to_lower)
+
     def close_all(self):
         """
         Utility function to close all queues managed by the LayerStack.
@@ -91,20 +144,97 @@ class LayerStack(object):
         self._queue_from_higher.close()
         self._queue_to_lower.close()
         self._queue_from_lower.close()
+        if self.in_process:
+            self._stop_writer.close()
 
     def start_all(self):
         """
-        Utility function to start all LayerProcesses managed by the LayerStack.
+        Utility function to start all LayerProcesses managed by the LayerStack. In the in-process mode, the process loop
+        of each layer runs in a thread of the current process, where it only serves the inputs of the layer from
+        outside the stack (e.g. the network interfaces of a link layer).
         """
         self.__started = True
-        [l.start_process() for l in self.layers]
+        if not self.in_process:
+            for i in range(len(self.layers)):
+                self.layers[i].use_asyncio = self.use_asyncio
+                self.layers[i].max_batch_size = self.max_batch_size
+                self.layers[i].batch_to_higher = self.max_batch_size > 1 and i > 0
+                self.layers[i].batch_to_lower = self.max_batch_size > 1 and i < len(self.layers) - 1
+            [l.start_process() for l in self.layers]
+            return
+        for i in range(len(self.layers) - 1):
+            self.layers[i].queue_to_lower.connect(self.layers[i + 1], from_lower=False)
+            self.layers[i + 1].queue_to_higher.connect(self.layers[i], from_lower=True)
+        if self._runtime is not None:
+            for layer in self.layers:
+                from_higher = self._queue_from_higher if layer == self.layers[0] else None
+                from_lower = self._queue_from_lower if layer == self.layers[len(self.layers) - 1] else None
+                self._runtime.add_layer(layer, from_lower, from_higher, layer.queue_to_lower, layer.queue_to_higher)
+                self._runtime.call_soon(layer.start_layer)
+            self.__start_thread(self._runtime.run)
+            return
+        for layer in self.layers:
+            layer.executor = self.run_exclusive
+        self.__start_thread(self.__receive_from_outside)
+        for layer in self.layers:
+            self.__start_thread(self.__run_layer, layer)
 
     def stop_all(self):
         """
         Utility function to stop all LayerProcesses managed by the LayerStack.
         """
+        if self.in_process and not self._stop_writer.closed:
+            self._stop_writer.send_bytes(b'stop')
+        if self._runtime is not None:
+            self._runtime.stop()
         [l.stop_process() for l in self.layers]
 
+    def dispatch(self, layer: LayerProcess, from_lower: bool, data):
+        """
+        Deliver data to a layer of an in-process stack, called by InProcessQueue.put. The layers handle one packet at a
+        time: if another packet is being handled, the data is queued and handled by the thread handling that packet
+        afterwards, so that a layer passing data on never re-enters a layer.
+        :param layer: The receiving layer
+        :param from_lower: True to call data_from_lower of the layer, False to call data_from_higher
+        :param data: The data to deliver
+        """
+        self._pending.append((layer, from_lower, data))
+        self.__drain()
+
+    def run_exclusive(self, func, *args):
+        """
+        Run a function of another thread while no layer of an in-process stack handles data, e.g. to access data
+        structures the layers use without locking them. Used by the mgmt, the timers of the layers and the threads
+        reading from the interfaces. Must not be called by a handler.
+        :param func: The function to run
+        :param args: Arguments of the function
+        :return: The result of the function
+        """
+        if not self.in_process:
+            return func(*args)
+        if self._runtime is not None:
+            return self._runtime.run_exclusive(func, *args)
+        with self._dispatch_lock:
+            result = func(*args)
+        # Data passed to the stack meanwhile was queued by threads which could not take over the dispatching
+        self.__drain()
+        return result
+
+    def __drain(self):
+        while len(self._pending) > 0:
+            if not self._dispatch_lock.acquire(blocking=False):
+                return
+            try:
+                while len(self._pending) > 0:
+                    layer, from_lower, data = self._pending.popleft()
+                    try:
+                        handler = layer.data_from_lower if from_lower else layer.data_from_higher
+                        layer.call_handler(handler, layer.queue_to_lower, layer.queue_to_higher, data)
+                    except Exception as e:
+                        layer.logger.error(f'Handling data failed: {e!r}')
+            finally:
+                self._dispatch_lock.release()
+
     @property
     def queue_to_higher(self):
         return self._queue_to_higher
@@ -149,6 +279,43 @@ class LayerStack(object):
         self.queue_from_lower = queue
         self.layers[len(self.layers)-1].queue_from_lower = queue
 
+    def __new_queue(self):
+        if self.in_process:
+            return InProcessQueue(self._runtime or self, self._stop_reader)
+        return multiprocessing.Queue()
+
+    def __start_thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def __run_layer(self, layer: LayerProcess):
+        # Inputs from outside of the stack are served by __receive_from_outside, the process loop gets an idle queue
+        idle = InProcessQueue(self, self._stop_reader)
+        from_lower = layer.queue_from_lower if isinstance(layer.queue_from_lower, InProcessQueue) else idle
+        from_higher = layer.queue_from_higher if isinstance(layer.queue_from_higher, InProcessQueue) else idle
+        try:
+            layer._run(from_lower, from_higher, layer.queue_to_lower, layer.queue_to_higher)
+        except Exception as e:
+            if not self._stop_reader.poll():
+                layer.logger.error(f'Layer stopped: {e!r}')
+
+    def __receive_from_outside(self):
+        top = self.layers[0]
+        bottom = self.layers[len(self.layers) - 1]
+        readers = {self._queue_from_higher._reader: (top, self._queue_from_higher, False),
+                   self._queue_from_lower._reader: (bottom, self._queue_from_lower, True)}
+        try:
+            while True:
+                for reader in wait(list(readers.keys()) + [self._stop_reader]):
+                    if reader == self._stop_reader:
+                        return
+                    layer, q, from_lower = readers[reader]
+                    if not q.empty():
+                        self.dispatch(layer, from_lower, q.get())
+        except (OSError, EOFError, ValueError):
+            return
+
     def __insert(self, layer: LayerProcess, at: int):
         # Get the layers between which to insert the new layer
         layer_above = self.layers[at - 1] if at > 0 else None
@@ -160,7 +327,7 @@ class LayerStack(object):
             queues.append(layer_above.queue_from_lower)
         # Create two new queues needed for connecting the new layer to the stack.
         for x in range(2):
-            q = multiprocessing.Queue()
+            q = self.__new_queue()
             self.queues.append(q)
             queues.append(q)
         # Set up queues to the layer above
@@ -0,0 +1,229 @@
+"""Queue between two layer processes based on a ring buffer in shared memory"""
+
+import os
+import pickle
+import queue
+import select
+import struct
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+from PiCN.Processes import PacketBatch
+
+
+class Doorbell(object):
+    """File descriptor signalling that data was put into a SharedMemoryQueue, so that the receiving process can wait
+    for it using select or poll. Uses an eventfd where available, a pipe otherwise."""
+
+    def __init__(self):
+        if hasattr(os, 'eventfd'):
+            self._read_fd = self._write_fd = os.eventfd(0, os.EFD_NONBLOCK)
+        else:
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._read_fd, False)
+            os.set_blocking(self._write_fd, False)
+        self.closed: bool = False
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    def ring(self):
+        """make the file descriptor readable"""
+        try:
+            if self._read_fd == self._write_fd:
+                os.eventfd_write(self._write_fd, 1)
+            else:
+                os.write(self._write_fd, b'\0')
+        except BlockingIOError:
+            pass  # it is readable already
+
+    def clear(self):
+        """make the file descriptor unreadable until the next ring"""
+        try:
+            if self._read_fd == self._write_fd:
+                os.eventfd_read(self._read_fd)
+            else:
+                while len(os.read(self._read_fd, 4096)) > 0:
+                    pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        os.close(self._read_fd)
+        if self._write_fd != self._read_fd:
+            os.close(self._write_fd)
+
+
+class SharedMemoryQueue(object):
+    """
+    Single producer, single consumer queue between two processes, replacing a multiprocessing.Queue between two layers.
+    The data is copied into a ring buffer in shared memory, there is no feeder thread and no pipe for the data. A
+    Doorbell, available as _reader like the pipe of a multiprocessing.Queue, makes the queue usable with select/poll.
+    [faceid, bytes] lists and bytes, as passed between the link layer and the packet encoding layer, are copied without
+    pickling, other data is pickled. A PacketBatch is written with a single doorbell ring and read item by item.
+    The queue must be created before the processes are forked and must have one producing and one consuming process
+    only, threads of these processes may share it.
+
+    Layout of the shared memory: read position (uint64, written by the consumer), write position (uint64, written by
+    the producer), ring buffer. Positions grow monotonically, the offset in the ring buffer is position % capacity.
+    Record: payload length (uint32), kind (uint8), payload. The payload of a [faceid, bytes] record starts with the face
+    id (int64).
+    """
+
+    KIND_BYTES: int = 0
+    KIND_FACE_BYTES: int = 1
+    KIND_PICKLED: int = 2
+
+    _position = struct.Struct('=Q')
+    _record = struct.Struct('=IB')
+    _faceid = struct.Struct('=q')
+    _positions_size = 2 * _position.size
+
+    def __init__(self, capacity: int = 1 << 20):
+        """
+        :param capacity: Size of the ring buffer in bytes, limits the size of a single record
+        """
+        self._capacity: int = capacity
+        self._shm = SharedMemory(create=True, size=self._positions_size + capacity)
+        self._buf = self._shm.buf
+        self._position.pack_into(self._buf, 0, 0)
+        self._position.pack_into(self._buf, self._position.size, 0)
+        self._reader: Doorbell = Doorbell()
+        self._creator: int = os.getpid()
+        self._put_lock = threading.Lock()
+        self._get_lock = threading.Lock()
+        self._is_closed: bool = False
+
+    @property
+    def _closed(self) -> bool:
+        """same as multiprocessing.Queue._closed, used by layers to detect that they were stopped"""
+        return self._is_closed
+
+    def put(self, data, block=True, timeout=None):
+        """
+        Put data into the queue, waits while the ring buffer is full
+        :param data: the data, a PacketBatch is put item by item
+        """
+        records = [self._encode(d) for d in (data if isinstance(data, PacketBatch) else [data])]
+        with self._put_lock:
+            for record in records:
+                self._write(record, timeout)
+        self._reader.ring()
+
+    def put_nowait(self, data):
+        self.put(data, timeout=0)
+
+    def get(self, block=True, timeout=None):
+        """
+        Get the next item of the queue
+        :param block: wait for data if the queue is empty
+        :param timeout: maximum time to wait in seconds, None to wait forever
+        :return: the item
+        :raise queue.Empty: if no item is available
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._get_lock:
+            while True:
+                if self._is_closed:
+                    raise ValueError('Queue is closed')
+                if self._available():
+                    return self._read()
+                remaining = None if deadline is None else max(0.0, deadline - time.time())
+                if not block or remaining == 0.0:
+                    raise queue.Empty()
+                if self.empty():
+                    select.select([self._reader], [], [], remaining)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def empty(self) -> bool:
+        """True if the queue is empty. The doorbell is cleared then, so that select/poll wait for the next item. It is
+        only cleared while the queue is empty: it stays readable while data is available."""
+        if self._available():
+            return False
+        self._reader.clear()
+        if self._available():
+            # put meanwhile, its ring may have been cleared
+            self._reader.ring()
+            return False
+        return True
+
+    def close(self):
+        """release the shared memory, the creating process removes it"""
+        if self._is_closed:
+            return
+        self._is_closed = True
+        self._buf = None
+        self._shm.close()
+        if os.getpid() == self._creator:
+            self._shm.unlink()
+        self._reader.close()
+
+    def join_thread(self):
+        pass
+
+    def _encode(self, data) -> bytes:
+        if isinstance(data, list) and len(data) == 2 and type(data[0]) is int \
+                and isinstance(data[1], (bytes, bytearray)):
+            payload = self._faceid.pack(data[0]) + data[1]
+            return self._record.pack(len(payload), self.KIND_FACE_BYTES) + payload
+        if isinstance(data, (bytes, bytearray)):
+            return self._record.pack(len(data), self.KIND_BYTES) + data
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._record.pack(len(payload), self.KIND_PICKLED) + payload
+
+    def _available(self) -> bool:
+        if self._is_closed:
+            raise ValueError('Queue is closed')
+        return self._position.unpack_from(self._buf, 0)[0] != \
+            self._position.unpack_from(self._buf, self._position.size)[0]
+
+    def _write(self, record: bytes, timeout):
+        if len(record) > self._capacity:
+            raise ValueError('Data exceeds the capacity of the queue')
+        deadline = None if timeout is None else time.time() + timeout
+        tail = self._position.unpack_from(self._buf, self._position.size)[0]
+        while self._capacity - (tail - self._position.unpack_from(self._buf, 0)[0]) < len(record):
+            # the records of a batch written so far must be read to make room
+            self._reader.ring()
+            if self._is_closed:
+                raise ValueError('Queue is closed')
+            if deadline is not None and time.time() >= deadline:
+                raise queue.Full()
+            time.sleep(0.0001)
+        self._copy_in(tail, record)
+        # publish the record after it was written completely
+        self._position.pack_into(self._buf, self._position.size, tail + len(record))
+
+    def _read(self):
+        head = self._position.unpack_from(self._buf, 0)[0]
+        length, kind = self._record.unpack(self._copy_out(head, self._record.size))
+        payload = self._copy_out(head + self._record.size, length)
+        self._position.pack_into(self._buf, 0, head + self._record.size + length)
+        if kind == self.KIND_FACE_BYTES:
+            return [self._faceid.unpack_from(payload, 0)[0], payload[self._faceid.size:]]
+        if kind == self.KIND_BYTES:
+            return payload
+        return pickle.loads(payload)
+
+    def _copy_in(self, position: int, data: bytes):
+        offset = position % self._capacity
+        first = min(len(data), self._capacity - offset)
+        start = self._positions_size + offset
+        self._buf[start:start + first] = data[:first]
+        if first < len(data):
+            self._buf[self._positions_size:self._positions_size + len(data) - first] = data[first:]
+
+    def _copy_out(self, position: int, length: int) -> bytes:
+        offset = position % self._capacity
+        first = min(length, self._capacity - offset)
+        start = self._positions_size + offset
+        data = bytes(self._buf[start:start + first])
+        if first < length:
+            data += bytes(self._buf[self._positions_size:self._positions_size + length - first])
+        return data
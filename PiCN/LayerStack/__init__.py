@@ -1,2 +1,3 @@
-
+from .InProcessQueue import InProcessQueue
+from .SharedMemoryQueue import SharedMemoryQueue
 from .LayerStack import LayerStack
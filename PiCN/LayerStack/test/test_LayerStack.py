@@ -1,11 +1,64 @@
 
 import unittest
 
-from PiCN.LayerStack import LayerStack
+from PiCN.LayerStack import LayerStack, InProcessQueue
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
 from PiCN.Processes import LayerProcess
 
 
+class RecordingLayer(LayerProcess):
+    """Passes data on, recording the received objects"""
+
+    def __init__(self, name):
+        super().__init__(logger_name=name)
+        self.name = name
+        self.received = []
+
+    def data_from_lower(self, to_lower, to_higher, data):
+        self.received.append(data)
+        to_higher.put(data + [self.name])
+
+    def data_from_higher(self, to_lower, to_higher, data):
+        self.received.append(data)
+        if data == ['bounce']:
+            # answered while the lower layer is still handling other data
+            to_higher.put(['bounced', self.name])
+        to_lower.put(data + [self.name])
+
+
+class AgeingLayer(RecordingLayer):
+    """Passes data on, while a timer keeps replacing the table the handler iterates"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.table = {i: i for i in range(0, 100)}
+        self.busy = False
+        self.overlaps = 0
+        self.ageing_runs = 0
+        self.stopped = False
+
+    def start_layer(self):
+        self.schedule(0.001, self.ageing)
+
+    def ageing(self):
+        if self.busy:
+            self.overlaps += 1
+        for key in list(self.table.keys()):
+            del self.table[key]
+        self.table = {i: i for i in range(0, 100)}
+        self.ageing_runs += 1
+        if not self.stopped:
+            self.schedule(0.001, self.ageing)
+
+    def data_from_higher(self, to_lower, to_higher, data):
+        self.busy = True
+        try:
+            sum(value for value in self.table.values())
+        finally:
+            self.busy = False
+        super().data_from_higher(to_lower, to_higher, data)
+
+
 class test_LayerStack(unittest.TestCase):
 
     def test_create_empty(self):
@@ -82,6 +135,102 @@ class test_LayerStack(unittest.TestCase):
         self.assertNotEqual(toplayer.queue_to_lower, bottomlayer.queue_from_higher)
         self.assertNotEqual(toplayer.queue_from_lower, bottomlayer.queue_to_higher)
 
+    def test_create_in_process(self):
+        toplayer: LayerProcess = BasicPacketEncodingLayer()
+        bottomlayer: LayerProcess = BasicPacketEncodingLayer()
+        newlayer: LayerProcess = BasicPacketEncodingLayer()
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], in_process=True)
+        lstack.insert(newlayer, below_of=toplayer)
+        self.assertEqual(4, len(lstack.queues))
+        self.assertTrue(all(isinstance(q, InProcessQueue) for q in lstack.queues))
+        self.assertEqual(toplayer.queue_to_lower, newlayer.queue_from_higher)
+        self.assertEqual(newlayer.queue_to_lower, bottomlayer.queue_from_higher)
+        self.assertNotIsInstance(lstack.queue_to_higher, InProcessQueue)
+        self.assertEqual(lstack.queue_to_lower, bottomlayer.queue_to_lower)
+
+    def test_in_process_pass_data(self):
+        toplayer = RecordingLayer('top')
+        middlelayer = RecordingLayer('middle')
+        bottomlayer = RecordingLayer('bottom')
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], in_process=True)
+        lstack.insert(middlelayer, on_top_of=bottomlayer)
+        lstack.start_all()
+        try:
+            lstack.queue_from_higher.put(['down'])
+            self.assertEqual(['down', 'top', 'middle', 'bottom'], lstack.queue_to_lower.get(timeout=2.0))
+            lstack.queue_from_lower.put(['up'])
+            self.assertEqual(['up', 'bottom', 'middle', 'top'], lstack.queue_to_higher.get(timeout=2.0))
+            # Objects are handed over without copying them
+            data = ['direct']
+            toplayer.queue_to_lower.put(data)
+            self.assertIs(data, middlelayer.received[-1])
+            self.assertEqual(['direct', 'middle', 'bottom'], lstack.queue_to_lower.get(timeout=2.0))
+            # Data passed on by a layer is handled after the layer returned, the top layer is not re-entered
+            toplayer.queue_to_lower.put(['bounce'])
+            self.assertEqual(['bounce', 'middle', 'bottom'], lstack.queue_to_lower.get(timeout=2.0))
+            self.assertEqual(['bounced', 'middle', 'top'], lstack.queue_to_higher.get(timeout=2.0))
+            self.assertEqual(['bounced', 'middle'], toplayer.received[-1])
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+        for thread in lstack._threads:
+            thread.join(timeout=2.0)
+            self.assertFalse(thread.is_alive())
+
+    def test_in_process_asyncio(self):
+        toplayer = RecordingLayer('top')
+        bottomlayer = RecordingLayer('bottom')
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], in_process=True, use_asyncio=True)
+        lstack.start_all()
+        try:
+            self.assertIs(toplayer.runtime, bottomlayer.runtime)
+            lstack.queue_from_higher.put(['down'])
+            self.assertEqual(['down', 'top', 'bottom'], lstack.queue_to_lower.get(timeout=2.0))
+            lstack.queue_from_lower.put(['up'])
+            self.assertEqual(['up', 'bottom', 'top'], lstack.queue_to_higher.get(timeout=2.0))
+            self.assertTrue(lstack.run_exclusive(toplayer.runtime.in_loop))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+        for thread in lstack._threads:
+            thread.join(timeout=2.0)
+            self.assertFalse(thread.is_alive())
+
+    def test_in_process_timers_exclusive(self):
+        toplayer = AgeingLayer('top')
+        bottomlayer = RecordingLayer('bottom')
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], in_process=True)
+        lstack.start_all()
+        try:
+            for i in range(0, 2000):
+                lstack.queue_from_higher.put([i])
+            for i in range(0, 2000):
+                self.assertEqual([i, 'top', 'bottom'], lstack.queue_to_lower.get(timeout=2.0))
+            self.assertGreater(toplayer.ageing_runs, 0)
+            # Timer callbacks do not run while a handler runs
+            self.assertEqual(0, toplayer.overlaps)
+        finally:
+            toplayer.stopped = True
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_batches(self):
+        toplayer = RecordingLayer('top')
+        bottomlayer = RecordingLayer('bottom')
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], max_batch_size=8)
+        for i in range(0, 20):
+            lstack.queue_from_higher.put([i])
+        lstack.start_all()
+        try:
+            self.assertTrue(toplayer.batch_to_lower and not toplayer.batch_to_higher)
+            self.assertTrue(bottomlayer.batch_to_higher and not bottomlayer.batch_to_lower)
+            # Data leaving the stack is not batched
+            for i in range(0, 20):
+                self.assertEqual([i, 'top', 'bottom'], lstack.queue_to_lower.get(timeout=2.0))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+import multiprocessing
+import queue
+import select
+import socket
+import unittest
+
+from PiCN.LayerStack import SharedMemoryQueue, LayerStack
+from PiCN.Layers.LinkLayer import BasicLinkLayer
+from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
+from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo
+from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+from PiCN.Packets import Content, Interest
+from PiCN.Processes import PacketBatch, PiCNSyncDataStructFactory
+
+from PiCN.LayerStack.test.test_LayerStack import RecordingLayer
+
+
+def produce(q: SharedMemoryQueue, count: int):
+    for i in range(0, count, 10):
+        q.put(PacketBatch([[j, bytes([j % 256]) * (j % 50)] for j in range(i, i + 10)]))
+
+
+class test_SharedMemoryQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = SharedMemoryQueue(capacity=256)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_put_get(self):
+        self.assertTrue(self.queue.empty())
+        self.queue.put([3, b'\x05\x00wire'])
+        self.queue.put(b'raw')
+        self.queue.put([None, Interest('/test/data')])
+        self.assertFalse(self.queue.empty())
+        self.assertEqual([3, b'\x05\x00wire'], self.queue.get())
+        self.assertEqual(b'raw', self.queue.get())
+        self.assertEqual([None, Interest('/test/data')], self.queue.get())
+        self.assertTrue(self.queue.empty())
+        with self.assertRaises(queue.Empty):
+            self.queue.get(timeout=0.1)
+
+    def test_batch(self):
+        self.queue.put(PacketBatch([[1, b'a'], [2, b'b']]))
+        self.assertEqual([1, b'a'], self.queue.get())
+        self.assertEqual([2, b'b'], self.queue.get())
+
+    def test_wrap_around(self):
+        for i in range(0, 100):
+            self.queue.put([i, b'x' * 60])
+            self.assertEqual([i, b'x' * 60], self.queue.get())
+        with self.assertRaises(ValueError):
+            self.queue.put(b'x' * 300)
+
+    def test_full(self):
+        self.queue.put(b'x' * 200)
+        with self.assertRaises(queue.Full):
+            self.queue.put(b'x' * 100, timeout=0.1)
+
+    def test_doorbell(self):
+        """Test that the reader is readable exactly while data is available"""
+        self.assertEqual([], select.select([self.queue._reader], [], [], 0)[0])
+        self.queue.put(b'data')
+        self.assertEqual([self.queue._reader], select.select([self.queue._reader], [], [], 0)[0])
+        self.assertFalse(self.queue.empty())
+        self.queue.get()
+        self.assertTrue(self.queue.empty())
+        self.assertEqual([], select.select([self.queue._reader], [], [], 0)[0])
+
+    def test_other_process(self):
+        """Test that a producer in another process can fill the ring buffer several times"""
+        p = multiprocessing.Process(target=produce, args=[self.queue, 500])
+        p.start()
+        for i in range(0, 500):
+            select.select([self.queue._reader], [], [], 2.0)
+            self.assertEqual([i, bytes([i % 256]) * (i % 50)], self.queue.get(timeout=2.0))
+        p.join()
+
+    def test_layer_stack(self):
+        toplayer = RecordingLayer('top')
+        bottomlayer = RecordingLayer('bottom')
+        lstack = LayerStack([toplayer, bottomlayer])
+        lstack.use_shared_memory(toplayer)
+        self.assertIsInstance(toplayer.queue_to_lower, SharedMemoryQueue)
+        self.assertEqual(toplayer.queue_to_lower, bottomlayer.queue_from_higher)
+        self.assertEqual(2, len(lstack.queues))
+        with self.assertRaises(ValueError):
+            lstack.use_shared_memory(bottomlayer)
+        lstack.start_all()
+        try:
+            lstack.queue_from_higher.put(['down'])
+            self.assertEqual(['down', 'top', 'bottom'], lstack.queue_to_lower.get(timeout=2.0))
+            lstack.queue_from_lower.put(['up'])
+            self.assertEqual(['up', 'bottom', 'top'], lstack.queue_to_higher.get(timeout=2.0))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_link_layer(self):
+        """Test the queues between the packet encoding layer and the link layer"""
+        synced_data_struct_factory = PiCNSyncDataStructFactory()
+        synced_data_struct_factory.register("faceidtable", FaceIDDict)
+        synced_data_struct_factory.create_manager()
+        faceidtable = synced_data_struct_factory.manager.faceidtable()
+        interface = UDP4Interface(0)
+        encoder = NdnTlvEncoder()
+        encodinglayer = BasicPacketEncodingLayer(encoder)
+        lstack = LayerStack([encodinglayer, BasicLinkLayer([interface], faceidtable)])
+        lstack.use_shared_memory(encodinglayer)
+        test_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        test_sock.bind(("127.0.0.1", 0))
+        faceid = faceidtable.get_or_create_faceid(AddressInfo(("127.0.0.1", test_sock.getsockname()[1]), 0))
+        lstack.start_all()
+        try:
+            lstack.queue_from_higher.put([faceid, Interest("/test/data")])
+            wire, addr = test_sock.recvfrom(8192)
+            self.assertEqual(Interest("/test/data"), encoder.decode(wire))
+            test_sock.sendto(encoder.encode(Content("/test/data", "HelloWorld")), ("127.0.0.1", interface.get_port()))
+            self.assertEqual([faceid, Content("/test/data", "HelloWorld")], lstack.queue_to_higher.get(timeout=2.0))
+        finally:
+            test_sock.close()
+            lstack.stop_all()
+            lstack.close_all()
@@ -168,9 +168,8 @@ class AutoconfigServerLayer(LayerProcess):
         else:
             # If routing is enabled AND the prefix is routed, create a RIB entry
             self.rib.insert(srvname, srvfid, 1, timeout)
-            container: List[ForwardingInformationBaseEntry] = self.fib.container
-            container = self.rib.build_fib(container)
-            self.fib.container = container
+            added, changed, removed = self.rib.build_fib_diff()
+            self.fib.apply_fib_diff(added, changed, removed)
         self._known_services.append((srvname, srvaddr, datetime.utcnow() + self._service_registration_timeout))
         ack: Content = Content(interest.name, str(int(self._service_registration_timeout.total_seconds())) + '\n')
         return ack
@@ -1,31 +1,44 @@
 
 """Basic ICN Forwarding Layer"""
 
+import copy
 import multiprocessing
-import threading
 import time
 from typing import List
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Layers.ICNLayer.ContentStore import BaseAdmissionPolicy, AlwaysAdmissionPolicy
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase, ForwardingInformationBaseEntry
+from PiCN.Layers.ICNLayer.ForwardingStrategy import BaseForwardingStrategy, OccupancyForwardingStrategy
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import BaseRoutingInformationBase
 from PiCN.Layers.ICNLayer.PendingInterestTable import BasePendingInterestTable, PendingInterestTableEntry
+from PiCN.Layers.ICNLayer.NameTree import NameTree
 from PiCN.Packets import Name, Content, Interest, Packet, Nack, NackReason
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, BatchWriter
 
 
 class BasicICNLayer(LayerProcess):
     """ICN Forwarding Plane. Maintains data structures for ICN Forwarding
+    :param admission_policy: decides which forwarded content objects are cached, defaults to caching all of them
+    :param name_tree: name tree of which cs, pit and fib are views, received interests are then looked up in a single
+    call instead of one call per data structure
+    :param forwarding_strategy: decides to which face of a FIB entry an interest is sent, defaults to the least
+    occupied face
     """
 
     def __init__(self, cs: BaseContentStore=None, pit: BasePendingInterestTable=None,
             fib: BaseForwardingInformationBase=None, rib: BaseRoutingInformationBase = None, log_level=255,
-                 ageing_interval: int=3):
+                 ageing_interval: int=3, admission_policy: BaseAdmissionPolicy=None, name_tree: NameTree=None,
+                 forwarding_strategy: BaseForwardingStrategy=None):
         super().__init__(logger_name="ICNLayer", log_level=log_level)
         self.cs = cs
         self.pit = pit
         self.fib = fib
         self.rib = rib
+        self.name_tree = name_tree
+        self.admission_policy = admission_policy if admission_policy is not None else AlwaysAdmissionPolicy()
+        self.forwarding_strategy = forwarding_strategy if forwarding_strategy is not None \
+            else OccupancyForwardingStrategy()
         self._ageing_interval: int = 20000
         self._interest_to_app: bool = False
 
@@ -62,34 +75,17 @@ class BasicICNLayer(LayerProcess):
     def handle_interest_from_higher (self, face_id: int, interest: Interest, to_lower: multiprocessing.Queue,
                                    to_higher: multiprocessing.Queue):
         self.logger.info("Handling Interest (from higher): " + str(interest.name) + "; Face ID: " + str(face_id))
-        cs_entry = self.cs.find_content_object(interest.name)
+        cs_entry, pit_entry, fib_entry = self.lookup_interest(interest.name, face_id, True)
         if cs_entry is not None:
-            self.queue_to_higher.put([face_id, cs_entry.content])
+            to_higher.put([face_id, self.content_from_cs(cs_entry)])
             return
-        pit_entry = self.pit.find_pit_entry(interest.name)
-
-        if pit_entry:
-            self.pit.add_interested_face(interest.name, face_id)
-            fib_entry = self.fib.find_fib_entry(interest.name, incoming_faceids=pit_entry.faceids)
-        else:
-            fib_entry = self.fib.find_fib_entry(interest.name)
 
         if fib_entry is not None:
-            self.pit.set_number_of_forwards(interest.name, 0)
-            pit_occupancy = self.pit.occupancy_available_faces_per_name(fib_entry)
-            sorted_pit_occupancy = sorted(pit_occupancy.items(), key=lambda kv: kv[1])
-            faces_sorted_by_occupancy = list(map(lambda kv: kv[0], sorted_pit_occupancy))
-
-            for fid in faces_sorted_by_occupancy:
-                try:
-                    if not self.pit.test_faceid_was_nacked(interest.name, fid):
-                        self.pit.add_pit_entry(interest.name, face_id, fid, interest, local_app=True)
-                        self.pit.increase_number_of_forwards(interest.name)
-                        self.pit.add_used_fib_face(interest.name, [fid])
-                        to_lower.put([fid, interest])
-                        break
-                except:
-                    pass
+            try:
+                self.forward_interest(interest.name, face_id, interest, fib_entry, to_lower, local_app=True,
+                                      reset_number_of_forwards=True)
+            except:
+                pass
         else:
             self.logger.info("No FIB entry, sending Nack: " + str(interest.name))
             nack = Nack(interest.name, NackReason.NO_ROUTE, interest=interest)
@@ -105,43 +101,26 @@ class BasicICNLayer(LayerProcess):
     def handle_interest_from_lower(self, face_id: int, interest: Interest, to_lower: multiprocessing.Queue,
                                    to_higher: multiprocessing.Queue, from_local: bool = False):
         self.logger.info("Handling Interest (from lower): " + str(interest.name) + "; Face ID: " + str(face_id))
-        cs_entry = self.cs.find_content_object(interest.name)
+        cs_entry, pit_entry, matching_fib_entry = self.lookup_interest(interest.name, face_id, False)
         if cs_entry is not None:
             self.logger.info("Found in content store")
-            to_lower.put([face_id, cs_entry.content])
-            self.cs.update_timestamp(cs_entry)
+            to_lower.put([face_id, self.content_from_cs(cs_entry)])
             return
-        pit_entry = self.pit.find_pit_entry(interest.name)
         if pit_entry is not None:
             self.logger.info("Found in PIT, appending")
-            self.pit.update_timestamp(pit_entry)
-            self.pit.add_interested_face(interest.name, face_id)
-            # self.pit.add_pit_entry(interest.name, face_id, interest, local_app=from_local)
             return
         if self._interest_to_app is True and to_higher is not None: #App layer support
             self.logger.info("Sending to higher Layer")
             self.pit.add_pit_entry(interest.name, face_id, -1, interest, local_app=from_local)
-            self.queue_to_higher.put([face_id, interest])
+            to_higher.put([face_id, interest])
             return
-        matching_fib_entry = self.fib.find_fib_entry(interest.name, None, [face_id])
         if matching_fib_entry is not None:
             self.logger.info("Found in FIB, the name is: " +  str(matching_fib_entry.name))
             self.logger.info("Found in FIB, available faces: " +  str(matching_fib_entry.faceid))
-            pit_occupancy = self.pit.occupancy_available_faces_per_name(matching_fib_entry)
-            self.logger.info("pit_occupancy: " + str(pit_occupancy))
-            sorted_pit_occupancy = sorted(pit_occupancy.items(), key=lambda kv: kv[1])
-            faces_sorted_by_occupancy = list(map(lambda kv: kv[0], sorted_pit_occupancy))
-            self.logger.info("faces_sorted_by_occupancy : " + str(faces_sorted_by_occupancy))
-
-            for fid in faces_sorted_by_occupancy:
-                if not self.pit.test_faceid_was_nacked(interest.name, fid):
-                    self.pit.add_pit_entry(interest.name, face_id, fid, interest, local_app=from_local)
-                    #TODO Check if the two following lines are right
-                    self.pit.add_used_fib_face(interest.name, [fid])
-                    self.pit.increase_number_of_forwards(interest.name)
-                    to_lower.put([fid, interest])
-                    self.logger.info("the interest :"+ str(interest.name) + "is sent to : " + str(fid) )
-                    break
+            fid = self.forward_interest(interest.name, face_id, interest, matching_fib_entry, to_lower,
+                                        local_app=from_local)
+            if fid is not None:
+                self.logger.info("the interest :"+ str(interest.name) + "is sent to : " + str(fid) )
             return
         self.logger.info("No FIB entry, sending Nack")
         nack = Nack(interest.name, NackReason.NO_ROUTE, interest=interest)
@@ -153,48 +132,48 @@ class BasicICNLayer(LayerProcess):
     def handle_content(self, face_id: int, content: Content, to_lower: multiprocessing.Queue,
                        to_higher: multiprocessing.Queue, from_local: bool = False):
         self.logger.info("Handling Content " + str(content.name) + " " + str(content.content))
-        pit_entry = self.pit.find_pit_entry(content.name)
+        if not from_local:
+            self.forwarding_strategy.record_data(content.name, face_id)
+        pit_entry = self.pit.pop_pit_entry(content.name)
         if pit_entry is None:
             self.logger.info("No PIT entry for content object available, dropping")
             #todo NACK??
             #self.cs.add_content_object(content)
             return
         else:
+            admitted, no_cache = self.admission_policy.decide(content, face_id, from_local)
+            if content.no_cache != no_cache:
+                # do not modify the object of the caller
+                content = copy.copy(content)
+                content.no_cache = no_cache
             for i in range(0, len(pit_entry.faceids)):
                 if to_higher and pit_entry.local_app[i]:
                     to_higher.put([face_id, content])
                 else:
                     to_lower.put([pit_entry.faceids[i], content])
-            self.pit.remove_pit_entry(pit_entry.name)
-            self.cs.add_content_object(content)
+            if admitted:
+                self.cs.add_content_object(content)
     #TODO CHECK
     def handle_nack(self, face_id: int, nack: Nack, to_lower: multiprocessing.Queue,
                     to_higher: multiprocessing.Queue, from_local: bool = False):
         self.logger.info("Handling NACK: " + str(nack.name) + " Reason: " + str(nack.reason) + ", From FaceID: " +
                          str(face_id) + ", From Local: " + str(from_local))
-        cur_pit_entry = self.pit.find_pit_entry(nack.name)
-        if cur_pit_entry is None:
+        if not from_local:
+            self.forwarding_strategy.record_nack(nack.name, face_id)
+        pit_entry, other_forwards_active = self.pit.record_nack(nack.name, face_id)
+        if pit_entry is None:
             self.logger.info("No PIT entry for NACK available, dropping")
             return
         else:
-            self.pit.add_nacked_faceid(nack.name, face_id)
-            if cur_pit_entry.number_of_forwards > 1:
-                self.logger.info("Ignoring Nack from FaceID " + str(face_id) + " for " + str(nack.name) + " since other faces (" + str(cur_pit_entry.number_of_forwards) + ") are still active")
-                self.pit.decrease_number_of_forwards(nack.name)
+            if other_forwards_active:
+                self.logger.info("Ignoring Nack from FaceID " + str(face_id) + " for " + str(nack.name) + " since other faces (" + str(pit_entry.number_of_forwards) + ") are still active")
                 return
-            self.pit.set_number_of_forwards(nack.name, 0)
             #TODO change here the strategy of getting the next FIB entry
-            cur_fib_entry = self.fib.find_fib_entry(nack.name, cur_pit_entry.fib_faces_already_used, cur_pit_entry.faceids) #current entry
-            # for fib_face in cur_fib_entry.faceid:
-            #     if fib_face in cur_pit_entry.fib_faces_already_used:
-            #         continue
-            self.pit.add_used_fib_face(nack.name,cur_pit_entry.fib_faces_already_used) #add current face to used list, modiefies pit entry in pit
-            pit_entry = self.pit.find_pit_entry(nack.name) #read modified entry from pit
-            fib_entry = self.fib.find_fib_entry(nack.name,pit_entry.fib_faces_already_used, pit_entry.faceids) #read new fib entry
+            fib_entry = self.fib.find_fib_entry(nack.name, pit_entry.fib_faces_already_used, pit_entry.faceids) #read new fib entry
             if fib_entry is None or fib_entry.faceid == [face_id]: #FIXME WHAT IS THE RIGHT CONDITION HERE?
                 if self._interest_to_app and not from_local and 'THUNK' in str(nack.name):
                     self.logger.info("Sending Thunk Nack to upper")
-                    self.queue_to_higher.put([face_id, nack])
+                    to_higher.put([face_id, nack])
                     return
                 self.logger.info("Sending NACK to previous node(s)")
                 re_add = False
@@ -219,24 +198,80 @@ class BasicICNLayer(LayerProcess):
 
             else:
                 self.logger.info("Try using next FIB path with FaceID: " + str(fib_entry.faceid))
-                pit_occupancy = self.pit.occupancy_available_faces_per_name(fib_entry)
-                self.logger.info("pit_occupancy: " + str(pit_occupancy))
-                sorted_pit_occupancy = sorted(pit_occupancy.items(), key=lambda kv: kv[1])
-                faces_sorted_by_occupancy = list(map(lambda kv: kv[0], sorted_pit_occupancy))
-                self.logger.info("faces_sorted_by_occupancy : " + str(faces_sorted_by_occupancy))
-                for fid in faces_sorted_by_occupancy:
-                    if not self.pit.test_faceid_was_nacked(pit_entry.name, fid):
-                        self.pit.add_pit_entry(pit_entry.interest.name, face_id, fid, pit_entry.interest, local_app=from_local)
-                        #self.pit.update_timestamp(pit_entry)
-                        self.pit.add_outgoing_face(pit_entry.name, fid)
-                        self.pit.increase_number_of_forwards(pit_entry.name)
-                        self.pit.add_used_fib_face(pit_entry.name, [fid])
-                        to_lower.put([fid, pit_entry.interest])
-                        self.logger.info("the interest :" + str(pit_entry.interest.name) + "is sent to : " + str(fid))
-                        break
+                fid = self.forward_interest(pit_entry.name, face_id, pit_entry.interest, fib_entry, to_lower,
+                                            local_app=from_local)
+                if fid is not None:
+                    self.logger.info("the interest :" + str(pit_entry.interest.name) + "is sent to : " + str(fid))
+
+    def lookup_interest(self, name: Name, face_id: int, from_higher: bool) \
+            -> (ContentStoreEntry, PendingInterestTableEntry, ForwardingInformationBaseEntry):
+        """CS lookup, PIT aggregation and FIB lookup for a received interest, see NameTree.lookup_interest
+        :param name: name of the interest
+        :param face_id: face the interest was received from
+        :param from_higher: True if the interest was received from the higher layer
+        :return: tuple of CS entry, PIT entry before aggregation and FIB entry, each None if not found or not looked up
+        """
+        if self.name_tree is not None:
+            cs_entry, pit_entry, fib_entry = self.name_tree.lookup_interest(name, face_id, from_higher)
+            self.admission_policy.record_lookup(cs_entry is not None)
+            return cs_entry, pit_entry, fib_entry
+        cs_entry = self.cs.find_content_object(name)
+        self.admission_policy.record_lookup(cs_entry is not None)
+        if cs_entry is not None:
+            if not from_higher:
+                self.cs.update_timestamp(cs_entry)
+            return cs_entry, None, None
+        pit_entry = self.pit.aggregate_interest(name, face_id, update_timestamp=not from_higher)
+        if from_higher:
+            incoming_faceids = pit_entry.faceids if pit_entry is not None else None
+            return None, pit_entry, self.fib.find_fib_entry(name, incoming_faceids=incoming_faceids)
+        if pit_entry is not None or self._interest_to_app:
+            return None, pit_entry, None
+        return None, None, self.fib.find_fib_entry(name, None, [face_id])
+
+    def forward_interest(self, name: Name, face_id: int, interest: Interest, fib_entry: ForwardingInformationBaseEntry,
+                         to_lower: multiprocessing.Queue, local_app: bool = False,
+                         reset_number_of_forwards: bool = False) -> int:
+        """Register an interest in the PIT and send it to the first face of the FIB entry in the order of the
+        forwarding strategy, which did not nack it yet. If the strategy selects a face to probe, the interest is sent
+        there as well.
+        :param name: name of the PIT entry
+        :param face_id: face the interest was received from
+        :param interest: interest to be forwarded
+        :param fib_entry: matching FIB entry
+        :param to_lower: queue to the lower layer
+        :param local_app: True if the interest was received from the higher layer
+        :param reset_number_of_forwards: if true, the number of forwards of the PIT entry is reset first
+        :return: the face the interest was sent to, None if there is no face left
+        """
+        faces = self.forwarding_strategy.rank_faces(name, fib_entry)
+        fid = self.pit.forward_interest(name, face_id, fib_entry, interest, local_app=local_app,
+                                        reset_number_of_forwards=reset_number_of_forwards, faces=faces)
+        if fid is None:
+            return None
+        self.forwarding_strategy.record_forward(name, fib_entry, fid)
+        to_lower.put([fid, interest])
+        probe = self.forwarding_strategy.select_probe(name, fib_entry, fid)
+        if probe is not None and self.pit.forward_interest(name, face_id, fib_entry, interest, local_app=local_app,
+                                                           faces=[probe]) == probe:
+            self.logger.info("Probing face " + str(probe) + " with " + str(name))
+            self.forwarding_strategy.record_forward(name, fib_entry, probe)
+            to_lower.put([probe, interest])
+        return fid
+
+    def content_from_cs(self, cs_entry: ContentStoreEntry) -> Content:
+        """content object of a content store entry, served without NoCache hint since this node is a cache hit"""
+        content = cs_entry.content
+        if content.no_cache:
+            content = copy.copy(content)
+            content.no_cache = False
+        return content
 
     def ageing(self):
-        """Ageing the data structs"""
+        """Ageing the data structs, the retransmits and nacks are sent as batches if enabled"""
+        to_lower = BatchWriter(self.queue_to_lower, self.max_batch_size) if self.batch_to_lower else self.queue_to_lower
+        to_higher = BatchWriter(self.queue_to_higher, self.max_batch_size) if self.batch_to_higher \
+            else self.queue_to_higher
         try:
             self.logger.debug("Ageing")
             #PIT ageing
@@ -246,20 +281,21 @@ class BasicICNLayer(LayerProcess):
                 if not fib_entry:
                     continue
                 for fid in fib_entry.faceid:
-                    if not self.pit.test_faceid_was_nacked(pit_entry.name, fid):
-                        self.queue_to_lower.put([fid, pit_entry.interest])
+                    if fid not in pit_entry.faces_already_nacked:
+                        to_lower.put([fid, pit_entry.interest])
             for pit_entry in removed_pit_entries:
                 if not pit_entry:
                     continue
                 for fid, local in zip(pit_entry.faceids, pit_entry.local_app):
                     if local is True:
-                        self.queue_to_higher.put([fid, Nack(pit_entry.name, NackReason.PIT_TIMEOUT, pit_entry.interest)])
+                        to_higher.put([fid, Nack(pit_entry.name, NackReason.PIT_TIMEOUT, pit_entry.interest)])
             #CS ageing
             self.cs.ageing()
         except Exception as e:
             self.logger.warning("Exception during ageing: " + str(e))
             pass
         finally:
-            t = threading.Timer(self._ageing_interval, self.ageing)
-            t.setDaemon(True)
-            t.start()
\ No newline at end of file
+            for writer in [to_lower, to_higher]:
+                if isinstance(writer, BatchWriter):
+                    writer.flush()
+            self.schedule(self._ageing_interval, self.ageing)
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""Cache admission policies, deciding which forwarded content objects are inserted into the content store"""
+
+import abc
+import random
+from collections import OrderedDict
+from typing import Dict
+
+from PiCN.Packets import Content
+
+
+class BaseAdmissionPolicy(object):
+    """Abstract admission policy. The ICN layer asks the policy for every forwarded content object whether it should
+    be cached and whether downstream nodes should be told not to cache it (NDNLPv2 CachePolicy NoCache). The policy
+    counts its decisions and the content store lookups, so that the cache efficiency of different policies can be
+    compared. A policy can be shared with other processes by registering it at the PiCNSyncDataStructFactory.
+    """
+
+    def __init__(self):
+        self.reset_statistics()
+
+    @abc.abstractmethod
+    def admit(self, content: Content, face_id: int, from_local: bool) -> bool:
+        """
+        Decide whether a content object should be cached
+        :param content: content object which is forwarded
+        :param face_id: face the content object was received from
+        :param from_local: True if the content object was received from a higher layer
+        :return: True if the content object should be cached
+        """
+
+    def downstream_no_cache(self, content: Content, admitted: bool, from_local: bool) -> bool:
+        """
+        Decide whether downstream nodes should be told not to cache a content object, by default the received hint is
+        passed on unchanged
+        :param content: content object which is forwarded
+        :param admitted: decision of admit for the content object
+        :param from_local: True if the content object was received from a higher layer
+        :return: True if the content object should be forwarded with a NoCache hint
+        """
+        return content.no_cache
+
+    def decide(self, content: Content, face_id: int, from_local: bool) -> (bool, bool):
+        """
+        Admission decision for a forwarded content object, updates the counters
+        :param content: content object which is forwarded
+        :param face_id: face the content object was received from
+        :param from_local: True if the content object was received from a higher layer
+        :return: tuple of (content object is cached, content object is forwarded with a NoCache hint)
+        """
+        admitted = self.admit(content, face_id, from_local)
+        if admitted:
+            self._admissions += 1
+        else:
+            self._rejections += 1
+        return admitted, self.downstream_no_cache(content, admitted, from_local)
+
+    def record_lookup(self, hit: bool):
+        """
+        Count a content store lookup
+        :param hit: True if the content store had a matching entry
+        :return: None
+        """
+        self._lookups += 1
+        if hit:
+            self._hits += 1
+
+    def get_statistics(self) -> Dict:
+        """
+        Counters to compare cache efficiency
+        :return: dict with number of lookups, hits, hit rate, admissions and rejections
+        """
+        return {"lookups": self._lookups, "hits": self._hits,
+                "hit_rate": self._hits / self._lookups if self._lookups > 0 else 0.0,
+                "admissions": self._admissions, "rejections": self._rejections}
+
+    def reset_statistics(self):
+        """Reset all counters"""
+        self._lookups = 0
+        self._hits = 0
+        self._admissions = 0
+        self._rejections = 0
+
+
+class AlwaysAdmissionPolicy(BaseAdmissionPolicy):
+    """Cache every forwarded content object"""
+
+    def admit(self, content: Content, face_id: int, from_local: bool) -> bool:
+        return True
+
+
+class ProbabilisticAdmissionPolicy(BaseAdmissionPolicy):
+    """Cache every forwarded content object with a fixed probability (ProbCache with a per node probability)
+    :param probability: probability to cache a content object
+    :param seed: seed of the random number generator, None to seed from the system
+    """
+
+    def __init__(self, probability: float = 0.5, seed: int = None):
+        super().__init__()
+        self._probability = probability
+        self._random = random.Random(seed)
+
+    def admit(self, content: Content, face_id: int, from_local: bool) -> bool:
+        return self._random.random() < self._probability
+
+
+class LeaveCopyDownAdmissionPolicy(BaseAdmissionPolicy):
+    """Leave copy down (Laoutaris et al.): a content object is only cached by the first node downstream of the node
+    which served it, i.e. the producer or a cache hit. The caching node forwards the content object with a NoCache
+    hint, so that further downstream nodes do not cache it. Content objects from a higher layer (local producer) are
+    not cached but forwarded without hint.
+    """
+
+    def admit(self, content: Content, face_id: int, from_local: bool) -> bool:
+        return not from_local and not content.no_cache
+
+    def downstream_no_cache(self, content: Content, admitted: bool, from_local: bool) -> bool:
+        return admitted or (content.no_cache and not from_local)
+
+
+class SecondHitAdmissionPolicy(BaseAdmissionPolicy):
+    """Cache a content object the second time it is forwarded, so that objects which are requested only once do not
+    evict popular objects. Names seen once are remembered in a bounded LRU list.
+    :param history_size: number of names seen once which are remembered
+    """
+
+    def __init__(self, history_size: int = 10000):
+        super().__init__()
+        self._history_size = history_size
+        self._seen: OrderedDict = OrderedDict()
+
+    def admit(self, content: Content, face_id: int, from_local: bool) -> bool:
+        if self._seen.pop(content.name, None) is not None:
+            return True
+        self._seen[content.name] = True
+        if len(self._seen) > self._history_size:
+            self._seen.popitem(last=False)
+        return False
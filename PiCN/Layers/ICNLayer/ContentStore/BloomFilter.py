@@ -0,0 +1,53 @@
+"""Counting Bloom filter for names"""
+
+import hashlib
+import math
+
+from PiCN.Packets import Name
+
+
+class CountingBloomFilter(object):
+    """Bloom filter which supports removal. Every cell is an 8 bit counter, a saturated counter is never decremented
+    again, so that removals can not introduce false negatives.
+    :param capacity: expected number of names in the filter
+    :param error_rate: false positive rate at the expected number of names
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01):
+        self._num_cells = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self._num_hashes = max(1, int(round(self._num_cells / capacity * math.log(2))))
+        self._cells = bytearray(self._num_cells)
+
+    def add(self, name: Name):
+        """
+        Add a name to the filter
+        :param name: name to add
+        :return: None
+        """
+        for cell in self._cell_indices(name):
+            if self._cells[cell] < 255:
+                self._cells[cell] += 1
+
+    def remove(self, name: Name):
+        """
+        Remove a name, which was added before, from the filter
+        :param name: name to remove
+        :return: None
+        """
+        for cell in self._cell_indices(name):
+            if 0 < self._cells[cell] < 255:
+                self._cells[cell] -= 1
+
+    def clear(self):
+        """Remove all names from the filter"""
+        self._cells = bytearray(self._num_cells)
+
+    def __contains__(self, name: Name) -> bool:
+        return all(self._cells[cell] > 0 for cell in self._cell_indices(name))
+
+    def _cell_indices(self, name: Name):
+        """k cell indices by double hashing of a single 128 bit digest"""
+        digest = hashlib.blake2b(name.to_string().encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self._num_cells for i in range(self._num_hashes)]
@@ -0,0 +1,130 @@
+""" An in-memory content store with exact matching, bounded in bytes and entries"""
+
+import time
+
+from typing import Callable, Dict, List
+
+from PiCN.Packets import Content, Name
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy, LRUReplacementPolicy
+
+
+class ContentStoreMemoryBounded(BaseContentStore):
+    """ An in-memory content store using exact matching with a hash index. The store is bounded by a byte budget
+    and/or a maximum number of entries, a replacement policy selects the entries to evict. Static entries are never
+    evicted, but count against the budget.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param max_bytes: byte budget for payload and wire format of the cached content objects, None for no limit
+    :param max_entries: maximum number of cached content objects, None for no limit
+    :param replacement_policy: policy to select the entries to evict, defaults to LRU
+    :param eviction_callback: function called with every evicted ContentStoreEntry
+    """
+
+    def __init__(self, cs_timeout: int = 10, max_bytes: int = None, max_entries: int = None,
+                 replacement_policy: BaseReplacementPolicy = None,
+                 eviction_callback: Callable[[ContentStoreEntry], None] = None):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+        self._container: Dict[Name, ContentStoreEntry] = {}
+        self._entry_sizes: Dict[Name, int] = {}
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._policy: BaseReplacementPolicy = replacement_policy if replacement_policy is not None \
+            else LRUReplacementPolicy()
+        self._eviction_callback = eviction_callback
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_container(self) -> List[ContentStoreEntry]:
+        return list(self._container.values())
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        entry = self._container.get(name)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        if not entry.static:
+            self._policy.touch(name)
+        return entry
+
+    def add_content_object(self, content: Content, static: bool=False):
+        size = self.entry_size(content)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        self.remove_content_object(content.name)
+        self._container[content.name] = ContentStoreEntry(content, static=static)
+        self._entry_sizes[content.name] = size
+        self._size_bytes += size
+        if not static:
+            self._policy.insert(content.name)
+        self._evict()
+
+    def remove_content_object(self, name: Name):
+        entry = self._container.pop(name, None)
+        if entry is None:
+            return
+        self._size_bytes -= self._entry_sizes.pop(name)
+        self._policy.remove(name)
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        entry = self._container.get(cs_entry.name)
+        if entry is None:
+            return
+        entry.timestamp = time.time()
+        if not entry.static:
+            self._policy.touch(entry.name)
+
+    def ageing(self):
+        cur_time = time.time()
+        remove = []
+        for cs_entry in self._container.values():
+            if cs_entry.static is True:
+                continue
+            if cs_entry.timestamp + self._cs_timeout < cur_time:
+                remove.append(cs_entry)
+        for cs_entry in remove:
+            self.remove_content_object(cs_entry.name)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Counters to size the content store
+        :return: dict with number of hits, misses, evictions, entries and cached bytes
+        """
+        return {"hits": self._hits, "misses": self._misses, "evictions": self._evictions,
+                "entries": len(self._container), "bytes": self._size_bytes}
+
+    def reset_statistics(self):
+        """Reset the hit, miss and eviction counters"""
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def entry_size(content: Content) -> int:
+        """
+        Number of bytes a content object is charged against the byte budget, determined when it is added
+        :param content: content object
+        :return: size of payload and wire format in bytes
+        """
+        size = len(content.get_bytes()) if content.get_bytes() else 0
+        if content.wire_format is not None:
+            size += len(content.wire_format)
+        return size
+
+    def _over_budget(self) -> bool:
+        if self._max_entries is not None and len(self._container) > self._max_entries:
+            return True
+        return self._max_bytes is not None and self._size_bytes > self._max_bytes
+
+    def _evict(self):
+        while self._over_budget():
+            name = self._policy.victim()
+            if name is None:
+                return # only static entries left
+            entry = self._container.pop(name)
+            self._size_bytes -= self._entry_sizes.pop(name)
+            self._evictions += 1
+            if self._eviction_callback is not None:
+                self._eviction_callback(entry)
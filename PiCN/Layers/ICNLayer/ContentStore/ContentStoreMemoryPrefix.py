@@ -2,15 +2,32 @@
 
 import time
 
+from typing import List
+
 from PiCN.Packets import Content, Name
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
 from PiCN.Layers.ICNLayer.ContentStore.NamedObjectTree import NamedObjectTree
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy, LRUReplacementPolicy
+from PiCN.Layers.ICNLayer.DeadlineHeap import DeadlineHeap
 
 class ContentStoreMemoryPrefix(BaseContentStore):
-    """ An in-memory content store with prefix matching"""
+    """ An in-memory content store with prefix matching. Entries are organized in a name tree, expiry is driven by a
+    deadline min-heap so that ageing only touches expired entries. Static entries never expire and are never evicted.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param max_entries: maximum number of cached content objects, None for no limit
+    :param replacement_policy: policy to select the entries to evict, defaults to LRU
+    """
+
+    def __init__(self, cs_timeout: int=10, max_entries: int=None, replacement_policy: BaseReplacementPolicy=None):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+        self._container: NamedObjectTree = NamedObjectTree()
+        self._max_entries = max_entries
+        self._policy: BaseReplacementPolicy = replacement_policy if replacement_policy is not None \
+            else LRUReplacementPolicy()
+        self._deadlines: DeadlineHeap = DeadlineHeap()
 
-    def __init__(self):
-        self._container:NamedObjectTree = NamedObjectTree()
+    def get_container(self) -> List[ContentStoreEntry]:
+        return list(self._container)
 
     def find_content_object(self, name: Name) -> ContentStoreEntry:
         """
@@ -18,18 +35,30 @@ class ContentStoreMemoryPrefix(BaseContentStore):
         :param name:  Name
         :return:      Matching Content Object or None
         """
-        return self._container.prefix_lookup(name)
+        return self._touch(self._container.prefix_lookup(name))
+
+    def find_longest_prefix_match(self, name: Name) -> ContentStoreEntry:
+        """
+        Lookup the content object with the longest name which is a prefix of a given name
+        :param name: Name
+        :return: Matching Content Object or None
+        """
+        return self._touch(self._container.longest_prefix_lookup(name))
 
     def add_content_object(self, content: Content, static: bool=False):
         """
         Insert content object
         :param content: content object to insert
-        :param static: <todo>
+        :param static: if true the content object will not be considered by ageing and eviction
         :return: None
         """
+        self.remove_content_object(content.name)
         entry = ContentStoreEntry(content, static=static)
-        entry.timestamp = time.time()
         self._container.insert(entry)
+        if not static:
+            self._policy.insert(content.name)
+            self._deadlines.schedule(content.name, entry.timestamp + self._cs_timeout)
+        self._evict()
 
     def remove_content_object(self, name: Name):
         """
@@ -38,6 +67,8 @@ class ContentStoreMemoryPrefix(BaseContentStore):
         :return: None
         """
         self._container.remove(name)
+        self._policy.remove(name)
+        self._deadlines.cancel(name)
 
     def update_timestamp(self, cs_entry: ContentStoreEntry):
         """
@@ -45,13 +76,36 @@ class ContentStoreMemoryPrefix(BaseContentStore):
         :param cs_entry: content store entry
         :return: None
         """
-        self._container.remove(cs_entry.name)
-        cs_entry.timestamp = time.time()
-        self._container.insert(cs_entry)
+        entry = self._container.exact_lookup(cs_entry.name)
+        if entry is None:
+            return
+        entry.timestamp = time.time()
+        if not entry.static:
+            self._policy.touch(entry.name)
+            self._deadlines.schedule(entry.name, entry.timestamp + self._cs_timeout)
 
     def ageing(self):
         """
-        Update the entries periodically
+        Remove the expired entries
         :return: None
         """
-        raise NotImplemented()
+        for name in self._deadlines.pop_due(time.time(), inclusive=False):
+            self.remove_content_object(name)
+
+    def set_cs_timeout(self, timeout: float):
+        delta = timeout - self._cs_timeout
+        super().set_cs_timeout(timeout)
+        self._deadlines.shift(delta)
+
+    def _touch(self, entry: ContentStoreEntry) -> ContentStoreEntry:
+        if entry is not None and not entry.static:
+            self._policy.touch(entry.name)
+        return entry
+
+    def _evict(self):
+        while self._max_entries is not None and len(self._container) > self._max_entries:
+            name = self._policy.victim()
+            if name is None:
+                return # only static entries left
+            self._container.remove(name)
+            self._deadlines.cancel(name)
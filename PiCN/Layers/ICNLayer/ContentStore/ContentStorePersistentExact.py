@@ -31,7 +31,7 @@ class ContentStorePersistentExact(BaseContentStore):
         self._container.clear()
 
     def find_content_object(self, name: Name) -> ContentStoreEntry:
-        if name.to_string() in self._container.keys():
+        if name.to_string() in self._container:
             return self._container[name.to_string()]
         else:
             return None
@@ -40,7 +40,7 @@ class ContentStorePersistentExact(BaseContentStore):
         self._container[content.name.to_string()] = ContentStoreEntry(content, static=static)
 
     def remove_content_object(self, name: Name):
-        if name.to_string() in self._container.keys():
+        if name.to_string() in self._container:
             del self._container[name.to_string()]
 
     def update_timestamp(self, cs_entry: ContentStoreEntry):
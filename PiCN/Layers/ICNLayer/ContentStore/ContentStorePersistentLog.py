@@ -0,0 +1,346 @@
+""" A persistent content store with exact matching, backed by an append-only segment log """
+
+import mmap
+import os
+import random
+import string
+import struct
+import threading
+import time
+
+from typing import Dict, List
+
+from PiCN.Packets import Content, Name
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+
+
+class ContentStoreLogIndexEntry(object):
+    """Location of the latest record of a content object in the segment log"""
+    __slots__ = ["segment", "offset", "length", "timestamp", "static", "content_length", "wire_length"]
+
+    def __init__(self, segment: int, offset: int, length: int, timestamp: float, static: bool, content_length: int,
+                 wire_length: int):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.timestamp = timestamp
+        self.static = static
+        self.content_length = content_length
+        self.wire_length = wire_length
+
+
+class ContentStorePersistentLog(BaseContentStore):
+    """ A persistent content store with exact matching. Content objects are appended to segment files, an in-memory
+    index maps names to the position of their latest record. Payloads are read through mmap, so lookups are O(1) and
+    only touch the requested object. On a restart, the index is rebuilt from the record headers without reading the
+    payloads. Records appended to the active segment after it was mapped are read from an in-memory tail, so that the
+    segment is only remapped once the tail exceeds TAIL_SIZE. Removed and outdated records are reclaimed by
+    compaction, which runs in a background thread once the fraction of garbage exceeds the compaction ratio.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param db_path: directory of the segment files, a random directory in /tmp if None
+    :param segment_size: size in bytes after which a new segment file is started
+    :param compaction_ratio: fraction of garbage in the sealed segments which triggers a background compaction
+    :param sync: if true, every record is flushed to disk with fsync
+    """
+
+    RECORD_PUT = 1
+    RECORD_DELETE = 2
+    RECORD_TOUCH = 3
+    HEADER = struct.Struct("!BBdHII")  # type, static, timestamp, name length, content length, wire format length
+    TAIL_SIZE = 1024 * 1024
+
+    def __init__(self, cs_timeout: int = 10, db_path: str = None, segment_size: int = 64 * 1024 * 1024,
+                 compaction_ratio: float = 0.5, sync: bool = False):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+        if db_path is None:
+            self.db_path = "/tmp/" + ''.join(random.choice(string.ascii_lowercase) for x in range(9)) + ".log.d"
+        else:
+            self.db_path = db_path
+        os.makedirs(self.db_path, exist_ok=True)
+        self._container: Dict[str, ContentStoreLogIndexEntry] = {}
+        self._segment_size = segment_size
+        self._compaction_ratio = compaction_ratio
+        self._sync = sync
+        self._lock = threading.RLock()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._segment_bytes: Dict[int, int] = {}
+        self._live_bytes: Dict[int, int] = {}
+        self._compaction_thread: threading.Thread = None
+        self._cancel_compaction = threading.Event()
+        self._load_index()
+        self._active_file = open(self._segment_path(self._active_segment), "ab")
+        # records of the active segment starting at _tail_offset, which are not covered by its mapping
+        self._tail = bytearray()
+        self._tail_offset = self._segment_bytes[self._active_segment]
+
+    def close_cs(self):
+        """Stop a running compaction and close all segment files"""
+        self._stop_compaction()
+        with self._lock:
+            for m in self._maps.values():
+                m.close()
+            self._maps.clear()
+            self._active_file.close()
+
+    def get_db_path(self) -> str:
+        return self.db_path
+
+    def delete_all(self):
+        """Remove all content objects and segment files"""
+        self._stop_compaction()
+        with self._lock:
+            for m in self._maps.values():
+                m.close()
+            self._maps.clear()
+            self._active_file.close()
+            for segment in self._segment_bytes:
+                os.remove(self._segment_path(segment))
+            self._container.clear()
+            self._segment_bytes = {0: 0}
+            self._live_bytes = {0: 0}
+            self._active_segment = 0
+            self._active_file = open(self._segment_path(self._active_segment), "ab")
+            self._tail = bytearray()
+            self._tail_offset = 0
+        self._cancel_compaction.clear()
+
+    def get_container(self) -> List[ContentStoreEntry]:
+        with self._lock:
+            return [self._read_entry(index_entry) for index_entry in self._container.values()]
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        with self._lock:
+            index_entry = self._container.get(name.to_string())
+            if index_entry is None:
+                return None
+            return self._read_entry(index_entry)
+
+    def add_content_object(self, content: Content, static: bool = False):
+        name = content.name.to_string().encode()
+        payload = content.get_bytes() or b""
+        wire_format = content.wire_format or b""
+        with self._lock:
+            timestamp = time.time()
+            segment, offset, length = self._append(self.RECORD_PUT, static, timestamp, name, payload, wire_format)
+            self._release(name.decode())
+            self._container[name.decode()] = ContentStoreLogIndexEntry(segment, offset, length, timestamp, static,
+                                                                       len(payload), len(wire_format))
+            self._live_bytes[segment] += length
+        self._maybe_compact()
+
+    def remove_content_object(self, name: Name):
+        with self._lock:
+            if name.to_string() not in self._container:
+                return
+            self._release(name.to_string())
+            del self._container[name.to_string()]
+            self._append(self.RECORD_DELETE, False, time.time(), name.to_string().encode())
+        self._maybe_compact()
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        with self._lock:
+            index_entry = self._container.get(cs_entry.name.to_string())
+            if index_entry is None:
+                return
+            index_entry.timestamp = time.time()
+            cs_entry.timestamp = index_entry.timestamp
+            self._append(self.RECORD_TOUCH, False, index_entry.timestamp, cs_entry.name.to_string().encode())
+
+    def ageing(self):
+        cur_time = time.time()
+        with self._lock:
+            names_to_remove = [name for name, index_entry in self._container.items()
+                               if not index_entry.static and index_entry.timestamp + self._cs_timeout < cur_time]
+        for name in names_to_remove:
+            self.remove_content_object(Name(name))
+
+    def compact(self):
+        """
+        Copy the live records of all segments containing garbage to the active segment and delete those segments.
+        Stops after the current segment if the compaction is cancelled.
+        :return: None
+        """
+        with self._lock:
+            if self._cancel_compaction.is_set():
+                return
+            if self._segment_bytes[self._active_segment] > self._live_bytes[self._active_segment]:
+                self._roll_over()
+            # oldest first, so that a record is never dropped before an older record it supersedes
+            segments = sorted(segment for segment in self._segment_bytes if segment != self._active_segment and
+                              self._segment_bytes[segment] > self._live_bytes[segment])
+        for segment in segments:
+            with self._lock:
+                if self._cancel_compaction.is_set():
+                    return
+                for name, index_entry in self._container.items():
+                    if index_entry.segment != segment:
+                        continue
+                    record = self._map(segment)[index_entry.offset:index_entry.offset + index_entry.length]
+                    new_segment, new_offset = self._write(record)
+                    index_entry.segment = new_segment
+                    index_entry.offset = new_offset
+                    self._live_bytes[new_segment] += index_entry.length
+                    # keep the timestamp of the entry if it was refreshed by a touch record in the compacted segment
+                    if self.HEADER.unpack_from(record)[2] != index_entry.timestamp:
+                        self._append(self.RECORD_TOUCH, False, index_entry.timestamp, name.encode())
+                m = self._maps.pop(segment, None)
+                if m is not None:
+                    m.close()
+                os.remove(self._segment_path(segment))
+                del self._segment_bytes[segment]
+                del self._live_bytes[segment]
+
+    def get_garbage_ratio(self) -> float:
+        """
+        Fraction of the log which is occupied by removed or outdated records
+        :return: garbage ratio between 0 and 1
+        """
+        with self._lock:
+            total = sum(self._segment_bytes.values())
+            if total == 0:
+                return 0.0
+            return 1 - sum(self._live_bytes.values()) / total
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.db_path, "segment-%08d.log" % segment)
+
+    def _load_index(self):
+        """rebuild the index by scanning the record headers of all segments, the payloads are skipped"""
+        segments = sorted(int(f[len("segment-"):-len(".log")]) for f in os.listdir(self.db_path)
+                          if f.startswith("segment-") and f.endswith(".log"))
+        for segment in segments:
+            self._segment_bytes[segment] = 0
+            self._live_bytes[segment] = 0
+            path = self._segment_path(segment)
+            size = os.path.getsize(path)
+            offset = 0
+            with open(path, "rb") as f:
+                while offset + self.HEADER.size <= size:
+                    f.seek(offset)
+                    record_type, static, timestamp, name_len, content_len, wire_len = \
+                        self.HEADER.unpack(f.read(self.HEADER.size))
+                    length = self.HEADER.size + name_len + content_len + wire_len
+                    if offset + length > size:
+                        break
+                    name = f.read(name_len).decode()
+                    if record_type == self.RECORD_PUT:
+                        self._release(name)
+                        self._container[name] = ContentStoreLogIndexEntry(segment, offset, length, timestamp,
+                                                                          bool(static), content_len, wire_len)
+                        self._live_bytes[segment] += length
+                    elif record_type == self.RECORD_DELETE:
+                        self._release(name)
+                        self._container.pop(name, None)
+                    elif record_type == self.RECORD_TOUCH and name in self._container:
+                        self._container[name].timestamp = timestamp
+                    offset += length
+            if offset < size:
+                os.truncate(path, offset)  # drop a record which was only partially written
+            self._segment_bytes[segment] = offset
+        self._active_segment = segments[-1] if len(segments) > 0 else 0
+        self._segment_bytes.setdefault(self._active_segment, 0)
+        self._live_bytes.setdefault(self._active_segment, 0)
+
+    def _release(self, name: str):
+        """the record currently indexed for name becomes garbage"""
+        index_entry = self._container.get(name)
+        if index_entry is not None:
+            self._live_bytes[index_entry.segment] -= index_entry.length
+
+    def _append(self, record_type: int, static: bool, timestamp: float, name: bytes, payload: bytes = b"",
+                wire_format: bytes = b"") -> (int, int, int):
+        header = self.HEADER.pack(record_type, 1 if static else 0, timestamp, len(name), len(payload),
+                                  len(wire_format))
+        record = b"".join([header, name, payload, wire_format])
+        segment, offset = self._write(record)
+        return segment, offset, len(record)
+
+    def _write(self, record: bytes) -> (int, int):
+        if self._segment_bytes[self._active_segment] > 0 and \
+                self._segment_bytes[self._active_segment] + len(record) > self._segment_size:
+            self._roll_over()
+        segment = self._active_segment
+        offset = self._segment_bytes[segment]
+        self._active_file.write(record)
+        self._active_file.flush()
+        if self._sync:
+            os.fsync(self._active_file.fileno())
+        self._segment_bytes[segment] += len(record)
+        self._tail += record
+        if len(self._tail) > self.TAIL_SIZE:
+            # the mapping of the active segment is renewed by the next read
+            m = self._maps.pop(segment, None)
+            if m is not None:
+                m.close()
+            self._tail = bytearray()
+            self._tail_offset = self._segment_bytes[segment]
+        return segment, offset
+
+    def _roll_over(self):
+        """seal the active segment and start a new one"""
+        self._active_file.close()
+        # a mapping of the sealed segment does not cover its tail
+        m = self._maps.pop(self._active_segment, None)
+        if m is not None:
+            m.close()
+        self._active_segment += 1
+        self._segment_bytes[self._active_segment] = 0
+        self._live_bytes[self._active_segment] = 0
+        self._active_file = open(self._segment_path(self._active_segment), "ab")
+        self._tail = bytearray()
+        self._tail_offset = 0
+
+    def _map(self, segment: int) -> mmap.mmap:
+        """mmap of a segment, mapped once. Records of the active segment which are not covered are in the tail"""
+        m = self._maps.get(segment)
+        if m is None:
+            with open(self._segment_path(segment), "rb") as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = m
+        return m
+
+    def _buffer(self, segment: int, offset: int) -> (memoryview, int):
+        """buffer holding the record at offset of a segment, and the position of the record in the buffer"""
+        if segment == self._active_segment and offset >= self._tail_offset:
+            return memoryview(self._tail), offset - self._tail_offset
+        return memoryview(self._map(segment)), offset
+
+    def _read_entry(self, index_entry: ContentStoreLogIndexEntry) -> ContentStoreEntry:
+        # The fields are copied out of the buffer: the entry outlives the mapping, which is closed on compaction, and
+        # a view would keep the mapping from being closed and the tail from being resized
+        buffer, start = self._buffer(index_entry.segment, index_entry.offset)
+        with buffer:
+            name_len = self.HEADER.unpack_from(buffer, start)[3]
+            start += self.HEADER.size
+            name = str(buffer[start:start + name_len], "utf-8")
+            start += name_len
+            payload = buffer[start:start + index_entry.content_length].tobytes()
+            start += index_entry.content_length
+            wire_format = buffer[start:start + index_entry.wire_length].tobytes() if index_entry.wire_length > 0 \
+                else None
+        entry = ContentStoreEntry(Content(name, payload, wire_format), static=index_entry.static)
+        entry.timestamp = index_entry.timestamp
+        return entry
+
+    def _maybe_compact(self):
+        if self._compaction_ratio is None:
+            return
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        with self._lock:
+            sealed = sum(size for segment, size in self._segment_bytes.items() if segment != self._active_segment)
+            if sealed == 0:
+                return
+            garbage = sealed - sum(live for segment, live in self._live_bytes.items()
+                                   if segment != self._active_segment)
+            if garbage / sealed < self._compaction_ratio:
+                return
+        self._compaction_thread = threading.Thread(target=self.compact, daemon=True)
+        self._compaction_thread.start()
+
+    def _stop_compaction(self):
+        """cancel a running compaction and wait for it, the caller clears _cancel_compaction when done"""
+        self._cancel_compaction.set()
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,137 @@
+""" A two-tier content store with exact matching: a bounded memory tier in front of a persistent disk tier"""
+
+import time
+
+from typing import Dict, List
+
+from PiCN.Packets import Content, Name
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Layers.ICNLayer.ContentStore.BloomFilter import CountingBloomFilter
+from PiCN.Layers.ICNLayer.ContentStore.ContentStoreMemoryBounded import ContentStoreMemoryBounded
+from PiCN.Layers.ICNLayer.ContentStore.ContentStorePersistentLog import ContentStorePersistentLog
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy
+
+
+class ContentStoreTiered(BaseContentStore):
+    """ A two-tier content store using exact matching. New content objects are inserted into a bounded memory tier.
+    Objects evicted from the memory tier are demoted to a log-structured disk tier, disk hits are promoted back to the
+    memory tier. A counting Bloom filter over the names in the disk tier answers most misses without any I/O.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param max_bytes: byte budget of the memory tier, None for no limit
+    :param max_entries: maximum number of content objects in the memory tier, None for no limit
+    :param db_path: directory of the disk tier, a random directory in /tmp if None
+    :param replacement_policy: policy to select the entries to demote, defaults to LRU
+    :param bloom_filter_capacity: expected number of content objects in the disk tier
+    :param bloom_filter_error_rate: false positive rate of the Bloom filter at its capacity
+    """
+
+    def __init__(self, cs_timeout: int = 10, max_bytes: int = None, max_entries: int = None, db_path: str = None,
+                 replacement_policy: BaseReplacementPolicy = None, bloom_filter_capacity: int = 100000,
+                 bloom_filter_error_rate: float = 0.01):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+        self._max_bytes = max_bytes
+        self._memory = ContentStoreMemoryBounded(cs_timeout=cs_timeout, max_bytes=max_bytes, max_entries=max_entries,
+                                                 replacement_policy=replacement_policy,
+                                                 eviction_callback=self._demote)
+        self._disk = ContentStorePersistentLog(cs_timeout=cs_timeout, db_path=db_path)
+        self._bloom_filter = CountingBloomFilter(bloom_filter_capacity, bloom_filter_error_rate)
+        for name in self._disk.container:
+            self._bloom_filter.add(Name(name))
+        self._reset_counters()
+
+    def close_cs(self):
+        self._disk.close_cs()
+
+    def get_db_path(self) -> str:
+        return self._disk.get_db_path()
+
+    def get_container(self) -> List[ContentStoreEntry]:
+        return self._memory.get_container() + self._disk.get_container()
+
+    def get_container_size(self) -> int:
+        return self._memory.get_container_size() + self._disk.get_container_size()
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        entry = self._memory.find_content_object(name)
+        if entry is not None:
+            self._memory_hits += 1
+            return entry
+        if name not in self._bloom_filter:
+            self._bloom_filter_rejections += 1
+            self._misses += 1
+            return None
+        entry = self._disk.find_content_object(name)
+        if entry is None:
+            self._bloom_filter_false_positives += 1
+            self._misses += 1
+            return None
+        self._disk_hits += 1
+        if self._max_bytes is None or ContentStoreMemoryBounded.entry_size(entry.content) <= self._max_bytes:
+            self._remove_from_disk(name)
+            self._memory.add_content_object(entry.content, static=entry.static)
+            self._promotions += 1
+        return entry
+
+    def add_content_object(self, content: Content, static: bool = False):
+        self._remove_from_disk(content.name)
+        self._memory.add_content_object(content, static=static)
+
+    def remove_content_object(self, name: Name):
+        self._memory.remove_content_object(name)
+        self._remove_from_disk(name)
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        self._memory.update_timestamp(cs_entry)
+        self._disk.update_timestamp(cs_entry)
+
+    def ageing(self):
+        self._memory.ageing()
+        cur_time = time.time()
+        expired = [name for name, index_entry in self._disk.container.items()
+                   if not index_entry.static and index_entry.timestamp + self._cs_timeout < cur_time]
+        for name in expired:
+            self._remove_from_disk(Name(name))
+
+    def set_cs_timeout(self, timeout: float):
+        super().set_cs_timeout(timeout)
+        self._memory.set_cs_timeout(timeout)
+        self._disk.set_cs_timeout(timeout)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Counters to size the tiers and the Bloom filter
+        :return: dict with number of memory hits, disk hits, misses, Bloom filter rejections and false positives,
+                 promotions, demotions and the number of entries per tier
+        """
+        return {"memory_hits": self._memory_hits, "disk_hits": self._disk_hits, "misses": self._misses,
+                "bloom_filter_rejections": self._bloom_filter_rejections,
+                "bloom_filter_false_positives": self._bloom_filter_false_positives,
+                "promotions": self._promotions, "demotions": self._demotions,
+                "memory_entries": self._memory.get_container_size(), "disk_entries": self._disk.get_container_size()}
+
+    def reset_statistics(self):
+        """Reset the hit, miss, Bloom filter, promotion and demotion counters"""
+        self._memory.reset_statistics()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._bloom_filter_rejections = 0
+        self._bloom_filter_false_positives = 0
+        self._promotions = 0
+        self._demotions = 0
+
+    def _demote(self, entry: ContentStoreEntry):
+        """eviction callback of the memory tier"""
+        self._remove_from_disk(entry.name)
+        self._disk.add_content_object(entry.content, static=entry.static)
+        self._bloom_filter.add(entry.name)
+        self._demotions += 1
+
+    def _remove_from_disk(self, name: Name):
+        if name.to_string() not in self._disk.container:
+            return
+        self._disk.remove_content_object(name)
+        self._bloom_filter.remove(name)
@@ -2,20 +2,19 @@
 
 from PiCN.Packets import Name
 
-from functools import reduce
-from collections import defaultdict
-import operator
 import json
-from typing import List
+from typing import List, Iterator
 
 
 def Tree(named_object=None):
-    return {"subtree": defaultdict(Tree), "leaf": named_object}
+    return {"subtree": {}, "leaf": named_object}
 
 class NamedObjectTree():
     """
     Data structure to organize objects with property 'name' (of type PiCN.Packets.Name) in a tree reflecting their
-    namespace hierarchy (e.g. Content, ContentStoreEntry). Exact and prefix lookup is possible.
+    namespace hierarchy (e.g. Content, ContentStoreEntry). Exact, longest prefix and prefix (any descendant) lookup is
+    possible. Nodes which neither hold an object nor lead to one are pruned on removal, therefore every lookup is
+    bounded by the number of components of the name.
     """
 
     def __init__(self):
@@ -23,16 +22,26 @@ class NamedObjectTree():
        Create empty tree
         """
         self.__tree = Tree()
+        self.__size = 0
 
-    def __get_subtree(self, path: List[str]):
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self) -> Iterator:
+        return self.__traverse_all(self.__tree)
+
+    def __get_node(self, path: List[str]):
         """
-        Get subtree of a certain path
-        :param path: path of subtree to return
-        :return: subtree of given path
+        Get node of a certain path, without creating missing nodes
+        :param path: path of node to return
+        :return: node of given path or None
         """
-        if len(path) == 0:
-            return self.__tree["subtree"]
-        return reduce(lambda subtree, key: operator.getitem(subtree["subtree"], key), path, self.__tree)["subtree"]
+        node = self.__tree
+        for key in path:
+            node = node["subtree"].get(key)
+            if node is None:
+                return None
+        return node
 
     def as_json(self) -> str:
         """
@@ -43,22 +52,37 @@ class NamedObjectTree():
 
     def insert(self, named_object) -> None:
         """
-        Insert an object
+        Insert an object, an object with the same name is replaced
         :param named_object: Object to insert (must have a property 'name' of type PiCN.Packets.Name)
         :return: None
         """
-        path = named_object.name.components
-        (self.__get_subtree(path[:-1])[path[-1]])["leaf"] = named_object
+        node = self.__tree
+        for key in named_object.name.components:
+            node = node["subtree"].setdefault(key, Tree())
+        if node["leaf"] is None:
+            self.__size += 1
+        node["leaf"] = named_object
 
     def remove(self, name: Name) -> None:
         """
-        Remove an object
+        Remove an object and prune the nodes which are no longer used
         :param name: Name of object to remove
         :return: None
         """
-        # TODO: this only removes the leaf (=value) but not nodes (=nested dicts) which are no longer used (if any).
-        path = name.components
-        del ((self.__get_subtree(path[:-1]))[path[-1]])["leaf"]
+        nodes = [self.__tree]
+        for key in name.components:
+            node = nodes[-1]["subtree"].get(key)
+            if node is None:
+                return
+            nodes.append(node)
+        if nodes[-1]["leaf"] is None:
+            return
+        nodes[-1]["leaf"] = None
+        self.__size -= 1
+        for i in range(len(nodes) - 1, 0, -1):
+            if nodes[i]["leaf"] is not None or len(nodes[i]["subtree"]) > 0:
+                break
+            del nodes[i - 1]["subtree"][name.components[i - 1]]
 
     def exact_lookup(self, name: Name):
         """
@@ -66,11 +90,10 @@ class NamedObjectTree():
         :param name: Name to lookup
         :return: Named object or None
         """
-        path = name.components
-        try:
-            return ((self.__get_subtree(path[:-1]))[path[-1]])["leaf"]
-        except KeyError:
+        node = self.__get_node(name.components)
+        if node is None:
             return None
+        return node["leaf"]
 
     def prefix_lookup(self, name: Name):
         """
@@ -78,14 +101,45 @@ class NamedObjectTree():
         :param name: name/prefix
         :return: Named object or None
         """
-        def traverse(tree):
-            if tree["leaf"] is not None:
-                return tree["leaf"]
-            else:
-                for key in tree["subtree"]:
-                    return traverse(tree["subtree"][key])
-            return None
+        node = self.__get_node(name.components)
+        while node is not None:
+            if node["leaf"] is not None:
+                return node["leaf"]
+            # pruning guarantees that every inner node without a leaf leads to an object
+            node = next(iter(node["subtree"].values()), None)
+        return None
+
+    def longest_prefix_lookup(self, name: Name):
+        """
+        Find the object with the longest name which is a prefix of a given name (or exact match)
+        :param name: name to lookup
+        :return: Named object or None
+        """
+        node = self.__tree
+        result = node["leaf"]
+        for key in name.components:
+            node = node["subtree"].get(key)
+            if node is None:
+                break
+            if node["leaf"] is not None:
+                result = node["leaf"]
+        return result
+
+    def descendants(self, name: Name) -> Iterator:
+        """
+        Iterate over all objects which have a given prefix (or exact match)
+        :param name: name/prefix
+        :return: iterator of named objects
+        """
+        node = self.__get_node(name.components)
+        if node is None:
+            return iter(())
+        return self.__traverse_all(node)
 
-        path = name.components
-        start = (self.__get_subtree(path[:-1]))[path[-1]]
-        return traverse(start)
+    def __traverse_all(self, node) -> Iterator:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node["leaf"] is not None:
+                yield node["leaf"]
+            stack.extend(node["subtree"].values())
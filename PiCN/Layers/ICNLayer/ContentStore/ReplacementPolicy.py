@@ -0,0 +1,174 @@
+"""Replacement policies for bounded content stores"""
+
+import abc
+from collections import OrderedDict
+
+from PiCN.Packets import Name
+
+
+class BaseReplacementPolicy(object):
+    """Abstract replacement policy. The policy only tracks the names of the cached objects, the content store asks
+    for a victim whenever it exceeds its budget"""
+
+    @abc.abstractmethod
+    def insert(self, name: Name):
+        """
+        Track a newly cached object
+        :param name: name of the object
+        :return: None
+        """
+
+    @abc.abstractmethod
+    def touch(self, name: Name):
+        """
+        Record a hit on a cached object
+        :param name: name of the object
+        :return: None
+        """
+
+    @abc.abstractmethod
+    def remove(self, name: Name):
+        """
+        Stop tracking an object, which was removed from the content store without being evicted
+        :param name: name of the object
+        :return: None
+        """
+
+    @abc.abstractmethod
+    def victim(self) -> Name:
+        """
+        Select the next object to evict, the policy stops tracking it
+        :return: name of the object to evict or None if no object is tracked
+        """
+
+    @abc.abstractmethod
+    def __len__(self):
+        """number of tracked objects"""
+
+
+class LRUReplacementPolicy(BaseReplacementPolicy):
+    """Least recently used replacement policy"""
+
+    def __init__(self):
+        self._entries: OrderedDict = OrderedDict()
+
+    def insert(self, name: Name):
+        self._entries[name] = None
+        self._entries.move_to_end(name)
+
+    def touch(self, name: Name):
+        if name in self._entries:
+            self._entries.move_to_end(name)
+
+    def remove(self, name: Name):
+        self._entries.pop(name, None)
+
+    def victim(self) -> Name:
+        if len(self._entries) == 0:
+            return None
+        return self._entries.popitem(last=False)[0]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ARCReplacementPolicy(BaseReplacementPolicy):
+    """Adaptive replacement cache policy (Megiddo and Modha, FAST 2003). Recently used objects (T1) and frequently
+    used objects (T2) are kept in two LRU lists. Ghost lists (B1, B2) remember recently evicted names and adapt the
+    target size of T1.
+    :param capacity: number of objects the cache can hold. If None, the capacity is learned from the number of
+                     tracked objects when the content store starts evicting.
+    """
+
+    def __init__(self, capacity: int = None):
+        self._capacity = capacity
+        self._learn_capacity = capacity is None
+        self._p: float = 0
+        self._t1: OrderedDict = OrderedDict()
+        self._t2: OrderedDict = OrderedDict()
+        self._b1: OrderedDict = OrderedDict()
+        self._b2: OrderedDict = OrderedDict()
+        self._next_victim: Name = None
+
+    def insert(self, name: Name):
+        capacity = self._get_capacity()
+        self._next_victim = None
+        if name in self._t1 or name in self._t2:
+            self.touch(name)
+            return
+        in_b1 = name in self._b1
+        in_b2 = name in self._b2
+        if in_b1:
+            self._p = min(capacity, self._p + max(len(self._b2) / len(self._b1), 1))
+        elif in_b2:
+            self._p = max(0, self._p - max(len(self._b1) / len(self._b2), 1))
+        if len(self) >= capacity:
+            # REPLACE: the victim is chosen before the object is inserted, so that it cannot be the object itself
+            self._next_victim = self._replace_candidate(in_b2)
+        if in_b1:
+            del self._b1[name]
+            self._t2[name] = None
+        elif in_b2:
+            del self._b2[name]
+            self._t2[name] = None
+        else:
+            self._t1[name] = None
+        self._trim_ghosts()
+
+    def touch(self, name: Name):
+        if name in self._t1:
+            del self._t1[name]
+            self._t2[name] = None
+        elif name in self._t2:
+            self._t2.move_to_end(name)
+
+    def remove(self, name: Name):
+        self._t1.pop(name, None)
+        self._t2.pop(name, None)
+
+    def victim(self) -> Name:
+        if self._learn_capacity:
+            self._capacity = max(self._capacity or 0, len(self))
+        name = self._next_victim
+        self._next_victim = None
+        if name is None or (name not in self._t1 and name not in self._t2):
+            name = self._replace_candidate(False)
+        if name is None:
+            return None
+        if name in self._t1:
+            del self._t1[name]
+            self._b1[name] = None
+        else:
+            del self._t2[name]
+            self._b2[name] = None
+        self._trim_ghosts()
+        return name
+
+    def __len__(self):
+        return len(self._t1) + len(self._t2)
+
+    def _get_capacity(self) -> int:
+        if self._capacity is None:
+            return max(len(self), 1)
+        return self._capacity
+
+    def _replace_candidate(self, in_b2: bool) -> Name:
+        """
+        Object to evict according to the target size of T1, the object is not evicted yet
+        :param in_b2: true if the object to be inserted is in B2
+        :return: name of the object or None if no object is tracked
+        """
+        if len(self._t1) > 0 and (len(self._t1) > self._p or len(self._t2) == 0 or
+                                  (in_b2 and len(self._t1) == self._p)):
+            return next(iter(self._t1))
+        if len(self._t2) > 0:
+            return next(iter(self._t2))
+        return None
+
+    def _trim_ghosts(self):
+        """keep |T1| + |B1| <= c and |T1| + |T2| + |B1| + |B2| <= 2c"""
+        capacity = self._get_capacity()
+        while len(self._b1) > 0 and len(self._t1) + len(self._b1) > capacity:
+            self._b1.popitem(last=False)
+        while len(self._b2) > 0 and len(self) + len(self._b1) + len(self._b2) > 2 * capacity:
+            self._b2.popitem(last=False)
@@ -1,4 +1,11 @@
 from .BaseContentStore import BaseContentStore
 from .BaseContentStore import ContentStoreEntry
 from .ContentStoreMemoryExact import ContentStoreMemoryExact
-from .ContentStorePersistentExact import ContentStorePersistentExact
\ No newline at end of file
+from .ContentStorePersistentExact import ContentStorePersistentExact
+from .ReplacementPolicy import BaseReplacementPolicy, LRUReplacementPolicy, ARCReplacementPolicy
+from .ContentStoreMemoryBounded import ContentStoreMemoryBounded
+from .ContentStorePersistentLog import ContentStorePersistentLog
+from .BloomFilter import CountingBloomFilter
+from .ContentStoreTiered import ContentStoreTiered
+from .AdmissionPolicy import BaseAdmissionPolicy, AlwaysAdmissionPolicy, ProbabilisticAdmissionPolicy, \
+    LeaveCopyDownAdmissionPolicy, SecondHitAdmissionPolicy
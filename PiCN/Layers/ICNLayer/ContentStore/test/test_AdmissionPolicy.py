@@ -0,0 +1,62 @@
+"""Tests for the cache admission policies"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import AlwaysAdmissionPolicy, ProbabilisticAdmissionPolicy, \
+    LeaveCopyDownAdmissionPolicy, SecondHitAdmissionPolicy
+from PiCN.Packets import Content
+
+
+class test_AdmissionPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.content = Content("/test/data", "data")
+        self.marked_content = Content("/test/data", "data")
+        self.marked_content.no_cache = True
+
+    def test_always(self):
+        """Test that every content object is admitted and the hint is passed on"""
+        policy = AlwaysAdmissionPolicy()
+        self.assertEqual(policy.decide(self.content, 1, False), (True, False))
+        self.assertEqual(policy.decide(self.marked_content, 1, False), (True, True))
+        self.assertEqual(policy.get_statistics()["admissions"], 2)
+
+    def test_probabilistic(self):
+        """Test that content objects are admitted with the given probability"""
+        policy = ProbabilisticAdmissionPolicy(probability=0.25, seed=1)
+        admitted = sum(1 for i in range(0, 1000) if policy.decide(self.content, 1, False)[0])
+        self.assertTrue(150 < admitted < 350)
+        self.assertEqual(policy.get_statistics()["rejections"], 1000 - admitted)
+        self.assertFalse(ProbabilisticAdmissionPolicy(probability=0).decide(self.content, 1, False)[0])
+        self.assertTrue(ProbabilisticAdmissionPolicy(probability=1).decide(self.content, 1, False)[0])
+
+    def test_leave_copy_down(self):
+        """Test that only the first node downstream of a hit caches the content object"""
+        policy = LeaveCopyDownAdmissionPolicy()
+        self.assertEqual(policy.decide(self.content, 1, False), (True, True))
+        self.assertEqual(policy.decide(self.marked_content, 1, False), (False, True))
+        self.assertEqual(policy.decide(self.content, 1, True), (False, False))
+        self.assertEqual(policy.decide(self.marked_content, 1, True), (False, False))
+
+    def test_second_hit(self):
+        """Test that a content object is admitted the second time it is seen"""
+        policy = SecondHitAdmissionPolicy(history_size=2)
+        self.assertFalse(policy.decide(self.content, 1, False)[0])
+        self.assertTrue(policy.decide(self.content, 1, False)[0])
+        self.assertFalse(policy.decide(self.content, 1, False)[0])
+        # names are forgotten once the history is full
+        policy.decide(Content("/test/other1"), 1, False)
+        policy.decide(Content("/test/other2"), 1, False)
+        self.assertFalse(policy.decide(self.content, 1, False)[0])
+
+    def test_statistics(self):
+        """Test the hit rate counters"""
+        policy = AlwaysAdmissionPolicy()
+        policy.record_lookup(True)
+        policy.record_lookup(False)
+        policy.record_lookup(False)
+        policy.record_lookup(True)
+        self.assertEqual(policy.get_statistics()["hit_rate"], 0.5)
+        policy.reset_statistics()
+        self.assertEqual(policy.get_statistics(), {"lookups": 0, "hits": 0, "hit_rate": 0.0, "admissions": 0,
+                                                   "rejections": 0})
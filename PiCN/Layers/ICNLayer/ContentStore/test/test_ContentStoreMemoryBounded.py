@@ -0,0 +1,130 @@
+"""Tests for the bounded in-memory Content Store"""
+
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryBounded, ARCReplacementPolicy
+from PiCN.Packets import Content, Name
+
+
+class test_ContentStoreMemoryBounded(unittest.TestCase):
+
+    def setUp(self):
+        self.cs = ContentStoreMemoryBounded(max_entries=3)
+
+    def tearDown(self):
+        pass
+
+    def test_add_and_find_content(self):
+        """Test adding and finding data in the CS"""
+        c = Content("/test/data", "Hello World")
+        self.cs.add_content_object(c)
+        self.assertEqual(self.cs.find_content_object(Name("/test/data")).content, c)
+        self.assertIsNone(self.cs.find_content_object(Name("/data/test")))
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertEqual(self.cs.get_container()[0].content, c)
+
+    def test_replace_content(self):
+        """Test adding content with an already cached name replaces the entry"""
+        self.cs.add_content_object(Content("/test/data", "Hello"))
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertEqual(self.cs.find_content_object(Name("/test/data")).content.content, "Hello World")
+        self.assertEqual(self.cs.get_statistics()["bytes"], len("Hello World"))
+
+    def test_remove_content(self):
+        """Test removing data from the CS"""
+        c = Content("/test/data", "Hello World")
+        self.cs.add_content_object(c)
+        self.cs.remove_content_object(c.name)
+        self.cs.remove_content_object(c.name)
+        self.assertEqual(self.cs.get_container_size(), 0)
+        self.assertEqual(self.cs.get_statistics()["bytes"], 0)
+
+    def test_lru_eviction_entry_limit(self):
+        """Test that the least recently used entry is evicted when the entry limit is reached"""
+        for n in ["/a", "/b", "/c"]:
+            self.cs.add_content_object(Content(n, "data"))
+        self.cs.find_content_object(Name("/a"))
+        self.cs.add_content_object(Content("/d", "data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/b")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/a")))
+        self.assertEqual(self.cs.get_container_size(), 3)
+        self.assertEqual(self.cs.get_statistics()["evictions"], 1)
+
+    def test_byte_budget(self):
+        """Test that the byte budget is enforced and oversized objects are not cached"""
+        self.cs = ContentStoreMemoryBounded(max_bytes=10)
+        self.cs.add_content_object(Content("/a", "12345"))
+        self.cs.add_content_object(Content("/b", "12345"))
+        self.assertEqual(self.cs.get_container_size(), 2)
+        self.cs.add_content_object(Content("/c", "123"))
+        self.assertEqual(self.cs.get_container_size(), 2)
+        self.assertIsNone(self.cs.find_content_object(Name("/a")))
+        self.assertLessEqual(self.cs.get_statistics()["bytes"], 10)
+        self.cs.add_content_object(Content("/d", "12345678901"))
+        self.assertIsNone(self.cs.find_content_object(Name("/d")))
+
+    def test_wire_format_counts_against_budget(self):
+        """Test that the wire format is charged against the byte budget"""
+        c = Content("/a", "12345", wire_format=b"0123456789")
+        self.assertEqual(ContentStoreMemoryBounded.entry_size(c), 15)
+
+    def test_size_charged_at_insert(self):
+        """Test that removing an object releases the size it was charged, even if the object changed meanwhile"""
+        self.cs = ContentStoreMemoryBounded(max_bytes=100)
+        c = Content("/a", "12345")
+        self.cs.add_content_object(c)
+        self.assertEqual(self.cs.get_statistics()["bytes"], 5)
+        c.wire_format = b"0123456789"
+        self.cs.remove_content_object(Name("/a"))
+        self.assertEqual(self.cs.get_statistics()["bytes"], 0)
+        c.wire_format = None
+        self.cs.add_content_object(c)
+        c.wire_format = b"0123456789"
+        self.cs.add_content_object(Content("/b", "1" * 96))
+        self.assertIsNone(self.cs.find_content_object(Name("/a")))
+        self.assertEqual(self.cs.get_statistics()["bytes"], 96)
+
+    def test_static_entries_not_evicted(self):
+        """Test that static entries are never evicted"""
+        self.cs.add_content_object(Content("/static", "data"), static=True)
+        for n in ["/a", "/b", "/c", "/d"]:
+            self.cs.add_content_object(Content(n, "data"))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/static")))
+        self.assertEqual(self.cs.get_container_size(), 3)
+
+    def test_statistics(self):
+        """Test hit and miss counters"""
+        self.cs.add_content_object(Content("/a", "data"))
+        self.cs.find_content_object(Name("/a"))
+        self.cs.find_content_object(Name("/a"))
+        self.cs.find_content_object(Name("/b"))
+        stats = self.cs.get_statistics()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["entries"], 1)
+        self.cs.reset_statistics()
+        self.assertEqual(self.cs.get_statistics()["hits"], 0)
+
+    def test_ageing(self):
+        """Test ageing removes expired non-static entries"""
+        self.cs.set_cs_timeout(0)
+        self.cs.add_content_object(Content("/a", "data"))
+        self.cs.add_content_object(Content("/b", "data"), static=True)
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertIsNotNone(self.cs.find_content_object(Name("/b")))
+
+    def test_arc_scan_resistance(self):
+        """Test that ARC keeps frequently used entries during a scan of one-time requests"""
+        self.cs = ContentStoreMemoryBounded(max_entries=4, replacement_policy=ARCReplacementPolicy(4))
+        for n in ["/hot1", "/hot2"]:
+            self.cs.add_content_object(Content(n, "data"))
+            self.cs.find_content_object(Name(n))
+        for i in range(0, 20):
+            self.cs.add_content_object(Content("/scan/" + str(i), "data"))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/hot1")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/hot2")))
+        self.assertEqual(self.cs.get_container_size(), 4)
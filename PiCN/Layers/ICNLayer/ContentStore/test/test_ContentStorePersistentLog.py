@@ -0,0 +1,169 @@
+"""Tests for the log-structured persistent Content Store"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStorePersistentLog
+from PiCN.Packets import Content, Name
+
+
+class test_ContentStorePersistentLog(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cs = ContentStorePersistentLog(db_path=self.path, compaction_ratio=None)
+
+    def tearDown(self):
+        self.cs.close_cs()
+        shutil.rmtree(self.path)
+
+    def restart(self, **kwargs):
+        self.cs.close_cs()
+        self.cs = ContentStorePersistentLog(db_path=self.path, **kwargs)
+
+    def test_find_content_to_cs(self):
+        """Test adding and searching data to CS"""
+        c = Content("/test/data", "Hello World", b"\x06\x01wire")
+        self.cs.add_content_object(c)
+        fc = self.cs.find_content_object(c.name)
+        self.assertEqual(fc.content, c)
+        self.assertEqual(fc.content.wire_format, b"\x06\x01wire")
+        self.assertIsNone(self.cs.find_content_object(Name("/data/test")))
+        self.assertEqual(self.cs.get_container_size(), 1)
+
+    def test_replace_and_remove_content(self):
+        """Test replacing and removing data from CS"""
+        self.cs.add_content_object(Content("/test/data", "Hello"))
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.assertEqual(self.cs.find_content_object(Name("/test/data")).content.content, "Hello World")
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.cs.remove_content_object(Name("/test/data"))
+        self.cs.remove_content_object(Name("/test/data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data")))
+        self.assertEqual(self.cs.get_container_size(), 0)
+        self.assertEqual(self.cs.get_garbage_ratio(), 1.0)
+
+    def test_restored(self):
+        """Test that the index is restored after a restart"""
+        c1 = Content("/test/data1", "Hello World")
+        c2 = Content("/test/data2", "Hello World 2")
+        self.cs.add_content_object(c1, static=True)
+        self.cs.add_content_object(c2)
+        self.cs.add_content_object(Content("/test/data3", "removed"))
+        self.cs.remove_content_object(Name("/test/data3"))
+        entry = self.cs.find_content_object(c2.name)
+        time.sleep(0.01)
+        self.cs.update_timestamp(entry)
+        self.restart()
+        self.assertEqual(self.cs.get_container_size(), 2)
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        self.assertTrue(self.cs.find_content_object(c1.name).static)
+        self.assertEqual(self.cs.find_content_object(c2.name).content, c2)
+        self.assertEqual(self.cs.find_content_object(c2.name).timestamp, entry.timestamp)
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data3")))
+
+    def test_restore_truncated_log(self):
+        """Test that a partially written record is dropped on restart"""
+        c = Content("/test/data", "Hello World")
+        self.cs.add_content_object(c)
+        self.cs.add_content_object(Content("/test/data2", "Hello World 2"))
+        self.cs.close_cs()
+        segment = os.path.join(self.path, os.listdir(self.path)[0])
+        os.truncate(segment, os.path.getsize(segment) - 3)
+        self.restart()
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertEqual(self.cs.find_content_object(c.name).content, c)
+        c3 = Content("/test/data3", "Hello World 3")
+        self.cs.add_content_object(c3)
+        self.restart()
+        self.assertEqual(self.cs.find_content_object(c3.name).content, c3)
+
+    def test_segments_and_compaction(self):
+        """Test that compaction keeps live records and deletes the old segments"""
+        self.restart(segment_size=200, compaction_ratio=None)
+        for i in range(0, 20):
+            self.cs.add_content_object(Content("/test/data" + str(i), "payload" + str(i)))
+        for i in range(0, 20, 2):
+            self.cs.remove_content_object(Name("/test/data" + str(i)))
+        self.assertGreater(len(os.listdir(self.path)), 1)
+        self.assertGreater(self.cs.get_garbage_ratio(), 0)
+        self.cs.compact()
+        self.assertEqual(self.cs.get_garbage_ratio(), 0)
+        for i in range(0, 20):
+            fc = self.cs.find_content_object(Name("/test/data" + str(i)))
+            if i % 2 == 0:
+                self.assertIsNone(fc)
+            else:
+                self.assertEqual(fc.content.content, "payload" + str(i))
+        self.restart()
+        self.assertEqual(self.cs.get_container_size(), 10)
+        self.assertEqual(self.cs.find_content_object(Name("/test/data19")).content.content, "payload19")
+
+    def test_background_compaction(self):
+        """Test that compaction is started once the garbage ratio is exceeded"""
+        self.restart(segment_size=200, compaction_ratio=0.5)
+        for i in range(0, 20):
+            self.cs.add_content_object(Content("/test/data", "payload" + str(i)))
+        self.cs._compaction_thread.join()
+        self.assertEqual(self.cs.find_content_object(Name("/test/data")).content.content, "payload19")
+        self.assertLess(len(os.listdir(self.path)), 5)
+
+    def test_ageing(self):
+        """Test that expired entries are removed and static entries are kept"""
+        self.restart(cs_timeout=0, compaction_ratio=None)
+        self.cs.add_content_object(Content("/test/data1", "Hello World"))
+        self.cs.add_content_object(Content("/test/data2", "Hello World"), static=True)
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data1")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data2")))
+
+    def test_delete_all(self):
+        """Test removing all entries"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.delete_all()
+        self.assertEqual(self.cs.get_container_size(), 0)
+        self.restart()
+        self.assertEqual(self.cs.get_container_size(), 0)
+
+    def test_active_segment_mapped_once(self):
+        """Test that records appended to the active segment are read without remapping it"""
+        self.cs.add_content_object(Content("/test/data0", "payload0"))
+        self.restart()
+        self.assertEqual(self.cs.find_content_object(Name("/test/data0")).content.content, "payload0")
+        m = self.cs._maps[0]
+        for i in range(1, 10):
+            self.cs.add_content_object(Content("/test/data" + str(i), "payload" + str(i)))
+            self.assertEqual(self.cs.find_content_object(Name("/test/data" + str(i))).content.content,
+                             "payload" + str(i))
+        self.assertEqual(self.cs.find_content_object(Name("/test/data0")).content.content, "payload0")
+        self.assertIs(self.cs._maps[0], m)
+        self.assertIsInstance(self.cs.find_content_object(Name("/test/data5")).content.get_bytes(), bytes)
+
+    def test_tail_exceeds_tail_size(self):
+        """Test that the active segment is remapped once the tail exceeds its size"""
+        self.cs.TAIL_SIZE = 100
+        for i in range(0, 20):
+            self.cs.add_content_object(Content("/test/data" + str(i), "payload" + str(i)))
+        self.assertLess(len(self.cs._tail), 100 + 50)
+        for i in range(0, 20):
+            self.assertEqual(self.cs.find_content_object(Name("/test/data" + str(i))).content.content,
+                             "payload" + str(i))
+
+    def test_delete_all_during_compaction(self):
+        """Test that removing all entries stops a running compaction"""
+        self.restart(segment_size=200, compaction_ratio=0.5)
+        for i in range(0, 20):
+            self.cs.add_content_object(Content("/test/data", "payload" + str(i)))
+        self.cs.delete_all()
+        self.assertFalse(self.cs._compaction_thread.is_alive())
+        self.assertEqual(self.cs.get_container_size(), 0)
+        self.assertEqual(os.listdir(self.path), ["segment-00000000.log"])
+        self.assertEqual(os.path.getsize(os.path.join(self.path, "segment-00000000.log")), 0)
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.assertEqual(self.cs.find_content_object(Name("/test/data")).content.content, "Hello World")
+        self.restart()
+        self.assertEqual(self.cs.get_container_size(), 1)
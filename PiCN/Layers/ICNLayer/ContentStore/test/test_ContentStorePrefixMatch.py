@@ -1,9 +1,10 @@
 """Tests for ContentStorePrefixMatch"""
 
+import time
 import unittest
 
 from PiCN.Layers.ICNLayer.ContentStore.ContentStoreMemoryPrefix import ContentStoreMemoryPrefix
-from PiCN.Packets import Content
+from PiCN.Packets import Content, Name
 
 
 class test_ContentStorePrefixMatch(unittest.TestCase):
@@ -38,4 +39,71 @@ class test_ContentStorePrefixMatch(unittest.TestCase):
         self.cs.find_content_object(c4.name).content.name.is_prefix_of(c4.name)
         self.cs.find_content_object(c5.name).content.name.is_prefix_of(c5.name)
         self.cs.find_content_object(c6.name).content.name.is_prefix_of(c6.name)
-        self.cs.find_content_object(c7.name).content.name.is_prefix_of(c7.name)
\ No newline at end of file
+        self.cs.find_content_object(c7.name).content.name.is_prefix_of(c7.name)
+
+    def test_find_longest_prefix_match(self):
+        """Test longest prefix match lookup"""
+        c1 = Content("/ndn/ch", "ndn-ch")
+        c2 = Content("/ndn/ch/unibas/foo", "unibas-foo")
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(c2)
+        self.assertEqual(self.cs.find_longest_prefix_match(Name("/ndn/ch/unibas/foo/bar")).content, c2)
+        self.assertEqual(self.cs.find_longest_prefix_match(Name("/ndn/ch/unibas")).content, c1)
+        self.assertIsNone(self.cs.find_longest_prefix_match(Name("/ndn")))
+
+    def test_remove_content(self):
+        """Test removing content from the CS"""
+        c1 = Content("/ndn/ch/unibas/foo", "unibas-foo")
+        self.cs.add_content_object(c1)
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.cs.remove_content_object(c1.name)
+        self.cs.remove_content_object(c1.name)
+        self.assertEqual(self.cs.get_container_size(), 0)
+        self.assertIsNone(self.cs.find_content_object(Name("/ndn")))
+
+    def test_ageing(self):
+        """Test that expired entries are removed and static entries are kept"""
+        self.cs = ContentStoreMemoryPrefix(cs_timeout=1)
+        c1 = Content("/ndn/ch/unibas/foo", "unibas-foo")
+        c2 = Content("/ndn/ch/unibas/static", "unibas-static")
+        c3 = Content("/ndn/ch/unibas/refreshed", "unibas-refreshed")
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(c2, static=True)
+        self.cs.add_content_object(c3)
+        time.sleep(0.6)
+        self.cs.update_timestamp(self.cs.find_content_object(c3.name))
+        time.sleep(0.6)
+        self.cs.ageing()
+        self.assertIsNone(self.cs.find_content_object(c1.name))
+        self.assertEqual(self.cs.find_content_object(c2.name).content, c2)
+        self.assertEqual(self.cs.find_content_object(c3.name).content, c3)
+        self.assertEqual(self.cs.get_container_size(), 2)
+
+    def test_ageing_many_entries(self):
+        """Test ageing of a large CS"""
+        self.cs = ContentStoreMemoryPrefix(cs_timeout=0)
+        for i in range(0, 10000):
+            self.cs.add_content_object(Content("/ndn/ch/unibas/" + str(i % 100) + "/" + str(i), str(i)))
+        self.assertEqual(self.cs.get_container_size(), 10000)
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertEqual(self.cs.get_container_size(), 0)
+        self.assertEqual(len(self.cs._deadlines), 0)
+        self.assertIsNone(self.cs._deadlines.next_deadline())
+
+    def test_eviction(self):
+        """Test that the least recently used entry is evicted when the CS is full"""
+        self.cs = ContentStoreMemoryPrefix(max_entries=2)
+        c1 = Content("/ndn/a", "a")
+        c2 = Content("/ndn/b", "b")
+        c3 = Content("/ndn/c", "c")
+        c4 = Content("/ndn/d", "d")
+        self.cs.add_content_object(c1, static=True)
+        self.cs.add_content_object(c2)
+        self.cs.add_content_object(c3)
+        self.assertEqual(self.cs.get_container_size(), 2)
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        self.assertIsNone(self.cs.find_content_object(c2.name))
+        self.cs.add_content_object(c4)
+        self.assertIsNone(self.cs.find_content_object(c3.name))
+        self.assertCountEqual([e.content for e in self.cs.get_container()], [c1, c4])
@@ -0,0 +1,114 @@
+"""Tests for the two-tier Content Store"""
+
+import shutil
+import tempfile
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreTiered, CountingBloomFilter
+from PiCN.Packets import Content, Name
+
+
+class test_ContentStoreTiered(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cs = ContentStoreTiered(max_entries=2, db_path=self.path)
+
+    def tearDown(self):
+        self.cs.close_cs()
+        shutil.rmtree(self.path)
+
+    def test_demote_and_promote(self):
+        """Test that evicted entries are demoted to disk and promoted on a hit"""
+        c1 = Content("/test/data1", "data1")
+        c2 = Content("/test/data2", "data2")
+        c3 = Content("/test/data3", "data3")
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(c2)
+        self.cs.add_content_object(c3)
+        stats = self.cs.get_statistics()
+        self.assertEqual(stats["demotions"], 1)
+        self.assertEqual(stats["memory_entries"], 2)
+        self.assertEqual(stats["disk_entries"], 1)
+        self.assertEqual(self.cs.get_container_size(), 3)
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        stats = self.cs.get_statistics()
+        self.assertEqual(stats["disk_hits"], 1)
+        self.assertEqual(stats["promotions"], 1)
+        self.assertEqual(stats["demotions"], 2)
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        self.assertEqual(self.cs.get_statistics()["memory_hits"], 1)
+        self.assertCountEqual([e.content for e in self.cs.get_container()], [c1, c2, c3])
+
+    def test_bloom_filter_rejects_misses(self):
+        """Test that misses are answered by the Bloom filter"""
+        self.cs.add_content_object(Content("/test/data1", "data1"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/unknown")))
+        stats = self.cs.get_statistics()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["bloom_filter_rejections"], 1)
+
+    def test_remove_content(self):
+        """Test removing entries from both tiers"""
+        c1 = Content("/test/data1", "data1")
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(Content("/test/data2", "data2"))
+        self.cs.add_content_object(Content("/test/data3", "data3"))
+        self.cs.remove_content_object(c1.name)
+        self.cs.remove_content_object(Name("/test/data3"))
+        self.assertIsNone(self.cs.find_content_object(c1.name))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data3")))
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertEqual(self.cs.get_statistics()["bloom_filter_rejections"], 2)
+
+    def test_replace_demoted_content(self):
+        """Test that adding a demoted name again replaces the disk entry"""
+        self.cs.add_content_object(Content("/test/data1", "old"))
+        self.cs.add_content_object(Content("/test/data2", "data2"))
+        self.cs.add_content_object(Content("/test/data3", "data3"))
+        self.cs.add_content_object(Content("/test/data1", "new"))
+        self.assertEqual(self.cs.find_content_object(Name("/test/data1")).content.content, "new")
+        self.assertEqual(self.cs.get_container_size(), 3)
+
+    def test_restart(self):
+        """Test that the disk tier and its Bloom filter are restored after a restart"""
+        c1 = Content("/test/data1", "data1")
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(Content("/test/data2", "data2"))
+        self.cs.add_content_object(Content("/test/data3", "data3"))
+        self.cs.close_cs()
+        self.cs = ContentStoreTiered(max_entries=2, db_path=self.path)
+        self.assertEqual(self.cs.find_content_object(c1.name).content, c1)
+        self.assertEqual(self.cs.get_statistics()["disk_hits"], 1)
+
+    def test_ageing(self):
+        """Test that expired entries are removed from both tiers"""
+        self.cs.set_cs_timeout(0)
+        self.cs.add_content_object(Content("/test/data1", "data1"))
+        self.cs.add_content_object(Content("/test/data2", "data2"))
+        self.cs.add_content_object(Content("/test/data3", "data3"), static=True)
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data3")))
+
+
+class test_CountingBloomFilter(unittest.TestCase):
+
+    def test_add_and_remove(self):
+        """Test membership after adding and removing names"""
+        bf = CountingBloomFilter(capacity=1000, error_rate=0.01)
+        names = [Name("/test/data" + str(i)) for i in range(0, 1000)]
+        for name in names:
+            bf.add(name)
+        for name in names:
+            self.assertIn(name, bf)
+        for name in names[:500]:
+            bf.remove(name)
+        for name in names[500:]:
+            self.assertIn(name, bf)
+        false_positives = sum(1 for i in range(0, 1000) if Name("/other/data" + str(i)) in bf)
+        self.assertLess(false_positives, 50)
+        bf.clear()
+        self.assertNotIn(names[999], bf)
@@ -262,4 +262,61 @@ class test_NamedObjectTree(unittest.TestCase):
         self.assertTrue(Name("/ndn").is_prefix_of(n1))
 
         n2 = self.tree_cse.prefix_lookup(Name("/ndn/ch")).name
-        self.assertTrue(Name("/ndn/ch").is_prefix_of(n2))
\ No newline at end of file
+        self.assertTrue(Name("/ndn/ch").is_prefix_of(n2))
+
+    def test_remove_prunes_nodes(self):
+        """Test that removing objects does not leave unused nodes behind"""
+        c1 = Content("/ndn/ch/unibas/foo/bar1", "unibas-foo-bar1")
+        c2 = Content("/ndn/ch", "ndn-ch")
+        self.tree1_co.insert(c1)
+        self.tree1_co.insert(c2)
+        self.assertEqual(len(self.tree1_co), 2)
+        self.tree1_co.remove(c1.name)
+        self.assertEqual(len(self.tree1_co), 1)
+        self.assertEqual(self.tree1_co.prefix_lookup(Name("/ndn/ch/unibas")), None)
+        self.assertEqual(self.tree1_co._NamedObjectTree__tree["subtree"][b"ndn"]["subtree"][b"ch"]["subtree"], {})
+        self.tree1_co.remove(c2.name)
+        self.assertEqual(len(self.tree1_co), 0)
+        self.assertEqual(self.tree1_co._NamedObjectTree__tree["subtree"], {})
+
+    def test_lookup_does_not_create_nodes(self):
+        """Test that lookups of unknown names do not modify the tree"""
+        self.tree1_co.insert(Content("/ndn/ch", "ndn-ch"))
+        tree = repr(self.tree1_co._NamedObjectTree__tree)
+        self.tree1_co.exact_lookup(Name("/ndn/unknown/foo"))
+        self.tree1_co.prefix_lookup(Name("/ndn/unknown/foo"))
+        self.tree1_co.remove(Name("/ndn/unknown/foo"))
+        self.tree1_co.remove(Name("/ndn"))
+        self.assertEqual(repr(self.tree1_co._NamedObjectTree__tree), tree)
+        self.assertEqual(len(self.tree1_co), 1)
+
+    def test_prefix_lookup_skips_removed_branches(self):
+        """Test that prefix lookup finds an object after the first branch was removed"""
+        c1 = Content("/ndn/a/foo", "a")
+        c2 = Content("/ndn/b/foo", "b")
+        self.tree1_co.insert(c1)
+        self.tree1_co.insert(c2)
+        self.tree1_co.remove(c1.name)
+        self.assertEqual(self.tree1_co.prefix_lookup(Name("/ndn")), c2)
+
+    def test_longest_prefix_lookup(self):
+        """Test longest prefix lookup"""
+        c1 = Content("/ndn", "ndn")
+        c2 = Content("/ndn/ch/unibas", "unibas")
+        self.tree1_co.insert(c1)
+        self.tree1_co.insert(c2)
+        self.assertEqual(self.tree1_co.longest_prefix_lookup(Name("/ndn/ch/unibas/foo")), c2)
+        self.assertEqual(self.tree1_co.longest_prefix_lookup(Name("/ndn/ch/unibas")), c2)
+        self.assertEqual(self.tree1_co.longest_prefix_lookup(Name("/ndn/ch")), c1)
+        self.assertEqual(self.tree1_co.longest_prefix_lookup(Name("/unknown")), None)
+
+    def test_descendants(self):
+        """Test iterating over all objects with a prefix"""
+        c1 = Content("/ndn/ch/unibas/foo1", "unibas-foo1")
+        c2 = Content("/ndn/ch/unibas/foo/bar1", "unibas-foo-bar1")
+        c3 = Content("/ndn/de", "ndn-de")
+        for c in [c1, c2, c3]:
+            self.tree1_co.insert(c)
+        self.assertCountEqual(list(self.tree1_co.descendants(Name("/ndn/ch"))), [c1, c2])
+        self.assertCountEqual(list(self.tree1_co), [c1, c2, c3])
+        self.assertEqual(list(self.tree1_co.descendants(Name("/unknown"))), [])
@@ -0,0 +1,66 @@
+"""Tests for the content store replacement policies"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import LRUReplacementPolicy, ARCReplacementPolicy
+from PiCN.Packets import Name
+
+
+class test_LRUReplacementPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = LRUReplacementPolicy()
+
+    def test_victim_order(self):
+        """Test that victims are chosen in least recently used order"""
+        for n in ["/a", "/b", "/c"]:
+            self.policy.insert(Name(n))
+        self.policy.touch(Name("/a"))
+        self.policy.remove(Name("/c"))
+        self.assertEqual(self.policy.victim(), Name("/b"))
+        self.assertEqual(self.policy.victim(), Name("/a"))
+        self.assertIsNone(self.policy.victim())
+        self.assertEqual(len(self.policy), 0)
+
+
+class test_ARCReplacementPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = ARCReplacementPolicy(2)
+
+    def test_recency_before_frequency(self):
+        """Test that entries used once are evicted before entries used twice"""
+        self.policy.insert(Name("/a"))
+        self.policy.insert(Name("/b"))
+        self.policy.touch(Name("/a"))
+        self.assertEqual(self.policy.victim(), Name("/b"))
+        self.assertEqual(len(self.policy), 1)
+
+    def test_ghost_hit_adapts_target(self):
+        """Test that a hit in the recency ghost list favours recently used entries"""
+        self.policy.insert(Name("/a"))
+        self.policy.touch(Name("/a"))
+        self.policy.insert(Name("/b"))
+        self.assertEqual(self.policy.victim(), Name("/b"))
+        self.policy.insert(Name("/b"))  # ghost hit in B1, goes to T2 and increases the T1 target
+        self.assertEqual(len(self.policy), 2)
+        self.policy.insert(Name("/c"))
+        self.assertEqual(self.policy.victim(), Name("/a"))
+
+    def test_victim_chosen_before_insert(self):
+        """Test that a new object is not evicted right after its insertion if T1 has a target size of 0"""
+        for n in ["/a", "/b"]:
+            self.policy.insert(Name(n))
+            self.policy.touch(Name(n))
+        self.policy.insert(Name("/c"))
+        self.assertEqual(self.policy.victim(), Name("/a"))
+        self.assertEqual(len(self.policy), 2)
+        self.assertEqual(self.policy.victim(), Name("/c"))
+
+    def test_learn_capacity(self):
+        """Test that the capacity is learned if not given"""
+        policy = ARCReplacementPolicy()
+        for n in ["/a", "/b", "/c"]:
+            policy.insert(Name(n))
+        self.assertEqual(policy.victim(), Name("/a"))
+        self.assertEqual(len(policy), 2)
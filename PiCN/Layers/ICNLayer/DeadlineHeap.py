@@ -0,0 +1,85 @@
+"""Deadlines of the entries of an ICN Data Struct"""
+
+import heapq
+import itertools
+
+from typing import Dict, Hashable, List, Tuple
+
+
+class DeadlineHeap(object):
+    """Deadlines of the entries of a data struct, kept in a min-heap so that ageing only touches the entries which are
+    due. Rescheduling or cancelling an entry does not touch the heap, outdated heap items are skipped lazily when
+    they are popped. The heap is rebuilt when it holds too many outdated items.
+    """
+
+    def __init__(self):
+        self._deadlines: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._counter = itertools.count()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: Hashable, deadline: float):
+        """
+        (Re)schedule an entry
+        :param key: key of the entry
+        :param deadline: point in time at which the entry is due
+        """
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, next(self._counter), key))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._rebuild()
+
+    def cancel(self, key: Hashable):
+        """
+        Remove the deadline of an entry, if there is one
+        :param key: key of the entry
+        """
+        self._deadlines.pop(key, None)
+
+    def shift(self, delta: float):
+        """
+        Move all deadlines by the same amount of time
+        :param delta: time added to the deadlines
+        """
+        if delta == 0:
+            return
+        for key in self._deadlines:
+            self._deadlines[key] += delta
+        self._rebuild()
+
+    def next_deadline(self) -> float:
+        """
+        Earliest deadline
+        :return: the earliest deadline, None if no entry is scheduled
+        """
+        while self._heap:
+            deadline, _, key = self._heap[0]
+            if self._deadlines.get(key) == deadline:
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, cur_time: float, inclusive: bool=True) -> List[Hashable]:
+        """
+        Remove the entries which are due, their deadlines are cancelled
+        :param cur_time: current point in time
+        :param inclusive: if true, entries with a deadline equal to cur_time are due as well
+        :return: keys of the due entries, earliest deadline first
+        """
+        due = []
+        while self._heap and (self._heap[0][0] <= cur_time if inclusive else self._heap[0][0] < cur_time):
+            deadline, _, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) != deadline:
+                continue  # entry was cancelled or rescheduled in the meantime
+            del self._deadlines[key]
+            due.append(key)
+        return due
+
+    def _rebuild(self):
+        self._heap = [(deadline, next(self._counter), key) for key, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
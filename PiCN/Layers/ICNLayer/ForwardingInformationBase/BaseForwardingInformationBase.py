@@ -80,4 +80,14 @@ class BaseForwardingInformationBase(BaseICNDataStruct):
     def clear(self):
         """Remove all non-static entries from the FIB"""
 
+    @abc.abstractmethod
+    def apply_fib_diff(self, added: List[ForwardingInformationBaseEntry], changed: List[ForwardingInformationBaseEntry],
+                       removed: List[Name]):
+        """Compound operation: apply the changes computed by a routing information base in a single call. The non-static
+        entries of the changed and removed names are replaced, static entries are kept
+        :param added: entries for names without entries so far
+        :param changed: all new entries of the names whose entries changed
+        :param removed: names whose entries are removed
+        """
+
 
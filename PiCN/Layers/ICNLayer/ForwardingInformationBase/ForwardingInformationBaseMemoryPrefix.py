@@ -1,6 +1,6 @@
 """ A in memory Forwarding Information Base using longest matching"""
 
-from typing import List
+from typing import Dict, List, Tuple
 
 from PiCN.Layers.ICNLayer.ForwardingInformationBase.BaseForwardingInformationBase import BaseForwardingInformationBase, \
     ForwardingInformationBaseEntry
@@ -8,16 +8,38 @@ from PiCN.Packets import Name
 
 
 class ForwardingInformationBaseMemoryPrefix(BaseForwardingInformationBase):
+    """In memory Forwarding Information Base using longest prefix matching. The entries are kept in a dict keyed by
+    name and face ids, ordered from the oldest to the newest entry, and newer entries of the same prefix are preferred.
+    An index of the keys per name lets add_fib_entry, remove_fib_entry and apply_fib_diff touch only the affected
+    entries instead of the whole table. The face ids of an entry must not be modified after it was added.
+    """
 
     def __init__(self):
         super().__init__()
+        self._entries: Dict[Tuple[Name, Tuple[int, ...]], ForwardingInformationBaseEntry] = {}
+        self._keys_by_name: Dict[Name, List[Tuple[Name, Tuple[int, ...]]]] = {}
+
+    @property
+    def container(self) -> List[ForwardingInformationBaseEntry]:
+        """all entries, newest first"""
+        return list(reversed(self._entries.values()))
+
+    @container.setter
+    def container(self, container: List[ForwardingInformationBaseEntry]):
+        self._entries = {}
+        self._keys_by_name = {}
+        for fib_entry in reversed(container):
+            self._insert(fib_entry)
+
+    def get_container_size(self) -> int:
+        return len(self._entries)
 
     def find_fib_entry(self, name: Name, already_used_face: List[int] = None,
                        incoming_faceids: List[int]=None) -> ForwardingInformationBaseEntry:
         components = name.components[:]
         for i in range(0, len(name.components)):
             complen = len(components)
-            for fib_entry in self._container:
+            for fib_entry in reversed(self._entries.values()):
                 # if already_used and fib_entry in already_used:
                 #     continue
                 forward_faceids = []
@@ -43,16 +65,13 @@ class ForwardingInformationBaseMemoryPrefix(BaseForwardingInformationBase):
 
     def add_fib_entry(self, name: Name, faceid: List[int], static: bool=False):
         assert (isinstance(faceid, List))
-        fib_entry = ForwardingInformationBaseEntry(name, faceid, static)
-        if fib_entry not in self._container:
-            self._container.insert(0, fib_entry)
+        self._insert(ForwardingInformationBaseEntry(name, faceid, static))
         # else:
         #     self.add_faceid_to_entry(name, faceid)
 
     def remove_fib_entry(self, name: Name):
-        for fib_entry in self._container:
-            if fib_entry.name == name:
-                self._container.remove(fib_entry)
+        for key in self._keys_by_name.pop(name, []):
+            del self._entries[key]
 
     def add_faceid_to_entry(self, name, fid):
         entry = self.find_fib_entry(name)
@@ -61,9 +80,37 @@ class ForwardingInformationBaseMemoryPrefix(BaseForwardingInformationBase):
             return
         if fid not in entry.faceid:
             entry.faceid.extend(fid)
-            self._container.insert(0, entry)
+            self._insert(entry)
 
     def clear(self):
-        for fib_entry in self._container:
-            if not fib_entry.static:
-                self._container.remove(fib_entry)
+        for name in list(self._keys_by_name):
+            self._remove_dynamic_entries(name)
+
+    def apply_fib_diff(self, added: List[ForwardingInformationBaseEntry], changed: List[ForwardingInformationBaseEntry],
+                       removed: List[Name]):
+        for name in set(removed) | set(fib_entry.name for fib_entry in changed):
+            self._remove_dynamic_entries(name)
+        for fib_entry in added + changed:
+            self._insert(fib_entry)
+
+    def _insert(self, fib_entry: ForwardingInformationBaseEntry):
+        """add an entry as the newest entry, unless an entry with the same name and face ids exists"""
+        key = (fib_entry.name, tuple(fib_entry.faceid))
+        if key in self._entries:
+            return
+        self._entries[key] = fib_entry
+        self._keys_by_name.setdefault(fib_entry.name, []).append(key)
+
+    def _remove_dynamic_entries(self, name: Name):
+        """remove the non-static entries of a name"""
+        keys = self._keys_by_name.get(name)
+        if keys is None:
+            return
+        kept = [key for key in keys if self._entries[key].static]
+        for key in keys:
+            if not self._entries[key].static:
+                del self._entries[key]
+        if kept:
+            self._keys_by_name[name] = kept
+        else:
+            del self._keys_by_name[name]
@@ -0,0 +1,183 @@
+""" A in memory Forwarding Information Base using longest prefix matching on a name component trie"""
+
+import itertools
+
+from typing import Dict, List, Tuple
+
+from PiCN.Layers.ICNLayer.ForwardingInformationBase.BaseForwardingInformationBase import BaseForwardingInformationBase, \
+    ForwardingInformationBaseEntry
+from PiCN.Packets import Name
+
+
+class ForwardingInformationBaseTrieNode(object):
+    """Node of the FIB trie, holding the entries of one prefix (newest first)"""
+    __slots__ = ["children", "entries"]
+
+    def __init__(self):
+        self.children: Dict[bytes, ForwardingInformationBaseTrieNode] = {}
+        self.entries: List[Tuple[int, ForwardingInformationBaseEntry]] = []
+
+
+class ForwardingInformationBaseMemoryTrie(BaseForwardingInformationBase):
+    """In memory Forwarding Information Base, the entries are stored in a trie of name components. A longest prefix
+    match walks down the trie along the name and back up until an entry with usable faces is found, so a lookup is
+    O(name length) independent of the number of routes. Matching and filtering behave like
+    ForwardingInformationBaseMemoryPrefix: newer entries of the same prefix are preferred, faces which were already used
+    or are interested in the name are skipped. If no face is filtered, the stored entry is returned without copying it,
+    entries returned by find_fib_entry must therefore not be modified.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._root = ForwardingInformationBaseTrieNode()
+        self._size = 0
+        self._sequence = itertools.count()
+
+    @property
+    def container(self) -> List[ForwardingInformationBaseEntry]:
+        """all entries, newest first"""
+        entries = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            entries.extend(node.entries)
+            stack.extend(node.children.values())
+        return [entry for _, entry in sorted(entries, key=lambda e: e[0], reverse=True)]
+
+    @container.setter
+    def container(self, container: List[ForwardingInformationBaseEntry]):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.entries = []
+            stack.extend(node.children.values())
+        self._size = 0
+        self._prune_all(self._root)
+        for entry in reversed(container):
+            self._insert(entry)
+
+    def get_container_size(self) -> int:
+        return self._size
+
+    def find_fib_entry(self, name: Name, already_used_face: List[int] = None,
+                       incoming_faceids: List[int]=None) -> ForwardingInformationBaseEntry:
+        return self._match_path(self._walk(name), already_used_face, incoming_faceids)
+
+    def add_fib_entry(self, name: Name, faceid: List[int], static: bool=False):
+        assert (isinstance(faceid, List))
+        self._insert(ForwardingInformationBaseEntry(name, faceid, static))
+
+    def remove_fib_entry(self, name: Name):
+        path = [self._root]
+        for component in name.components:
+            node = path[-1].children.get(component)
+            if node is None:
+                return
+            path.append(node)
+        self._size -= len(path[-1].entries)
+        path[-1].entries = []
+        self._prune(name, path)
+
+    def add_faceid_to_entry(self, name, fid):
+        node = self._find_node(name)
+        if node is None or len(node.entries) == 0:
+            return
+        sequence, entry = node.entries[0]
+        faceid = entry.faceid + [face for face in (fid if isinstance(fid, list) else [fid]) if face not in entry.faceid]
+        # replace the entry, entries handed out by find_fib_entry are not modified
+        node.entries[0] = (sequence, ForwardingInformationBaseEntry(entry.name, faceid, entry.static))
+
+    def clear(self):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            kept = [e for e in node.entries if e[1].static]
+            self._size -= len(node.entries) - len(kept)
+            node.entries = kept
+            stack.extend(node.children.values())
+        self._prune_all(self._root)
+
+    def apply_fib_diff(self, added: List[ForwardingInformationBaseEntry], changed: List[ForwardingInformationBaseEntry],
+                       removed: List[Name]):
+        for name in set(removed) | set(fib_entry.name for fib_entry in changed):
+            path = [self._root]
+            for component in name.components:
+                node = path[-1].children.get(component)
+                if node is None:
+                    break
+                path.append(node)
+            else:
+                kept = [e for e in path[-1].entries if e[1].static]
+                self._size -= len(path[-1].entries) - len(kept)
+                path[-1].entries = kept
+                self._prune(name, path)
+        for fib_entry in added + changed:
+            self._insert(fib_entry)
+
+    def _find_node(self, name: Name) -> ForwardingInformationBaseTrieNode:
+        node = self._root
+        for component in name.components:
+            node = node.children.get(component)
+            if node is None:
+                return None
+        return node
+
+    def _walk(self, name: Name) -> List[ForwardingInformationBaseTrieNode]:
+        """nodes along the name below the root, ends at the first component which is not in the trie"""
+        path = []
+        node = self._root
+        for component in name.components:
+            node = node.children.get(component)
+            if node is None:
+                break
+            path.append(node)
+        return path
+
+    def _match_path(self, path: List[ForwardingInformationBaseTrieNode], already_used_face: List[int] = None,
+                    incoming_faceids: List[int] = None) -> ForwardingInformationBaseEntry:
+        """longest prefix match on the nodes returned by _walk"""
+        for node in reversed(path):
+            for _, fib_entry in node.entries:
+                if not already_used_face and not incoming_faceids:
+                    if len(fib_entry.faceid) > 0:
+                        return fib_entry
+                    continue
+                forward_faceids = [face for face in fib_entry.faceid
+                                   if not (already_used_face and face in already_used_face)
+                                   and not (incoming_faceids and face in incoming_faceids)]
+                if len(forward_faceids) == 0:
+                    continue
+                if len(forward_faceids) == len(fib_entry.faceid):
+                    return fib_entry
+                return ForwardingInformationBaseEntry(fib_entry.name, forward_faceids)
+        return None
+
+    def _new_node(self) -> ForwardingInformationBaseTrieNode:
+        return ForwardingInformationBaseTrieNode()
+
+    def _insert(self, fib_entry: ForwardingInformationBaseEntry):
+        node = self._root
+        for component in fib_entry.name.components:
+            child = node.children.get(component)
+            if child is None:
+                child = self._new_node()
+                node.children[component] = child
+            node = child
+        if any(entry == fib_entry for _, entry in node.entries):
+            return
+        node.entries.insert(0, (next(self._sequence), fib_entry))
+        self._size += 1
+
+    def _prune(self, name: Name, path: List[ForwardingInformationBaseTrieNode]):
+        """remove the nodes of a path which have neither entries nor children"""
+        for i in range(len(path) - 1, 0, -1):
+            if len(path[i].entries) > 0 or len(path[i].children) > 0:
+                return
+            del path[i - 1].children[name.components[i - 1]]
+
+    def _prune_all(self, node: ForwardingInformationBaseTrieNode) -> bool:
+        """remove all empty subtrees below a node, returns True if the node itself is empty"""
+        for component in list(node.children):
+            if self._prune_all(node.children[component]):
+                del node.children[component]
+        return len(node.entries) == 0 and len(node.children) == 0
@@ -3,3 +3,4 @@
 from .BaseForwardingInformationBase import BaseForwardingInformationBase
 from .BaseForwardingInformationBase import ForwardingInformationBaseEntry
 from .ForwardingInformationBaseMemoryPrefix import ForwardingInformationBaseMemoryPrefix
+from .ForwardingInformationBaseMemoryTrie import ForwardingInformationBaseMemoryTrie
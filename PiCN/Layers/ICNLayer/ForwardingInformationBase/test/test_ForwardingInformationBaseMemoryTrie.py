@@ -0,0 +1,135 @@
+"""Test of in-memory Forwarding Information Base using a name component trie"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryTrie, \
+    ForwardingInformationBaseEntry
+from PiCN.Packets import Name
+
+
+class test_ForwardingInformationBaseMemoryTrie(unittest.TestCase):
+    """Test of in-memory Forwarding Information Base using a name component trie"""
+
+    def setUp(self):
+        self.fib = ForwardingInformationBaseMemoryTrie()
+
+    def tearDown(self):
+        pass
+
+    def test_add_and_find_entry(self):
+        """Test adding and finding fib entries"""
+        self.fib.add_fib_entry(Name("/data/test"), [2])
+        self.fib.add_fib_entry(Name("/test/data"), [1])
+        self.fib.add_fib_entry(Name("/test/data"), [1])
+        self.assertEqual(self.fib.get_container_size(), 2)
+        self.assertEqual(self.fib.get_container()[0], ForwardingInformationBaseEntry(Name("/test/data"), [1]))
+        fib_entry = self.fib.find_fib_entry(Name("/test/data"))
+        self.assertEqual(fib_entry.name, Name("/test/data"))
+        self.assertEqual(fib_entry.faceid, [1])
+        self.assertIsNone(self.fib.find_fib_entry(Name("/test")))
+        self.assertIsNone(self.fib.find_fib_entry(Name("/unknown/data")))
+
+    def test_find_entry_longest_match(self):
+        """Test finding a fib entry using a longest match"""
+        self.fib.add_fib_entry(Name("/test/data"), [1])
+        self.fib.add_fib_entry(Name("/data"), [2])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data/object")).faceid, [1])
+        self.assertEqual(self.fib.find_fib_entry(Name("/data/object/content")).faceid, [2])
+
+    def test_newest_entry_preferred(self):
+        """Test that the newest entry of a prefix is matched first"""
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.fib.add_fib_entry(Name("/test"), [2])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data")).faceid, [2])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data"), [2]).faceid, [1])
+
+    def test_get_already_used_fib_face(self):
+        """Test to get a fib entry if all faces of a longer match are already used"""
+        self.fib.add_fib_entry(Name("/test/data/content"), [1])
+        self.fib.add_fib_entry(Name("/test"), [2])
+        self.fib.add_fib_entry(Name("/test/data"), [3])
+        iname = Name("/test/data/content/object1")
+        already_used = []
+        for expected in [[1], [3], [2]]:
+            fib_entry = self.fib.find_fib_entry(iname, already_used)
+            self.assertEqual(fib_entry.faceid, expected)
+            already_used.extend(fib_entry.faceid)
+        self.assertIsNone(self.fib.find_fib_entry(iname, already_used))
+
+    def test_filter_faces(self):
+        """Test that used and incoming faces are removed from the returned entry"""
+        self.fib.add_fib_entry(Name("/test"), [1, 2, 3])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data"), [1], [3]).faceid, [2])
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data"), None, [2]).faceid, [1, 3])
+        self.assertIsNone(self.fib.find_fib_entry(Name("/test/data"), [1, 2], [3]))
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data")).faceid, [1, 2, 3])
+
+    def test_remove_entry(self):
+        """Test removing fib entries"""
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.fib.add_fib_entry(Name("/test/data/content"), [2])
+        self.fib.remove_fib_entry(Name("/test/data/content"))
+        self.fib.remove_fib_entry(Name("/test/unknown"))
+        self.assertEqual(self.fib.get_container_size(), 1)
+        self.assertEqual(self.fib.find_fib_entry(Name("/test/data/content")).faceid, [1])
+        self.assertEqual(len(self.fib._root.children[b"test"].children), 0)
+        self.fib.remove_fib_entry(Name("/test"))
+        self.assertEqual(len(self.fib._root.children), 0)
+        self.assertIsNone(self.fib.find_fib_entry(Name("/test/data/content")))
+
+    def test_clear(self):
+        """Test that clear removes all non-static entries"""
+        self.fib.add_fib_entry(Name('/test/foo'), [42], static=True)
+        self.fib.add_fib_entry(Name('/test/bar'), [1337], static=False)
+        self.assertEqual(2, len(self.fib.container))
+        self.fib.clear()
+        self.assertEqual(1, len(self.fib.container))
+        self.assertEqual(1, self.fib.get_container_size())
+        self.assertIsNotNone(self.fib.find_fib_entry(Name('/test/foo')))
+        self.assertIsNone(self.fib.find_fib_entry(Name('/test/bar')))
+        self.assertNotIn(b"bar", self.fib._root.children[b"test"].children)
+
+    def test_add_faceid_to_entry(self):
+        """Test adding a face to an existing entry"""
+        self.fib.add_fib_entry(Name('/test/bar'), [1337], static=False)
+        found = self.fib.find_fib_entry(Name("/test/bar"))
+        self.fib.add_faceid_to_entry(Name("/test/bar"), 21)
+        self.fib.add_faceid_to_entry(Name("/test/bar"), 21)
+        self.fib.add_faceid_to_entry(Name("/test/unknown"), 21)
+        self.assertEqual([1337, 21], self.fib.find_fib_entry(Name("/test/bar")).faceid)
+        self.assertEqual([1337], found.faceid)
+
+    def test_set_container(self):
+        """Test replacing all entries"""
+        self.fib.add_fib_entry(Name('/test/foo'), [1])
+        self.fib.container = [ForwardingInformationBaseEntry(Name("/test/bar"), [2]),
+                              ForwardingInformationBaseEntry(Name("/test"), [3])]
+        self.assertEqual(self.fib.get_container_size(), 2)
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/foo')).faceid, [3])
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/bar')).faceid, [2])
+        self.assertEqual([e.name for e in self.fib.container], [Name("/test/bar"), Name("/test")])
+
+    def test_many_routes(self):
+        """Test lookups in a FIB with many routes"""
+        for i in range(0, 50000):
+            self.fib.add_fib_entry(Name("/prefix" + str(i % 100) + "/route" + str(i)), [i])
+        for i in range(0, 50000, 997):
+            fib_entry = self.fib.find_fib_entry(Name("/prefix" + str(i % 100) + "/route" + str(i) + "/data"))
+            self.assertEqual(fib_entry.faceid, [i])
+        self.assertIsNone(self.fib.find_fib_entry(Name("/prefix1/unknown")))
+
+    def test_apply_fib_diff(self):
+        """Test applying the changes of a routing information base"""
+        self.fib.add_fib_entry(Name('/test/static'), [1], static=True)
+        self.fib.add_fib_entry(Name('/test/changed'), [2], static=True)
+        self.fib.add_fib_entry(Name('/test/changed'), [3])
+        self.fib.add_fib_entry(Name('/test/removed'), [4])
+        self.fib.apply_fib_diff([ForwardingInformationBaseEntry(Name('/test/added'), [5])],
+                                [ForwardingInformationBaseEntry(Name('/test/changed'), [6])],
+                                [Name('/test/removed')])
+        self.assertEqual(self.fib.get_container_size(), 4)
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/static')).faceid, [1])
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/added')).faceid, [5])
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/changed')).faceid, [6])
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/changed'), incoming_faceids=[6]).faceid, [2])
+        self.assertIsNone(self.fib.find_fib_entry(Name('/test/removed')))
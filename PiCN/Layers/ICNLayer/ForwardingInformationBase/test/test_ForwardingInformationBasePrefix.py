@@ -3,7 +3,7 @@
 import multiprocessing
 import unittest
 
-from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix, ForwardingInformationBaseEntry
 from PiCN.Packets import Name
 
 
@@ -22,7 +22,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         fid = [1]
         name = Name("/test/data")
         self.fib.add_fib_entry(name, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.container[0]
         self.assertEqual(entry.name, name)
         self.assertEqual(entry.faceid, fid)
 
@@ -31,7 +31,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         fid = [1]
         name = Name("/test/data")
         self.fib.add_fib_entry(name, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.container[0]
         self.assertEqual(entry.name, name)
         self.assertEqual(entry.faceid, fid)
         fib_entry = self.fib.find_fib_entry(name)
@@ -46,7 +46,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         name2 = Name("/data/test")
         self.fib.add_fib_entry(name2, fid2)
         self.fib.add_fib_entry(name1, fid1)
-        entry = self.fib._container[1]
+        entry = self.fib.container[1]
         self.assertEqual(entry.name, name2)
         self.assertEqual(entry.faceid, fid2)
         fib_entry = self.fib.find_fib_entry(name1)
@@ -76,7 +76,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         name1 = Name("/test/data")
         name2 = Name("/data/test")
         self.fib.add_fib_entry(name1, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.container[0]
         self.assertEqual(entry.name, name1)
         self.assertEqual(entry.faceid, fid)
         fib_entry = self.fib.find_fib_entry(name2)
@@ -87,7 +87,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         fid = [1]
         name = Name("/test/data")
         self.fib.add_fib_entry(name, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.container[0]
         self.assertEqual(entry.name, name)
         self.assertEqual(entry.faceid, fid)
         self.fib.remove_fib_entry(name)
@@ -145,3 +145,32 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         entry = self.fib.find_fib_entry(Name("/test/bar"))
         self.assertEqual([1337, 21], entry.faceid)
 
+    def test_apply_fib_diff(self):
+        """Test applying the changes of a routing information base"""
+        self.fib.add_fib_entry(Name('/test/static'), [1], static=True)
+        self.fib.add_fib_entry(Name('/test/changed'), [2], static=True)
+        self.fib.add_fib_entry(Name('/test/changed'), [3])
+        self.fib.add_fib_entry(Name('/test/removed'), [4])
+        self.fib.apply_fib_diff([ForwardingInformationBaseEntry(Name('/test/added'), [5])],
+                                [ForwardingInformationBaseEntry(Name('/test/changed'), [6])],
+                                [Name('/test/removed')])
+        self.assertEqual(self.fib.get_container_size(), 4)
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/static')).faceid, [1])
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/added')).faceid, [5])
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/changed')).faceid, [6])
+        self.assertEqual(self.fib.find_fib_entry(Name('/test/changed'), incoming_faceids=[6]).faceid, [2])
+        self.assertIsNone(self.fib.find_fib_entry(Name('/test/removed')))
+
+    def test_apply_fib_diff_per_entry(self):
+        """Test that applying a diff keeps the order of the unaffected entries and ignores duplicate entries"""
+        for i in range(0, 5):
+            self.fib.add_fib_entry(Name('/test/' + str(i)), [i])
+        self.fib.add_fib_entry(Name('/test/2'), [7])
+        unaffected = [e for e in self.fib.container if e.name not in [Name('/test/1'), Name('/test/2')]]
+        self.fib.apply_fib_diff([ForwardingInformationBaseEntry(Name('/test/0'), [0])],
+                                [ForwardingInformationBaseEntry(Name('/test/2'), [8])], [Name('/test/1')])
+        self.assertEqual(self.fib.get_container_size(), 4)
+        self.assertEqual(self.fib.container[0], ForwardingInformationBaseEntry(Name('/test/2'), [8]))
+        self.assertEqual(self.fib.container[1:], unaffected)
+        self.fib.remove_fib_entry(Name('/test/2'))
+        self.assertIsNone(self.fib.find_fib_entry(Name('/test/2')))
@@ -0,0 +1,209 @@
+"""Forwarding strategies, choosing the faces of a FIB entry an interest is sent to"""
+
+import abc
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
+from PiCN.Packets import Name
+
+
+class BaseForwardingStrategy(object):
+    """Abstract forwarding strategy. The ICN layer asks the strategy in which order the faces of a matching FIB entry
+    are tried and whether a forwarded interest should be sent to another face as well, to probe it. The ICN layer
+    reports forwarded interests, received data and received nacks, so that a strategy can measure the faces. The
+    strategy is used by the ICN layer process only and is not shared.
+    """
+
+    @abc.abstractmethod
+    def rank_faces(self, name: Name, fib_entry: ForwardingInformationBaseEntry) -> List[int]:
+        """
+        Order in which the faces of a FIB entry are tried, faces which nacked the interest are skipped by the PIT
+        :param name: name of the interest
+        :param fib_entry: matching FIB entry
+        :return: faces of the FIB entry, best first, or None to try the face with the fewest pending interests first
+        """
+
+    def select_probe(self, name: Name, fib_entry: ForwardingInformationBaseEntry, faceid: int) -> int:
+        """
+        Decide whether a forwarded interest is sent to another face as well, to measure it
+        :param name: name of the interest
+        :param fib_entry: matching FIB entry
+        :param faceid: face the interest was forwarded to
+        :return: face to probe, None to not probe
+        """
+        return None
+
+    def record_forward(self, name: Name, fib_entry: ForwardingInformationBaseEntry, faceid: int):
+        """
+        Record that an interest was sent to a face
+        :param name: name of the interest
+        :param fib_entry: FIB entry the face was taken from
+        :param faceid: face the interest was sent to
+        :return: None
+        """
+
+    def record_data(self, name: Name, faceid: int):
+        """
+        Record that a content object was received from a face, also if it did not satisfy a pending interest anymore
+        :param name: name of the content object
+        :param faceid: face the content object was received from
+        :return: None
+        """
+
+    def record_nack(self, name: Name, faceid: int):
+        """
+        Record that a nack was received from a face
+        :param name: name of the nack
+        :param faceid: face the nack was received from
+        :return: None
+        """
+
+
+class OccupancyForwardingStrategy(BaseForwardingStrategy):
+    """Try the face with the fewest pending interests for the prefix first, ties are broken randomly (default)"""
+
+    def rank_faces(self, name: Name, fib_entry: ForwardingInformationBaseEntry) -> List[int]:
+        return None
+
+
+class FaceMeasurement(object):
+    """Smoothed measurements of a face for a prefix
+    :param srtt: smoothed round trip time in seconds, None if not measured yet
+    :param satisfaction: smoothed ratio of the interests that returned data
+    """
+
+    def __init__(self):
+        self.srtt: float = None
+        self.satisfaction: float = None
+        self.last_update: float = 0.0
+
+    def update(self, rtt: float, satisfied: bool, alpha: float, beta: float, now: float):
+        """
+        Add a sample
+        :param rtt: round trip time of the sample, the timeout for unsatisfied interests
+        :param satisfied: True if the interest returned data
+        :param alpha: weight of the sample in the smoothed round trip time
+        :param beta: weight of the sample in the satisfaction ratio
+        :param now: time of the sample
+        :return: None
+        """
+        ratio = 1.0 if satisfied else 0.0
+        if self.srtt is None:
+            self.srtt = rtt
+            self.satisfaction = ratio
+        else:
+            self.srtt = (1 - alpha) * self.srtt + alpha * rtt
+            self.satisfaction = (1 - beta) * self.satisfaction + beta * ratio
+        self.last_update = now
+
+
+class AdaptiveForwardingStrategy(BaseForwardingStrategy):
+    """Measurement based forwarding (similar to the adaptive smoothed RTT-based forwarding of NFD). For every
+    (prefix, face) the smoothed RTT and the satisfaction ratio of the forwarded interests are measured as data returns,
+    interests without data or with a nack count as unsatisfied. Interests are forwarded to the face with the lowest
+    cost, srtt / satisfaction, faces which were not measured yet are tried last. At most every probe interval, a
+    forwarded interest of a prefix is sent to an alternative face as well, faces which were not measured yet first,
+    otherwise the face with the oldest measurement, so that a path which became faster is found.
+    :param probe_interval: minimum time in seconds between two probes of a prefix
+    :param timeout: time in seconds after which a forwarded interest without data counts as unsatisfied
+    :param rtt_weight: weight of a new sample in the smoothed RTT
+    :param satisfaction_weight: weight of a new sample in the satisfaction ratio
+    """
+
+    def __init__(self, probe_interval: float = 5.0, timeout: float = 4.0, rtt_weight: float = 0.125,
+                 satisfaction_weight: float = 0.1):
+        self._probe_interval = probe_interval
+        self._timeout = timeout
+        self._rtt_weight = rtt_weight
+        self._satisfaction_weight = satisfaction_weight
+        self._clock = time.time
+        self._measurements: Dict[Tuple[Tuple, int], FaceMeasurement] = {}
+        # forwarded interests without data in the order they were sent: (name, face) -> (time, prefix)
+        self._pending: OrderedDict = OrderedDict()
+        self._last_probe: Dict[Tuple, float] = {}
+
+    def rank_faces(self, name: Name, fib_entry: ForwardingInformationBaseEntry) -> List[int]:
+        self._expire()
+        prefix = tuple(fib_entry.name.components)
+        measured = []
+        unmeasured = []
+        for fid in fib_entry.faceid:
+            measurement = self._measurements.get((prefix, fid))
+            if measurement is None:
+                unmeasured.append(fid)
+            else:
+                measured.append((self._cost(measurement), fid))
+        return [fid for _, fid in sorted(measured)] + unmeasured
+
+    def select_probe(self, name: Name, fib_entry: ForwardingInformationBaseEntry, faceid: int) -> int:
+        alternatives = [fid for fid in fib_entry.faceid if fid != faceid]
+        if len(alternatives) == 0:
+            return None
+        prefix = tuple(fib_entry.name.components)
+        now = self._clock()
+        last_probe = self._last_probe.get(prefix)
+        if last_probe is not None and now - last_probe < self._probe_interval:
+            return None
+        self._last_probe[prefix] = now
+
+        def age(fid):
+            measurement = self._measurements.get((prefix, fid))
+            return measurement.last_update if measurement is not None else -1.0
+        return min(alternatives, key=age)
+
+    def record_forward(self, name: Name, fib_entry: ForwardingInformationBaseEntry, faceid: int):
+        self._expire()
+        key = (name, faceid)
+        self._pending.pop(key, None)
+        self._pending[key] = (self._clock(), tuple(fib_entry.name.components))
+
+    def record_data(self, name: Name, faceid: int):
+        self._expire()
+        pending = self._pending.pop((name, faceid), None)
+        if pending is None:
+            return
+        now = self._clock()
+        sent, prefix = pending
+        self._measure(prefix, faceid, now - sent, True, now)
+
+    def record_nack(self, name: Name, faceid: int):
+        self._expire()
+        pending = self._pending.pop((name, faceid), None)
+        if pending is None:
+            return
+        now = self._clock()
+        sent, prefix = pending
+        measurement = self._measurements.get((prefix, faceid))
+        rtt = measurement.srtt if measurement is not None else self._timeout
+        self._measure(prefix, faceid, rtt, False, now)
+
+    def get_measurements(self, prefix: Name) -> Dict[int, Tuple[float, float]]:
+        """
+        Measurements of the faces of a prefix
+        :param prefix: name of the FIB entry
+        :return: dict face -> (smoothed RTT, satisfaction ratio)
+        """
+        self._expire()
+        components = tuple(prefix.components)
+        return {fid: (m.srtt, m.satisfaction) for (p, fid), m in self._measurements.items() if p == components}
+
+    def _cost(self, measurement: FaceMeasurement) -> float:
+        return measurement.srtt / max(measurement.satisfaction, 0.01)
+
+    def _measure(self, prefix: Tuple, faceid: int, rtt: float, satisfied: bool, now: float):
+        measurement = self._measurements.get((prefix, faceid))
+        if measurement is None:
+            measurement = self._measurements[(prefix, faceid)] = FaceMeasurement()
+        measurement.update(rtt, satisfied, self._rtt_weight, self._satisfaction_weight, now)
+
+    def _expire(self):
+        """count forwarded interests without data within the timeout as unsatisfied"""
+        now = self._clock()
+        while len(self._pending) > 0:
+            (name, faceid), (sent, prefix) = next(iter(self._pending.items()))
+            if now - sent < self._timeout:
+                break
+            del self._pending[(name, faceid)]
+            self._measure(prefix, faceid, self._timeout, False, now)
@@ -0,0 +1,4 @@
+"""Forwarding strategies, choosing the faces of a FIB entry an interest is sent to"""
+
+from .ForwardingStrategy import BaseForwardingStrategy, OccupancyForwardingStrategy, AdaptiveForwardingStrategy, \
+    FaceMeasurement
@@ -0,0 +1,106 @@
+"""Tests for the forwarding strategies"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
+from PiCN.Layers.ICNLayer.ForwardingStrategy import OccupancyForwardingStrategy, AdaptiveForwardingStrategy
+from PiCN.Packets import Name
+
+
+class test_ForwardingStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.strategy = AdaptiveForwardingStrategy(probe_interval=10, timeout=4)
+        self.strategy._clock = lambda: self.now
+        self.fib_entry = ForwardingInformationBaseEntry(Name("/test"), [1, 2, 3])
+
+    def forward(self, name: Name, faceid: int, rtt: float = None):
+        """forward an interest to a face and receive the data after rtt, None for no data"""
+        self.strategy.record_forward(name, self.fib_entry, faceid)
+        if rtt is not None:
+            self.now += rtt
+            self.strategy.record_data(name, faceid)
+
+    def test_occupancy(self):
+        """Test that the default strategy leaves the order to the PIT"""
+        strategy = OccupancyForwardingStrategy()
+        self.assertIsNone(strategy.rank_faces(Name("/test/data"), self.fib_entry))
+        self.assertIsNone(strategy.select_probe(Name("/test/data"), self.fib_entry, 1))
+
+    def test_rank_by_rtt(self):
+        """Test that measured faces are ranked by smoothed RTT and unmeasured faces are tried last"""
+        self.assertEqual(self.strategy.rank_faces(Name("/test/a"), self.fib_entry), [1, 2, 3])
+        self.forward(Name("/test/a"), 1, 0.5)
+        self.forward(Name("/test/b"), 3, 0.1)
+        self.assertEqual(self.strategy.rank_faces(Name("/test/c"), self.fib_entry), [3, 1, 2])
+        measurements = self.strategy.get_measurements(Name("/test"))
+        self.assertAlmostEqual(measurements[1][0], 0.5)
+        self.assertEqual(measurements[3][1], 1.0)
+        # the RTT is smoothed
+        for i in range(0, 20):
+            self.forward(Name("/test/d" + str(i)), 3, 1.0)
+        self.assertGreater(self.strategy.get_measurements(Name("/test"))[3][0], 0.9)
+        self.assertEqual(self.strategy.rank_faces(Name("/test/e"), self.fib_entry), [1, 3, 2])
+
+    def test_unsatisfied_interests(self):
+        """Test that timeouts and nacks lower the satisfaction ratio of a face"""
+        self.forward(Name("/test/a"), 1, 0.1)
+        self.forward(Name("/test/b"), 2, 0.2)
+        self.assertEqual(self.strategy.rank_faces(Name("/test/c"), self.fib_entry)[:2], [1, 2])
+        for i in range(0, 5):
+            self.forward(Name("/test/x" + str(i)), 1)
+            self.strategy.record_nack(Name("/test/x" + str(i)), 1)
+        self.forward(Name("/test/y"), 1)
+        self.now += 5
+        self.assertEqual(self.strategy.rank_faces(Name("/test/c"), self.fib_entry)[:2], [2, 1])
+        self.assertLess(self.strategy.get_measurements(Name("/test"))[1][1], 0.6)
+        # late data of an expired interest is not measured
+        self.strategy.record_data(Name("/test/y"), 1)
+        self.assertLess(self.strategy.get_measurements(Name("/test"))[1][1], 0.6)
+
+    def test_probing(self):
+        """Test that unmeasured faces are probed first, then the oldest measurement, at most every probe interval"""
+        name = Name("/test/a")
+        self.assertEqual(self.strategy.select_probe(name, self.fib_entry, 1), 2)
+        self.assertIsNone(self.strategy.select_probe(name, self.fib_entry, 1))
+        self.forward(Name("/test/b"), 2, 0.1)
+        self.forward(Name("/test/c"), 1, 0.1)
+        self.now += 10
+        self.assertEqual(self.strategy.select_probe(name, self.fib_entry, 1), 3)
+        self.forward(Name("/test/d"), 3, 0.1)
+        self.now += 10
+        self.assertEqual(self.strategy.select_probe(name, self.fib_entry, 1), 2)
+        single = ForwardingInformationBaseEntry(Name("/other"), [1])
+        self.assertIsNone(self.strategy.select_probe(Name("/other/a"), single, 1))
+
+    def test_converge_to_faster_path(self):
+        """Test that probing finds a face which became faster"""
+        latency = {1: 0.1, 2: 0.5, 3: 0.5}
+        for i in range(0, 600):
+            name = Name("/test/" + str(i))
+            faces = self.strategy.rank_faces(name, self.fib_entry)
+            probe = self.strategy.select_probe(name, self.fib_entry, faces[0])
+            sent = [fid for fid in [faces[0], probe] if fid is not None]
+            for fid in sent:
+                self.strategy.record_forward(name, self.fib_entry, fid)
+            start = self.now
+            for fid in sorted(sent, key=latency.get):
+                self.now = start + latency[fid]
+                self.strategy.record_data(name, fid)
+            self.now = start + 1
+            if i == 20:
+                self.assertEqual(faces[0], 1)
+                latency[3] = 0.05
+        self.assertEqual(self.strategy.rank_faces(Name("/test/x"), self.fib_entry)[0], 3)
+
+    def test_expire_on_data(self):
+        """Test that timed out interests are counted when data arrives, without a lookup of their prefix"""
+        other = ForwardingInformationBaseEntry(Name("/other"), [4])
+        self.forward(Name("/test/a"), 1)
+        self.now += 5
+        self.strategy.record_forward(Name("/other/a"), other, 4)
+        self.strategy.record_data(Name("/other/a"), 4)
+        measurement = self.strategy._measurements[(tuple(Name("/test").components), 1)]
+        self.assertEqual(measurement.satisfaction, 0.0)
+        self.assertEqual(measurement.srtt, 4)
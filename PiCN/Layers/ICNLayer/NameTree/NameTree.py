@@ -0,0 +1,232 @@
+"""Name tree shared by the content store, the pending interest table and the forwarding information base"""
+
+from collections.abc import MutableMapping
+from typing import List
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreEntry
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableEntry
+from PiCN.Layers.ICNLayer.NameTree.NameTreeNode import NameTreeNode
+from PiCN.Layers.ICNLayer.NameTree.NameTreeContentStore import NameTreeContentStore
+from PiCN.Layers.ICNLayer.NameTree.NameTreeForwardingInformationBase import NameTreeForwardingInformationBase
+from PiCN.Layers.ICNLayer.NameTree.NameTreePendingInterestTable import NameTreePendingInterestTable
+from PiCN.Packets import Name
+
+
+class NameTreeTable(MutableMapping):
+    """Dict-like view name -> entry on one slot of the name tree nodes, used as container of the CS and the PIT
+    :param name_tree: name tree storing the entries
+    :param slot: attribute of the nodes holding the entries
+    """
+
+    def __init__(self, name_tree, slot: str):
+        self._name_tree = name_tree
+        self._slot = slot
+        self._size = 0
+
+    def __getitem__(self, name: Name):
+        node = self._name_tree.find_node(name)
+        entry = getattr(node, self._slot) if node is not None else None
+        if entry is None:
+            raise KeyError(name)
+        return entry
+
+    def __setitem__(self, name: Name, entry):
+        node = self._name_tree.get_node(name)
+        if getattr(node, self._slot) is None:
+            self._size += 1
+        setattr(node, self._slot, entry)
+
+    def __delitem__(self, name: Name):
+        node = self._name_tree.find_node(name)
+        if node is None or getattr(node, self._slot) is None:
+            raise KeyError(name)
+        setattr(node, self._slot, None)
+        self._size -= 1
+        self._name_tree.prune(name)
+
+    def __iter__(self):
+        # iterate over a snapshot, so that entries can be removed while iterating
+        return iter([entry.name for entry in self._name_tree.entries(self._slot)])
+
+    def __len__(self):
+        return self._size
+
+    def values(self) -> List:
+        return self._name_tree.entries(self._slot)
+
+
+class NameTree(object):
+    """NFD style name tree: every node of the tree can hold a CS entry, a PIT entry and the FIB entries of its name.
+    The content store, the pending interest table and the forwarding information base are views on the same tree, so
+    that the ICN layer can resolve a received interest with a single walk down the tree (lookup_interest), which is a
+    single call if the tree is shared through the PiCNSyncDataStructFactory.
+    The views are available by get_cs, get_pit and get_fib and can be used like any other CS, PIT and FIB.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param pit_timeout: timeout for a pit entry when calling the ageing function
+    :param pit_retransmits: number of retransmits before a pit entry is removed
+    :param pit_retransmit_interval: time between two retransmissions of a pit entry, defaults to the pit timeout
+    """
+
+    def __init__(self, cs_timeout: int = 10, pit_timeout: int = 4, pit_retransmits: int = 3,
+                 pit_retransmit_interval: float = None):
+        self.root = NameTreeNode()
+        self._last_name: Name = None
+        self._last_node: NameTreeNode = None
+        self.cs_table = NameTreeTable(self, "cs_entry")
+        self.pit_table = NameTreeTable(self, "pit_entry")
+        self._cs = NameTreeContentStore(self, cs_timeout=cs_timeout)
+        self._pit = NameTreePendingInterestTable(self, pit_timeout=pit_timeout, pit_retransmits=pit_retransmits,
+                                                 pit_retransmit_interval=pit_retransmit_interval)
+        self._fib = NameTreeForwardingInformationBase(self)
+
+    def get_cs(self) -> NameTreeContentStore:
+        """content store view of the name tree"""
+        return self._cs
+
+    def get_pit(self) -> NameTreePendingInterestTable:
+        """pending interest table view of the name tree"""
+        return self._pit
+
+    def get_fib(self) -> NameTreeForwardingInformationBase:
+        """forwarding information base view of the name tree"""
+        return self._fib
+
+    def get_node_count(self) -> int:
+        """number of nodes in the tree, including the root"""
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
+
+    def lookup_interest(self, name: Name, faceid: int, from_higher: bool = False) \
+            -> (ContentStoreEntry, PendingInterestTableEntry, ForwardingInformationBaseEntry):
+        """
+        Compound operation: content store lookup, aggregation in the PIT and longest prefix match in the FIB for a
+        received interest, resolved in a single walk down the tree. The lookup stops at a CS hit, an interest from a
+        lower layer which is aggregated in the PIT is not looked up in the FIB. For interests from a lower layer, the
+        timestamps of the CS or PIT entry are updated and the incoming face is not used for forwarding.
+        :param name: name of the interest
+        :param faceid: face the interest was received from
+        :param from_higher: True if the interest was received from a higher layer
+        :return: tuple of the CS entry, the PIT entry as it was before the face was added and the FIB entry, each None
+                 if there is no match or it was not looked up
+        """
+        path = self.walk(name)
+        node = None
+        if len(path) == len(name.components):
+            node = path[-1] if len(path) > 0 else self.root
+            self._last_name, self._last_node = name, node
+        if node is not None and node.cs_entry is not None:
+            if not from_higher:
+                self._cs.update_timestamp(node.cs_entry)
+            return node.cs_entry, None, None
+        pit_entry = None
+        if node is not None and node.pit_entry is not None:
+            pit_entry = self._pit.aggregate_interest(name, faceid, update_timestamp=not from_higher)
+            if not from_higher:
+                return None, pit_entry, None
+        if pit_entry is not None:
+            incoming_faceids = pit_entry.faceids
+        else:
+            incoming_faceids = None if from_higher else [faceid]
+        return None, pit_entry, self._fib._match_path(path, None, incoming_faceids)
+
+    def walk(self, name: Name) -> List[NameTreeNode]:
+        """
+        Nodes along a name
+        :param name: name to walk down
+        :return: nodes below the root, ends at the first component which is not in the tree
+        """
+        path = []
+        node = self.root
+        for component in name.components:
+            node = node.children.get(component)
+            if node is None:
+                break
+            path.append(node)
+        return path
+
+    def find_node(self, name: Name) -> NameTreeNode:
+        """
+        Node of a name, the node found by the last lookup_interest is reused for the same name object
+        :param name: name of the node
+        :return: the node, None if there is no node for the name
+        """
+        if name is self._last_name:
+            return self._last_node
+        node = self.root
+        for component in name.components:
+            node = node.children.get(component)
+            if node is None:
+                return None
+        return node
+
+    def get_node(self, name: Name) -> NameTreeNode:
+        """
+        Node of a name, missing nodes are created
+        :param name: name of the node
+        :return: the node
+        """
+        if name is self._last_name:
+            return self._last_node
+        node = self.root
+        for component in name.components:
+            child = node.children.get(component)
+            if child is None:
+                child = NameTreeNode()
+                node.children[component] = child
+            node = child
+        return node
+
+    def entries(self, slot: str) -> List:
+        """
+        All entries of one slot
+        :param slot: attribute of the nodes holding the entries
+        :return: list of entries
+        """
+        entries = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            entry = getattr(node, slot)
+            if entry is not None:
+                entries.append(entry)
+            stack.extend(node.children.values())
+        return entries
+
+    def prune(self, name: Name):
+        """
+        Remove the nodes along a name which hold no entries and have no children
+        :param name: name to prune
+        :return: None
+        """
+        path = [self.root]
+        for component in name.components:
+            node = path[-1].children.get(component)
+            if node is None:
+                break
+            path.append(node)
+        for i in range(len(path) - 1, 0, -1):
+            if not self._is_empty(path[i]):
+                return
+            del path[i - 1].children[name.components[i - 1]]
+            if path[i] is self._last_node:
+                self._last_name, self._last_node = None, None
+
+    def prune_all(self):
+        """Remove all nodes which hold no entries and have no children"""
+        self._last_name, self._last_node = None, None
+        self._prune_subtree(self.root)
+
+    def _prune_subtree(self, node: NameTreeNode) -> bool:
+        for component in list(node.children):
+            if self._prune_subtree(node.children[component]):
+                del node.children[component]
+        return self._is_empty(node)
+
+    def _is_empty(self, node: NameTreeNode) -> bool:
+        return len(node.entries) == 0 and len(node.children) == 0 and node.cs_entry is None and node.pit_entry is None
@@ -0,0 +1,48 @@
+"""Content store with exact matching on a name tree"""
+
+import time
+
+from typing import List
+
+from PiCN.Packets import Content, Name
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+
+
+class NameTreeContentStore(BaseContentStore):
+    """Content store with exact matching, the entries are stored in the nodes of the name tree. Created by the NameTree.
+    :param name_tree: name tree storing the entries
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    """
+
+    def __init__(self, name_tree, cs_timeout: int = 10):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+        self._container = name_tree.cs_table
+
+    def get_container(self) -> List[ContentStoreEntry]:
+        return list(self._container.values())
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        return self._container.get(name)
+
+    def add_content_object(self, content: Content, static: bool = False):
+        cs_entry = self._container.get(content.name)
+        if cs_entry is not None and cs_entry.content == content:
+            return
+        self._container[content.name] = ContentStoreEntry(content, static=static)
+
+    def remove_content_object(self, name: Name):
+        self._container.pop(name, None)
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        entry = self._container.get(cs_entry.name)
+        if entry is None:
+            return
+        entry.timestamp = time.time()
+        cs_entry.timestamp = entry.timestamp
+
+    def ageing(self):
+        cur_time = time.time()
+        remove = [cs_entry.name for cs_entry in self._container.values()
+                  if not cs_entry.static and cs_entry.timestamp + self._cs_timeout < cur_time]
+        for name in remove:
+            self.remove_content_object(name)
@@ -0,0 +1,30 @@
+"""Forwarding Information Base on a name tree"""
+
+from typing import List
+
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryTrie
+from PiCN.Layers.ICNLayer.NameTree.NameTreeNode import NameTreeNode
+from PiCN.Packets import Name
+
+
+class NameTreeForwardingInformationBase(ForwardingInformationBaseMemoryTrie):
+    """Forwarding Information Base using longest prefix matching on the name tree, behaves like
+    ForwardingInformationBaseMemoryTrie. Nodes are only pruned if they hold no CS and PIT entry either. Created by the
+    NameTree.
+    :param name_tree: name tree storing the entries
+    """
+
+    def __init__(self, name_tree):
+        super().__init__()
+        self._name_tree = name_tree
+        self._root = name_tree.root
+
+    def _new_node(self) -> NameTreeNode:
+        return NameTreeNode()
+
+    def _prune(self, name: Name, path: List[NameTreeNode]):
+        self._name_tree.prune(name)
+
+    def _prune_all(self, node: NameTreeNode) -> bool:
+        self._name_tree.prune_all()
+        return False
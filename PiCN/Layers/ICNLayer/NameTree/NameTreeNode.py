@@ -0,0 +1,16 @@
+"""Node of the name tree"""
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreEntry
+from PiCN.Layers.ICNLayer.ForwardingInformationBase.ForwardingInformationBaseMemoryTrie import \
+    ForwardingInformationBaseTrieNode
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableEntry
+
+
+class NameTreeNode(ForwardingInformationBaseTrieNode):
+    """Node of the name tree, holding the FIB entries (newest first), the CS entry and the PIT entry of one name"""
+    __slots__ = ["cs_entry", "pit_entry"]
+
+    def __init__(self):
+        super().__init__()
+        self.cs_entry: ContentStoreEntry = None
+        self.pit_entry: PendingInterestTableEntry = None
@@ -0,0 +1,16 @@
+"""Pending Interest Table on a name tree"""
+
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryHashed
+
+
+class NameTreePendingInterestTable(PendingInterestTableMemoryHashed):
+    """Pending Interest Table using exact matching, the entries are stored in the nodes of the name tree instead of a
+    dict. Occupancy counters and ageing behave like PendingInterestTableMemoryHashed. Created by the NameTree.
+    :param name_tree: name tree storing the entries
+    """
+
+    def __init__(self, name_tree, pit_timeout: int=4, pit_retransmits: int=3,
+                 pit_retransmit_interval: float=None) -> None:
+        super().__init__(pit_timeout=pit_timeout, pit_retransmits=pit_retransmits,
+                         pit_retransmit_interval=pit_retransmit_interval)
+        self.container = name_tree.pit_table
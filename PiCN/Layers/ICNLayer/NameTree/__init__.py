@@ -0,0 +1,7 @@
+"""Name tree shared by CS, PIT and FIB"""
+
+from .NameTreeNode import NameTreeNode
+from .NameTreeContentStore import NameTreeContentStore
+from .NameTreePendingInterestTable import NameTreePendingInterestTable
+from .NameTreeForwardingInformationBase import NameTreeForwardingInformationBase
+from .NameTree import NameTree, NameTreeTable
@@ -0,0 +1,100 @@
+"""Tests for the NameTree"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.NameTree import NameTree
+from PiCN.Packets import Content, Interest, Name
+
+
+class test_NameTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = NameTree()
+        self.cs = self.tree.get_cs()
+        self.pit = self.tree.get_pit()
+        self.fib = self.tree.get_fib()
+
+    def test_views_share_nodes(self):
+        """test that CS, PIT and FIB entries of the same name are stored in the same node"""
+        name = Name("/test/data")
+        self.fib.add_fib_entry(name, [1])
+        self.pit.add_pit_entry(name, 2, 1, Interest(name))
+        self.cs.add_content_object(Content(name, "HelloWorld"))
+        self.assertEqual(self.tree.get_node_count(), 3)
+        node = self.tree.find_node(name)
+        self.assertEqual(node.cs_entry.content.content, "HelloWorld")
+        self.assertEqual(node.pit_entry.faceids, [2])
+        self.assertEqual(node.entries[0][1].faceid, [1])
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertEqual(self.pit.get_container_size(), 1)
+        self.assertEqual(self.fib.get_container_size(), 1)
+
+    def test_nodes_are_pruned_when_all_tables_removed_the_name(self):
+        """test that a node is only removed if it holds no entry of any table"""
+        name = Name("/test/data")
+        self.fib.add_fib_entry(name, [1])
+        self.cs.add_content_object(Content(name, "HelloWorld"))
+        self.fib.remove_fib_entry(name)
+        self.assertEqual(self.tree.get_node_count(), 3)
+        self.assertIsNotNone(self.cs.find_content_object(name))
+        self.cs.remove_content_object(name)
+        self.assertEqual(self.tree.get_node_count(), 1)
+        self.pit.add_pit_entry(name, 2, 1)
+        self.fib.clear()
+        self.assertEqual(self.tree.get_node_count(), 3)
+        self.pit.remove_pit_entry(name)
+        self.assertEqual(self.tree.get_node_count(), 1)
+
+    def test_lookup_interest_cs_hit(self):
+        """test that a CS hit ends the lookup and refreshes the entry for interests from lower"""
+        name = Name("/test/data")
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.cs.add_content_object(Content(name, "HelloWorld"))
+        self.cs.find_content_object(name).timestamp = 0
+        cs_entry, pit_entry, fib_entry = self.tree.lookup_interest(name, 2)
+        self.assertEqual(cs_entry.content.content, "HelloWorld")
+        self.assertIsNone(pit_entry)
+        self.assertIsNone(fib_entry)
+        self.assertNotEqual(self.cs.find_content_object(name).timestamp, 0)
+
+    def test_lookup_interest_pit_aggregation(self):
+        """test that an interest from lower is aggregated and not looked up in the FIB"""
+        name = Name("/test/data")
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.pit.add_pit_entry(name, 2, 1, Interest(name))
+        cs_entry, pit_entry, fib_entry = self.tree.lookup_interest(name, 3)
+        self.assertIsNone(cs_entry)
+        self.assertEqual(pit_entry.faceids, [2])
+        self.assertIsNone(fib_entry)
+        self.assertEqual(self.pit.find_pit_entry(name).faceids, [2, 3])
+
+    def test_lookup_interest_from_higher_filters_pit_faces(self):
+        """test that an aggregated interest from higher is looked up in the FIB without the interested faces"""
+        name = Name("/test/data")
+        self.fib.add_fib_entry(Name("/test"), [1, 2])
+        self.pit.add_pit_entry(name, 2, 1, Interest(name))
+        cs_entry, pit_entry, fib_entry = self.tree.lookup_interest(name, 3, from_higher=True)
+        self.assertEqual(pit_entry.faceids, [2])
+        self.assertEqual(fib_entry.faceid, [1])
+
+    def test_lookup_interest_fib_longest_prefix(self):
+        """test the longest prefix match and that the incoming face is not used"""
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.fib.add_fib_entry(Name("/test/data"), [2])
+        self.assertEqual(self.tree.lookup_interest(Name("/test/data/object"), 3)[2].faceid, [2])
+        self.assertEqual(self.tree.lookup_interest(Name("/test/data/object"), 2)[2].faceid, [1])
+        self.assertEqual(self.tree.lookup_interest(Name("/test/other"), 3)[2].faceid, [1])
+        self.assertEqual(self.tree.lookup_interest(Name("/other"), 3), (None, None, None))
+        self.assertEqual(self.tree.get_node_count(), 3)
+
+    def test_pit_ageing(self):
+        """test that expired PIT entries are removed from the tree"""
+        self.pit.set_pit_timeout(0)
+        self.pit.set_pit_retransmits(0)
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 2, 1, Interest(name))
+        self.pit.ageing()
+        retransmit, removed = self.pit.ageing()
+        self.assertEqual(removed[0].name, name)
+        self.assertEqual(self.pit.get_container_size(), 0)
+        self.assertEqual(self.tree.get_node_count(), 1)
@@ -1,6 +1,7 @@
 """Abstract BasePendingInterestTable for usage in BasicICNLayer"""
 
 import abc
+import copy
 import multiprocessing
 import time
 from typing import List, Dict
@@ -75,7 +76,7 @@ class PendingInterestTableEntry(object):
 
     @timestamp.setter
     def timestamp(self, timestamp):
-        self._timestamp
+        self._timestamp = timestamp
 
     @property
     def retransmits(self):
@@ -207,6 +208,103 @@ class BasePendingInterestTable(BaseICNDataStruct):
             return (fid in pit_entry.faces_already_nacked)
         return False
 
+    def pop_pit_entry(self, name: Name) -> PendingInterestTableEntry:
+        """Compound operation: remove an entry and return it
+        :param name: name of the entry to be removed
+        :return: the removed entry or None if there was no entry
+        """
+        pit_entry = self.find_pit_entry(name)
+        if pit_entry is not None:
+            self.remove_pit_entry(name)
+        return pit_entry
+
+    def aggregate_interest(self, name: Name, faceid: int, update_timestamp: bool = False) \
+            -> PendingInterestTableEntry:
+        """Compound operation: add an interested face to an existing entry
+        :param name: name of the entry
+        :param faceid: face to be added to the interested faces
+        :param update_timestamp: if true, the timestamp of the entry is updated as well
+        :return: the entry as it was before the face was added, None if there is no entry (nothing is added then)
+        """
+        pit_entry = self.find_pit_entry(name)
+        if pit_entry is None:
+            return None
+        # shallow copy, only the faces changed by the aggregation are copied, the interest is shared
+        snapshot = copy.copy(pit_entry)
+        snapshot._faceids = list(pit_entry._faceids)
+        snapshot._local_app = list(pit_entry._local_app)
+        if update_timestamp:
+            self.update_timestamp(pit_entry)
+        self.add_interested_face(name, faceid)
+        return snapshot
+
+    def forward_interest(self, name: Name, faceid: int, fib_entry: ForwardingInformationBaseEntry,
+                         interest: Interest = None, local_app: bool = False,
+                         reset_number_of_forwards: bool = False, faces: List[int] = None) -> int:
+        """Compound operation: choose the least occupied face of a FIB entry, that did not nack the interest yet, and
+        register the forward in the PIT (interested face, outgoing face, used fib face, number of forwards)
+        :param name: name of the interest
+        :param faceid: face the interest was received from
+        :param fib_entry: matching fib entry, providing the faces to choose from
+        :param interest: interest to be stored in a new entry
+        :param local_app: true if the interest was received from the higher layer
+        :param reset_number_of_forwards: if true, the number of forwards is set to 0 before the forward is registered
+        :param faces: faces to choose from in the given order (e.g. ranked by a forwarding strategy) instead of the
+        faces of the fib entry ordered by occupancy
+        :return: the face id the interest has to be sent to or None if there is no face left
+        """
+        if reset_number_of_forwards:
+            self.set_number_of_forwards(name, 0)
+        if faces is None:
+            pit_occupancy = self.occupancy_available_faces_per_name(fib_entry)
+            faces = sorted(pit_occupancy, key=pit_occupancy.get)
+        for fid in faces:
+            if self.test_faceid_was_nacked(name, fid):
+                continue
+            self.add_pit_entry(name, faceid, fid, interest, local_app=local_app)
+            self.increase_number_of_forwards(name)
+            self.add_used_fib_face(name, [fid])
+            return fid
+        return None
+
+    def record_nack(self, name: Name, faceid: int) -> (PendingInterestTableEntry, bool):
+        """Compound operation: mark a face as nacked for an entry and update the number of forwards
+        :param name: name of the entry
+        :param faceid: face the nack was received from
+        :return: the updated entry (None if there is no entry) and a flag which is true if other forwards are still
+        pending, so the nack can be ignored
+        """
+        pit_entry = self.find_pit_entry(name)
+        if pit_entry is None:
+            return None, False
+        self.add_nacked_faceid(name, faceid)
+        if pit_entry.number_of_forwards > 1:
+            self.decrease_number_of_forwards(name)
+            return self.find_pit_entry(name), True
+        self.set_number_of_forwards(name, 0)
+        return self.find_pit_entry(name), False
+
+    def remove_faces(self, faceids: List[int]) -> List[PendingInterestTableEntry]:
+        """Compound operation: remove faces, e.g. faces removed from the face table, from the interested faces of all
+        entries. Entries without an interested face left are removed.
+        :param faceids: faces to be removed
+        :return: the removed entries
+        """
+        faceids = set(faceids)
+        removed = []
+        for pit_entry in list(self.get_container()):
+            kept = [i for i, fid in enumerate(pit_entry.faceids) if fid not in faceids]
+            if len(kept) == len(pit_entry.faceids):
+                continue
+            if len(kept) == 0:
+                self.remove_pit_entry(pit_entry.name)
+                removed.append(pit_entry)
+                continue
+            local_app = pit_entry.local_app
+            pit_entry.local_app = [local_app[i] for i in kept if i < len(local_app)]
+            pit_entry.faceids[:] = [pit_entry.faceids[i] for i in kept]
+        return removed
+
     def set_pit_timeout(self, timeout: float):
         """set the timeout intervall for a pit entry
         :param timeout: timout value to be set
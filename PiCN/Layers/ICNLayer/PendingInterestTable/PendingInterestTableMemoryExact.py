@@ -67,7 +67,7 @@ class PendingInterstTableMemoryExact(BasePendingInterestTable):
     def occupancy_available_faces_per_name(self, fib_entry: ForwardingInformationBaseEntry) -> Dict:
         dict_of_faces_with_occupancy ={}
         fib_components = fib_entry.name.string_components
-        face_ids = fib_entry.faceid
+        face_ids = list(fib_entry.faceid)
         random.shuffle(face_ids)
         for fib_face in face_ids:
             number_of_appearance_in_pit = 0
@@ -0,0 +1,183 @@
+"""in-memory Pending Interest Table using a hash index on the name"""
+
+import random
+import time
+
+from typing import List, Dict, Tuple
+
+from PiCN.Layers.ICNLayer.PendingInterestTable.BasePendingInterestTable import BasePendingInterestTable, \
+    PendingInterestTableEntry
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
+from PiCN.Layers.ICNLayer.DeadlineHeap import DeadlineHeap
+from PiCN.Packets import Interest, Name
+
+
+class PendingInterestTableMemoryHashed(BasePendingInterestTable):
+    """in-memory Pending Interest Table using exact matching. Entries are kept in a dict keyed by name, so that
+    lookups, updates and removals are O(1). Entries are modified in place instead of being removed and re-appended.
+    Retransmission and expiry are driven by a deadline min-heap, so ageing only touches entries which are due.
+    The number of entries per (prefix, outgoing face) is maintained incrementally, outgoing faces must therefore only
+    be changed through the table.
+    :param pit_retransmit_interval: time between two retransmissions of an entry, defaults to the pit timeout
+    """
+
+    def __init__(self, pit_timeout: int=4, pit_retransmits: int=3, pit_retransmit_interval: float=None) -> None:
+        super().__init__(pit_timeout=pit_timeout, pit_retransmits=pit_retransmits)
+        self.container: Dict[Name, PendingInterestTableEntry] = {}
+        self._pit_retransmit_interval = pit_retransmit_interval
+        self._deadlines: DeadlineHeap = DeadlineHeap()
+        self._occupancy: Dict[Tuple[int, Tuple], int] = {}
+
+    def get_container(self) -> List[PendingInterestTableEntry]:
+        return list(self.container.values())
+
+    def add_interested_face(self, name, face: int):
+        pit_entry = self.container.get(name)
+        if pit_entry is None or face in pit_entry.faceids:
+            return
+        pit_entry.faceids.append(face)
+        pit_entry.local_app.append(False)
+
+    def add_outgoing_face(self, name, face: int):
+        pit_entry = self.container.get(name)
+        if pit_entry is None or face in pit_entry.outgoing_faces:
+            return
+        pit_entry.outgoing_faces.append(face)
+        self._count_outgoing_face(pit_entry.name, face, 1)
+
+    def add_pit_entry(self, name, faceid: int, outgoing_face: int, interest: Interest = None, local_app = False):
+        pit_entry = self.container.get(name)
+        if pit_entry is None:
+            pit_entry = PendingInterestTableEntry(name, faceid, outgoing_face, interest, local_app)
+            self._insert(pit_entry)
+            self._deadlines.schedule(name, pit_entry.timestamp + self._get_retransmit_interval())
+            return
+        if faceid not in pit_entry.faceids or local_app not in pit_entry.local_app:
+            pit_entry.faceids.append(faceid)
+            pit_entry.local_app.append(local_app)
+        if outgoing_face not in pit_entry.outgoing_faces:
+            pit_entry.outgoing_faces.append(outgoing_face)
+            self._count_outgoing_face(pit_entry.name, outgoing_face, 1)
+
+    def occupancy_available_faces_per_name(self, fib_entry: ForwardingInformationBaseEntry) -> Dict:
+        # the faces are shuffled (on a copy) so that faces with equal occupancy are chosen randomly when sorted
+        face_ids = list(fib_entry.faceid)
+        random.shuffle(face_ids)
+        prefix = tuple(fib_entry.name.components)
+        return {fib_face: self._occupancy.get((fib_face, prefix), 0) for fib_face in face_ids}
+
+    def remove_pit_entry(self, name: Name):
+        self._delete(name)
+        self._deadlines.cancel(name)
+
+    def find_pit_entry(self, name: Name) -> PendingInterestTableEntry:
+        return self.container.get(name)
+
+    def update_timestamp(self, pit_entry: PendingInterestTableEntry):
+        entry = self.container.get(pit_entry.name)
+        if entry is None:
+            return
+        entry.timestamp = time.time()
+        entry.retransmits = 0
+        self._deadlines.schedule(entry.name, entry.timestamp + self._get_retransmit_interval())
+
+    def add_used_fib_face(self, name: Name, used_fib_face: List[int]):
+        pit_entry = self.container.get(name)
+        if pit_entry is None:
+            return
+        pit_entry.fib_faces_already_used.extend(used_fib_face)
+
+    def get_already_used_pit_entries(self, name: Name):
+        pit_entry = self.container.get(name)
+        if pit_entry is None:
+            return []
+        return pit_entry.fib_faces_already_used
+
+    def append(self, entry):
+        self._delete(entry.name)
+        self._insert(entry)
+        if entry.name not in self._deadlines:
+            self._deadlines.schedule(entry.name, time.time() + self._get_retransmit_interval())
+
+    def set_number_of_forwards(self, name, forwards):
+        pit_entry = self.container.get(name)
+        if pit_entry:
+            pit_entry.number_of_forwards = forwards
+
+    def increase_number_of_forwards(self, name):
+        pit_entry = self.container.get(name)
+        if pit_entry:
+            pit_entry.number_of_forwards += 1
+
+    def decrease_number_of_forwards(self, name):
+        pit_entry = self.container.get(name)
+        if pit_entry:
+            pit_entry.number_of_forwards -= 1
+
+    def add_nacked_faceid(self, name, fid: int):
+        pit_entry = self.container.get(name)
+        if pit_entry:
+            pit_entry.faces_already_nacked.append(fid)
+
+    def ageing(self) -> (List[PendingInterestTableEntry], List[PendingInterestTableEntry]):
+        cur_time = time.time()
+        remove = []
+        updated = []
+        for name in self._deadlines.pop_due(cur_time):
+            pit_entry = self.container[name]
+            if pit_entry.timestamp + self._pit_timeout < cur_time and pit_entry.retransmits > self._pit_retransmits:
+                self._delete(name)
+                remove.append(pit_entry)
+            else:
+                pit_entry.retransmits = pit_entry.retransmits + 1
+                updated.append(pit_entry)
+        # reschedule after draining the heap, a retransmit interval of 0 would otherwise never leave the loop
+        for pit_entry in updated:
+            self._deadlines.schedule(pit_entry.name, cur_time + self._get_retransmit_interval())
+        return updated, remove
+
+    def set_pit_timeout(self, timeout: float):
+        old_interval = self._get_retransmit_interval()
+        super().set_pit_timeout(timeout)
+        self._deadlines.shift(self._get_retransmit_interval() - old_interval)
+
+    def set_pit_retransmit_interval(self, interval: float):
+        """set the time between two retransmissions of a pit entry
+        :param interval: retransmit interval to be set, None to use the pit timeout
+        """
+        old_interval = self._get_retransmit_interval()
+        self._pit_retransmit_interval = interval
+        self._deadlines.shift(self._get_retransmit_interval() - old_interval)
+
+    def get_next_deadline(self) -> float:
+        """returns the earliest point in time at which ageing has work to do, None if the PIT is empty"""
+        return self._deadlines.next_deadline()
+
+    def _insert(self, pit_entry: PendingInterestTableEntry):
+        self.container[pit_entry.name] = pit_entry
+        for face in set(pit_entry.outgoing_faces):
+            self._count_outgoing_face(pit_entry.name, face, 1)
+
+    def _delete(self, name: Name):
+        pit_entry = self.container.pop(name, None)
+        if pit_entry is None:
+            return
+        for face in set(pit_entry.outgoing_faces):
+            self._count_outgoing_face(pit_entry.name, face, -1)
+
+    def _count_outgoing_face(self, name: Name, face: int, delta: int):
+        """update the occupancy counter of a face for every prefix of a name, called with the name stored in the
+        entry, as equal names may be split into different components"""
+        components = tuple(name.components)
+        for i in range(0, len(components) + 1):
+            key = (face, components[:i])
+            count = self._occupancy.get(key, 0) + delta
+            if count > 0:
+                self._occupancy[key] = count
+            else:
+                self._occupancy.pop(key, None)
+
+    def _get_retransmit_interval(self) -> float:
+        if self._pit_retransmit_interval is None:
+            return self._pit_timeout
+        return self._pit_retransmit_interval
@@ -152,3 +152,34 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         self.assertEqual(result[2], 1)
         self.assertEqual(result[3], 0)
         self.assertEqual(len(result), 3)
+
+    def test_forward_interest(self):
+        """Test choosing a face and registering the forward in one operation"""
+        name = Name("/a/b")
+        fib_entry = ForwardingInformationBaseEntry(Name("/a"), [1, 2], False)
+        self.pit.add_pit_entry(Name("/a/c"), 7, 1)
+        fid = self.pit.forward_interest(name, 5, fib_entry)
+        self.assertEqual(fid, 2)
+        entry = self.pit.find_pit_entry(name)
+        self.assertEqual(entry.outgoing_faces, [2])
+        self.assertEqual(entry.fib_faces_already_used, [2])
+        self.assertEqual(entry.number_of_forwards, 1)
+        entry, other_forwards_active = self.pit.record_nack(name, 2)
+        self.assertFalse(other_forwards_active)
+        self.assertEqual(entry.number_of_forwards, 0)
+        self.assertTrue(self.pit.test_faceid_was_nacked(name, 2))
+
+    def test_remove_faces(self):
+        """Test removing faces from the interested faces of all entries"""
+        self.pit.add_pit_entry(Name("/a/b"), 1, 4)
+        self.pit.add_pit_entry(Name("/a/b"), 2, 4)
+        self.pit.add_pit_entry(Name("/a/c"), 1, 4)
+        self.pit.add_pit_entry(Name("/a/d"), 3, 4)
+        removed = self.pit.remove_faces([1, 5])
+        self.assertEqual([e.name for e in removed], [Name("/a/c")])
+        self.assertIsNone(self.pit.find_pit_entry(Name("/a/c")))
+        entry = self.pit.find_pit_entry(Name("/a/b"))
+        self.assertEqual(entry.faceids, [2])
+        self.assertEqual(entry.local_app, [False])
+        self.assertEqual(self.pit.find_pit_entry(Name("/a/d")).faceids, [3])
+        self.assertEqual(len(self.pit.get_container()), 2)
@@ -0,0 +1,319 @@
+"""Tests for the in Memory Pending Interest Table using a hash index"""
+
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryHashed
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
+from PiCN.Packets import Interest, Name
+from PiCN.Processes import PiCNSyncDataStructFactory
+
+
+class test_PendingInterestTableMemoryHashed(unittest.TestCase):
+    def setUp(self):
+        self.pit: PendingInterestTableMemoryHashed = PendingInterestTableMemoryHashed()
+
+    def tearDown(self):
+        pass
+
+    def test_add_data_to_pit(self):
+        """Test adding data to PIT"""
+        fid = 1
+        fake_outgoing_face = 15
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, fid, fake_outgoing_face)
+        data = self.pit.get_container()[0]
+        self.assertEqual(data.name, name)
+        self.assertEqual(self.pit.get_container_size(), 1)
+
+    def test_find_data_in_pit(self):
+        """Test finding data in PIT exact"""
+        fid = 1
+        fake_outgoing_face = 15
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, fid, fake_outgoing_face)
+        res = self.pit.find_pit_entry(Name("/test/data"))
+        self.assertEqual(res.name, name)
+        self.assertEqual(res.faceids, [fid])
+
+    def test_find_data_in_pit_no_match(self):
+        """Test finding data in PIT exact, with no match"""
+        self.pit.add_pit_entry(Name("/test/data"), 1, 15)
+        res = self.pit.find_pit_entry(Name("/data/test"))
+        self.assertEqual(res, None)
+
+    def test_find_data_to_pit_deduplication(self):
+        """Test finding data in PIT with multiple fids"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1, 15)
+        self.pit.add_pit_entry(name, 2, 16)
+        self.assertEqual(self.pit.get_container_size(), 1)
+        res = self.pit.find_pit_entry(name)
+        self.assertEqual(res.faceids, [1, 2])
+        self.assertEqual(res.local_app, [False, False])
+        self.assertEqual(res.outgoing_faces, [15, 16])
+
+    def test_find_data_to_pit_deduplication_samefid(self):
+        """Test finding data in PIT with two time same fids"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1, 15)
+        self.pit.add_pit_entry(name, 1, 16)
+        self.pit.add_pit_entry(name, 1, 16)
+        res = self.pit.find_pit_entry(name)
+        self.assertEqual(res.faceids, [1])
+        self.assertEqual(res.outgoing_faces, [15, 16])
+
+    def test_remove_data_from_pit(self):
+        """Test removing data from PIT"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1, 15)
+        self.assertEqual(self.pit.get_container_size(), 1)
+        self.pit.remove_pit_entry(name)
+        self.assertEqual(self.pit.get_container_size(), 0)
+        self.pit.remove_pit_entry(name)
+        self.assertEqual(self.pit.get_container_size(), 0)
+
+    def test_add_already_used_fib_face(self):
+        """Test adding an already used FIB face"""
+        n1 = Name("/test/data")
+        self.pit.add_pit_entry(n1, 1, 2, None, False)
+        self.pit.add_used_fib_face(n1, [2])
+        self.pit.add_used_fib_face(n1, [3])
+        self.assertEqual(self.pit.get_already_used_pit_entries(n1), [2, 3])
+        self.pit.add_used_fib_face(Name("/not/available"), [2])
+
+    def test_number_of_forwards(self):
+        """Test setting, increasing and decreasing the number of forwards in place"""
+        n1 = Name("/test/data")
+        self.pit.add_pit_entry(n1, [1], 15, None, False)
+        entry = self.pit.find_pit_entry(n1)
+        self.pit.set_number_of_forwards(n1, 3)
+        self.pit.increase_number_of_forwards(n1)
+        self.pit.increase_number_of_forwards(n1)
+        self.pit.decrease_number_of_forwards(n1)
+        self.assertEqual(entry.number_of_forwards, 4)
+        self.assertIs(self.pit.find_pit_entry(n1), entry)
+
+    def test_add_interested_face(self):
+        """Test the addition of an interested face to an existing PIT entry"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(Name("/other"), 3, 15)
+        self.pit.add_pit_entry(name, 1, 15)
+        self.pit.add_interested_face(name, 2)
+        self.pit.add_interested_face(name, 2)
+        pit_entry = self.pit.find_pit_entry(name)
+        self.assertEqual(pit_entry.faceids, [1, 2])
+        self.assertEqual(len(pit_entry.local_app), 2)
+
+    def test_nacked_faceid(self):
+        """Test recording nacked faces"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1, 15)
+        self.assertFalse(self.pit.test_faceid_was_nacked(name, 15))
+        self.pit.add_nacked_faceid(name, 15)
+        self.assertTrue(self.pit.test_faceid_was_nacked(name, 15))
+
+    def test_update_timestamp(self):
+        """Test that updating the timestamp resets the retransmit counter"""
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1, 15)
+        entry = self.pit.find_pit_entry(name)
+        old_timestamp = entry.timestamp
+        entry.retransmits = 2
+        time.sleep(0.01)
+        self.pit.update_timestamp(entry)
+        self.assertGreater(entry.timestamp, old_timestamp)
+        self.assertEqual(entry.retransmits, 0)
+
+    def test_ageing(self):
+        """Test ageing retransmits fresh entries and removes expired ones"""
+        self.pit.set_pit_timeout(0)
+        self.pit.set_pit_retransmits(1)
+        name = Name("/test/data")
+        self.pit.add_pit_entry(name, 1, 15)
+        for i in range(0, 2):
+            updated, removed = self.pit.ageing()
+            self.assertEqual(len(updated), 1)
+            self.assertEqual(len(removed), 0)
+        time.sleep(0.01)
+        updated, removed = self.pit.ageing()
+        self.assertEqual(len(updated), 0)
+        self.assertEqual(removed[0].name, name)
+        self.assertEqual(self.pit.get_container_size(), 0)
+
+    def test_ageing_only_due_entries(self):
+        """Test ageing does not touch entries before their retransmit deadline"""
+        self.pit.set_pit_timeout(10)
+        for i in range(0, 100000):
+            self.pit.add_pit_entry(Name("/test/data/" + str(i)), 1, 15)
+        updated, removed = self.pit.ageing()
+        self.assertEqual(updated, [])
+        self.assertEqual(removed, [])
+        self.assertTrue(all(e.retransmits == 0 for e in self.pit.get_container()))
+        self.assertGreater(self.pit.get_next_deadline(), time.time())
+
+    def test_ageing_retransmit_interval(self):
+        """Test retransmission with a retransmit interval shorter than the timeout"""
+        self.pit.set_pit_timeout(10)
+        self.pit.set_pit_retransmit_interval(0.05)
+        n1 = Name("/test/data")
+        n2 = Name("/test/other")
+        self.pit.add_pit_entry(n1, 1, 15)
+        self.pit.add_pit_entry(n2, 1, 15)
+        self.pit.remove_pit_entry(n2)
+        time.sleep(0.1)
+        updated, removed = self.pit.ageing()
+        self.assertEqual([e.name for e in updated], [n1])
+        self.assertEqual(removed, [])
+        updated, removed = self.pit.ageing()
+        self.assertEqual(updated, [])
+        self.pit.update_timestamp(self.pit.find_pit_entry(n1))
+        self.assertEqual(self.pit.find_pit_entry(n1).retransmits, 0)
+        self.assertEqual(self.pit.ageing(), ([], []))
+
+    def test_occupancy_available_faces_per_name(self):
+        name = Name("/a/b")
+        fib_entry_faces = [1, 2, 3]
+        fib_entry = ForwardingInformationBaseEntry(name, fib_entry_faces, False)
+
+        self.pit.add_pit_entry(Name("/a/b"), 7, 1, None, False)
+        self.pit.add_pit_entry(Name("/x/y/z"), 5, 1, None, False)
+        self.pit.add_pit_entry(Name("/m/n"), 6, 3, None, False)
+        self.pit.add_pit_entry(Name("/a/b/c"), 8, 1, None, False)
+        self.pit.add_pit_entry(Name("/l/o"), 9, 2, None, False)
+        self.pit.add_pit_entry(Name("/a/b/c/d"), 4, 2, None, False)
+        self.pit.add_pit_entry(Name("/a"), 4, 2, None, False)
+
+        result = self.pit.occupancy_available_faces_per_name(fib_entry)
+        self.assertEqual(result[1], 2)
+        self.assertEqual(result[2], 1)
+        self.assertEqual(result[3], 0)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(fib_entry.faceid, [1, 2, 3])
+
+    def test_registered_in_sync_data_struct_factory(self):
+        """Test using the PIT through the PiCNSyncDataStructFactory"""
+        synced_data_struct_factory = PiCNSyncDataStructFactory()
+        synced_data_struct_factory.register("pit_hashed", PendingInterestTableMemoryHashed)
+        synced_data_struct_factory.create_manager()
+        pit = synced_data_struct_factory.manager.pit_hashed()
+        name = Name("/test/data")
+        pit.add_pit_entry(name, 1, 15)
+        pit.add_interested_face(name, 2)
+        pit.increase_number_of_forwards(name)
+        entry = pit.find_pit_entry(name)
+        self.assertEqual(entry.faceids, [1, 2])
+        self.assertEqual(entry.number_of_forwards, 1)
+        self.assertEqual(pit.get_container_size(), 1)
+        synced_data_struct_factory.manager.shutdown()
+
+    def test_occupancy_counters_follow_updates(self):
+        """Test that the occupancy counters are updated when faces are added and entries are removed"""
+        fib_entry = ForwardingInformationBaseEntry(Name("/a"), [1, 2], False)
+        self.pit.add_pit_entry(Name("/a/b"), 7, 1)
+        self.pit.add_pit_entry(Name("/a/c"), 7, 1)
+        self.pit.add_pit_entry(Name("/a/c"), 8, 2)
+        self.pit.add_outgoing_face(Name("/a/b"), 2)
+        self.pit.add_outgoing_face(Name("/a/b"), 2)
+        self.assertEqual(self.pit.occupancy_available_faces_per_name(fib_entry), {1: 2, 2: 2})
+
+        self.pit.remove_pit_entry(Name("/a/c"))
+        self.assertEqual(self.pit.occupancy_available_faces_per_name(fib_entry), {1: 1, 2: 1})
+
+        entry = self.pit.find_pit_entry(Name("/a/b"))
+        self.pit.remove_pit_entry(entry.name)
+        self.assertEqual(self.pit.occupancy_available_faces_per_name(fib_entry), {1: 0, 2: 0})
+        self.pit.append(entry)
+        self.pit.append(entry)
+        self.assertEqual(self.pit.occupancy_available_faces_per_name(fib_entry), {1: 1, 2: 1})
+
+        self.pit.set_pit_timeout(0)
+        self.pit.set_pit_retransmits(-1)
+        time.sleep(0.01)
+        self.pit.ageing()
+        self.assertEqual(self.pit.get_container_size(), 0)
+        self.assertEqual(self.pit.occupancy_available_faces_per_name(fib_entry), {1: 0, 2: 0})
+
+    def test_occupancy_counters_equal_names_split_differently(self):
+        """Test that the occupancy counters use the name of the entry if an equal name has other components"""
+        stored_name = Name("/lib/func/f1")
+        stored_name += "_(/test/data)"
+        other_name = Name("/lib/func/f1/_(/test/data)")
+        self.assertEqual(stored_name, other_name)
+        self.assertNotEqual(stored_name.components, other_name.components)
+        fib_entry = ForwardingInformationBaseEntry(Name("/lib/func/f1"), [1, 2], False)
+
+        self.pit.add_pit_entry(stored_name, 7, 1)
+        self.pit.add_pit_entry(other_name, 8, 2)
+        self.pit.add_outgoing_face(other_name, 3)
+        self.assertEqual(self.pit.occupancy_available_faces_per_name(fib_entry), {1: 1, 2: 1})
+
+        self.pit.remove_pit_entry(other_name)
+        self.assertEqual(self.pit.get_container_size(), 0)
+        self.assertEqual(self.pit._occupancy, {})
+
+    def test_forward_interest(self):
+        """Test choosing a face and registering the forward in one operation"""
+        name = Name("/a/b")
+        fib_entry = ForwardingInformationBaseEntry(Name("/a"), [1, 2], False)
+        self.pit.add_pit_entry(Name("/a/c"), 7, 1)
+        fid = self.pit.forward_interest(name, 5, fib_entry, None, local_app=False)
+        self.assertEqual(fid, 2)
+        entry = self.pit.find_pit_entry(name)
+        self.assertEqual(entry.faceids, [5])
+        self.assertEqual(entry.outgoing_faces, [2])
+        self.assertEqual(entry.fib_faces_already_used, [2])
+        self.assertEqual(entry.number_of_forwards, 1)
+
+        self.pit.add_nacked_faceid(name, 1)
+        self.pit.add_nacked_faceid(name, 2)
+        self.assertIsNone(self.pit.forward_interest(name, 5, fib_entry, reset_number_of_forwards=True))
+        self.assertEqual(entry.number_of_forwards, 0)
+
+    def test_aggregate_interest(self):
+        """Test adding an interested face to an existing entry in one operation"""
+        name = Name("/a/b")
+        self.assertIsNone(self.pit.aggregate_interest(name, 1))
+        self.assertEqual(self.pit.get_container_size(), 0)
+        interest = Interest(name)
+        self.pit.add_pit_entry(name, 1, 2, interest)
+        self.pit.find_pit_entry(name).retransmits = 2
+        snapshot = self.pit.aggregate_interest(name, 3, update_timestamp=True)
+        self.assertEqual(snapshot.faceids, [1])
+        self.assertEqual(snapshot.local_app, [False])
+        self.assertEqual(snapshot.retransmits, 2)
+        self.assertIs(snapshot.interest, interest)
+        self.assertEqual(self.pit.find_pit_entry(name).faceids, [1, 3])
+        self.assertEqual(self.pit.find_pit_entry(name).retransmits, 0)
+
+    def test_record_nack_and_pop(self):
+        """Test recording a nack and popping an entry"""
+        name = Name("/a/b")
+        self.assertEqual(self.pit.record_nack(name, 2), (None, False))
+        self.pit.add_pit_entry(name, 1, 2)
+        self.pit.set_number_of_forwards(name, 2)
+        entry, other_forwards_active = self.pit.record_nack(name, 2)
+        self.assertTrue(other_forwards_active)
+        self.assertEqual(entry.number_of_forwards, 1)
+        entry, other_forwards_active = self.pit.record_nack(name, 3)
+        self.assertFalse(other_forwards_active)
+        self.assertEqual(entry.number_of_forwards, 0)
+        self.assertEqual(entry.faces_already_nacked, [2, 3])
+        self.assertEqual(self.pit.pop_pit_entry(name), entry)
+        self.assertIsNone(self.pit.pop_pit_entry(name))
+        self.assertEqual(self.pit.get_container_size(), 0)
+
+    def test_remove_faces(self):
+        """Test removing faces from the interested faces of all entries"""
+        self.pit.add_pit_entry(Name("/a/b"), 1, 4)
+        self.pit.add_pit_entry(Name("/a/b"), 2, 4)
+        self.pit.add_pit_entry(Name("/a/c"), 1, 4)
+        self.pit.add_pit_entry(Name("/a/d"), 3, 4)
+        removed = self.pit.remove_faces([1, 5])
+        self.assertEqual([e.name for e in removed], [Name("/a/c")])
+        self.assertIsNone(self.pit.find_pit_entry(Name("/a/c")))
+        entry = self.pit.find_pit_entry(Name("/a/b"))
+        self.assertEqual(entry.faceids, [2])
+        self.assertEqual(entry.local_app, [False])
+        self.assertEqual(self.pit.find_pit_entry(Name("/a/d")).faceids, [3])
+        self.assertEqual(len(self.pit.get_container()), 2)
@@ -8,4 +8,5 @@
 """
 
 from .BaseICNDataStruct import BaseICNDataStruct
+from .DeadlineHeap import DeadlineHeap
 from .BasicICNLayer import BasicICNLayer
\ No newline at end of file
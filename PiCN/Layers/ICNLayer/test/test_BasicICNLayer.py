@@ -1,15 +1,19 @@
 """Test the Basic ICN Layer implementation"""
 
 import multiprocessing
+import queue
 import time
 import unittest
 
 from PiCN.Layers.ICNLayer import BasicICNLayer
-from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact, LeaveCopyDownAdmissionPolicy, \
+    SecondHitAdmissionPolicy
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.ForwardingStrategy import AdaptiveForwardingStrategy
 from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact
+from PiCN.Layers.ICNLayer.NameTree import NameTree
 from PiCN.Packets import Name, Interest, Content, Nack, NackReason
-from PiCN.Processes import PiCNSyncDataStructFactory
+from PiCN.Processes import PiCNSyncDataStructFactory, PacketBatch
 
 
 class test_BasicICNLayer(unittest.TestCase):
@@ -261,6 +265,80 @@ class test_BasicICNLayer(unittest.TestCase):
         self.assertEqual(face_id_2, from_face_id_2)
         self.assertEqual(data2, content)
 
+    def test_ICNLayer_content_leave_copy_down(self):
+        """Test that content is cached only by the first node downstream of a hit with leave copy down admission"""
+        self.icn_layer.admission_policy = LeaveCopyDownAdmissionPolicy()
+        self.icn_layer.start_process()
+        content_in_face_id = 1
+        from_face_id = 2
+        content1 = Content("/test/data1", "data1")
+        content2 = Content("/test/data2", "data2")
+        content2.no_cache = True
+
+        self.icn_layer.pit.add_pit_entry(content1.name, from_face_id, content_in_face_id, None, False)
+        self.icn_layer.pit.add_pit_entry(content2.name, from_face_id, content_in_face_id, None, False)
+        self.queue1_icn_routing_up.put([content_in_face_id, content1])
+        self.queue1_icn_routing_up.put([content_in_face_id, content2])
+
+        face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+        self.assertEqual(data, content1)
+        self.assertTrue(data.no_cache)
+        face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+        self.assertEqual(data, content2)
+        self.assertTrue(data.no_cache)
+        time.sleep(0.1)
+        self.assertEqual(self.icn_layer.cs.find_content_object(content1.name).content, content1)
+        self.assertIsNone(self.icn_layer.cs.find_content_object(content2.name))
+
+        # a cache hit is served without NoCache hint, so that the next node caches it
+        self.queue1_icn_routing_up.put([from_face_id, Interest("/test/data1")])
+        face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+        self.assertEqual(face_id, from_face_id)
+        self.assertEqual(data, content1)
+        self.assertFalse(data.no_cache)
+
+    def test_ICNLayer_content_second_hit(self):
+        """Test that content is cached when it is forwarded the second time with second hit admission"""
+        self.icn_layer.admission_policy = SecondHitAdmissionPolicy()
+        self.icn_layer.start_process()
+        content = Content("/test/data", "data")
+        for i in range(0, 2):
+            self.icn_layer.pit.add_pit_entry(content.name, 2, 1, None, False)
+            self.queue1_icn_routing_up.put([1, content])
+            self.queue1_icn_routing_down.get(timeout=2.0)
+            time.sleep(0.1)
+            if i == 0:
+                self.assertIsNone(self.icn_layer.cs.find_content_object(content.name))
+        self.assertEqual(self.icn_layer.cs.find_content_object(content.name).content, content)
+
+    def test_ICNLayer_adaptive_forwarding_strategy(self):
+        """Test that the adaptive strategy probes the alternative face and then prefers the faster face"""
+        self.icn_layer.forwarding_strategy = AdaptiveForwardingStrategy(probe_interval=100)
+        self.icn_layer.start_process()
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [1, 2])
+
+        # the first interest is sent to both faces, face 2 answers faster
+        interest = Interest("/test/data1")
+        self.queue1_icn_routing_up.put([10, interest])
+        sent = [self.queue1_icn_routing_down.get(timeout=2.0), self.queue1_icn_routing_down.get(timeout=2.0)]
+        self.assertEqual(sorted(face_id for face_id, _ in sent), [1, 2])
+        self.assertEqual(self.icn_layer.pit.find_pit_entry(interest.name).outgoing_faces, [1, 2])
+        content = Content("/test/data1", "data1")
+        self.queue1_icn_routing_up.put([2, content])
+        self.assertEqual(self.queue1_icn_routing_down.get(timeout=2.0), [10, content])
+        time.sleep(0.3)
+        # the late content of the slower face is measured and dropped
+        self.queue1_icn_routing_up.put([1, content])
+        time.sleep(0.1)
+
+        for i in range(2, 5):
+            interest = Interest("/test/data" + str(i))
+            self.queue1_icn_routing_up.put([10, interest])
+            face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+            self.assertEqual(face_id, 2)
+            self.assertEqual(data, interest)
+        self.assertTrue(self.queue1_icn_routing_down.empty())
+
     def test_ICNLayer_ageing_pit(self):
         """Test PIT ageing"""
 
@@ -743,4 +821,129 @@ class test_BasicICNLayer(unittest.TestCase):
         self.icn_layer.queue_from_lower.put([10, i5])
         d1 = self.icn_layer.queue_to_lower.get(timeout=2.0)
         pit_entry = self.icn_layer.pit.find_pit_entry(i5.name)
-        self.assertEqual([1], pit_entry.outgoing_faces)
\ No newline at end of file
+        self.assertEqual([1], pit_entry.outgoing_faces)
+
+    def test_ICNLayer_handlers_use_given_queues(self):
+        """Test that the handlers send through the queues they were given, e.g. the batch writers of the process loop"""
+        to_lower = queue.Queue()
+        to_higher = queue.Queue()
+        content = Content("/test/data", "HelloWorld")
+        self.icn_layer.cs.add_content_object(content)
+        self.icn_layer.handle_interest_from_higher(1, Interest("/test/data"), to_lower, to_higher)
+        self.assertEqual(to_higher.get(timeout=2.0), [1, content])
+
+        self.icn_layer._interest_to_app = True
+        interest = Interest("/test/app")
+        self.icn_layer.handle_interest_from_lower(2, interest, to_lower, to_higher)
+        self.assertEqual(to_higher.get(timeout=2.0), [2, interest])
+        self.assertTrue(to_lower.empty())
+
+    def test_ICNLayer_ageing_batches(self):
+        """Test that the retransmits of the ageing are sent as one batch"""
+        self.icn_layer.batch_to_lower = True
+        self.icn_layer.max_batch_size = 8
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [2])
+        for i in range(0, 3):
+            name = Name("/test/data" + str(i))
+            self.icn_layer.pit.add_pit_entry(name, 1, 2, Interest(name), False)
+        self.icn_layer.ageing()
+        batch = self.queue1_icn_routing_down.get(timeout=2.0)
+        self.assertIsInstance(batch, PacketBatch)
+        self.assertEqual(sorted(interest.name.to_string() for face_id, interest in batch),
+                         ["/test/data0", "/test/data1", "/test/data2"])
+
+
+class test_BasicICNLayerNameTree(unittest.TestCase):
+    """Test the Basic ICN Layer with CS, PIT and FIB sharing a name tree"""
+
+    def setUp(self):
+        synced_data_struct_factory = PiCNSyncDataStructFactory()
+        synced_data_struct_factory.register("name_tree", NameTree,
+                                            method_to_typeid={"get_cs": "name_tree_cs", "get_pit": "name_tree_pit",
+                                                              "get_fib": "name_tree_fib"})
+        synced_data_struct_factory.register("name_tree_cs", None)
+        synced_data_struct_factory.register("name_tree_pit", None)
+        synced_data_struct_factory.register("name_tree_fib", None)
+        synced_data_struct_factory.create_manager()
+
+        name_tree = synced_data_struct_factory.manager.name_tree()
+        self.icn_layer = BasicICNLayer(log_level=255, name_tree=name_tree)
+        self.icn_layer.cs = name_tree.get_cs()
+        self.icn_layer.fib = name_tree.get_fib()
+        self.icn_layer.pit = name_tree.get_pit()
+
+        self.queue1_icn_routing_up = multiprocessing.Queue()
+        self.queue1_icn_routing_down = multiprocessing.Queue()
+        self.icn_layer.queue_from_lower = self.queue1_icn_routing_up
+        self.icn_layer.queue_to_lower = self.queue1_icn_routing_down
+
+    def tearDown(self):
+        self.icn_layer.stop_process()
+
+    def test_ICNLayer_name_tree_interest_forward_longest_match(self):
+        """Test forwarding an interest by the longest matching FIB entry of the name tree"""
+        self.icn_layer.start_process()
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [1], static=True)
+        self.icn_layer.fib.add_fib_entry(Name("/test/data"), [3], static=True)
+        interest = Interest("/test/data/object")
+
+        self.queue1_icn_routing_up.put([2, interest])
+        try:
+            face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+        except:
+            self.fail()
+
+        self.assertEqual(face_id, 3)
+        self.assertEqual(data, interest)
+        self.assertEqual(self.icn_layer.pit.get_container_size(), 1)
+        self.assertEqual(self.icn_layer.pit.find_pit_entry(interest.name).faceids, [2])
+        self.assertEqual(self.icn_layer.pit.find_pit_entry(interest.name).outgoing_faces, [3])
+
+    def test_ICNLayer_name_tree_interest_deduplication(self):
+        """Test aggregating an interest in the PIT of the name tree"""
+        self.icn_layer.start_process()
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [1])
+        interest = Interest("/test/data")
+
+        self.queue1_icn_routing_up.put([2, interest])
+        try:
+            face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+        except:
+            self.fail()
+        self.assertEqual(face_id, 1)
+        self.queue1_icn_routing_up.put([3, interest])
+        time.sleep(0.3) # sleep required, since there is no blocking get before the checks
+
+        self.assertTrue(self.queue1_icn_routing_down.empty())
+        self.assertEqual(self.icn_layer.pit.find_pit_entry(interest.name).faceids, [2, 3])
+
+    def test_ICNLayer_name_tree_content_cached_and_served(self):
+        """Test caching a content object in the name tree and answering the next interest from it"""
+        self.icn_layer.start_process()
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [1])
+        interest = Interest("/test/data")
+        content = Content("/test/data", "HelloWorld")
+
+        self.queue1_icn_routing_up.put([2, interest])
+        try:
+            self.queue1_icn_routing_down.get(timeout=2.0)
+        except:
+            self.fail()
+        self.queue1_icn_routing_up.put([1, content])
+        try:
+            face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+        except:
+            self.fail()
+        self.assertEqual(face_id, 2)
+        self.assertEqual(data, content)
+        time.sleep(0.1) # the content object is cached after it was forwarded
+
+        self.queue1_icn_routing_up.put([3, interest])
+        try:
+            face_id, data = self.queue1_icn_routing_down.get(timeout=2.0)
+        except:
+            self.fail()
+        self.assertEqual(face_id, 3)
+        self.assertEqual(data, content)
+        self.assertEqual(self.icn_layer.pit.get_container_size(), 0)
+        self.assertEqual(self.icn_layer.cs.get_container_size(), 1)
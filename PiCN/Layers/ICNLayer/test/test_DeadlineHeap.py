@@ -0,0 +1,55 @@
+"""Test the DeadlineHeap"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer import DeadlineHeap
+from PiCN.Packets import Name
+
+
+class test_DeadlineHeap(unittest.TestCase):
+    """Test the DeadlineHeap"""
+
+    def setUp(self):
+        self.deadlines = DeadlineHeap()
+
+    def tearDown(self):
+        pass
+
+    def test_pop_due(self):
+        """Test that due entries are popped in the order of their deadlines"""
+        self.deadlines.schedule(Name("/a"), 3.0)
+        self.deadlines.schedule(Name("/b"), 1.0)
+        self.deadlines.schedule(Name("/c"), 2.0)
+        self.assertEqual(self.deadlines.next_deadline(), 1.0)
+        self.assertEqual(self.deadlines.pop_due(2.0, inclusive=False), [Name("/b")])
+        self.assertEqual(self.deadlines.pop_due(2.0), [Name("/c")])
+        self.assertEqual(len(self.deadlines), 1)
+        self.assertNotIn(Name("/c"), self.deadlines)
+        self.assertIn(Name("/a"), self.deadlines)
+
+    def test_reschedule_and_cancel(self):
+        """Test that outdated deadlines are skipped"""
+        self.deadlines.schedule(Name("/a"), 1.0)
+        self.deadlines.schedule(Name("/b"), 2.0)
+        self.deadlines.schedule(Name("/a"), 5.0)
+        self.deadlines.cancel(Name("/b"))
+        self.deadlines.cancel(Name("/c"))
+        self.assertEqual(self.deadlines.next_deadline(), 5.0)
+        self.assertEqual(self.deadlines.pop_due(4.0), [])
+        self.assertEqual(self.deadlines.pop_due(5.0), [Name("/a")])
+        self.assertIsNone(self.deadlines.next_deadline())
+
+    def test_shift(self):
+        """Test that shifting moves all deadlines"""
+        self.deadlines.schedule(Name("/a"), 1.0)
+        self.deadlines.schedule(Name("/b"), 2.0)
+        self.deadlines.shift(-0.5)
+        self.assertEqual(self.deadlines.next_deadline(), 0.5)
+        self.assertEqual(self.deadlines.pop_due(1.5), [Name("/a"), Name("/b")])
+
+    def test_rebuild(self):
+        """Test that the heap does not grow with the number of reschedules"""
+        for i in range(0, 1000):
+            self.deadlines.schedule(Name("/a"), float(i))
+        self.assertLessEqual(len(self.deadlines._heap), 2 * len(self.deadlines) + 65)
+        self.assertEqual(self.deadlines.next_deadline(), 999.0)
@@ -1,11 +1,12 @@
 """Default Link Layer implementation for PiCN"""
 import multiprocessing
-import select
+import selectors
 import socket
 
-from typing import List
+from typing import Dict, List
 
 from PiCN.Processes import LayerProcess
+from PiCN.Processes.PacketBatch import BatchWriter
 
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 from PiCN.Layers.LinkLayer.Interfaces import BaseInterface
@@ -17,12 +18,27 @@ class BasicLinkLayer(LayerProcess):
     :param interface: preconfigured interfaces used by the link layer
     :param faceidtable: faceidtable, that maintains the mapping between IDs and Interfaces
     :param log_level: Loglevel used in the Linklayer
+    :param receive_batch_size: maximum number of packets received from a readable interface before serving the other
+    interfaces and the higher layer
+    :param face_idle_timeout: time in seconds after which faces without activity are removed from the faceidtable,
+    None to keep them until they are evicted. The removed faces are removed from the PITs in pits as well.
     """
 
-    def __init__(self, interfaces: List[BaseInterface], faceidtable: BaseFaceIDTable, log_level=255):
+    def __init__(self, interfaces: List[BaseInterface], faceidtable: BaseFaceIDTable, log_level=255,
+                 receive_batch_size: int=32, face_idle_timeout: float=None):
         super().__init__(logger_name="LinkLayer", log_level=log_level)
         self.interfaces = interfaces
         self.faceidtable = faceidtable
+        self.receive_batch_size: int = receive_batch_size
+        self.face_idle_timeout: float = face_idle_timeout
+        self.pits: list = []
+        self._reaper_timer = None
+        self._interface_ids: Dict[int, int] = {}
+        self._coalescing: bool = False
+
+    def start_layer(self):
+        if self.face_idle_timeout is not None:
+            self._reaper_timer = self.schedule(self.face_idle_timeout / 2, self._reap_idle_faces)
 
     def data_from_lower(self, interface: BaseInterface, to_higher: multiprocessing.Queue, data):
         """In the Linklayer, it handles received data, to lower is the network interface
@@ -33,7 +49,7 @@ class BasicLinkLayer(LayerProcess):
         packet = data[0]
         addr = data[1]
 
-        addr_info = AddressInfo(addr, self.interfaces.index(interface))
+        addr_info = AddressInfo(addr, self._interface_id(interface))
         faceid = self.faceidtable.get_or_create_faceid(addr_info)
         self.logger.info("Got data from Network and from Face ID: " + str(faceid) + ", addr: " + str(addr_info.address))
         to_higher.put([faceid, packet])
@@ -53,50 +69,91 @@ class BasicLinkLayer(LayerProcess):
         if not addr_info:
             self.logger.error("No addr_info found for faceid: " + str(faceid))
             return
-        self.interfaces[addr_info.interface_id].send(packet, addr_info.address)
+        interface = self.interfaces[addr_info.interface_id]
+        interface.send(packet, addr_info.address)
+        if not self._coalescing:
+            interface.flush()
         self.logger.info("Send packet to: " + str(addr_info.address))
 
+    def event_sources(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
+                      to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue) -> list:
+        sources = super().event_sources(None, from_higher, to_lower, to_higher)
+        for interface in self.interfaces:
+            sources.append((interface.file_descriptor,
+                            lambda i=interface: self._receive_from_interface(i, to_higher)))
+        return sources
+
+    def _handle_queue(self, from_queue: multiprocessing.Queue, to_lower: multiprocessing.Queue,
+                      to_higher: multiprocessing.Queue, handler):
+        """ Handle the data available from the higher layer, the interfaces may coalesce the packets sent meanwhile
+            and write them when flushed afterwards """
+        self._coalescing = True
+        try:
+            super()._handle_queue(from_queue, to_lower, to_higher, handler)
+        finally:
+            self._coalescing = False
+            for interface in self.interfaces:
+                interface.flush()
+
+    def _reap_idle_faces(self):
+        """remove the idle faces from the faceidtable and the pits, rescheduled periodically"""
+        try:
+            faceids = self.faceidtable.remove_idle(self.face_idle_timeout)
+            if len(faceids) > 0:
+                self.logger.info("Removed idle faces: " + str(faceids))
+                for pit in self.pits:
+                    pit.remove_faces(faceids)
+        except Exception as e:
+            self.logger.warning("Removing idle faces failed: " + str(e))
+        self._reaper_timer = self.schedule(self.face_idle_timeout / 2, self._reap_idle_faces)
+
+    def _interface_id(self, interface: BaseInterface) -> int:
+        """index of an interface in interfaces, without comparing it to the other interfaces"""
+        interface_id = self._interface_ids.get(id(interface))
+        if interface_id is None or interface_id >= len(self.interfaces) \
+                or self.interfaces[interface_id] is not interface:
+            interface_id = self.interfaces.index(interface)
+            self._interface_ids[id(interface)] = interface_id
+        return interface_id
+
+    def _receive_from_interface(self, interface: BaseInterface, to_higher: multiprocessing.Queue):
+        """handle the data available at a readable interface, up to receive_batch_size packets"""
+        for data in interface.receive_batch(self.receive_batch_size):
+            self.data_from_lower(interface, to_higher, data)
+
+    def _run_selector(self, from_higher: multiprocessing.Queue, to_lower: multiprocessing.Queue,
+                      to_higher: multiprocessing.Queue):
+        """ Process loop, the interfaces and the queue from the higher layer are registered once with the default
+            selector of the platform (epoll on Linux), which maps a ready file descriptor to its interface.
+            :param from_higher: Queue to receive data from higher Layer
+            :param to_lower: Queue to send data to lower Layer
+            :param to_higher: Queue to send data to higher Layer
+        """
+        selector = selectors.DefaultSelector()
+        for interface in self.interfaces:
+            selector.register(interface.file_descriptor, selectors.EVENT_READ, interface)
+        selector.register(from_higher._reader, selectors.EVENT_READ, None)
+        try:
+            while True:
+                ready = selector.select()
+                higher_writer = BatchWriter(to_higher, self.max_batch_size) if self.batch_to_higher else to_higher
+                for key, _ in ready:
+                    if key.data is None:
+                        self._handle_queue(from_higher, to_lower, to_higher, self.data_from_higher)
+                    else:
+                        self.run_exclusive(self._receive_from_interface, key.data, higher_writer)
+                if self.batch_to_higher:
+                    higher_writer.flush()
+        finally:
+            selector.close()
+
     def _run_poll(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                   to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
-        while True:
-            poller = select.poll()
-            READ_ONLY = select.POLLIN | select.POLLPRI | select.POLLHUP | select.POLLERR
-            fds = list(map(lambda x: x.file_descriptor, self.interfaces))
-            for fd in fds:
-                poller.register(fd, READ_ONLY)
-            poller.register(from_higher._reader, READ_ONLY)
-            ready_fds = poller.poll()
-            for fd in ready_fds:
-                if fd[0] == from_higher._reader.fileno():
-                    data = from_higher.get()
-                    self.data_from_higher(to_lower, to_higher, data)
-                else:
-                    interfaces = list(filter(lambda x: x.file_descriptor.fileno() == fd[0], self.interfaces))
-                    try:
-                        interface = interfaces[0]
-                    except:
-                        return
-                    data = interface.receive()
-                    self.data_from_lower(interface, to_higher, data)
+        self._run_selector(from_higher, to_lower, to_higher)
 
     def _run_select(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                     to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
-        while True:
-            fds = list(map(lambda x: x.file_descriptor, self.interfaces))
-            fds.append(from_higher._reader)
-            ready_fds, _, _ = select.select(fds, [], [])
-            for fd in ready_fds:
-                if fd == from_higher._reader:
-                    data = from_higher.get()
-                    self.data_from_higher(to_lower, to_higher, data)
-                else:
-                    interfaces = list(filter(lambda x: x.file_descriptor == fd, self.interfaces))
-                    try:
-                        interface = interfaces[0]
-                    except:
-                        return
-                    data = interface.receive()
-                    self.data_from_lower(interface, to_higher, data)
+        self._run_selector(from_higher, to_lower, to_higher)
 
     def _run_sleep(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                    to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -106,6 +163,9 @@ class BasicLinkLayer(LayerProcess):
 
 
     def stop_process(self):
+        if self._reaper_timer is not None:
+            self._reaper_timer.cancel()
+            self._reaper_timer = None
         for i in self.interfaces:
             i.close()
         if self.process:
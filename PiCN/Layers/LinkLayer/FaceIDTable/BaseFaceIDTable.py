@@ -2,6 +2,8 @@
 
 import abc
 
+from typing import List
+
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 
 class BaseFaceIDTable(object):
@@ -26,10 +28,11 @@ class BaseFaceIDTable(object):
         """
 
     @abc.abstractmethod
-    def add(self, faceid: int, address_info: AddressInfo):
+    def add(self, faceid: int, address_info: AddressInfo, static: bool=False):
         """adds an entry to the FaceIDTable
         :param faceid: faceid of the new entry
         :param address_info: address info of the new entry
+        :param static: if true, the entry is neither evicted nor removed when idle
         :return: none
         """
 
@@ -44,6 +47,19 @@ class BaseFaceIDTable(object):
     def remove_oldest(self):
         """removes the oldest entry if no space is left in the datastruct"""
 
+    @abc.abstractmethod
+    def remove_idle(self, max_idle_time: float) -> List[int]:
+        """removes the entries which are not static and had no activity for a given time
+        :param max_idle_time: time in seconds since the last activity after which an entry is removed
+        :return: faceids of the removed entries
+        """
+
+    @abc.abstractmethod
+    def set_static(self, faceid: int):
+        """marks an existing entry as static, so that it is neither evicted nor removed when idle
+        :param faceid: faceid of the entry
+        """
+
     @abc.abstractmethod
     def get_num_entries(self):
         """returns the current number of entries in the table
@@ -51,15 +67,18 @@ class BaseFaceIDTable(object):
         """
 
 
-    def get_or_create_faceid(self, address_info: AddressInfo) -> int:
+    def get_or_create_faceid(self, address_info: AddressInfo, static: bool=False) -> int:
         """adds and entry and automatically selects a faceid or if an entry exits select that entry
         :param address_info: address info of the new entry
+        :param static: if true, the entry is neither evicted nor removed when idle
         :return: faceid that was selected, if an entry already exists, returns the existing faceid
         """
         fid = self.get_face_id(address_info)
         if fid is not None:
+            if static:
+                self.set_static(fid)
             return fid
         self.remove_oldest()
         self.next_face_id += 1
-        self.add(self.next_face_id, address_info)
+        self.add(self.next_face_id, address_info, static)
         return self.next_face_id
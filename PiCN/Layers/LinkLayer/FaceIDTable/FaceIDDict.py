@@ -2,48 +2,87 @@
 
 import time
 
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, List, Set
 
 from PiCN.Layers.LinkLayer.FaceIDTable import BaseFaceIDTable
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 
 
 class FaceIDDict(BaseFaceIDTable):
-    """Implementation of a FaceIDTable using a Double Dict"""
+    """Implementation of a FaceIDTable using a Double Dict. The dynamic faces are kept in the order of their last
+    activity (lookup of the face id or the address info), so that the least recently used face is evicted in O(1) when
+    the table is full and idle faces are found without scanning the table. Static faces are never evicted.
+    """
 
     def __init__(self):
         super().__init__()
         self.faceid_to_addrinfo: Dict[int, AddressInfo] = {}
         self.addrinfo_to_faceid: Dict[AddressInfo, int] = {}
-        self.faceids = []
+        self.last_activity: OrderedDict = OrderedDict()  # faceid -> time of the last activity, least recent first
+        self.static_faceids: Set[int] = set()
+
+    @property
+    def faceids(self) -> List[int]:
+        return list(self.faceid_to_addrinfo.keys())
 
     def get_address_info(self, faceid: int) -> AddressInfo:
-        return self.faceid_to_addrinfo.get(faceid)
+        address_info = self.faceid_to_addrinfo.get(faceid)
+        if address_info is not None:
+            self._touch(faceid)
+        return address_info
 
     def get_face_id(self, address_info: AddressInfo) -> int:
-        return self.addrinfo_to_faceid.get(address_info)
+        faceid = self.addrinfo_to_faceid.get(address_info)
+        if faceid is not None:
+            self._touch(faceid)
+        return faceid
 
-    def add(self, faceid: int, address_info: AddressInfo):
+    def add(self, faceid: int, address_info: AddressInfo, static: bool=False):
         if faceid not in self.faceid_to_addrinfo and address_info not in self.addrinfo_to_faceid:
             self.faceid_to_addrinfo[faceid] = address_info
             self.addrinfo_to_faceid[address_info] = faceid
-            self.faceids.append(faceid)
+            if static:
+                self.static_faceids.add(faceid)
+            else:
+                self.last_activity[faceid] = time.time()
+
+    def set_static(self, faceid: int):
+        if faceid in self.last_activity:
+            del self.last_activity[faceid]
+            self.static_faceids.add(faceid)
 
     def remove(self, faceid: int):
         if faceid in self.faceid_to_addrinfo:
-            addr_info = self.get_address_info(faceid)
+            addr_info = self.faceid_to_addrinfo.pop(faceid)
             try:
                 addr_info.inferface.close()
             except:
                 pass
-            del self.faceid_to_addrinfo[faceid]
             del self.addrinfo_to_faceid[addr_info]
-            self.faceids.remove(faceid)
+            self.last_activity.pop(faceid, None)
+            self.static_faceids.discard(faceid)
 
     def remove_oldest(self):
-        if len(self.faceids) < self.max_entries or len(self.faceids) <= 0:
+        if len(self.faceid_to_addrinfo) < self.max_entries or len(self.last_activity) <= 0:
             return
-        self.remove(self.faceids[0])
+        self.remove(next(iter(self.last_activity)))
+
+    def remove_idle(self, max_idle_time: float) -> List[int]:
+        deadline = time.time() - max_idle_time
+        removed = []
+        while len(self.last_activity) > 0:
+            faceid, last_activity = next(iter(self.last_activity.items()))
+            if last_activity > deadline:
+                break
+            self.remove(faceid)
+            removed.append(faceid)
+        return removed
 
     def get_num_entries(self):
-        return len(self.faceids)
\ No newline at end of file
+        return len(self.faceid_to_addrinfo)
+
+    def _touch(self, faceid: int):
+        if faceid in self.last_activity:
+            self.last_activity[faceid] = time.time()
+            self.last_activity.move_to_end(faceid)
@@ -116,5 +116,31 @@ class test_FaceIDDict(unittest.TestCase):
             addr_info = self.faceidtable.get_address_info(entries[i][0])
             self.assertEqual(addr_info, entries[i][1])
 
-
-
+    def test_remove_least_recently_used(self):
+        """test that the least recently used entry is evicted and static entries are kept"""
+        self.faceidtable.max_entries = 3
+        static_fid = self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 0), static=True)
+        fid1 = self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 1))
+        fid2 = self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 2))
+        self.faceidtable.get_address_info(fid1)
+        fid3 = self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 3))
+        self.assertIsNone(self.faceidtable.get_address_info(fid2))
+        self.assertEqual(sorted(self.faceidtable.faceids), sorted([static_fid, fid1, fid3]))
+        self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 4))
+        self.assertIsNone(self.faceidtable.get_address_info(fid1))
+        self.assertIsNotNone(self.faceidtable.get_address_info(static_fid))
+        self.assertEqual(self.faceidtable.get_num_entries(), 3)
+
+    def test_remove_idle(self):
+        """test removing the entries without activity"""
+        static_fid = self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 0), static=True)
+        fid1 = self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 1))
+        fid2 = self.faceidtable.get_or_create_faceid(AddressInfo("127.0.0.1", 2))
+        self.faceidtable.last_activity[fid1] -= 10
+        self.faceidtable.last_activity[fid2] -= 10
+        self.faceidtable.get_face_id(AddressInfo("127.0.0.1", 2))
+        self.assertEqual(self.faceidtable.remove_idle(5), [fid1])
+        self.assertIsNone(self.faceidtable.get_address_info(fid1))
+        self.assertEqual(self.faceidtable.get_face_id(AddressInfo("127.0.0.1", 2)), fid2)
+        self.assertEqual(self.faceidtable.remove_idle(0), [fid2])
+        self.assertEqual(self.faceidtable.faceids, [static_fid])
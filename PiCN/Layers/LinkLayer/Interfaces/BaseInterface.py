@@ -32,12 +32,24 @@ class BaseInterface(object):
         :param data: data to be sent
         """
 
+    def flush(self):
+        """send the data buffered by send. Must be overwritten if an interface buffers data to coalesce writes"""
+
     @abc.abstractmethod
     def receive(self):
         """receives data from the socket
         :return Tuple of received data and addr from which the data where received
         """
 
+    def receive_batch(self, max_items: int) -> list:
+        """receives the data available at the socket without blocking, called when the file descriptor is readable.
+        Must be overwritten if an interface can check for further data without blocking, receives a single item
+        otherwise.
+        :param max_items: maximum number of items to receive
+        :return List of tuples of received data and addr from which the data where received, at least one item
+        """
+        return [self.receive()]
+
     @property
     @abc.abstractmethod
     def file_descriptor(self):
@@ -4,6 +4,7 @@ which can be used as identify for a Face in the LinkLayer.
 """
 
 import multiprocessing
+import queue
 import select
 import threading
 import time
@@ -61,6 +62,16 @@ class SimulationInterface(BaseInterface):
         packet = data[1]
         return (packet, addr)
 
+    def receive_batch(self, max_items: int) -> list:
+        batch = [self.receive()]
+        while len(batch) < max_items:
+            try:
+                addr, packet = self.queue_from_bus.get_nowait()
+            except queue.Empty:
+                break
+            batch.append((packet, addr))
+        return batch
+
     def address(self):
         return self._address
 
@@ -0,0 +1,278 @@
+"""Abstract Superclass for Interfaces using stream sockets, e.g. TCP or Unix domain sockets"""
+
+import selectors
+import socket
+import struct
+from collections import deque
+from typing import Dict, List, Tuple
+
+from PiCN.Layers.LinkLayer.Interfaces import BaseInterface
+
+
+LP_PACKET_TYPE = 100
+LP_FRAGMENT_TYPE = 80
+
+
+def read_tlv_header(buffer, offset: int) -> Tuple[int, int, int]:
+    """
+    Read the type and length of a NDN TLV element
+    :param buffer: buffer containing the element
+    :param offset: offset of the element in the buffer
+    :return: type, length of the value and offset of the value, None if the header is incomplete
+    """
+    tlv_type, offset = _read_varnum(buffer, offset)
+    if offset is None:
+        return None
+    length, offset = _read_varnum(buffer, offset)
+    if offset is None:
+        return None
+    return tlv_type, length, offset
+
+
+def write_varnum(value: int) -> bytes:
+    """encode a number as NDN TLV VAR-NUMBER"""
+    if value < 253:
+        return bytes([value])
+    if value <= 0xFFFF:
+        return b'\xfd' + struct.pack('!H', value)
+    if value <= 0xFFFFFFFF:
+        return b'\xfe' + struct.pack('!I', value)
+    return b'\xff' + struct.pack('!Q', value)
+
+
+def _read_varnum(buffer, offset: int) -> Tuple[int, int]:
+    if offset >= len(buffer):
+        return None, None
+    first = buffer[offset]
+    if first < 253:
+        return first, offset + 1
+    size = {253: 2, 254: 4, 255: 8}[first]
+    if offset + 1 + size > len(buffer):
+        return None, None
+    return int.from_bytes(buffer[offset + 1:offset + 1 + size], 'big'), offset + 1 + size
+
+
+def frame(data) -> bytes:
+    """
+    Frame a packet for a stream: a packet consisting of a single NDN TLV element is sent as it is, other data (e.g.
+    from the SimpleStringEncoder) as the fragment of a NDNLPv2 LpPacket
+    :param data: the packet
+    :return: the framed packet
+    """
+    header = read_tlv_header(data, 0)
+    if header is not None and header[2] + header[1] == len(data):
+        return bytes(data)
+    fragment = write_varnum(LP_FRAGMENT_TYPE) + write_varnum(len(data)) + bytes(data)
+    return write_varnum(LP_PACKET_TYPE) + write_varnum(len(fragment)) + fragment
+
+
+def unframe(element: bytes) -> bytes:
+    """
+    Packet of a frame: the fragment of a LpPacket without further fields, the frame otherwise
+    :param element: the frame, a single NDN TLV element
+    :return: the packet
+    """
+    tlv_type, length, offset = read_tlv_header(element, 0)
+    if tlv_type != LP_PACKET_TYPE:
+        return element
+    header = read_tlv_header(element, offset)
+    if header is None or header[0] != LP_FRAGMENT_TYPE or header[2] + header[1] != len(element):
+        return element
+    return element[header[2]:]
+
+
+class _Connection(object):
+    """A connected stream socket with its receive and send buffers"""
+
+    def __init__(self, sock: socket.socket, address):
+        self.sock = sock
+        self.address = address
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.writing = False
+
+
+class StreamInterface(BaseInterface):
+    """Abstract Superclass for Interfaces using stream sockets. A connection is kept per peer and reused for all
+    packets from and to the peer, whether it was accepted or opened by send. Packets are delimited by their NDN TLV
+    header (see frame), so that packets of any size are received completely. send only buffers the framed packets,
+    flush writes the buffered packets of each connection with a single system call. The link layer flushes after
+    handling the data available from the higher layer, other users of send must call flush.
+    The sockets are registered with a selector of the interface, whose file descriptor is readable if a socket is
+    readable or a buffered packet can be written. A platform with epoll or kqueue is required.
+    :param listen_address: address to accept connections on, None to only open connections
+    :param max_frame_size: maximum size of a received packet, a connection sending a larger packet is closed
+    :param max_buffer_size: size of the buffered packets of a connection at which send flushes them
+    """
+
+    def __init__(self, family: int, listen_address, max_frame_size: int=1 << 24, max_buffer_size: int=1 << 16):
+        self._family = family
+        self._max_frame_size: int = max_frame_size
+        self._max_buffer_size: int = max_buffer_size
+        self._selector = selectors.DefaultSelector()
+        self._connections: Dict[object, _Connection] = {}
+        self._received: deque = deque()
+        self._listener: socket.socket = None
+        if listen_address is not None:
+            self._listener = socket.socket(family, socket.SOCK_STREAM)
+            self._prepare_listener(self._listener)
+            self._listener.bind(listen_address)
+            self._listener.listen(128)
+            self._listener.setblocking(False)
+            self._selector.register(self._listener, selectors.EVENT_READ, None)
+
+    def send(self, data, addr):
+        connection = self._connections.get(addr)
+        if connection is None:
+            connection = self._connect(addr)
+            if connection is None:
+                return
+        connection.outbuf += frame(data)
+        if len(connection.outbuf) >= self._max_buffer_size:
+            self._write(connection)
+
+    def flush(self):
+        for connection in list(self._connections.values()):
+            if len(connection.outbuf) > 0 and not connection.writing:
+                self._write(connection)
+
+    def receive(self):
+        while len(self._received) == 0:
+            self._handle_events(None, 1)
+        return self._received.popleft()
+
+    def receive_batch(self, max_items: int) -> list:
+        """receives the packets available at the connections, reading at most max_items times from the sockets. May
+        return all packets of the data read, or none if the data did not complete a packet."""
+        self._handle_events(0, max_items)
+        batch = list(self._received)
+        self._received.clear()
+        return batch
+
+    @property
+    def file_descriptor(self):
+        return self._selector
+
+    def get_connected_addresses(self) -> List[object]:
+        """Returns the addresses of the peers with an open connection"""
+        return list(self._connections.keys())
+
+    def close(self):
+        for connection in list(self._connections.values()):
+            self._close_connection(connection)
+        if self._listener is not None:
+            self._listener.close()
+        self._selector.close()
+
+    def _prepare_listener(self, sock: socket.socket):
+        """set options of the listening socket before it is bound"""
+
+    def _prepare_connection(self, sock: socket.socket):
+        """set options of a connected socket"""
+
+    def _accepted_address(self, sock: socket.socket, peer_address):
+        """address identifying an accepted connection"""
+        return peer_address
+
+    def _connect(self, addr) -> _Connection:
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(2.0)
+            sock.connect(addr)
+        except OSError:
+            sock.close()
+            return None
+        return self._add_connection(sock, addr)
+
+    def _add_connection(self, sock: socket.socket, addr) -> _Connection:
+        sock.setblocking(False)
+        self._prepare_connection(sock)
+        connection = _Connection(sock, addr)
+        self._connections[addr] = connection
+        self._selector.register(sock, selectors.EVENT_READ, connection)
+        return connection
+
+    def _close_connection(self, connection: _Connection):
+        if self._connections.get(connection.address) is connection:
+            del self._connections[connection.address]
+        try:
+            self._selector.unregister(connection.sock)
+        except (KeyError, ValueError):
+            pass
+        connection.sock.close()
+
+    def _handle_events(self, timeout, max_reads: int):
+        reads = 0
+        for key, events in self._selector.select(timeout):
+            connection = key.data
+            if connection is None:
+                self._accept()
+                continue
+            if events & selectors.EVENT_WRITE:
+                self._write(connection)
+            if events & selectors.EVENT_READ and reads < max_reads:
+                reads += self._read(connection, max_reads - reads)
+
+    def _accept(self):
+        try:
+            sock, peer_address = self._listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        addr = self._accepted_address(sock, peer_address)
+        previous = self._connections.get(addr)
+        if previous is not None:
+            self._close_connection(previous)
+        self._add_connection(sock, addr)
+
+    def _read(self, connection: _Connection, max_reads: int) -> int:
+        reads = 0
+        while reads < max_reads:
+            try:
+                data = connection.sock.recv(1 << 16)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                data = b''
+            reads += 1
+            if len(data) == 0:
+                self._close_connection(connection)
+                break
+            connection.inbuf += data
+            if not self._split_frames(connection):
+                self._close_connection(connection)
+                break
+        return reads
+
+    def _split_frames(self, connection: _Connection) -> bool:
+        """move the complete packets of the receive buffer to the received packets, False on a protocol error"""
+        offset = 0
+        inbuf = connection.inbuf
+        while True:
+            header = read_tlv_header(inbuf, offset)
+            if header is None:
+                break
+            _, length, value_offset = header
+            if value_offset - offset + length > self._max_frame_size:
+                return False
+            if value_offset + length > len(inbuf):
+                break
+            self._received.append((unframe(bytes(inbuf[offset:value_offset + length])), connection.address))
+            offset = value_offset + length
+        if offset > 0:
+            del inbuf[:offset]
+        return True
+
+    def _write(self, connection: _Connection):
+        try:
+            sent = connection.sock.send(connection.outbuf)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            self._close_connection(connection)
+            return
+        del connection.outbuf[:sent]
+        writing = len(connection.outbuf) > 0
+        if writing != connection.writing:
+            connection.writing = writing
+            events = selectors.EVENT_READ | selectors.EVENT_WRITE if writing else selectors.EVENT_READ
+            self._selector.modify(connection.sock, events, connection)
@@ -0,0 +1,27 @@
+"""Implementation of an Interface using TCP over IPv4 for communication"""
+
+import socket
+
+from PiCN.Layers.LinkLayer.Interfaces.StreamInterface import StreamInterface
+
+
+class TCP4Interface(StreamInterface):
+    """Implementation of an Interface using TCP over IPv4 for communication. Peers are addressed by (ip, port), an
+    accepted connection by the address of the connecting socket.
+    :param listen_port: port to accept connections on, 0 for any free port, None to only open connections
+    """
+
+    def __init__(self, listen_port: int=0, max_frame_size: int=1 << 24, max_buffer_size: int=1 << 16):
+        super().__init__(socket.AF_INET, None if listen_port is None else ("0.0.0.0", listen_port),
+                         max_frame_size=max_frame_size, max_buffer_size=max_buffer_size)
+
+    def get_port(self) -> int:
+        """Returns port on which the Interface is listening"""
+        return int(self._listener.getsockname()[1])
+
+    def _prepare_listener(self, sock: socket.socket):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+    def _prepare_connection(self, sock: socket.socket):
+        # packets are coalesced by the interface
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
@@ -25,6 +25,15 @@ class UDP4Interface(BaseInterface):
         data, addr = self.sock.recvfrom(self._buffersize)
         return data, addr
 
+    def receive_batch(self, max_items: int) -> list:
+        batch = [self.sock.recvfrom(self._buffersize)]
+        while len(batch) < max_items:
+            try:
+                batch.append(self.sock.recvfrom(self._buffersize, socket.MSG_DONTWAIT))
+            except (BlockingIOError, InterruptedError):
+                break
+        return batch
+
     @property
     def file_descriptor(self):
         return self.sock
@@ -0,0 +1,32 @@
+"""Implementation of an Interface using Unix domain stream sockets for communication"""
+
+import itertools
+import os
+import socket
+
+from PiCN.Layers.LinkLayer.Interfaces.StreamInterface import StreamInterface
+
+
+class UnixInterface(StreamInterface):
+    """Implementation of an Interface using Unix domain stream sockets for communication, e.g. between a forwarder and
+    applications on the same host. Peers are addressed by the path of their socket. Connections accepted from unbound
+    sockets are addressed by a generated address starting with '@'.
+    :param path: path of the socket to accept connections on, None to only open connections
+    """
+
+    def __init__(self, path: str=None, max_frame_size: int=1 << 24, max_buffer_size: int=1 << 16):
+        self.path = path
+        if path is not None and os.path.exists(path):
+            os.unlink(path)
+        self._accepted = itertools.count()
+        super().__init__(socket.AF_UNIX, path, max_frame_size=max_frame_size, max_buffer_size=max_buffer_size)
+
+    def close(self):
+        super().close()
+        if self.path is not None and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _accepted_address(self, sock: socket.socket, peer_address):
+        if peer_address:
+            return peer_address
+        return '@' + str(next(self._accepted))
@@ -3,6 +3,9 @@
 from .BaseInterface import AddressInfo
 from .BaseInterface import BaseInterface
 from .UDP4Interface import UDP4Interface
+from .StreamInterface import StreamInterface
+from .TCP4Interface import TCP4Interface
+from .UnixInterface import UnixInterface
 
 from .Simulation import SimulationInterface
 from .Simulation import SimulationBus
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""Test the TCP4 Interface"""
+
+import select
+import socket
+import unittest
+
+from PiCN.Layers.LinkLayer.Interfaces import TCP4Interface
+from PiCN.Layers.LinkLayer.Interfaces.StreamInterface import frame, unframe
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+from PiCN.Packets import Content, Interest
+
+
+class test_TCP4Interface(unittest.TestCase):
+    """Test the TCP4 Interface"""
+
+    def setUp(self):
+        self.interface1 = TCP4Interface(0)
+        self.interface2 = TCP4Interface(0)
+        self.encoder = NdnTlvEncoder()
+
+    def tearDown(self):
+        self.interface1.close()
+        self.interface2.close()
+
+    def receive(self, interface, count: int) -> list:
+        """receive count packets, waiting for the file descriptor like the link layer"""
+        received = []
+        while len(received) < count:
+            ready, _, _ = select.select([interface.file_descriptor], [], [], 2.0)
+            self.assertTrue(ready, "timeout")
+            received.extend(interface.receive_batch(32))
+        return received
+
+    def test_framing(self):
+        """test that TLV packets are sent as they are and other data as fragment of a LpPacket"""
+        interest = self.encoder.encode(Interest("/test/data"))
+        self.assertEqual(frame(interest), bytes(interest))
+        self.assertEqual(unframe(frame(interest)), bytes(interest))
+        self.assertEqual(frame(b"I:/test/data:"), b"\x64\x0f\x50\x0dI:/test/data:")
+        self.assertEqual(unframe(frame(b"I:/test/data:")), b"I:/test/data:")
+        large = b"x" * 70000
+        self.assertEqual(frame(large)[:2], b"\x64\xfe")
+        self.assertEqual(unframe(frame(large)), large)
+
+    def test_send_receive(self):
+        """test sending and receiving packets over a connection opened by send"""
+        peer = ("127.0.0.1", self.interface2.get_port())
+        packets = [self.encoder.encode(Interest("/test/data" + str(i))) for i in range(0, 10)] + [b"SimpleString"]
+        for packet in packets:
+            self.interface1.send(packet, peer)
+        self.interface1.flush()
+
+        received = self.receive(self.interface2, len(packets))
+        self.assertEqual([data for data, addr in received], [bytes(p) for p in packets])
+        addr = received[0][1]
+        self.assertEqual(self.interface2.get_connected_addresses(), [addr])
+
+        # the reply uses the accepted connection
+        self.interface2.send(b"Reply", addr)
+        self.interface2.flush()
+        self.assertEqual(self.receive(self.interface1, 1), [(b"Reply", peer)])
+        self.assertEqual(self.interface1.get_connected_addresses(), [peer])
+
+    def test_large_content(self):
+        """test that content larger than a datagram is received completely"""
+        content = self.encoder.encode(Content("/test/data", "x" * 200000))
+        self.interface1.send(content, ("127.0.0.1", self.interface2.get_port()))
+        self.interface1.flush()
+        received = []
+        while len(received) == 0:
+            # the sender writes the remaining data when its socket becomes writable
+            select.select([self.interface1.file_descriptor, self.interface2.file_descriptor], [], [], 2.0)
+            self.interface1.receive_batch(32)
+            received.extend(self.interface2.receive_batch(32))
+        self.assertEqual(received[0][0], bytes(content))
+        self.assertEqual(self.encoder.decode(received[0][0]).content, "x" * 200000)
+
+    def test_receive_from_socket(self):
+        """test receiving packets split over several segments from a plain socket, and the closing of a connection"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.connect(("127.0.0.1", self.interface1.get_port()))
+        packet = frame(self.encoder.encode(Interest("/test/data")))
+        sock.sendall(packet[:3])
+        select.select([self.interface1.file_descriptor], [], [], 2.0)
+        self.assertEqual(self.interface1.receive_batch(32), [])
+        sock.sendall(packet[3:] + packet)
+        received = self.receive(self.interface1, 2)
+        self.assertEqual([data for data, addr in received], [packet, packet])
+        self.assertEqual(received[0][1], sock.getsockname())
+        sock.close()
+        select.select([self.interface1.file_descriptor], [], [], 2.0)
+        self.interface1.receive_batch(32)
+        self.assertEqual(self.interface1.get_connected_addresses(), [])
+
+    def test_connection_refused(self):
+        """test that packets to an unreachable peer are dropped"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        self.interface1.send(b"HelloWorld", ("127.0.0.1", port))
+        self.interface1.flush()
+        self.assertEqual(self.interface1.get_connected_addresses(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
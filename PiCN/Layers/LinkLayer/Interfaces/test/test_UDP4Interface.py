@@ -1,6 +1,7 @@
 """Test the UDP4 Interface"""
 
 import socket
+import time
 import unittest
 
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface
@@ -50,4 +51,15 @@ class test_UDP4Interface(unittest.TestCase):
         data, addr = self.interface2.receive()
 
         self.assertEqual(data, b"HelloWorld")
-        self.assertEqual(addr, ("127.0.0.1", self.interface1.get_port()))
\ No newline at end of file
+        self.assertEqual(addr, ("127.0.0.1", self.interface1.get_port()))
+    def test_receive_batch(self):
+        "test receiving the available data without blocking"
+        for i in range(0, 5):
+            self.interface1.send(b"HelloWorld" + str(i).encode(), ("127.0.0.1", self.interface2.get_port()))
+        time.sleep(0.1)
+
+        batch = self.interface2.receive_batch(3)
+        self.assertEqual([data for data, addr in batch], [b"HelloWorld0", b"HelloWorld1", b"HelloWorld2"])
+        batch = self.interface2.receive_batch(10)
+        self.assertEqual([data for data, addr in batch], [b"HelloWorld3", b"HelloWorld4"])
+        self.assertEqual(batch[0][1], ("127.0.0.1", self.interface1.get_port()))
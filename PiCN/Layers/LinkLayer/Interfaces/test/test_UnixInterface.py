@@ -0,0 +1,50 @@
+"""Test the Unix Interface"""
+
+import os
+import select
+import tempfile
+import unittest
+
+from PiCN.Layers.LinkLayer.Interfaces import UnixInterface
+
+
+class test_UnixInterface(unittest.TestCase):
+    """Test the Unix Interface"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "picn.sock")
+        self.interface1 = UnixInterface(self.path)
+        self.interface2 = UnixInterface()
+
+    def tearDown(self):
+        self.interface1.close()
+        self.interface2.close()
+        self.directory.cleanup()
+
+    def test_send_receive(self):
+        """test sending data to a listening socket and replying over the accepted connection"""
+        self.interface2.send(b"HelloWorld", self.path)
+        self.interface2.flush()
+        select.select([self.interface1.file_descriptor], [], [], 2.0)
+        received = self.interface1.receive_batch(32)
+        while len(received) == 0:
+            select.select([self.interface1.file_descriptor], [], [], 2.0)
+            received = self.interface1.receive_batch(32)
+        data, addr = received[0]
+        self.assertEqual(data, b"HelloWorld")
+        self.assertTrue(addr.startswith("@"))
+
+        self.interface1.send(b"Reply", addr)
+        self.interface1.flush()
+        self.assertEqual(self.interface2.receive(), (b"Reply", self.path))
+
+    def test_close_removes_socket(self):
+        """test that closing the interface removes its socket"""
+        self.assertTrue(os.path.exists(self.path))
+        self.interface1.close()
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,14 @@
 
 import multiprocessing
 import socket
+import time
 import unittest
 
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
-from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo
+from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, TCP4Interface, AddressInfo
 from PiCN.Layers.LinkLayer import BasicLinkLayer
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact
+from PiCN.Packets import Name
 from PiCN.Processes import PiCNSyncDataStructFactory
 
 
@@ -198,4 +201,74 @@ class test_BasicLinkLayer(unittest.TestCase):
             self.assertEqual(data1_3[1].decode(), str1)
             self.assertEqual(data2_1[1].decode(), str2)
             self.assertEqual(data3_1[1].decode(), str3)
-            self.assertEqual(data3_2[1].decode(), str3)
\ No newline at end of file
+            self.assertEqual(data3_2[1].decode(), str3)
+
+    def test_receiving_bursts_on_several_interfaces(self):
+        """Test that bursts received on several interfaces are passed up with the interface they arrived on"""
+        udp4interface4 = UDP4Interface(0)
+        self.linklayer1.interfaces.append(udp4interface4)
+        self.linklayer1.receive_batch_size = 4
+        self.linklayer1.start_process()
+        for i in range(0, 20):
+            self.testSock.sendto(("HelloWorld" + str(i)).encode(), ("127.0.0.1", self.udp4interface1.get_port()))
+            self.testSock.sendto(("GoodBye" + str(i)).encode(), ("127.0.0.1", udp4interface4.get_port()))
+        received = {0: [], 1: []}
+        for i in range(0, 40):
+            faceid, packet = self.linklayer1.queue_to_higher.get(timeout=2.0)
+            interface_id = self.linklayer1.faceidtable.get_address_info(faceid).interface_id
+            received[interface_id].append(packet.decode())
+        self.assertEqual(received[0], ["HelloWorld" + str(i) for i in range(0, 20)])
+        self.assertEqual(received[1], ["GoodBye" + str(i) for i in range(0, 20)])
+
+    def test_sending_and_receiving_over_tcp(self):
+        """Test that link layers with TCP interfaces exchange packets larger than a datagram over one connection"""
+        tcp4interface1 = TCP4Interface(0)
+        tcp4interface2 = TCP4Interface(0)
+        linklayer4 = BasicLinkLayer([tcp4interface1], self.faceidtable1)
+        linklayer4.queue_to_higher = multiprocessing.Queue()
+        linklayer4.queue_from_higher = multiprocessing.Queue()
+        linklayer5 = BasicLinkLayer([tcp4interface2], self.faceidtable2)
+        linklayer5.queue_to_higher = multiprocessing.Queue()
+        linklayer5.queue_from_higher = multiprocessing.Queue()
+        fid = self.faceidtable1.get_or_create_faceid(AddressInfo(("127.0.0.1", tcp4interface2.get_port()), 0))
+        linklayer4.start_process()
+        linklayer5.start_process()
+        try:
+            for i in range(0, 10):
+                linklayer4.queue_from_higher.put([fid, ("HelloWorld" + str(i)).encode() * 2000])
+            for i in range(0, 10):
+                faceid, packet = linklayer5.queue_to_higher.get(timeout=2.0)
+                self.assertEqual(packet, ("HelloWorld" + str(i)).encode() * 2000)
+            self.assertEqual(self.faceidtable2.get_num_entries(), 1)
+            linklayer5.queue_from_higher.put([faceid, "GoodBye".encode()])
+            self.assertEqual(linklayer4.queue_to_higher.get(timeout=2.0), [fid, "GoodBye".encode()])
+        finally:
+            linklayer4.stop_process()
+            linklayer5.stop_process()
+
+    def test_removing_idle_faces(self):
+        """Test that faces without activity are removed from the face table and the PIT"""
+        synced_data_struct_factory = PiCNSyncDataStructFactory()
+        synced_data_struct_factory.register("faceidtable", FaceIDDict)
+        synced_data_struct_factory.register("pit", PendingInterstTableMemoryExact)
+        synced_data_struct_factory.create_manager()
+        faceidtable = synced_data_struct_factory.manager.faceidtable()
+        pit = synced_data_struct_factory.manager.pit()
+        udp4interface4 = UDP4Interface(0)
+        linklayer4 = BasicLinkLayer([udp4interface4], faceidtable, face_idle_timeout=0.5)
+        linklayer4.queue_to_higher = multiprocessing.Queue()
+        linklayer4.queue_from_higher = multiprocessing.Queue()
+        linklayer4.pits = [pit]
+        static_fid = faceidtable.get_or_create_faceid(AddressInfo(("127.0.0.1", 1), 0), static=True)
+        linklayer4.start_process()
+        try:
+            self.testSock.sendto("HelloWorld".encode(), ("127.0.0.1", udp4interface4.get_port()))
+            fid, packet = linklayer4.queue_to_higher.get(timeout=2.0)
+            pit.add_pit_entry(Name("/test/data"), fid, static_fid)
+            self.assertEqual(faceidtable.get_num_entries(), 2)
+            time.sleep(1.5)
+            self.assertIsNone(faceidtable.get_address_info(fid))
+            self.assertIsNotNone(faceidtable.get_address_info(static_fid))
+            self.assertIsNone(pit.find_pit_entry(Name("/test/data")))
+        finally:
+            linklayer4.stop_process()
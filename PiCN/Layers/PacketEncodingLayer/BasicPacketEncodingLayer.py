@@ -1,16 +1,26 @@
 """ De- and Encoding Layer, using a predefined Encoder """
 
 import multiprocessing
+from collections import OrderedDict
+
 from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
+from PiCN.Packets import Content
 from PiCN.Processes import LayerProcess
 
 
 class BasicPacketEncodingLayer(LayerProcess):
-    """ De- and Encoding Layer, using a predefined Encoder """
+    """ De- and Encoding Layer, using a predefined Encoder.
+    Packets which carry a wire format are passed through unchanged. The wire format of content objects without one
+    (e.g. produced by a local repository) is cached, so that a content object served repeatedly from the content store
+    is encoded only once.
+    :param wire_format_cache_size: maximum number of cached content object wire formats, 0 to disable the cache
+    """
 
-    def __init__(self, encoder: BasicEncoder=None, log_level=255):
+    def __init__(self, encoder: BasicEncoder=None, log_level=255, wire_format_cache_size: int=1024):
         LayerProcess.__init__(self, logger_name="PktEncLayer", log_level=log_level)
         self._encoder: BasicEncoder = encoder
+        self._wire_format_cache_size = wire_format_cache_size
+        self._wire_format_cache: OrderedDict = OrderedDict()
 
     @property
     def encoder(self):
@@ -19,6 +29,7 @@ class BasicPacketEncodingLayer(LayerProcess):
     @encoder.setter
     def encoder(self, encoder):
         self._encoder = encoder
+        self._wire_format_cache.clear()
 
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         face_id, packet = self.check_data(data)
@@ -44,7 +55,20 @@ class BasicPacketEncodingLayer(LayerProcess):
 
     def encode(self, data):
         self.logger.info("Encode packet")
-        return self._encoder.encode(data)
+        if not isinstance(data, Content) or data.wire_format is not None or data.no_cache or \
+                self._wire_format_cache_size <= 0:
+            return self._encoder.encode(data)
+        cached = self._wire_format_cache.get(data.name)
+        if cached is not None and cached[0] == data.get_bytes():
+            self._wire_format_cache.move_to_end(data.name)
+            return cached[1]
+        encoded = self._encoder.encode(data)
+        if encoded is not None:
+            self._wire_format_cache[data.name] = (data.get_bytes(), encoded)
+            self._wire_format_cache.move_to_end(data.name)
+            if len(self._wire_format_cache) > self._wire_format_cache_size:
+                self._wire_format_cache.popitem(last=False)
+        return encoded
 
     def decode(self, data):
         self.logger.info("Decode packet")
@@ -70,19 +70,22 @@ class NdnTlvEncoder(BasicEncoder):
         """
         if isinstance(packet, Interest):
             self.logger.info("Encode interest")
-            if isinstance(packet.wire_format, bytes):
+            if isinstance(packet.wire_format, (bytes, bytearray)):
                 return packet.wire_format
             else:
                 return self.encode_interest(packet.name)
         if isinstance(packet, Content):
             self.logger.info("Encode content object")
-            if isinstance(packet.wire_format, bytes):
-                return packet.wire_format
+            if isinstance(packet.wire_format, (bytes, bytearray)):
+                wire_data = packet.wire_format
             else:
-                return self.encode_data(packet.name, packet.get_bytes())
+                wire_data = self.encode_data(packet.name, packet.get_bytes())
+            if packet.no_cache:
+                return self.encode_no_cache(wire_data)
+            return wire_data
         if isinstance(packet, Nack):
             self.logger.info("Encode NACK")
-            if isinstance(packet.wire_format, bytes):
+            if isinstance(packet.wire_format, (bytes, bytearray)):
                 return packet.wire_format
             else:
                 return self.encode_nack(packet.name, packet.reason, packet.interest)
@@ -121,6 +124,19 @@ class NdnTlvEncoder(BasicEncoder):
             except:
                 self.logger.info("Decoding failed (malformed packet)")
                 return UnknownPacket(wire_format=wire_data)
+        if(self.is_lp_packet(wire_data)):
+            self.logger.info("Decode link packet")
+            try:
+                (fragment, no_cache) = self.decode_lp_packet(wire_data)
+                if not self.is_content(fragment):
+                    return UnknownPacket(wire_format=wire_data)
+                (name, payload) = self.decode_data(fragment)
+                content = Content(name, payload, fragment)
+                content.no_cache = no_cache
+                return content
+            except:
+                self.logger.info("Decoding failed (malformed packet)")
+                return UnknownPacket(wire_format=wire_data)
         else:
             self.logger.info("Decode failed (unknown packet type)")
             return UnknownPacket(wire_format=wire_data)
@@ -218,6 +234,24 @@ class NdnTlvEncoder(BasicEncoder):
         encoder.writeTypeAndLength(Tlv.LpPacket_LpPacket, len(encoder))
         return encoder.getOutput().tobytes()
 
+    def encode_no_cache(self, wire_data: bytearray) -> bytearray:
+        """
+        Wrap a data packet in a link packet carrying a CachePolicy NoCache field (NDNLPv2)
+        :param wire_data: Data-TLV
+        :return: LpPacket-TLV
+        """
+        encoder = TlvEncoder()
+        # write fragment (data packet)
+        encoder.writeBuffer(wire_data)
+        encoder.writeTypeAndLength(Tlv.LpPacket_Fragment, len(wire_data))
+        fragment_len = len(encoder)
+        # write cache policy
+        encoder.writeNonNegativeIntegerTlv(Tlv.LpPacket_CachePolicyType, 1)  # NoCache
+        encoder.writeTypeAndLength(Tlv.LpPacket_CachePolicy, len(encoder) - fragment_len)
+        # write link packet header
+        encoder.writeTypeAndLength(Tlv.LpPacket_LpPacket, len(encoder))
+        return encoder.getOutput().tobytes()
+
     def encode_nack_reason(self, reason: NackReason) -> bytearray:
         """
         Encode a NackReason
@@ -312,6 +346,29 @@ class NdnTlvEncoder(BasicEncoder):
             reason = NackReason.NOT_SET
         return (name, reason)
 
+    def decode_lp_packet(self, input: bytearray) -> (bytearray, bool):
+        """
+        Decode a link packet without NACK header
+        :param input: LpPacket in NDN-TLV wire format
+        :return: Fragment and True if the CachePolicy is NoCache
+        """
+        decoder = TlvDecoder(input)
+        end_offset = decoder.readNestedTlvsStart(Tlv.LpPacket_LpPacket)
+        no_cache = False
+        fragment = None
+        while decoder.getOffset() < end_offset:
+            if decoder.peekType(Tlv.LpPacket_CachePolicy, end_offset):
+                policy_end_offset = decoder.readNestedTlvsStart(Tlv.LpPacket_CachePolicy)
+                no_cache = decoder.readNonNegativeIntegerTlv(Tlv.LpPacket_CachePolicyType) == 1
+                decoder.finishNestedTlvs(policy_end_offset)
+            elif decoder.peekType(Tlv.LpPacket_Fragment, end_offset):
+                fragment = decoder.readBlobTlv(Tlv.LpPacket_Fragment).tobytes()
+            else:
+                # skip unknown header fields
+                decoder.readVarNumber()
+                decoder.seek(decoder.getOffset() + decoder.readVarNumber())
+        return (fragment, no_cache)
+
     def is_content(self, input: bytearray) -> bool:
         """
         Checks if content object packet
@@ -334,6 +391,17 @@ class NdnTlvEncoder(BasicEncoder):
         except:
             return False
 
+    def is_lp_packet(self, input: bytearray) -> bool:
+        """
+        Checks if link packet
+        :param input:  Packet in NDN-TLV wire format
+        :return: True if link packet
+        """
+        try:
+            return input[0] == Tlv.LpPacket_LpPacket
+        except:
+            return False
+
     def is_nack(selfself, input: bytearray) -> bool:
         """
         Checks if NACK packet
@@ -0,0 +1,376 @@
+"""NDN TLV Encoder writing and parsing packets in place"""
+
+import hashlib
+import os
+import struct
+
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+from PiCN.Packets import Packet, Content, Interest, Nack, NackReason, Name, UnknownPacket
+
+from PiCNExternal.pyndn.encoding.tlv.tlv.tlv import Tlv
+
+
+_UINT16 = struct.Struct('!H')
+_UINT32 = struct.Struct('!I')
+_UINT64 = struct.Struct('!Q')
+
+_SIGNATURE_INFO = bytes([Tlv.SignatureType, 1, 0])  # DigestSha256
+_SIGNATURE_SIZE = 32
+
+
+def _varnum_size(value: int) -> int:
+    """number of bytes of a VAR-NUMBER"""
+    if value < 253:
+        return 1
+    if value <= 0xFFFF:
+        return 3
+    if value <= 0xFFFFFFFF:
+        return 5
+    return 9
+
+
+def _tlv_size(tlv_type: int, length: int) -> int:
+    """number of bytes of a TLV element with a value of the given length"""
+    return _varnum_size(tlv_type) + _varnum_size(length) + length
+
+
+def _write_varnum(buffer: bytearray, offset: int, value: int) -> int:
+    """write a VAR-NUMBER, returns the offset behind it"""
+    if value < 253:
+        buffer[offset] = value
+        return offset + 1
+    if value <= 0xFFFF:
+        buffer[offset] = 253
+        _UINT16.pack_into(buffer, offset + 1, value)
+        return offset + 3
+    if value <= 0xFFFFFFFF:
+        buffer[offset] = 254
+        _UINT32.pack_into(buffer, offset + 1, value)
+        return offset + 5
+    buffer[offset] = 255
+    _UINT64.pack_into(buffer, offset + 1, value)
+    return offset + 9
+
+
+def _write_header(buffer: bytearray, offset: int, tlv_type: int, length: int) -> int:
+    """write type and length of a TLV element, returns the offset of the value"""
+    return _write_varnum(buffer, _write_varnum(buffer, offset, tlv_type), length)
+
+
+def _write_tlv(buffer: bytearray, offset: int, tlv_type: int, value) -> int:
+    """write a TLV element, returns the offset behind it"""
+    offset = _write_header(buffer, offset, tlv_type, len(value))
+    end = offset + len(value)
+    buffer[offset:end] = value
+    return end
+
+
+def _read_varnum(buffer, offset: int, end: int) -> (int, int):
+    """read a VAR-NUMBER, returns the number and the offset behind it"""
+    if offset >= end:
+        raise ValueError("TLV element exceeds its enclosing element")
+    first = buffer[offset]
+    if first < 253:
+        return first, offset + 1
+    size = 1 << (first - 252)
+    if offset + 1 + size > end:
+        raise ValueError("TLV element exceeds its enclosing element")
+    return int.from_bytes(buffer[offset + 1:offset + 1 + size], 'big'), offset + 1 + size
+
+
+def _read_header(buffer, offset: int, end: int) -> (int, int, int):
+    """read type and length of a TLV element, returns the type, the offset of the value and the offset behind it"""
+    if offset + 1 < end and buffer[offset] < 253 and buffer[offset + 1] < 253:
+        # type and length of a single byte each, as for name components
+        tlv_type = buffer[offset]
+        offset += 2
+        value_end = offset + buffer[offset - 1]
+    else:
+        tlv_type, offset = _read_varnum(buffer, offset, end)
+        length, offset = _read_varnum(buffer, offset, end)
+        value_end = offset + length
+    if value_end > end:
+        raise ValueError("TLV element exceeds its enclosing element")
+    return tlv_type, offset, value_end
+
+
+def _read_expected_header(buffer, offset: int, end: int, expected_type: int) -> (int, int):
+    """read type and length of a TLV element of a given type, returns the offset of the value and the offset behind
+    it"""
+    tlv_type, offset, value_end = _read_header(buffer, offset, end)
+    if tlv_type != expected_type:
+        raise ValueError("Did not get the expected TLV type " + str(expected_type))
+    return offset, value_end
+
+
+class NdnTlvFastEncoder(NdnTlvEncoder):
+    """
+    Packet Encoder for NDN-TLV, producing the same wire format as NdnTlvEncoder without the pyndn TlvEncoder and
+    TlvDecoder: the sizes of all elements of a packet are computed first, then the packet is written front to back
+    into a buffer of its final size. Received packets are parsed in place, the decode_* helpers return memoryview
+    slices of the received packet. Only the name components and the payload of a decoded packet are copied, since
+    PiCN's packets hold bytes. An interest gets a nonce from a single os.urandom call.
+    """
+
+    __nack_reason_values = NdnTlvEncoder._NdnTlvEncoder__nack_reason_values
+    __nack_reason_enum = NdnTlvEncoder._NdnTlvEncoder__nack_reason_enum
+
+    def __init__(self, log_level=255):
+        super().__init__(log_level=log_level)
+
+    def decode(self, wire_data) -> Packet:
+        """
+        NDN TLV wire format packet to python object (PiCN's internal representation)
+        :param wire_data: Packet in wire format (NDN TLV representation)
+        :return: Packet in PiCN's internal representation
+        """
+        if self.is_content(wire_data):
+            self.logger.info("Decode content object")
+            try:
+                (name, payload) = self.decode_data(wire_data)
+                return Content(name, bytes(payload), wire_data)
+            except:
+                self.logger.info("Decoding failed (malformed packet)")
+                return UnknownPacket(wire_format=wire_data)
+        if self.is_interest(wire_data):
+            self.logger.info("Decode interest")
+            try:
+                return Interest(self.decode_interest(wire_data), wire_data)
+            except:
+                self.logger.info("Decoding failed (malformed packet)")
+                return UnknownPacket(wire_format=wire_data)
+        if self.is_nack(wire_data):
+            self.logger.info("Decode NACK")
+            try:
+                (name, reason) = self.decode_nack(wire_data)
+                return Nack(name, reason, None, wire_format=wire_data)
+            except:
+                self.logger.info("Decoding failed (malformed packet)")
+                return UnknownPacket(wire_format=wire_data)
+        if self.is_lp_packet(wire_data):
+            self.logger.info("Decode link packet")
+            try:
+                (fragment, no_cache) = self.decode_lp_packet(wire_data)
+                if not self.is_content(fragment):
+                    return UnknownPacket(wire_format=wire_data)
+                (name, payload) = self.decode_data(fragment)
+                content = Content(name, bytes(payload), bytes(fragment))
+                content.no_cache = no_cache
+                return content
+            except:
+                self.logger.info("Decoding failed (malformed packet)")
+                return UnknownPacket(wire_format=wire_data)
+        self.logger.info("Decode failed (unknown packet type)")
+        return UnknownPacket(wire_format=wire_data)
+
+    ### Helpers ###
+
+    def encode_name(self, name: Name) -> bytearray:
+        """
+        Assembly a name-TLV
+        :param name: Name
+        :return: Name-TLV
+        """
+        size = self._name_size(name)
+        buffer = bytearray(_tlv_size(Tlv.Name, size))
+        self._write_name(buffer, 0, name, size)
+        return buffer
+
+    def encode_interest(self, name: Name) -> bytearray:
+        """
+        Assembly an interest packet
+        :param name: Name
+        :return: Interest-TLV
+        """
+        name_size = self._name_size(name)
+        size = _tlv_size(Tlv.Name, name_size) + _tlv_size(Tlv.Nonce, 4)
+        buffer = bytearray(_tlv_size(Tlv.Interest, size))
+        offset = _write_header(buffer, 0, Tlv.Interest, size)
+        offset = self._write_name(buffer, offset, name, name_size)
+        _write_tlv(buffer, offset, Tlv.Nonce, os.urandom(4))
+        return buffer
+
+    def encode_data(self, name: Name, payload: bytearray) -> bytearray:
+        """
+        Assembly a data packet including a signature according to NDN packet format specification 0.3 (DigestSha256).
+        :param name: Name
+        :param payload: Payload
+        :return: Data-TLV
+        """
+        name_size = self._name_size(name)
+        size = _tlv_size(Tlv.Name, name_size) + _tlv_size(Tlv.MetaInfo, 0) + _tlv_size(Tlv.Content, len(payload)) \
+            + _tlv_size(Tlv.SignatureInfo, len(_SIGNATURE_INFO)) + _tlv_size(Tlv.SignatureValue, _SIGNATURE_SIZE)
+        buffer = bytearray(_tlv_size(Tlv.Data, size))
+        offset = _write_header(buffer, 0, Tlv.Data, size)
+        offset = self._write_name(buffer, offset, name, name_size)
+        offset = _write_header(buffer, offset, Tlv.MetaInfo, 0)
+        offset = _write_tlv(buffer, offset, Tlv.Content, payload)
+        offset = _write_tlv(buffer, offset, Tlv.SignatureInfo, _SIGNATURE_INFO)
+        offset = _write_header(buffer, offset, Tlv.SignatureValue, _SIGNATURE_SIZE)
+        buffer[offset:] = hashlib.sha256(memoryview(buffer)[:offset]).digest()
+        return buffer
+
+    def encode_nack(self, name: Name, reason: NackReason, interest: Interest) -> bytearray:
+        """
+        Assembly a negative acknowledgement packet
+        :param name: Name carried by interest for which this NACK is generated
+        :param reason: Nack reason
+        :param interest: Interest for which this NACk is generated
+        :return:  NACK-TLV
+        """
+        if interest.wire_format is None:
+            interest._wire_format = self.encode(interest)
+        wire_reason = None
+        nack_size = 0
+        if reason is not NackReason.NOT_SET:
+            wire_reason = self.encode_nack_reason(reason)
+            nack_size = _tlv_size(Tlv.LpPacket_NackReason, len(wire_reason))
+        size = _tlv_size(Tlv.LpPacket_Nack, nack_size) + _tlv_size(Tlv.LpPacket_Fragment, len(interest.wire_format))
+        buffer = bytearray(_tlv_size(Tlv.LpPacket_LpPacket, size))
+        offset = _write_header(buffer, 0, Tlv.LpPacket_LpPacket, size)
+        offset = _write_header(buffer, offset, Tlv.LpPacket_Nack, nack_size)
+        if wire_reason is not None:
+            offset = _write_tlv(buffer, offset, Tlv.LpPacket_NackReason, wire_reason)
+        _write_tlv(buffer, offset, Tlv.LpPacket_Fragment, interest.wire_format)
+        return buffer
+
+    def encode_no_cache(self, wire_data: bytearray) -> bytearray:
+        """
+        Wrap a data packet in a link packet carrying a CachePolicy NoCache field (NDNLPv2)
+        :param wire_data: Data-TLV
+        :return: LpPacket-TLV
+        """
+        policy_size = _tlv_size(Tlv.LpPacket_CachePolicyType, 1)
+        size = _tlv_size(Tlv.LpPacket_CachePolicy, policy_size) + _tlv_size(Tlv.LpPacket_Fragment, len(wire_data))
+        buffer = bytearray(_tlv_size(Tlv.LpPacket_LpPacket, size))
+        offset = _write_header(buffer, 0, Tlv.LpPacket_LpPacket, size)
+        offset = _write_header(buffer, offset, Tlv.LpPacket_CachePolicy, policy_size)
+        offset = _write_tlv(buffer, offset, Tlv.LpPacket_CachePolicyType, b'\x01')  # NoCache
+        _write_tlv(buffer, offset, Tlv.LpPacket_Fragment, wire_data)
+        return buffer
+
+    def encode_nack_reason(self, reason: NackReason) -> bytearray:
+        """
+        Encode a NackReason
+        :param reason: NackReason
+        :return: Nack reason in wire format
+        """
+        value = self.__nack_reason_values[reason]
+        buffer = bytearray(_varnum_size(value))
+        _write_varnum(buffer, 0, value)
+        return buffer
+
+    def decode_interest(self, input: bytearray) -> Name:
+        """
+        Decode an interest packet
+        :param input: Interest packet in NDN-TLV wire format
+        :return: Name
+        """
+        offset, end = _read_expected_header(input, 0, len(input), Tlv.Interest)
+        offset, end = _read_expected_header(input, offset, end, Tlv.Name)
+        return self._decode_name(input, offset, end)
+
+    def decode_data(self, input: bytearray) -> (Name, memoryview):
+        """
+        Decodes a data packet
+        :param input: Data packet in NDN-TLV wire format
+        :return: Name and payload, the payload is a slice of the input
+        """
+        offset, end = _read_expected_header(input, 0, len(input), Tlv.Data)
+        name_offset, offset = _read_expected_header(input, offset, end, Tlv.Name)
+        name = self._decode_name(input, name_offset, offset)
+        tlv_type, offset, value_end = _read_header(input, offset, end)
+        if tlv_type == Tlv.MetaInfo:
+            tlv_type, offset, value_end = _read_header(input, value_end, end)
+        if tlv_type != Tlv.Content:
+            raise ValueError("Did not get the expected TLV type " + str(Tlv.Content))
+        return name, memoryview(input)[offset:value_end]
+
+    def decode_nack(self, input: bytearray) -> (Name, NackReason):
+        """
+        Decode NACK packet
+        :param input: Data packet in NDN-TLV wire format
+        :return: Name
+        """
+        offset, end = _read_expected_header(input, 0, len(input), Tlv.LpPacket_LpPacket)
+        name = None
+        reason = NackReason.NOT_SET
+        while offset < end:
+            tlv_type, offset, value_end = _read_header(input, offset, end)
+            if tlv_type == Tlv.LpPacket_Nack and value_end > offset:
+                offset, reason_end = _read_expected_header(input, offset, value_end, Tlv.LpPacket_NackReason)
+                reason = self.__nack_reason_enum[_read_varnum(input, offset, reason_end)[0]]
+            elif tlv_type == Tlv.LpPacket_Fragment:
+                name = self.decode_interest(memoryview(input)[offset:value_end])
+            offset = value_end
+        if name is None:
+            raise ValueError("NACK without fragment")
+        return (name, reason)
+
+    def decode_lp_packet(self, input: bytearray) -> (memoryview, bool):
+        """
+        Decode a link packet without NACK header
+        :param input: LpPacket in NDN-TLV wire format
+        :return: Fragment as slice of the input and True if the CachePolicy is NoCache
+        """
+        offset, end = _read_expected_header(input, 0, len(input), Tlv.LpPacket_LpPacket)
+        no_cache = False
+        fragment = None
+        while offset < end:
+            tlv_type, offset, value_end = _read_header(input, offset, end)
+            if tlv_type == Tlv.LpPacket_CachePolicy:
+                offset, policy_end = _read_expected_header(input, offset, value_end, Tlv.LpPacket_CachePolicyType)
+                no_cache = int.from_bytes(input[offset:policy_end], 'big') == 1
+            elif tlv_type == Tlv.LpPacket_Fragment:
+                fragment = memoryview(input)[offset:value_end]
+            # unknown header fields are skipped
+            offset = value_end
+        return (fragment, no_cache)
+
+    def is_nack(self, input: bytearray) -> bool:
+        """
+        Checks if NACK packet, the header of the link packet is parsed, so that the length may have any size
+        :param input:  Packet in NDN-TLV wire format
+        :return: True if NACK
+        """
+        try:
+            if input[0] != Tlv.LpPacket_LpPacket:
+                return False
+            _, offset = _read_varnum(input, 1, len(input))
+            return _read_varnum(input, offset, len(input))[0] == Tlv.LpPacket_Nack
+        except:
+            return False
+
+    def _name_size(self, name: Name) -> int:
+        """length of the value of a name-TLV"""
+        size = 0
+        for c in name._components:
+            size += _tlv_size(Tlv.NameComponent, len(c))
+        if name.digest:
+            size += _tlv_size(Tlv.ImplicitSha256DigestComponent, len(name.digest))
+        return size
+
+    def _write_name(self, buffer: bytearray, offset: int, name: Name, size: int) -> int:
+        """write a name-TLV whose value has the given size, returns the offset behind it"""
+        offset = _write_header(buffer, offset, Tlv.Name, size)
+        for c in name._components:
+            offset = _write_tlv(buffer, offset, Tlv.NameComponent, c)
+        if name.digest:
+            offset = _write_tlv(buffer, offset, Tlv.ImplicitSha256DigestComponent, name.digest)
+        return offset
+
+    def _decode_name(self, buffer, offset: int, end: int) -> Name:
+        """decode the value of a name-TLV, the components are copied"""
+        components = []
+        digest = None
+        while offset < end:
+            tlv_type, offset, value_end = _read_header(buffer, offset, end)
+            component = buffer[offset:value_end]
+            if type(component) is not bytes:
+                component = bytes(component)
+            if tlv_type == Tlv.ImplicitSha256DigestComponent:
+                digest = component
+            else:
+                components.append(component)
+            offset = value_end
+        return Name(components).setDigest(digest)
@@ -18,7 +18,7 @@ class SimpleStringEncoder(BasicEncoder):
             self.logger.info("Encode content object")
             content = packet.content
             content = content.replace(":", "%58")
-            res = "C:" + name.to_string() + ":" + ":" + content
+            res = "C:" + name.to_string() + ":" + ("NoCache" if packet.no_cache else "") + ":" + content
         elif(isinstance(packet, Nack)):
             self.logger.info("Encode NACK")
             res = "N:" + name.to_string() + ":" + ":" + packet.reason.value
@@ -38,7 +38,9 @@ class SimpleStringEncoder(BasicEncoder):
             self.logger.info("Decode content object")
             name = data.split(":")[1]
             content = data.split(":")[3].replace("%58", ":")
-            return Content(self.unescape_name(Name(name)), content)
+            content = Content(self.unescape_name(Name(name)), content)
+            content.no_cache = data.split(":")[2] == "NoCache"
+            return content
         elif data[0] == "N":
             self.logger.info("Decode NACK")
             name = data.split(":")[1]
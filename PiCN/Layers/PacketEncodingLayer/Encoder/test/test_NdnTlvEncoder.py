@@ -51,4 +51,33 @@ class test_NdnTlvEncoder(unittest.TestCase):
         self.assertFalse(self.encoder.is_content(enc_n1))
         self.assertTrue(self.encoder.is_nack(enc_n1))
         dec_n1 = self.encoder.decode(enc_n1)
-        self.assertEqual(dec_n1, n1)
\ No newline at end of file
+        self.assertEqual(dec_n1, n1)
+    def test_Content_Creation_wireformat_passthrough(self):
+        """Test that a given wireformat (bytes or bytearray) is returned unchanged"""
+        enc_c1 = self.encoder.encode(Content("/test/data", "HelloWorld"))
+        c1 = self.encoder.decode(enc_c1)
+        self.assertIs(self.encoder.encode(c1), enc_c1)
+        c2 = Content("/test/data", "HelloWorld", bytearray(enc_c1))
+        self.assertIs(self.encoder.encode(c2), c2.wire_format)
+
+    def test_Content_no_cache(self):
+        """Test that the NoCache hint is carried in a link packet around the unchanged data packet"""
+        c1 = Content("/test/data", "HelloWorld")
+        enc_c1 = self.encoder.encode(c1)
+        c1.no_cache = True
+        enc_lp = self.encoder.encode(c1)
+        self.assertEqual(enc_lp[0], 0x64)
+        self.assertFalse(self.encoder.is_content(enc_lp))
+        self.assertFalse(self.encoder.is_nack(enc_lp))
+        dec_c1 = self.encoder.decode(enc_lp)
+        self.assertEqual(dec_c1, c1)
+        self.assertTrue(dec_c1.no_cache)
+        self.assertEqual(dec_c1.wire_format, enc_c1)
+        dec_c1.no_cache = False
+        self.assertEqual(self.encoder.encode(dec_c1), enc_c1)
+        # large payload with multi byte length fields
+        c2 = Content("/test/data", "x" * 1000)
+        c2.no_cache = True
+        dec_c2 = self.encoder.decode(self.encoder.encode(c2))
+        self.assertEqual(dec_c2, c2)
+        self.assertTrue(dec_c2.no_cache)
@@ -0,0 +1,86 @@
+"""Test the NdnTlvFastEncoder"""
+
+import unittest
+
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder, NdnTlvFastEncoder
+from PiCN.Packets import Content, Interest, Nack, NackReason, Name, UnknownPacket
+
+class test_NdnTlvFastEncoder(unittest.TestCase):
+    """Test the NdnTlvFastEncoder"""
+
+    def setUp(self):
+        self.encoder = NdnTlvFastEncoder()
+        self.reference = NdnTlvEncoder()
+        self.names = [Name("/test/data"), Name("/"), Name("/a" * 200), Name("/test/" + "x" * 300),
+                      Name("/test/data").setDigest(bytes(range(32)))]
+
+    def tearDown(self):
+        pass
+
+    def test_same_wire_format_as_NdnTlvEncoder(self):
+        """Test that names, data packets, nacks and link packets are encoded like by the NdnTlvEncoder"""
+        for name in self.names:
+            self.assertEqual(self.encoder.encode_name(name), self.reference.encode_name(name))
+            for payload in [b"", b"HelloWorld", b"x" * 1000, b"y" * 70000]:
+                self.assertEqual(self.encoder.encode_data(name, payload), self.reference.encode_data(name, payload))
+            interest = Interest(name, self.reference.encode_interest(name))
+            for reason in [NackReason.NOT_SET, NackReason.NO_ROUTE, NackReason.PIT_TIMEOUT]:
+                self.assertEqual(self.encoder.encode(Nack(name, reason, interest)),
+                                 self.reference.encode(Nack(name, reason, interest)))
+            content = Content(name, "HelloWorld")
+            content.no_cache = True
+            self.assertEqual(self.encoder.encode(content), self.reference.encode(content))
+
+    def test_interest_nonce(self):
+        """Test that interests differ from the NdnTlvEncoder's in the nonce only"""
+        for name in self.names:
+            enc_i1 = self.encoder.encode_interest(name)
+            enc_i2 = self.encoder.encode_interest(name)
+            ref_i1 = self.reference.encode_interest(name)
+            self.assertEqual(enc_i1[:-4], ref_i1[:-4])
+            self.assertEqual(enc_i1[-6:-4], b"\x0a\x04")
+            self.assertNotEqual(enc_i1[-4:], enc_i2[-4:])
+
+    def test_decoding_packets_of_NdnTlvEncoder(self):
+        """Test that packets are decoded like by the NdnTlvEncoder"""
+        for name in self.names:
+            i1 = Interest(name)
+            c1 = Content(name, "HelloWorld")
+            n1 = Nack(name, NackReason.COMP_EXCEPTION, interest=i1)
+            c2 = Content(name, "x" * 70000)
+            c2.no_cache = True
+            for packet in [i1, c1, n1, c2]:
+                wire_data = self.reference.encode(packet)
+                decoded = self.encoder.decode(wire_data)
+                self.assertEqual(decoded, packet)
+                self.assertEqual(decoded.name.digest, name.digest)
+                reference_decoded = self.reference.decode(wire_data)
+                if not isinstance(reference_decoded, UnknownPacket):
+                    # NdnTlvEncoder does not recognize nacks longer than 252 bytes
+                    self.assertEqual(decoded, reference_decoded)
+            self.assertEqual(self.encoder.decode(self.reference.encode(n1)).reason, NackReason.COMP_EXCEPTION)
+            self.assertTrue(self.encoder.decode(self.reference.encode(c2)).no_cache)
+
+    def test_decoding_returns_slices(self):
+        """Test that the decode helpers return slices of the input instead of copies"""
+        wire_data = self.reference.encode(Content("/test/data", "HelloWorld"))
+        name, payload = self.encoder.decode_data(wire_data)
+        self.assertIsInstance(payload, memoryview)
+        self.assertIs(payload.obj, wire_data)
+        self.assertEqual(payload, b"HelloWorld")
+        self.assertEqual(name, Name("/test/data"))
+        c1 = Content("/test/data", "HelloWorld")
+        c1.no_cache = True
+        wire_data = self.reference.encode(c1)
+        fragment, no_cache = self.encoder.decode_lp_packet(wire_data)
+        self.assertIs(fragment.obj, wire_data)
+        self.assertTrue(no_cache)
+        self.assertEqual(fragment, self.reference.encode(Content("/test/data", "HelloWorld")))
+
+    def test_malformed_packets(self):
+        """Test that truncated packets are decoded to UnknownPackets"""
+        for packet in [Interest("/test/data"), Content("/test/data", "HelloWorld"),
+                       Nack("/test/data", NackReason.NO_ROUTE, interest=Interest("/test/data"))]:
+            wire_data = self.encoder.encode(packet)
+            self.assertIsInstance(self.encoder.decode(bytes(wire_data[:-1])), UnknownPacket)
+            self.assertIsInstance(self.encoder.decode(bytes(wire_data[:3])), UnknownPacket)
@@ -74,4 +74,15 @@ class test_SimpleStringEncoder(unittest.TestCase):
         n = Nack("/data/test", NackReason.NO_CONTENT, interest=interest)
         en = self.encoder1.encode(n)
         dn = self.encoder1.decode(en)
-        self.assertTrue(n == dn)
\ No newline at end of file
+        self.assertTrue(n == dn)
+
+    def test_Encoder_content_no_cache(self):
+        """Test that the NoCache hint of a content object is encoded"""
+        c = Content("/test/data", "HelloWorld")
+        c.no_cache = True
+        ec = self.encoder1.encode(c)
+        self.assertEqual(ec, "C:/test/data:NoCache:HelloWorld".encode())
+        dc = self.encoder1.decode(ec)
+        self.assertEqual(dc, c)
+        self.assertTrue(dc.no_cache)
+        self.assertFalse(self.encoder1.decode(self.encoder1.encode(Content("/test/data", "HelloWorld"))).no_cache)
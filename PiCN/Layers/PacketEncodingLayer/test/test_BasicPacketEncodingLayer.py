@@ -150,6 +150,28 @@ class cases_BasicPacketEncodingLayer(object):
         self.assertEqual(rc, c)
 
 
+    def test_BasicPacketEncodingLayer_wire_format_cache(self):
+        """Test that content objects without wire format are encoded only once"""
+        encoded = []
+        encode = self.encoder1.encode
+        def counting_encode(packet):
+            encoded.append(packet)
+            return encode(packet)
+        self.encoder1.encode = counting_encode
+        c1 = Content("/test/data", "HelloWorld")
+        ec1 = self.packetEncodingLayer1.encode(c1)
+        self.assertEqual(self.packetEncodingLayer1.encode(Content("/test/data", "HelloWorld")), ec1)
+        self.assertEqual(len(encoded), 1)
+        # changed payload is encoded again
+        ec2 = self.packetEncodingLayer1.encode(Content("/test/data", "HelloWorld2"))
+        self.assertNotEqual(ec1, ec2)
+        self.assertEqual(len(encoded), 2)
+        # interests are not cached
+        self.packetEncodingLayer1.encode(Interest("/test/data"))
+        self.packetEncodingLayer1.encode(Interest("/test/data"))
+        self.assertEqual(len(encoded), 4)
+
+
 class test_BasicPacketEncodingLayer_SimplePacketEncoder(cases_BasicPacketEncodingLayer, unittest.TestCase):
     """Runs tests with the SimplePacketEncoder"""
     def get_encoder(self):
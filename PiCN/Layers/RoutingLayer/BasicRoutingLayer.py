@@ -1,22 +1,62 @@
+from typing import Dict, List, Optional, Tuple
 
-from typing import List, Tuple
-
+import collections
 import multiprocessing
+import random
 import threading
 from datetime import datetime, timedelta
 
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 from PiCN.Processes import LayerProcess
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase, ForwardingInformationBaseEntry
+from PiCN.Layers.RoutingLayer.RoutingAdvertisement import RoutingAdvertisement
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import BaseRoutingInformationBase
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Packets import Name, Content, Interest
 
 
+class _RoutingPeerState(object):
+
+    def __init__(self, epoch: int, version: int, last_seen: datetime):
+        """
+        Routing state of a peer as known by this node.
+        :param epoch: Epoch of the routing state of the peer
+        :param version: Last known version of the routing state of the peer
+        :param last_seen: Time of the last advertisement received from the peer
+        """
+        self.epoch: int = epoch
+        self.version: int = version
+        self.last_seen: datetime = last_seen
+        # Routes advertised by the peer: name -> distance at the peer
+        self.routes: Dict[Name, int] = {}
+        # Time at which the timeouts of the routes of the peer in the RIB were last renewed
+        self.refreshed: datetime = last_seen
+
+
 class BasicRoutingLayer(LayerProcess):
+    """
+    Distance vector routing layer. Every ageing interval, the routes in the RIB are published as a new version of the
+    routing state of this node, and each peer is asked for the changes since the last version known from it by an
+    interest /routing/<epoch>/<version>. The reply contains the changes in the binary RoutingAdvertisement encoding, or
+    the full table if the peer is not known yet (interest /routing), has restarted (the epoch changed) or is more
+    versions behind than the history holds. Routes of peers which did not answer within the maximum RIB age are
+    removed, and routes learned from a peer time out in the RIB after the maximum RIB age unless the peer keeps
+    answering. A route learned from a peer is withdrawn in the advertisements to that peer (split horizon with
+    poisoned reverse), and routes with a distance of max_distance or more are treated as unreachable, so that a lost
+    route is not counted to infinity between the peers. The routing state is kept in the layer process, which
+    therefore runs the ageing as well.
+    """
 
     def __init__(self, linklayer: BasicLinkLayer,
-                 peers: List[Tuple[str, int]] = None, log_level: int = 255):
+                 peers: List[Tuple[str, int]] = None, log_level: int = 255, history_size: int = 64,
+                 max_distance: int = 16):
+        """
+        :param linklayer: The link layer, to look up the face IDs of the peers
+        :param peers: Addresses of the peers to request routes from
+        :param log_level: Log level
+        :param history_size: Number of versions for which the changes are kept to answer delta requests
+        :param max_distance: Distance at which a route is unreachable
+        """
         super().__init__('BasicRoutingLayer', log_level)
         self._prefix: Name = Name('/routing')
         self._linklayer: BasicLinkLayer = linklayer
@@ -24,11 +64,22 @@ class BasicRoutingLayer(LayerProcess):
         self.fib: BaseForwardingInformationBase = None
         self._rib_maxage: timedelta = timedelta(seconds=3600)
         self._peers: List[Tuple[str, int]] = peers if peers is not None else []
+        self._max_distance: int = max_distance
         self._ageing_interval: float = 5.0
         self._ageing_timer: threading.Timer = None
+        # Own routing state: name -> (distance, face ID of the peer the route was learned from or None) as advertised
+        # in the current version
+        self._epoch: int = random.getrandbits(32)
+        self._version: int = 0
+        self._advertised: Dict[Name, Tuple[int, Optional[int]]] = {}
+        # Changes of the last versions: (version, name -> (distance, learned from), None if withdrawn)
+        self._history: collections.deque = collections.deque(maxlen=history_size)
+        # Routing state of the peers by face ID
+        self._peer_states: Dict[int, _RoutingPeerState] = {}
+        # The ageing timer and the process loop both access the routing state
+        self._lock: threading.Lock = threading.Lock()
 
-    def start_process(self):
-        super().start_process()
+    def start_layer(self):
         self._ageing()
 
     def stop_process(self):
@@ -43,52 +94,153 @@ class BasicRoutingLayer(LayerProcess):
             self.logger.warn('Expects [fid, Packet] from lower')
             return
         rcv_fid, packet = data
-        now = datetime.utcnow()
-        if packet.name == self._prefix:
+        if self._prefix.is_prefix_of(packet.name):
             if isinstance(packet, Interest):
                 self.logger.info('Received routing interest')
-                output: str = ''
-                for name, fid, dist, timeout in self.rib.entries():
-                    if timeout is None:
-                        output = f'{output}{name}:{dist}:-1\n'
-                    else:
-                        output = f'{output}{name}:{dist}:{int((timeout - now).total_seconds())}\n'
-                content: Content = Content(self._prefix, output.encode('utf-8'))
+                with self._lock:
+                    advertisement = self._build_advertisement(packet.name, rcv_fid)
+                content: Content = Content(packet.name, advertisement.encode())
                 self.queue_to_lower.put([rcv_fid, content])
             elif isinstance(packet, Content):
                 self.logger.info('Received routing content')
-                rib: BaseRoutingInformationBase = self.rib
-                lines: List[str] = [l for l in packet.content.split('\n') if len(l) > 0]
-                for line in lines:
-                    name, dist, timeout = line.rsplit(':', 2)
-                    if timeout == '-1':
-                        timeout = self._rib_maxage
-                    else:
-                        timeout = timedelta(seconds=int(timeout))
-                    rib.insert(Name(name), rcv_fid, int(dist) + 1, now + min(timeout, self._rib_maxage))
+                try:
+                    advertisement = RoutingAdvertisement.decode(packet.get_bytes())
+                except ValueError as e:
+                    self.logger.warn(f'Dropping routing content: {e}')
+                    return
+                with self._lock:
+                    self._apply_advertisement(rcv_fid, advertisement)
             return
         self.queue_to_higher.put(data)
 
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         self.queue_to_lower.put(data)
 
+    def _build_advertisement(self, name: Name, fid: int) -> RoutingAdvertisement:
+        """
+        Build the reply to a routing interest. Routes learned from the requesting peer are withdrawn.
+        :param name: /routing for a full table, /routing/<epoch>/<version> for the changes since a known version
+        :param fid: The face ID of the requesting peer
+        :return: The changes since the requested version, or the full table if they are not available
+        """
+        base: int = None
+        if len(name.components) == len(self._prefix.components) + 2:
+            try:
+                epoch, version = [int(c) for c in name.components[-2:]]
+                if epoch == self._epoch:
+                    base = version
+            except ValueError:
+                pass
+        oldest = self._history[0][0] - 1 if len(self._history) > 0 else self._version
+        if base is None or base < oldest or base > self._version:
+            routes = {name: dist for name, (dist, source) in self._advertised.items() if source != fid}
+            return RoutingAdvertisement(self._epoch, 0, self._version, full=True, routes=routes)
+        routes: Dict[Name, Optional[int]] = {}
+        for version, changes in self._history:
+            if version > base:
+                for name, route in changes.items():
+                    routes[name] = route[0] if route is not None and route[1] != fid else None
+        return RoutingAdvertisement(self._epoch, base, self._version, routes=routes)
+
+    def _apply_advertisement(self, fid: int, advertisement: RoutingAdvertisement):
+        """
+        Apply the routes advertised by a peer to the RIB. Changes which do not apply to the known version of the
+        peer are ignored, the next request asks for them again.
+        :param fid: The face ID of the peer
+        :param advertisement: The received advertisement
+        """
+        state = self._peer_states.get(fid)
+        if advertisement.full:
+            if state is None:
+                state = self._peer_states[fid] = _RoutingPeerState(advertisement.epoch, advertisement.version,
+                                                                   datetime.utcnow())
+            routes: Dict[Name, Optional[int]] = dict(advertisement.routes)
+            for name in state.routes:
+                if name not in routes:
+                    routes[name] = None
+        elif state is not None and state.epoch == advertisement.epoch and state.version == advertisement.base_version:
+            routes = advertisement.routes
+        else:
+            self.logger.info(f'Ignoring routing changes from face {fid} which do not apply to the known version')
+            return
+        now = datetime.utcnow()
+        timeout = now + self._rib_maxage
+        for name, dist in routes.items():
+            if dist is None or dist + 1 >= self._max_distance:
+                if state.routes.pop(name, None) is not None:
+                    self.rib.remove(name, fid)
+            elif state.routes.get(name) != dist:
+                state.routes[name] = dist
+                self.rib.insert(name, fid, dist + 1, timeout)
+        if now - state.refreshed > self._rib_maxage / 2:
+            # Renew the timeouts of the unchanged routes as well, twice per maximum RIB age
+            for name, dist in state.routes.items():
+                self.rib.insert(name, fid, dist + 1, timeout)
+            state.refreshed = now
+        state.epoch = advertisement.epoch
+        state.version = advertisement.version
+        state.last_seen = now
+
+    def _publish_routes(self):
+        """
+        Compare the routes in the RIB to the current version of the own routing state, and record the changes as a
+        new version if there are any.
+        """
+        routes: Dict[Name, Tuple[int, Optional[int]]] = {}
+        for name, fid, dist, timeout in self.rib.entries():
+            if name not in routes or dist < routes[name][0]:
+                state = self._peer_states.get(fid)
+                routes[name] = (dist, fid if state is not None and name in state.routes else None)
+        changes: Dict[Name, Optional[Tuple[int, Optional[int]]]] = {name: route for name, route in routes.items()
+                                                                    if self._advertised.get(name) != route}
+        for name in self._advertised:
+            if name not in routes:
+                changes[name] = None
+        if len(changes) > 0:
+            self._version += 1
+            self._history.append((self._version, changes))
+            self._advertised = routes
+
+    def _expire_peers(self):
+        """
+        Remove the routes of peers from which no advertisement was received within the maximum RIB age.
+        """
+        now = datetime.utcnow()
+        for fid, state in list(self._peer_states.items()):
+            if now - state.last_seen > self._rib_maxage:
+                for name in state.routes:
+                    self.rib.remove(name, fid)
+                del self._peer_states[fid]
+
     def _ageing(self):
         if self.rib is not None:
-            self.rib.ageing()
-            self.fib.clear()
-            for entry in self.rib.build_fib():
-                self.fib.add_fib_entry(entry.name, [entry.faceid], static=entry.static)
+            with self._lock:
+                self._expire_peers()
+                self.rib.ageing()
+                self._publish_routes()
+            added, changed, removed = self.rib.build_fib_diff()
+            if len(added) > 0 or len(changed) > 0 or len(removed) > 0:
+                self.fib.apply_fib_diff(added, changed, removed)
         self._send_routing_interest()
-        self._ageing_timer = threading.Timer(self._ageing_interval, self._ageing)
-        self._ageing_timer.start()
+        self._ageing_timer = self.schedule(self._ageing_interval, self._ageing)
+
+    def _request_name(self, fid: int) -> Name:
+        """
+        Name of the next routing interest to a peer.
+        :param fid: The face ID of the peer
+        :return: /routing/<epoch>/<version> for the changes since the known version of the peer, /routing if unknown
+        """
+        state = self._peer_states.get(fid)
+        return self._prefix if state is None else self._prefix + [str(state.epoch), str(state.version)]
 
     def _send_routing_interest(self):
-        solicitation: Interest = Interest(self._prefix)
         for addr in self._peers:
             addr_info: AddressInfo = AddressInfo(addr, 0)
             fid = self._linklayer.faceidtable.get_or_create_faceid(addr_info)
+            with self._lock:
+                name = self._request_name(fid)
             try:
-                self.queue_to_lower.put([fid, solicitation])
+                self.queue_to_lower.put([fid, Interest(name)])
             except AssertionError:
                 # Queue is closed.
                 return
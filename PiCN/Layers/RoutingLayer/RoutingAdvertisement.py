@@ -0,0 +1,95 @@
+from typing import Dict, Optional
+
+import struct
+
+from PiCN.Packets import Name
+
+
+class RoutingAdvertisement(object):
+    """
+    Routing state of a node, as exchanged by the BasicRoutingLayer. An advertisement contains either the full routing
+    table of the node or the changes between two versions of it.
+
+    Binary encoding, all integers in network byte order:
+        header:    epoch (uint32), base version (uint32), version (uint32), flags (uint8)
+        per route: distance (uint16, 0xffff if the route was withdrawn), number of name components (uint16),
+                   per component: length (uint16), component
+    """
+
+    FLAG_FULL: int = 1
+    WITHDRAWN: int = 0xffff
+    MAX_DISTANCE: int = 0xfffe
+
+    _header = struct.Struct('!IIIB')
+    _route = struct.Struct('!HH')
+    _component = struct.Struct('!H')
+
+    def __init__(self, epoch: int, base_version: int, version: int, full: bool = False,
+                 routes: Dict[Name, Optional[int]] = None):
+        """
+        :param epoch: Random identifier of the routing state of the advertising node, changes when it restarts
+        :param base_version: Version the changes apply to, ignored for full advertisements
+        :param version: Version of the routing state after applying the advertisement
+        :param full: Whether the advertisement contains the full routing table instead of changes
+        :param routes: Name -> distance, None if the route was withdrawn
+        """
+        self.epoch: int = epoch
+        self.base_version: int = base_version
+        self.version: int = version
+        self.full: bool = full
+        self.routes: Dict[Name, Optional[int]] = routes if routes is not None else {}
+
+    def encode(self) -> bytes:
+        """
+        Encode the advertisement to its binary representation.
+        :return: The encoded advertisement
+        """
+        flags = self.FLAG_FULL if self.full else 0
+        parts = [self._header.pack(self.epoch, self.base_version, self.version, flags)]
+        for name, dist in self.routes.items():
+            dist = self.WITHDRAWN if dist is None else min(dist, self.MAX_DISTANCE)
+            components = [c if isinstance(c, bytes) else c.encode() for c in name.components]
+            parts.append(self._route.pack(dist, len(components)))
+            for component in components:
+                parts.append(self._component.pack(len(component)))
+                parts.append(component)
+        return b''.join(parts)
+
+    @staticmethod
+    def decode(wire: bytes) -> 'RoutingAdvertisement':
+        """
+        Decode an advertisement from its binary representation.
+        :param wire: The encoded advertisement
+        :return: The decoded advertisement
+        :raise ValueError: If the data is not a valid advertisement
+        """
+        cls = RoutingAdvertisement
+        try:
+            epoch, base_version, version, flags = cls._header.unpack_from(wire, 0)
+            offset = cls._header.size
+            routes: Dict[Name, Optional[int]] = {}
+            while offset < len(wire):
+                dist, count = cls._route.unpack_from(wire, offset)
+                offset += cls._route.size
+                components = []
+                for _ in range(count):
+                    length, = cls._component.unpack_from(wire, offset)
+                    offset += cls._component.size
+                    if offset + length > len(wire):
+                        raise ValueError('Truncated name component')
+                    components.append(bytes(wire[offset:offset + length]))
+                    offset += length
+                routes[Name(components)] = None if dist == cls.WITHDRAWN else dist
+        except struct.error as e:
+            raise ValueError(f'Malformed routing advertisement: {e}')
+        return RoutingAdvertisement(epoch, base_version, version, bool(flags & cls.FLAG_FULL), routes)
+
+    def __eq__(self, other):
+        if not isinstance(other, RoutingAdvertisement):
+            return False
+        return self.epoch == other.epoch and self.base_version == other.base_version \
+            and self.version == other.version and self.full == other.full and self.routes == other.routes
+
+    def __repr__(self):
+        kind = 'full' if self.full else f'delta from {self.base_version}'
+        return f'<RoutingAdvertisement epoch {self.epoch} version {self.version} ({kind}, {len(self.routes)} routes)>'
@@ -40,6 +40,15 @@ class BaseRoutingInformationBase(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def remove(self, name: Name, fid: int):
+        """
+        Remove the route over a face to a name from the RIB.
+        :param name: The ICN name of the route
+        :param fid: The face ID of the route
+        """
+        pass
+
     @abc.abstractmethod
     def build_fib(self) -> List[ForwardingInformationBaseEntry]:
         """
@@ -47,6 +56,15 @@ class BaseRoutingInformationBase(abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def build_fib_diff(self) -> Tuple[List[ForwardingInformationBaseEntry], List[ForwardingInformationBaseEntry],
+                                      List[Name]]:
+        """
+        Construct the changes of the FIB entries since the last call.
+        :return: Tuple of the added entries, the changed entries and the names of the removed entries
+        """
+        pass
+
     @abc.abstractmethod
     def __iter__(self) -> Iterator[Tuple[Name, int, int, datetime]]:
         """
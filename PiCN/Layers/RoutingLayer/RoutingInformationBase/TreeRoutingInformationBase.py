@@ -1,5 +1,5 @@
 
-from typing import List, Tuple, Dict, Iterator
+from typing import List, Tuple, Dict, Iterator, Set
 
 from datetime import datetime
 
@@ -23,6 +23,18 @@ class _RIBTreeNode(object):
         self._nc: bytes = nc
         #                           fid        dist  timeout
         self._distance_vector: Dict[int, Tuple[int, datetime]] = {}
+        # Incremental FIB synchronisation state:
+        # True if the node or one of its descendants changed since the last publish()
+        self._dirty: bool = True
+        # Number of entries and distinct face IDs of the collapse() result of this subtree
+        self._result_count: int = 0
+        self._result_fids: Set[int] = set()
+        # True if the collapse() result of this subtree is a single entry for the own name
+        self._collapsed: bool = False
+        # Face IDs of the FIB entries for the own name at the last publish()
+        self._published: List[int] = []
+        # True if the children were visible (no collapsed node on the path to the root) at the last publish()
+        self._children_visible: bool = False
 
     def insert(self, name: Name, fid: int, distance: int, timeout: datetime=None):
         """
@@ -48,7 +60,11 @@ class _RIBTreeNode(object):
             comps = comps[1:]
             node = child
         # Create a distance vector entry for the deepest node
+        old = node._distance_vector.get(fid)
         node._distance_vector[fid] = distance, timeout
+        # Timeouts do not change the face IDs of the FIB entries
+        if old is None or old[0] != distance:
+            node._mark_dirty()
 
     def collapse(self) -> List[Tuple[List[bytes], int, int, datetime]]:
         """
@@ -96,14 +112,15 @@ class _RIBTreeNode(object):
                     result.append(c)
         return result
 
-    def ageing(self, now: datetime):
+    def ageing(self, now: datetime, removed: Dict[Tuple[bytes, ...], List[int]] = None):
         """
         Remove outdated entries from the RIB.
         :param now: Reference time
+        :param removed: Filled with the names and published face IDs of the deleted nodes
         """
         # Recursively call ageing on all children
         for child in list(self._children.values()):
-            child.ageing(now)
+            child.ageing(now, removed)
         # Remove all outdated distance vector entries
         todelete: List[int] = list()
         for (fid, (_, timeout)) in self._distance_vector.items():
@@ -111,10 +128,123 @@ class _RIBTreeNode(object):
                 todelete.append(fid)
         for fid in todelete:
             del self._distance_vector[fid]
+        if len(todelete) > 0:
+            self._mark_dirty()
         # Delete the node from the tree if it has no children and no distance vector entries left
         if self._parent is not None and len(self._distance_vector) == 0 and len(self._children) == 0:
-            del self._parent._children[self._nc]
-            self._parent = None
+            self._delete(removed)
+
+    def remove(self, name: Name, fid: int, removed: Dict[Tuple[bytes, ...], List[int]] = None):
+        """
+        Remove the route over a face to a name. This function can only be used on the root node.
+        :param name: The ICN name of the route
+        :param fid: The face ID of the route
+        :param removed: Filled with the names and published face IDs of the deleted nodes
+        :raise ValueError: If not called on the root node
+        """
+        if self._parent is not None:
+            raise ValueError('RIB entries can only be removed starting at the root node.')
+        node = self
+        for comp in name.components:
+            node = node._children.get(comp)
+            if node is None:
+                return
+        if node._distance_vector.pop(fid, None) is None:
+            return
+        node._mark_dirty()
+        # Delete the node and its ancestors from the tree as long as they have no children and no entries left
+        while node._parent is not None and len(node._distance_vector) == 0 and len(node._children) == 0:
+            parent = node._parent
+            node._delete(removed)
+            node = parent
+
+    def _delete(self, removed: Dict[Tuple[bytes, ...], List[int]] = None):
+        """
+        Delete this node from the tree.
+        :param removed: Filled with the name and the published face IDs of the node
+        """
+        if removed is not None and len(self._published) > 0:
+            removed[tuple(self._name_components())] = self._published
+        self._parent._mark_dirty()
+        del self._parent._children[self._nc]
+        self._parent = None
+
+    def publish(self, changes: Dict[Tuple[bytes, ...], Tuple[List[int], List[int]]],
+                visible: bool = True, nclist: List[bytes] = None):
+        """
+        Bring the collapse() representation of all changed subtrees up to date and record which FIB entries changed
+        since the last call. Only changed subtrees are visited, unless a node changes between collapsed and not
+        collapsed, which changes the FIB entries of its whole subtree. This function can only be used on the root node.
+        :param changes: Filled with name -> (published face IDs before, face IDs now) for every changed name
+        :param visible: Whether the entries of this node are part of the FIB, i.e. no ancestor is collapsed
+        :param nclist: Name components of this node
+        """
+        if nclist is None:
+            if self._parent is not None:
+                raise ValueError('The RIB can only be published starting at the root node.')
+            nclist = []
+            self._update_result()
+        fids: List[int] = []
+        if visible:
+            fids = list(self._result_fids) if self._collapsed else self._own_fids()
+        if fids != self._published:
+            before, _ = changes.get(tuple(nclist), (self._published, None))
+            changes[tuple(nclist)] = before, fids
+            self._published = fids
+        children_visible = visible and not self._collapsed
+        # If the visibility of the children changed, all of their entries change
+        visit_all = children_visible != self._children_visible
+        self._children_visible = children_visible
+        for child in self._children.values():
+            if visit_all or child._dirty:
+                child.publish(changes, children_visible, nclist + [child._nc])
+        self._dirty = False
+
+    def _update_result(self):
+        """
+        Recompute the number of entries, the face IDs and the collapse state of the collapse() result of all changed
+        subtrees, bottom up. Follows the rules of collapse().
+        """
+        count = 0
+        fids: Set[int] = set()
+        for child in self._children.values():
+            if child._dirty:
+                child._update_result()
+            count += child._result_count
+            fids.update(child._result_fids)
+        own = self._own_fids()
+        count += len(own)
+        fids.update(own)
+        self._collapsed = len(self._children) > 0 and len(fids) == 1 and count > 1
+        self._result_count = 1 if self._collapsed else count
+        self._result_fids = fids
+
+    def _own_fids(self) -> List[int]:
+        """
+        Face IDs of the entries for the own name in the collapse() result, if the node is not collapsed
+        """
+        if len(self._distance_vector) == 0:
+            return []
+        if self._collapse_shortest:
+            return [self._get_best_fid()[0]]
+        return list(self._distance_vector.keys())
+
+    def _mark_dirty(self):
+        """
+        Mark the node and its ancestors as changed since the last publish().
+        """
+        node = self
+        while node is not None and not node._dirty:
+            node._dirty = True
+            node = node._parent
+
+    def _name_components(self) -> List[bytes]:
+        comp: List[bytes] = []
+        node: _RIBTreeNode = self
+        while node._nc is not None:
+            comp.insert(0, node._nc)
+            node = node._parent
+        return comp
 
     def _add_child(self, child: '_RIBTreeNode'):
         """
@@ -126,6 +256,7 @@ class _RIBTreeNode(object):
             raise ValueError(f'The node {child.__repr__()} already has a parent({child._parent.__repr__()}).')
         self._children[child._nc] = child
         child._parent = self
+        self._mark_dirty()
 
     def _get_best_fid(self) -> Tuple[int, int, datetime]:
         """
@@ -168,12 +299,14 @@ class TreeRoutingInformationBase(BaseRoutingInformationBase):
         """
         super().__init__(shortest_only)
         self._tree: _RIBTreeNode = _RIBTreeNode(collapse_reduce_to_shortest=shortest_only)
+        # Names of the nodes deleted since the last build_fib_diff() and their published face IDs
+        self._removed: Dict[Tuple[bytes, ...], List[int]] = {}
 
     def ageing(self):
         """
         Remove outdated entries from the RIB.
         """
-        self._tree.ageing(datetime.utcnow())
+        self._tree.ageing(datetime.utcnow(), self._removed)
 
     def insert(self, name: Name, fid: int, distance: int, timeout: datetime = None):
         """
@@ -186,6 +319,14 @@ class TreeRoutingInformationBase(BaseRoutingInformationBase):
         """
         self._tree.insert(name, fid, distance, timeout)
 
+    def remove(self, name: Name, fid: int):
+        """
+        Remove the route over a face to a name from the RIB.
+        :param name: The ICN name of the route
+        :param fid: The face ID of the route
+        """
+        self._tree.remove(name, fid, self._removed)
+
     def build_fib(self) -> List[ForwardingInformationBaseEntry]:
         """
         Construct FIB entries from the RIB data, and insert them into the passed FIB object.
@@ -199,6 +340,35 @@ class TreeRoutingInformationBase(BaseRoutingInformationBase):
             fib.append(ForwardingInformationBaseEntry(name, fid, static=False))
         return fib
 
+    def build_fib_diff(self) -> Tuple[List[ForwardingInformationBaseEntry], List[ForwardingInformationBaseEntry],
+                                      List[Name]]:
+        """
+        Construct the changes of the FIB entries since the last call. Only the subtrees which changed are visited, so
+        the cost is proportional to the number of changes and not to the size of the RIB. The first call returns all
+        entries as added.
+        :return: Tuple of the added entries, the changed entries and the names of the removed entries. If a name is
+        reached over several faces, there is one entry per face, all entries of a changed name are returned.
+        """
+        changes: Dict[Tuple[bytes, ...], Tuple[List[int], List[int]]] = \
+            {name: (fids, []) for name, fids in self._removed.items()}
+        self._removed.clear()
+        self._tree.publish(changes)
+        added: List[ForwardingInformationBaseEntry] = []
+        changed: List[ForwardingInformationBaseEntry] = []
+        removed: List[Name] = []
+        for components, (before, after) in changes.items():
+            name = Name(list(components))
+            if len(after) == 0:
+                if len(before) > 0:
+                    removed.append(name)
+                continue
+            entries = [ForwardingInformationBaseEntry(name, [fid], static=False) for fid in after]
+            if len(before) == 0:
+                added += entries
+            elif before != after:
+                changed += entries
+        return added, changed, removed
+
     def __iter__(self) -> Iterator[Tuple[Name, int, int, datetime]]:
         collapsed: List[Tuple[List[bytes], int, int, datetime]] = self._tree.collapse()
         for name, fid, dist, timeout in collapsed:
@@ -1,4 +1,5 @@
 
+import random
 import unittest
 from datetime import datetime, timedelta
 
@@ -122,3 +123,115 @@ class test_TreeRoutingInformationBase(unittest.TestCase):
         self.assertIn(cnentry1, fib)
         self.assertIn(cnentry2, fib)
         self.assertIn(uclaentry, fib)
+
+    def _apply_diff(self, fib, diff):
+        added, changed, removed = diff
+        for name in removed + [entry.name for entry in changed]:
+            fib.pop(name, None)
+        for entry in added:
+            self.assertNotIn(entry.name, fib)
+        for entry in added + changed:
+            fib.setdefault(entry.name, set()).update(entry.faceid)
+
+    def _expected_fib(self, rib):
+        fib = {}
+        for entry in rib.build_fib():
+            fib.setdefault(entry.name, set()).add(entry.faceid)
+        return fib
+
+    def test_fib_diff_initial(self):
+        rib: BaseRoutingInformationBase = TreeRoutingInformationBase()
+        rib.insert(Name('/foo/bar'), 0, 42)
+        rib.insert(Name('/ndn/ch/unibas/dmi/cn'), 1, 10)
+        rib.insert(Name('/ndn/ch/unibas/dmi/cs'), 1, 12)
+        added, changed, removed = rib.build_fib_diff()
+        self.assertEqual(2, len(added))
+        self.assertIn(ForwardingInformationBaseEntry(Name('/foo/bar'), [0]), added)
+        self.assertIn(ForwardingInformationBaseEntry(Name('/ndn/ch/unibas/dmi'), [1]), added)
+        self.assertEqual([], changed)
+        self.assertEqual([], removed)
+        self.assertEqual(([], [], []), rib.build_fib_diff())
+
+    def test_fib_diff_refresh_is_no_change(self):
+        rib: BaseRoutingInformationBase = TreeRoutingInformationBase()
+        rib.insert(Name('/foo/bar'), 0, 42, datetime.utcnow() + timedelta(hours=1))
+        rib.build_fib_diff()
+        rib.insert(Name('/foo/bar'), 0, 42, datetime.utcnow() + timedelta(hours=2))
+        self.assertEqual(([], [], []), rib.build_fib_diff())
+
+    def test_fib_diff_changed(self):
+        rib: BaseRoutingInformationBase = TreeRoutingInformationBase()
+        rib.insert(Name('/foo/bar'), 0, 42)
+        rib.insert(Name('/foo/baz'), 0, 42)
+        rib.build_fib_diff()
+        # a shorter route over another face
+        rib.insert(Name('/foo/bar'), 1, 2)
+        added, changed, removed = rib.build_fib_diff()
+        self.assertEqual(2, len(added))
+        self.assertIn(ForwardingInformationBaseEntry(Name('/foo/bar'), [1]), added)
+        self.assertIn(ForwardingInformationBaseEntry(Name('/foo/baz'), [0]), added)
+        self.assertEqual([], changed)
+        self.assertEqual([Name('/foo')], removed)
+        rib.insert(Name('/foo/baz'), 1, 2)
+        added, changed, removed = rib.build_fib_diff()
+        self.assertEqual([ForwardingInformationBaseEntry(Name('/foo'), [1])], added)
+        self.assertEqual([], changed)
+        self.assertEqual(2, len(removed))
+        rib.insert(Name('/foo/bar'), 2, 1)
+        rib.insert(Name('/foo/baz'), 2, 1)
+        self.assertEqual(([], [ForwardingInformationBaseEntry(Name('/foo'), [2])], []), rib.build_fib_diff())
+
+    def test_fib_diff_ageing(self):
+        rib: BaseRoutingInformationBase = TreeRoutingInformationBase()
+        rib.insert(Name('/foo/bar'), 0, 4, datetime.utcnow() - timedelta(seconds=1))
+        rib.insert(Name('/ndn/ch'), 1, 2)
+        rib.build_fib_diff()
+        rib.ageing()
+        self.assertEqual(([], [], [Name('/foo/bar')]), rib.build_fib_diff())
+
+    def test_remove(self):
+        rib: BaseRoutingInformationBase = TreeRoutingInformationBase()
+        rib.insert(Name('/foo/bar/baz'), 0, 4)
+        rib.insert(Name('/foo/bar/baz'), 1, 2)
+        rib.insert(Name('/foo/qux'), 0, 3)
+        rib.build_fib_diff()
+        rib.remove(Name('/foo/bar/baz'), 1)
+        added, changed, removed = rib.build_fib_diff()
+        # the remaining routes are collapsed to a common prefix
+        self.assertEqual([ForwardingInformationBaseEntry(Name('/foo'), [0])], added)
+        self.assertEqual([], changed)
+        self.assertEqual(2, len(removed))
+        # unknown names and faces are ignored
+        rib.remove(Name('/foo/bar'), 0)
+        rib.remove(Name('/foo/bar/baz'), 1)
+        rib.remove(Name('/ndn'), 0)
+        self.assertEqual(([], [], []), rib.build_fib_diff())
+        # empty nodes are deleted from the tree
+        rib.remove(Name('/foo/bar/baz'), 0)
+        rib.remove(Name('/foo/qux'), 0)
+        self.assertEqual(0, len(rib))
+        self.assertEqual({}, rib._tree._children)
+        self.assertEqual(([], [], [Name('/foo')]), rib.build_fib_diff())
+
+    def test_fib_diff_random_churn(self):
+        """apply the diffs of random inserts, removals and ageing and compare with a full rebuild"""
+        rng = random.Random(4711)
+        for shortest_only in [True, False]:
+            rib: BaseRoutingInformationBase = TreeRoutingInformationBase(shortest_only=shortest_only)
+            fib = {}
+            now = datetime.utcnow()
+            for step in range(300):
+                for _ in range(rng.randint(1, 5)):
+                    name = Name('/' + '/'.join(rng.choice('abc') for _ in range(rng.randint(0, 4))))
+                    if rng.random() < 0.3:
+                        timeout = now - timedelta(seconds=1)
+                    else:
+                        timeout = now + timedelta(hours=1)
+                    rib.insert(name, rng.randint(0, 3), rng.randint(1, 5), timeout)
+                if rng.random() < 0.3:
+                    name = Name('/' + '/'.join(rng.choice('abc') for _ in range(rng.randint(0, 4))))
+                    rib.remove(name, rng.randint(0, 3))
+                if step % 7 == 0:
+                    rib.ageing()
+                self._apply_diff(fib, rib.build_fib_diff())
+                self.assertEqual(self._expected_fib(rib), fib)
@@ -0,0 +1,39 @@
+
+import unittest
+
+from PiCN.Layers.RoutingLayer.RoutingAdvertisement import RoutingAdvertisement
+from PiCN.Packets import Name
+
+
+class test_RoutingAdvertisement(unittest.TestCase):
+
+    def test_encode_decode_full(self):
+        advertisement = RoutingAdvertisement(0xdeadbeef, 0, 17, True, {Name('/ndn/ch/unibas'): 3, Name('/'): 0})
+        decoded = RoutingAdvertisement.decode(advertisement.encode())
+        self.assertEqual(advertisement, decoded)
+        self.assertTrue(decoded.full)
+
+    def test_encode_decode_delta(self):
+        advertisement = RoutingAdvertisement(42, 16, 17, False, {Name('/ndn/ch/unibas'): None,
+                                                                 Name([b'bin\x00\xff', b'ary']): 70000})
+        decoded = RoutingAdvertisement.decode(advertisement.encode())
+        self.assertFalse(decoded.full)
+        self.assertEqual((42, 16, 17), (decoded.epoch, decoded.base_version, decoded.version))
+        # distances are capped, withdrawn routes are kept
+        self.assertEqual({Name('/ndn/ch/unibas'): None,
+                          Name([b'bin\x00\xff', b'ary']): RoutingAdvertisement.MAX_DISTANCE},
+                         decoded.routes)
+
+    def test_empty(self):
+        advertisement = RoutingAdvertisement(1, 2, 2)
+        self.assertEqual(13, len(advertisement.encode()))
+        self.assertEqual(advertisement, RoutingAdvertisement.decode(advertisement.encode()))
+
+    def test_decode_malformed(self):
+        wire = RoutingAdvertisement(1, 0, 1, True, {Name('/ndn/ch/unibas'): 3}).encode()
+        with self.assertRaises(ValueError):
+            RoutingAdvertisement.decode(wire[:10])
+        with self.assertRaises(ValueError):
+            RoutingAdvertisement.decode(wire[:-2])
+        with self.assertRaises(ValueError):
+            RoutingAdvertisement.decode(b'/ndn/ch/unibas:3:-1\n')
@@ -1,6 +1,7 @@
 
 import unittest
 
+import collections
 import multiprocessing
 import queue
 from datetime import datetime, timedelta
@@ -10,6 +11,7 @@ from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 from PiCN.Layers.RoutingLayer import BasicRoutingLayer
+from PiCN.Layers.RoutingLayer.RoutingAdvertisement import RoutingAdvertisement
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import BaseRoutingInformationBase, TreeRoutingInformationBase
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase, \
     ForwardingInformationBaseMemoryPrefix
@@ -86,54 +88,97 @@ class test_RoutingLayer(unittest.TestCase):
         packets.remove([1337, i2])
         self.assertNotIn([1337, i2], packets)
 
-    def test_empty_routing_content(self):
+    def _collect(self, q: multiprocessing.Queue, waittime: float = 1.0):
         """
-        Test that an empty /routing content packet is sent in reply to a /routing interest.
+        Collect all packets from a queue for a short time.
         """
-        self.routinglayer.start_process()
-        waittime = 1.0
-
-        # The routing interest sent into the layer
-        i = Interest(Name('/routing'))
-        # The expected reply - a content packet with empty content
-        c = Content(Name('/routing'), bytes())
-        self.queue_from_lower.put([42, i])
-        # Collect all packets for a short time
         timeout = datetime.utcnow() + timedelta(seconds=waittime)
         packets = []
         while datetime.utcnow() < timeout:
             try:
-                packets.append(self.queue_to_lower.get(timeout=waittime/10))
+                packets.append(q.get(timeout=waittime/10))
             except queue.Empty:
                 pass
-        # Test for exactly one occurrence of the wanted packet
-        self.assertIn([42, c], packets)
-        packets.remove([42, c])
-        self.assertNotIn([42, c], packets)
+        return packets
+
+    def _request_routes(self, name: Name, fid: int = 42) -> RoutingAdvertisement:
+        """
+        Send a routing interest into the layer and decode the reply.
+        """
+        self.queue_from_lower.put([fid, Interest(name)])
+        replies = [p for p in self._collect(self.queue_to_lower) if p[0] == fid and isinstance(p[1], Content)]
+        self.assertEqual(1, len(replies))
+        self.assertEqual(name, replies[0][1].name)
+        return RoutingAdvertisement.decode(replies[0][1].get_bytes())
+
+    def test_empty_routing_content(self):
+        """
+        Test that a full advertisement without routes is sent in reply to a /routing interest.
+        """
+        self.routinglayer.start_process()
+        advertisement = self._request_routes(Name('/routing'))
+        self.assertTrue(advertisement.full)
+        self.assertEqual(self.routinglayer._epoch, advertisement.epoch)
+        self.assertEqual({}, advertisement.routes)
 
     def test_nonempty_routing_content(self):
         self.rib.insert(Name('/ndn/ch/unibas'), 42, 3)
 
         self.routinglayer.start_process()
-        waittime = 1.0
+        sleep(0.5)
+        advertisement = self._request_routes(Name('/routing'))
+        self.assertTrue(advertisement.full)
+        self.assertEqual(1, advertisement.version)
+        self.assertEqual({Name('/ndn/ch/unibas'): 3}, advertisement.routes)
 
-        # The routing interest sent into the layer
-        i = Interest(Name('/routing'))
-        # The expected reply - a content packet with empty content
-        c = Content(Name('/routing'), '/ndn/ch/unibas:3:-1\n'.encode('utf-8'))
-        self.queue_from_lower.put([42, i])
-        # Collect all packets for a short time
-        timeout = datetime.utcnow() + timedelta(seconds=waittime)
-        packets = []
-        while datetime.utcnow() < timeout:
-            try:
-                packets.append(self.queue_to_lower.get(timeout=waittime/10))
-            except queue.Empty:
-                pass
-        # Test for exactly one occurrence of the wanted packet
-        self.assertIn([42, c], packets)
-        packets.remove([42, c])
-        self.assertNotIn([42, c], packets)
+    def test_delta_routing_content(self):
+        """
+        Test that a peer requesting a known version only receives the changes since that version.
+        """
+        self.routinglayer._ageing_interval = 0.5
+        self.rib.insert(Name('/ndn/ch/unibas'), 42, 3)
+        self.rib.insert(Name('/ndn/ch/ethz'), 43, 2)
+        self.routinglayer.start_process()
+        sleep(0.5)
+        full = self._request_routes(Name('/routing'))
+        self.assertEqual(2, len(full.routes))
+        epoch, version = str(full.epoch), str(full.version)
+        # Nothing changed
+        delta = self._request_routes(Name('/routing') + [epoch, version])
+        self.assertFalse(delta.full)
+        self.assertEqual((full.version, full.version), (delta.base_version, delta.version))
+        self.assertEqual({}, delta.routes)
+        # A new and a withdrawn route
+        self.rib.insert(Name('/ndn/ch/epfl'), 44, 4)
+        self.rib.remove(Name('/ndn/ch/ethz'), 43)
+        sleep(1.0)
+        delta = self._request_routes(Name('/routing') + [epoch, version])
+        self.assertFalse(delta.full)
+        self.assertEqual(full.version, delta.base_version)
+        self.assertEqual({Name('/ndn/ch/epfl'): 4, Name('/ndn/ch/ethz'): None}, delta.routes)
+        # Unknown epoch
+        full = self._request_routes(Name('/routing') + [str(full.epoch ^ 1), version])
+        self.assertTrue(full.full)
+        self.assertEqual({Name('/ndn/ch/unibas'): 3, Name('/ndn/ch/epfl'): 4}, full.routes)
+
+    def test_full_resync_when_behind(self):
+        """
+        Test that a peer which is more versions behind than the history holds receives the full table.
+        """
+        self.routinglayer._ageing_interval = 0.3
+        self.routinglayer._history = collections.deque(maxlen=2)
+        self.rib.insert(Name('/a'), 42, 1)
+        self.routinglayer.start_process()
+        sleep(0.5)
+        full = self._request_routes(Name('/routing'))
+        epoch, version = str(full.epoch), str(full.version)
+        for dist in [2, 3, 4]:
+            self.rib.insert(Name('/a'), 42, dist)
+            sleep(0.6)
+        advertisement = self._request_routes(Name('/routing') + [epoch, version])
+        self.assertTrue(advertisement.full)
+        self.assertEqual(full.version + 3, advertisement.version)
+        self.assertEqual({Name('/a'): 4}, advertisement.routes)
 
     def test_add_to_rib(self):
         """
@@ -143,7 +188,8 @@ class test_RoutingLayer(unittest.TestCase):
         waittime = 1.0
 
         # The packet containing the route announcements of the peer
-        announcement = Content(Name('/routing'), '/ndn/ch/unibas:3:-1\n'.encode('utf-8'))
+        announcement = Content(Name('/routing'),
+                               RoutingAdvertisement(1, 0, 1, True, {Name('/ndn/ch/unibas'): 3}).encode())
         # Make sure an interest for /routing is sent out
         try:
             self.queue_to_lower.get(timeout=waittime)
@@ -175,3 +221,123 @@ class test_RoutingLayer(unittest.TestCase):
                 pass
         filtered = [p for p in packets if p[0] == peerfid and p[1] == Interest(Name('/routing'))]
         self.assertGreater(len(filtered), 5)
+
+    def test_rib_to_fib(self):
+        """
+        Test that announced routes are synchronised to the FIB, without touching static FIB entries.
+        """
+        self.routinglayer._ageing_interval = 0.5
+        self.fib.add_fib_entry(Name('/static'), [1], static=True)
+        self.routinglayer.start_process()
+        announcement = Content(Name('/routing'), RoutingAdvertisement(1, 0, 1, True, {
+            Name('/ndn/ch/unibas'): 3, Name('/ndn/ch/unibas/dmi'): 2}).encode())
+        self.queue_from_lower.put([42, announcement])
+        sleep(1.5)
+        self.assertEqual(2, self.fib.get_container_size())
+        self.assertEqual([42], self.fib.find_fib_entry(Name('/ndn/ch/unibas/dmi/cn')).faceid)
+        self.assertEqual(Name('/ndn/ch/unibas'), self.fib.find_fib_entry(Name('/ndn/ch/unibas/dmi/cn')).name)
+        self.assertEqual([1], self.fib.find_fib_entry(Name('/static')).faceid)
+        # a shorter route over another face splits the collapsed entry
+        announcement = Content(Name('/routing'),
+                               RoutingAdvertisement(2, 0, 1, True, {Name('/ndn/ch/unibas/dmi'): 0}).encode())
+        self.queue_from_lower.put([43, announcement])
+        sleep(1.5)
+        self.assertEqual(3, self.fib.get_container_size())
+        self.assertEqual([43], self.fib.find_fib_entry(Name('/ndn/ch/unibas/dmi/cn')).faceid)
+        self.assertEqual([42], self.fib.find_fib_entry(Name('/ndn/ch/unibas/cs')).faceid)
+
+
+    def test_apply_routing_changes(self):
+        """
+        Test that the changes advertised by a peer are requested by version and applied to the RIB.
+        """
+        peerfid = self.linklayer.faceidtable.get_or_create_faceid(AddressInfo(self.peer, 0))
+        self.routinglayer._ageing_interval = 0.5
+        # A route over another face, so that the routes of the peer are not collapsed to a common prefix
+        self.rib.insert(Name('/other'), 1, 1)
+        self.routinglayer.start_process()
+        # The first request asks for the full table
+        interests = [p[1] for p in self._collect(self.queue_to_lower) if p[0] == peerfid]
+        self.assertIn(Interest(Name('/routing')), interests)
+        full = RoutingAdvertisement(7, 0, 3, True, {Name('/unibas'): 1, Name('/ethz'): 2})
+        self.queue_from_lower.put([peerfid, Content(Name('/routing'), full.encode())])
+        # Subsequent requests ask for the changes since the known version
+        interests = [p[1] for p in self._collect(self.queue_to_lower) if p[0] == peerfid]
+        self.assertIn(Interest(Name('/routing/7/3')), interests)
+        delta = RoutingAdvertisement(7, 3, 4, False, {Name('/ethz'): None, Name('/epfl'): 1})
+        self.queue_from_lower.put([peerfid, Content(Name('/routing/7/3'), delta.encode())])
+        # Changes to an unknown version are ignored
+        stale = RoutingAdvertisement(7, 1, 2, False, {Name('/unibas'): None})
+        self.queue_from_lower.put([peerfid, Content(Name('/routing/7/1'), stale.encode())])
+        interests = [p[1] for p in self._collect(self.queue_to_lower) if p[0] == peerfid]
+        self.assertIn(Interest(Name('/routing/7/4')), interests)
+        routes = sorted((name.to_string(), fid, dist) for name, fid, dist, _ in self.rib.entries() if fid == peerfid)
+        self.assertEqual([('/epfl', peerfid, 2), ('/unibas', peerfid, 2)], routes)
+        # A full table replaces all routes of the peer
+        full = RoutingAdvertisement(8, 0, 1, True, {Name('/epfl'): 1})
+        self.queue_from_lower.put([peerfid, Content(Name('/routing/7/4'), full.encode())])
+        interests = [p[1] for p in self._collect(self.queue_to_lower) if p[0] == peerfid]
+        self.assertIn(Interest(Name('/routing/8/1')), interests)
+        self.assertEqual([(Name('/epfl'), peerfid, 2)], [e[:3] for e in self.rib.entries() if e[1] == peerfid])
+
+    def _exchange(self, requester: BasicRoutingLayer, requester_fid: int, peer: BasicRoutingLayer, peer_fid: int):
+        """
+        Let a routing layer request the routes of a peer, as one ageing interval would do.
+        :param requester_fid: The face ID of the requester at the peer
+        :param peer_fid: The face ID of the peer at the requester
+        """
+        advertisement = peer._build_advertisement(requester._request_name(peer_fid), requester_fid)
+        requester._apply_advertisement(peer_fid, RoutingAdvertisement.decode(advertisement.encode()))
+
+    def test_withdrawal_across_two_peers(self):
+        """
+        Test that a withdrawn route is removed along a chain of peers A - B - C without counting to infinity, and that
+        routes are not advertised back to the peer they were learned from.
+        """
+        layers = {}
+        for node in ['A', 'B', 'C']:
+            layers[node] = BasicRoutingLayer(self.linklayer)
+            layers[node].rib = TreeRoutingInformationBase()
+        # Face IDs of the links: (node, peer) -> face ID of the peer at the node
+        links = {('A', 'B'): 1, ('B', 'A'): 1, ('B', 'C'): 2, ('C', 'B'): 1}
+        layers['A'].rib.insert(Name('/unibas'), 100, 0)
+
+        def run_rounds(rounds: int):
+            for _ in range(rounds):
+                for layer in layers.values():
+                    layer.rib.ageing()
+                    layer._publish_routes()
+                for (node, peer), fid in links.items():
+                    self._exchange(layers[node], links[(peer, node)], layers[peer], fid)
+
+        def routes(node: str):
+            return sorted((name.to_string(), fid, dist) for name, fid, dist, _ in layers[node].rib.entries())
+
+        run_rounds(3)
+        self.assertEqual([('/unibas', 100, 0)], routes('A'))
+        self.assertEqual([('/unibas', 1, 1)], routes('B'))
+        self.assertEqual([('/unibas', 1, 2)], routes('C'))
+        self.assertTrue(all(timeout is not None for _, _, _, timeout in layers['C'].rib.entries()))
+        # B does not advertise the route back to A, C not back to B
+        self.assertEqual({}, layers['B']._build_advertisement(Name('/routing'), 1).routes)
+        self.assertEqual({}, layers['C']._build_advertisement(Name('/routing'), 1).routes)
+        self.assertEqual({Name('/unibas'): 1}, layers['B']._build_advertisement(Name('/routing'), 2).routes)
+
+        layers['A'].rib.remove(Name('/unibas'), 100)
+        run_rounds(1)
+        self.assertEqual([], routes('A'))
+        self.assertEqual([], routes('B'))
+        run_rounds(10)
+        for node in layers:
+            self.assertEqual([], routes(node))
+
+    def test_unreachable_distance(self):
+        """
+        Test that routes reaching the maximum distance are treated as withdrawn.
+        """
+        full = RoutingAdvertisement(7, 0, 1, True, {Name('/unibas'): 3, Name('/ethz'): 15})
+        self.routinglayer._apply_advertisement(42, full)
+        self.assertEqual([(Name('/unibas'), 42, 4)], [e[:3] for e in self.rib.entries()])
+        delta = RoutingAdvertisement(7, 1, 2, False, {Name('/unibas'): 15})
+        self.routinglayer._apply_advertisement(42, delta)
+        self.assertEqual([], list(self.rib.entries()))
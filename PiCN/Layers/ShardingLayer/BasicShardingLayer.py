@@ -0,0 +1,125 @@
+"""Dispatcher distributing packets to several ICN layer processes by name"""
+
+import multiprocessing
+import zlib
+from typing import List
+
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Packets import Content, Name, Packet
+from PiCN.Processes import LayerProcess
+
+
+def shard_of(name: Name, num_shards: int, prefix_components: int=0) -> int:
+    """
+    Stable mapping of a name to a shard, equal in all processes and runs of the forwarder
+    :param name: the name
+    :param num_shards: number of shards
+    :param prefix_components: number of leading name components hashed, 0 to hash the whole name
+    :return: index of the shard
+    """
+    components = name.components if prefix_components <= 0 else name.components[:prefix_components]
+    h = 0
+    for c in components:
+        h = zlib.crc32(c.encode('ascii') if isinstance(c, str) else c, h)
+        h = zlib.crc32(b'/', h)
+    return h % num_shards
+
+
+class BasicShardingLayer(LayerProcess):
+    """Distributes the packets to shards, layers running in processes of their own (e.g. BasicICNLayer) which are
+    responsible for disjoint parts of the name space and own the CS and PIT of their part. The shard of a packet is
+    chosen by a stable hash of its name, so that an interest and the content object or nack answering it are handled
+    by the same shard. The shards send their data directly to the layers below and above the sharding layer.
+    Exact matching CS and PIT can hash the whole name. With prefix matching, hash a prefix of the names only: interests
+    shorter than prefix_components are assigned by their whole name and may miss content of longer names.
+    The queue to the lower layer has as many producers as there are shards, it must not be a SharedMemoryQueue.
+    :param shards: layers handling the packets, started and stopped together with the sharding layer
+    :param prefix_components: number of leading name components hashed, 0 to hash the whole name
+    """
+
+    def __init__(self, shards: List[LayerProcess], prefix_components: int=0, log_level=255):
+        LayerProcess.__init__(self, logger_name="ShardingLayer", log_level=log_level)
+        self.shards: List[LayerProcess] = shards
+        self.prefix_components: int = prefix_components
+        self._shard_from_lower: List[multiprocessing.Queue] = [multiprocessing.Queue() for _ in shards]
+        self._shard_from_higher: List[multiprocessing.Queue] = [multiprocessing.Queue() for _ in shards]
+
+    def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self._shard_queues(self._shard_from_lower, data).put(data)
+
+    def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self._shard_queues(self._shard_from_higher, data).put(data)
+
+    def shard_of(self, name: Name) -> int:
+        """
+        Shard responsible for a name
+        :param name: the name
+        :return: index of the shard in shards
+        """
+        return shard_of(name, len(self.shards), self.prefix_components)
+
+    def _shard_queues(self, queues: List[multiprocessing.Queue], data) -> multiprocessing.Queue:
+        """queue of the shard handling data, the first shard for data without a name, which only logs it"""
+        if isinstance(data, list) and len(data) == 2 and isinstance(data[1], Packet) \
+                and isinstance(data[1].name, Name):
+            return queues[self.shard_of(data[1].name)]
+        return queues[0]
+
+    def start_process(self):
+        """Connect and start the shards, then the sharding layer"""
+        for shard, from_lower, from_higher in zip(self.shards, self._shard_from_lower, self._shard_from_higher):
+            shard.queue_from_lower = from_lower
+            shard.queue_from_higher = from_higher
+            shard.queue_to_lower = self.queue_to_lower
+            shard.queue_to_higher = self.queue_to_higher
+            shard.max_batch_size = self.max_batch_size
+            shard.batch_to_lower = self.batch_to_lower
+            shard.batch_to_higher = self.batch_to_higher
+            shard.use_asyncio = self.use_asyncio
+            shard.start_process()
+        super().start_process()
+
+    def stop_process(self):
+        """Stop the shards and the sharding layer"""
+        for shard in self.shards:
+            if shard.process:
+                shard.process.terminate()
+        for queue in self._shard_from_lower + self._shard_from_higher:
+            queue.close()
+            queue.join_thread()
+        super().stop_process()
+
+
+class ShardedContentStore(object):
+    """Content stores of all shards, accessed like a single content store, e.g. by Mgmt. Content objects are added to
+    and looked up in the content store of the shard responsible for their name.
+    :param stores: content store of each shard
+    :param prefix_components: number of leading name components hashed, as for the sharding layer
+    """
+
+    def __init__(self, stores: List[BaseContentStore], prefix_components: int=0):
+        self.stores: List[BaseContentStore] = stores
+        self.prefix_components: int = prefix_components
+
+    def add_content_object(self, content: Content, static: bool=False):
+        self._store(content.name).add_content_object(content, static=static)
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        return self._store(name).find_content_object(name)
+
+    def remove_content_object(self, name: Name):
+        self._store(name).remove_content_object(name)
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        self._store(cs_entry.name).update_timestamp(cs_entry)
+
+    def ageing(self):
+        for store in self.stores:
+            store.ageing()
+
+    def set_cs_timeout(self, timeout: float):
+        for store in self.stores:
+            store.set_cs_timeout(timeout)
+
+    def _store(self, name: Name) -> BaseContentStore:
+        return self.stores[shard_of(name, len(self.stores), self.prefix_components)]
@@ -0,0 +1,7 @@
+"""Sharding Layer, distributing packets to several ICN layer processes by name
+    * from_lower queue expects to get [faceid, packet]
+    * from_higher queue expects to get [faceid, packet]
+    * the shards put their data directly into to_lower and to_higher
+"""
+
+from .BasicShardingLayer import BasicShardingLayer, ShardedContentStore, shard_of
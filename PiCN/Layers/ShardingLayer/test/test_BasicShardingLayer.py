@@ -0,0 +1,81 @@
+"""Test the BasicShardingLayer"""
+
+import unittest
+from multiprocessing import Queue
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ShardingLayer import BasicShardingLayer, ShardedContentStore, shard_of
+from PiCN.Packets import Content, Interest, Name, Nack, NackReason
+from PiCN.Processes import LayerProcess
+
+
+class ShardMock(LayerProcess):
+    """Answers with its index and the received data"""
+
+    def __init__(self, index: int):
+        LayerProcess.__init__(self, logger_name="Shard" + str(index))
+        self.index = index
+
+    def data_from_lower(self, to_lower: Queue, to_higher: Queue, data):
+        to_higher.put([self.index, data])
+
+    def data_from_higher(self, to_lower: Queue, to_higher: Queue, data):
+        to_lower.put([self.index, data])
+
+
+class test_BasicShardingLayer(unittest.TestCase):
+    """Test the BasicShardingLayer"""
+
+    def setUp(self):
+        self.shards = [ShardMock(i) for i in range(0, 4)]
+        self.shardinglayer = BasicShardingLayer(self.shards)
+        self.q_from_lower = Queue()
+        self.q_from_higher = Queue()
+        self.q_to_lower = Queue()
+        self.q_to_higher = Queue()
+        self.shardinglayer.queue_from_lower = self.q_from_lower
+        self.shardinglayer.queue_from_higher = self.q_from_higher
+        self.shardinglayer.queue_to_lower = self.q_to_lower
+        self.shardinglayer.queue_to_higher = self.q_to_higher
+
+    def tearDown(self):
+        self.shardinglayer.stop_process()
+
+    def test_shard_of(self):
+        """Test that names are spread over the shards and prefixes decide the shard if requested"""
+        names = [Name("/test/data/" + str(i)) for i in range(0, 100)]
+        shards = set([shard_of(name, 4) for name in names])
+        self.assertEqual(shards, {0, 1, 2, 3})
+        self.assertEqual(shard_of(Name("/test/data/1"), 4), shard_of(Name("/test/data/1"), 4))
+        self.assertEqual(set([shard_of(name, 4, prefix_components=2) for name in names]),
+                         {shard_of(Name("/test/data"), 4)})
+
+    def test_dispatch_by_name(self):
+        """Test that interests, content and nacks of a name are handled by the same shard"""
+        self.shardinglayer.start_process()
+        for i in range(0, 20):
+            name = Name("/test/data/" + str(i))
+            shard = self.shardinglayer.shard_of(name)
+            for packet in [Interest(name), Content(name, "data"), Nack(name, NackReason.NO_ROUTE, Interest(name))]:
+                self.q_from_lower.put([1, packet])
+                self.assertEqual(self.q_to_higher.get(timeout=2.0), [shard, [1, packet]])
+            self.q_from_higher.put([2, Interest(name)])
+            self.assertEqual(self.q_to_lower.get(timeout=2.0), [shard, [2, Interest(name)]])
+
+    def test_sharded_content_store(self):
+        """Test that content is stored in the content store of the shard of its name"""
+        stores = [ContentStoreMemoryExact() for _ in range(0, 4)]
+        cs = ShardedContentStore(stores)
+        for i in range(0, 20):
+            cs.add_content_object(Content("/test/data/" + str(i), "data" + str(i)), static=True)
+        for i in range(0, 20):
+            name = Name("/test/data/" + str(i))
+            self.assertEqual(cs.find_content_object(name).content.content, "data" + str(i))
+            self.assertIsNotNone(stores[shard_of(name, 4)].find_content_object(name))
+        self.assertTrue(all([len(store._container) < 20 for store in stores]))
+        cs.remove_content_object(Name("/test/data/0"))
+        self.assertIsNone(cs.find_content_object(Name("/test/data/0")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@
 Moreover, it contains handler for incomming R2C messages"""
 
 import multiprocessing
-import time, threading
+import time
 
 from typing import Dict
 
@@ -187,9 +187,7 @@ class BasicTimeoutPreventionLayer(LayerProcess):
         except Exception as e:
             self.logger.warning("Exception during ageing: " + str(e))
             return
-        t = threading.Timer(self.ageing_interval, self.ageing)
-        t.setDaemon(True)
-        t.start()
+        self.schedule(self.ageing_interval, self.ageing)
 
     def add_keep_alive_from_name(self, name):
         if name.components[-1] != b"NFN":
@@ -15,6 +15,7 @@ from PiCN.Packets import Content, Name
 from PiCN.Processes import LayerProcess
 from PiCN.Processes import PiCNProcess
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo, BaseInterface, UDP4Interface
+from PiCN.Layers.LinkLayer.FaceIDTable import BaseFaceIDTable
 
 
 class Mgmt(PiCNProcess):
@@ -22,12 +23,16 @@ class Mgmt(PiCNProcess):
 
     def __init__(self, cs: BaseContentStore, fib: BaseForwardingInformationBase, pit:BasePendingInterestTable,
                  linklayer: LayerProcess, port: int, shutdown = None,
-                 repo_prfx: str=None, repo_path: str=None, log_level=255):
+                 repo_prfx: str=None, repo_path: str=None, log_level=255, faceidtable: BaseFaceIDTable=None):
         super().__init__("MgmtSys", log_level)
         self.cs = cs
         self.fib = fib
         self.pit = pit
         self._linklayer = linklayer
+        # face ID table to use instead of the one of the link layer, e.g. if the link layer owns its table
+        self._faceidtable = faceidtable
+        if faceidtable is None and linklayer is not None:
+            self._faceidtable = linklayer.faceidtable
 
         self._repo_prfx = repo_prfx
         self._repo_path = repo_path
@@ -96,9 +101,9 @@ class Mgmt(PiCNProcess):
                 port = int(port)
             if_num = int(if_num)
             if port != 'None':
-                fid = self._linklayer.faceidtable.get_or_create_faceid(AddressInfo((ip, port), if_num))
+                fid = self._faceidtable.get_or_create_faceid(AddressInfo((ip, port), if_num), static=True)
             else:
-                fid = self._linklayer.faceidtable.get_or_create_faceid(AddressInfo(ip, if_num))
+                fid = self._faceidtable.get_or_create_faceid(AddressInfo(ip, if_num), static=True)
             reply = "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n newface OK:" + str(fid) + "\r\n"
             replysock.send(reply.encode())
             self.logger.info("New Face added " + ip + "|" + str(port) + ", FaceID: " + str(fid))
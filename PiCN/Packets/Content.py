@@ -17,7 +17,8 @@ class Content(Packet):
         self._wire_format = wire_format
         assert (type(self._wire_format) in [bytes, bytearray, type(None)]), "MUST be raw bytes or None"
         if content == None:
-            self.content = b""
+            self._content = b""
+        self._no_cache = False
 
     @property
     def content(self) -> str:
@@ -37,6 +38,17 @@ class Content(Packet):
             content = content.encode()
         assert (type(content) in [bytes, bytearray]), "MUST be raw bytes"
         self._content = content
+        self._wire_format = None  # the wire format no longer matches the payload
+
+    @property
+    def no_cache(self) -> bool:
+        """hint that downstream nodes should not cache the content object (NDNLPv2 CachePolicy NoCache). The hint is
+        carried in the link header and not part of the wire format of the content object"""
+        return getattr(self, "_no_cache", False)
+
+    @no_cache.setter
+    def no_cache(self, no_cache: bool):
+        self._no_cache = no_cache
 
     def __eq__(self, other):
         if type(other) is not Content:
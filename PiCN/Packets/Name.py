@@ -102,7 +102,8 @@ class Name(object):
         return Name(components)
 
     def __hash__(self) -> int:
-        return self._components.__str__().__hash__()
+        # equal names may be split into different components (e.g. NFN names), so hash the string compared by __eq__
+        return self.to_string().__hash__()
 
     def __len__(self):
         return len(self._components)
@@ -31,7 +31,13 @@ class Packet(object):
     @name.setter
     def name(self, name):
         self._name = name
+        self._wire_format = None  # the wire format no longer matches the packet
 
     @property
     def wire_format(self):
         return self._wire_format
+
+    @wire_format.setter
+    def wire_format(self, wire_format):
+        assert (type(wire_format) in [bytes, bytearray, type(None)]), "MUST be raw bytes or None"
+        self._wire_format = wire_format
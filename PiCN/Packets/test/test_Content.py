@@ -1,7 +1,7 @@
 """Test Content Object"""
 import unittest
 
-from PiCN.Packets import Content
+from PiCN.Packets import Content, Name
 
 class TestContent(unittest.TestCase):
 
@@ -32,3 +32,14 @@ class TestContent(unittest.TestCase):
         c2 = Content("/test/data", "the-payload")
         payload_as_string2 = c2.content
         self.assertEqual("the-payload", payload_as_string2)
+
+    def test_modification_invalidates_wire_format(self):
+        """Test that changing name or payload drops the wire format"""
+        c1 = Content("/test/data", "HelloWorld", b"wire")
+        self.assertEqual(c1.wire_format, b"wire")
+        c1.content = "HelloWorld2"
+        self.assertIsNone(c1.wire_format)
+        c2 = Content("/test/data", None, b"wire")
+        self.assertEqual(c2.wire_format, b"wire")
+        c2.name = Name("/test/data2")
+        self.assertIsNone(c2.wire_format)
@@ -65,3 +65,12 @@ class TestName(unittest.TestCase):
         n += 'data'
         self.assertEqual([b'test', b'data'], n._components)
         self.assertEqual('/test/data', n.components_to_string())
+
+    def test_hash_of_equal_names(self):
+        n1 = Name('/lib/func/f1')
+        n1 += '_(/test/data)'
+        n2 = Name('/lib/func/f1/_(/test/data)')
+        self.assertEqual(n1, n2)
+        self.assertNotEqual(n1._components, n2._components)
+        self.assertEqual(hash(n1), hash(n2))
+        self.assertEqual({n1: 1}.get(n2), 1)
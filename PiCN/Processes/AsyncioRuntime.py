@@ -0,0 +1,124 @@
+"""Runtime executing layers on an asyncio event loop"""
+
+import asyncio
+import concurrent.futures
+import threading
+
+
+class AsyncioRuntime(object):
+    """Runs one or more LayerProcesses on a single asyncio event loop. The event sources of each layer (queues from
+    adjacent layers, sockets of interfaces) are registered as readers of the loop, the timers of the layers are
+    scheduled as callbacks of the loop, and data passed between layers of the runtime is delivered by callbacks as
+    well. Handlers may be coroutines (async def data_from_lower/data_from_higher), they run as tasks of the loop.
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._thread_id: int = None
+
+    def add_layer(self, layer, from_lower, from_higher, to_lower, to_higher):
+        """
+        Register the event sources of a layer
+        :param layer: the LayerProcess
+        :param from_lower: Queue to receive data from lower Layer, None if data is delivered by the runtime
+        :param from_higher: Queue to receive data from higher Layer, None if data is delivered by the runtime
+        :param to_lower: Queue to send data to lower Layer
+        :param to_higher: Queue to send data to higher Layer
+        """
+        layer.runtime = self
+        for fileobj, callback in layer.event_sources(from_lower, from_higher, to_lower, to_higher):
+            self.loop.add_reader(fileobj, self._guarded, layer, callback)
+
+    def run(self):
+        """run the event loop in the current thread until stop is called"""
+        self._thread_id = threading.get_ident()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def stop(self):
+        """stop the event loop, can be called from any thread"""
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def in_loop(self) -> bool:
+        """True if called by the thread running the event loop"""
+        return threading.get_ident() == self._thread_id
+
+    def call_soon(self, callback, *args):
+        """schedule a callback of the loop, can be called from any thread, ignored once the loop was closed"""
+        try:
+            if self.in_loop():
+                return self.loop.call_soon(callback, *args)
+            return self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            return None
+
+    def call_later(self, delay: float, callback, *args):
+        """
+        schedule a callback of the loop after a delay, can be called from any thread, ignored once the loop was closed
+        :return: handle to cancel the callback, None if the loop was closed
+        """
+        try:
+            if self.in_loop():
+                return self.loop.call_later(delay, callback, *args)
+            return _DelayedHandle(self, delay, callback, args)
+        except RuntimeError:
+            return None
+
+    def dispatch(self, layer, from_lower: bool, data):
+        """
+        Deliver data to a layer of the runtime, called by InProcessQueue.put. The data is handled by a callback, after
+        the currently running handler returned.
+        :param layer: The receiving layer
+        :param from_lower: True to call data_from_lower of the layer, False to call data_from_higher
+        :param data: The data to deliver
+        """
+        handler = layer.data_from_lower if from_lower else layer.data_from_higher
+        self.call_soon(self._guarded, layer, lambda: layer.call_handler(handler, layer.queue_to_lower,
+                                                                        layer.queue_to_higher, data))
+
+    def run_exclusive(self, func, *args):
+        """
+        Run a function in the loop thread, so that it does not interleave with the handlers of the layers
+        :param func: The function to run
+        :param args: Arguments of the function
+        :return: The result of the function
+        """
+        if self.in_loop():
+            return func(*args)
+        future = concurrent.futures.Future()
+
+        def run():
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+        self.loop.call_soon_threadsafe(run)
+        return future.result()
+
+    def _guarded(self, layer, callback):
+        try:
+            callback()
+        except Exception as e:
+            layer.logger.error(f'Handling data failed: {e!r}')
+
+
+class _DelayedHandle(object):
+    """Handle of a callback scheduled with a delay by another thread than the loop thread"""
+
+    def __init__(self, runtime: AsyncioRuntime, delay: float, callback, args):
+        self._handle: asyncio.TimerHandle = None
+        self._cancelled: bool = False
+        runtime.loop.call_soon_threadsafe(self._schedule, runtime, delay, callback, args)
+
+    def _schedule(self, runtime, delay, callback, args):
+        if not self._cancelled:
+            self._handle = runtime.loop.call_later(delay, callback, *args)
+
+    def cancel(self):
+        self._cancelled = True
+        if self._handle is not None:
+            self._handle.cancel()
@@ -1,13 +1,17 @@
 """ Abstract Class defining a Process running on a layer"""
 
 import abc
+import asyncio
 import inspect
 import multiprocessing
 import os
 import select
+import threading
 import time
 
 from PiCN.Processes import PiCNProcess
+from PiCN.Processes.AsyncioRuntime import AsyncioRuntime
+from PiCN.Processes.PacketBatch import PacketBatch, BatchWriter
 
 class LayerProcess(PiCNProcess):
     """ Abstract Class defining a Process running on a layer"""
@@ -19,6 +23,17 @@ class LayerProcess(PiCNProcess):
         self._queue_to_lower: multiprocessing.Queue = None
         self._queue_to_higher: multiprocessing.Queue = None
         self.stop: bool = False
+        # Maximum number of items handled per wakeup, and sent as one PacketBatch to the queues enabled for batches
+        self.max_batch_size: int = 1
+        self.batch_to_lower: bool = False
+        self.batch_to_higher: bool = False
+        # Run the process loop on an asyncio event loop, set to the runtime executing the layer while it runs
+        self.use_asyncio: bool = False
+        self.runtime: AsyncioRuntime = None
+        # Runs a function while no layer of the stack handles data, set by a LayerStack running in-process
+        self.executor = None
+        # Held by the process loop while it handles data and flushes the batches, so that a timer runs in between
+        self._handler_lock: threading.Lock = threading.Lock()
 
     @property
     def queue_from_lower(self):
@@ -64,6 +79,112 @@ class LayerProcess(PiCNProcess):
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         """ handle incoming data from the higher layer """
 
+    def start_layer(self):
+        """ Called by the process or thread running the layer before it handles data, e.g. to start ageing """
+
+    def schedule(self, delay: float, callback):
+        """ Run a callback after a delay, on the event loop if the layer runs on an AsyncioRuntime, in a timer thread
+            otherwise. The timer thread runs the callback with run_exclusive. Used for ageing.
+            :param delay: delay in seconds
+            :param callback: function to call
+            :return: handle to cancel the callback
+        """
+        if self.runtime is not None:
+            return self.runtime.call_later(delay, callback)
+        timer = threading.Timer(delay, self.run_exclusive, args=[callback])
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def run_exclusive(self, func, *args):
+        """ Run a function of another thread than the one handling the data, e.g. a timer callback, so that it does
+            not interleave with the handlers, whose data structures are not locked. In a process of its own, the layer
+            runs the function between two wakeups, after the batches of the handlers were flushed.
+            :param func: function to call
+            :param args: arguments of the function
+            :return: result of the function
+        """
+        if self.executor is None:
+            with self._handler_lock:
+                return func(*args)
+        return self.executor(func, *args)
+
+    def call_handler(self, handler, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        """ Call data_from_lower or data_from_higher. Handlers may be coroutines: on an AsyncioRuntime they run as a
+            task of the event loop, otherwise they are run to completion.
+            :param handler: data_from_lower or data_from_higher
+            :param to_lower: Queue to send data to lower Layer
+            :param to_higher: Queue to send data to higher Layer
+            :param data: data to handle
+        """
+        result = handler(to_lower, to_higher, data)
+        if asyncio.iscoroutine(result):
+            if self.runtime is not None:
+                self.runtime.loop.create_task(result)
+            else:
+                asyncio.run(result)
+
+    def event_sources(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
+                      to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue) -> list:
+        """ Event sources of the layer for an AsyncioRuntime: file objects to wait for and the callback to run when they
+            are readable. Overwrite to add further sources.
+            :param from_lower: Queue to receive data from lower Layer
+            :param from_higher: Queue to receive data from higher Layer
+            :param to_lower: Queue to send data to lower Layer
+            :param to_higher: Queue to send data to higher Layer
+            :return: list of (file object, callback)
+        """
+        sources = []
+        if from_lower:
+            sources.append((from_lower._reader,
+                            lambda: self._handle_available(from_lower, to_lower, to_higher, self.data_from_lower)))
+        if from_higher:
+            sources.append((from_higher._reader,
+                            lambda: self._handle_available(from_higher, to_lower, to_higher, self.data_from_higher)))
+        return sources
+
+    def _handle_available(self, from_queue: multiprocessing.Queue, to_lower: multiprocessing.Queue,
+                          to_higher: multiprocessing.Queue, handler):
+        if not from_queue.empty():
+            self._handle_queue(from_queue, to_lower, to_higher, handler)
+
+    def _handle_queue(self, from_queue: multiprocessing.Queue, to_lower: multiprocessing.Queue,
+                      to_higher: multiprocessing.Queue, handler):
+        """ Handle the data available in a queue, up to max_batch_size items. The data the handler puts into queues
+            enabled for batches is sent as one batch per queue after all items were handled. The loop does not wait
+            for further data, so that a single packet is not delayed.
+            :param from_queue: Queue to receive data from
+            :param to_lower: Queue to send data to lower Layer
+            :param to_higher: Queue to send data to higher Layer
+            :param handler: data_from_lower or data_from_higher
+        """
+        with self._handler_lock:
+            items = self._receive(from_queue)
+            if len(items) > 1 and self.batch_to_lower:
+                to_lower = BatchWriter(to_lower, self.max_batch_size)
+            if len(items) > 1 and self.batch_to_higher:
+                to_higher = BatchWriter(to_higher, self.max_batch_size)
+            for data in items:
+                self.call_handler(handler, to_lower, to_higher, data)
+            for writer in [to_lower, to_higher]:
+                if isinstance(writer, BatchWriter):
+                    writer.flush()
+
+    def _receive(self, from_queue: multiprocessing.Queue) -> list:
+        """ Get the data available in a queue, up to max_batch_size items. Does not block, the queue may be empty
+            after a spurious wakeup, e.g. by the doorbell of a SharedMemoryQueue rung after its data was read.
+            :param from_queue: Queue to receive data from
+            :return: the received items, batches are unpacked
+        """
+        items = []
+        while len(items) < self.max_batch_size and not from_queue.empty():
+            data = from_queue.get()
+            if isinstance(data, PacketBatch):
+                items.extend(data)
+            else:
+                items.append(data)
+        return items
+
     def _run_poll(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
             to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
         """ Process loop, handle incoming packets, use poll if many file descriptors are required
@@ -82,9 +203,9 @@ class LayerProcess(PiCNProcess):
             ready_vars = poller.poll()
             for filno, var in ready_vars:
                 if from_lower and filno == from_lower._reader.fileno() and not from_lower.empty():
-                    self.data_from_lower(to_lower, to_higher, from_lower.get())
+                    self._handle_queue(from_lower, to_lower, to_higher, self.data_from_lower)
                 elif from_higher and filno == from_higher._reader.fileno() and not from_higher.empty():
-                    self.data_from_higher(to_lower, to_higher, from_higher.get())
+                    self._handle_queue(from_higher, to_lower, to_higher, self.data_from_higher)
 
     def _run_select(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
              to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -105,9 +226,9 @@ class LayerProcess(PiCNProcess):
             ready_vars, _, _ = select.select(in_queues, [], [])
             for var in ready_vars:
                 if from_lower and var == from_lower._reader and not from_lower.empty():
-                    self.data_from_lower(to_lower, to_higher, from_lower.get())
+                    self._handle_queue(from_lower, to_lower, to_higher, self.data_from_lower)
                 elif from_higher and var == from_higher._reader and not from_higher.empty():
-                    self.data_from_higher(to_lower, to_higher, from_higher.get())
+                    self._handle_queue(from_higher, to_lower, to_higher, self.data_from_higher)
 
     def _run_sleep(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                    to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -121,24 +242,40 @@ class LayerProcess(PiCNProcess):
         while True:
             dequeued: bool = False
             if from_lower and not from_lower.empty():
-                self.data_from_lower(to_lower, to_higher, from_lower.get())
+                self._handle_queue(from_lower, to_lower, to_higher, self.data_from_lower)
                 dequeued = True
             if from_higher and not from_higher.empty():
-                self.data_from_higher(to_lower, to_higher, from_higher.get())
+                self._handle_queue(from_higher, to_lower, to_higher, self.data_from_higher)
             if not dequeued:
                 time.sleep(0.3)
 
+    def _run_asyncio(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
+                     to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        """ Process loop, handle incoming packets and timers on an asyncio event loop
+            :param from_lower: Queue to receive data from lower Layer
+            :param from_higher: Queue to receive data from higher Layer
+            :param to_lower: Queue to send data to lower Layer
+            :param to_higher: Queue to send data to higher Layer
+        """
+        runtime = AsyncioRuntime()
+        runtime.add_layer(self, from_lower, from_higher, to_lower, to_higher)
+        runtime.run()
+
     def _run(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
              to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
         """
-        Initialize the execution loop. Switch between NT, Unix and Unittest. Use select for Unix, Use poll for
-        unittest, since select cannot handle more than 1024 File Descriptors.
+        Initialize the execution loop. Use an asyncio event loop if use_asyncio is set, otherwise switch between NT,
+        Unix and Unittest. Use select for Unix, Use poll for unittest, since select cannot handle more than 1024 File
+        Descriptors.
         :param from_lower: Queue to receive data from lower Layer
         :param from_higher: Queue to receive data from higher Layer
         :param to_lower: Queue to send data to lower Layer
         :param to_higher: Queue to send data to higher Layer
         """
-        if os.name == 'nt': # Exception for windows since MS POSIX api do not support select on File Descriptors
+        self.start_layer()
+        if self.use_asyncio:
+            self._run_asyncio(from_lower, from_higher, to_lower, to_higher)
+        elif os.name == 'nt': # Exception for windows since MS POSIX api do not support select on File Descriptors
             self._run_sleep(from_lower, from_higher, to_lower, to_higher)
         elif self.in_unittest():
             self._run_poll(from_lower, from_higher, to_lower, to_higher)
@@ -0,0 +1,39 @@
+"""Batches of data passed between two layers with a single queue operation"""
+
+import multiprocessing
+
+
+class PacketBatch(list):
+    """List of data items put into a queue as one item. The receiving LayerProcess handles the items one by one."""
+
+
+class BatchWriter(object):
+    """Collects the data put by a layer while it handles the data available at one wakeup, and puts it into the queue
+    as a PacketBatch when flushed or when the maximum batch size is reached. A single item is put as it is.
+    :param queue: queue to the next layer
+    :param max_batch_size: maximum number of items in a batch
+    """
+
+    def __init__(self, queue: multiprocessing.Queue, max_batch_size: int):
+        self.queue = queue
+        self.max_batch_size = max_batch_size
+        self._items = []
+
+    def put(self, data, block=True, timeout=None):
+        self._items.append(data)
+        if len(self._items) >= self.max_batch_size:
+            self.flush()
+
+    def put_nowait(self, data):
+        self.put(data)
+
+    def flush(self):
+        """put the collected items into the queue"""
+        if len(self._items) == 1:
+            self.queue.put(self._items[0])
+        elif len(self._items) > 1:
+            self.queue.put(PacketBatch(self._items))
+        self._items = []
+
+    def __getattr__(self, item):
+        return getattr(self.queue, item)
@@ -0,0 +1,197 @@
+"""Owned Datastruct Factory for PiCN, creating datastructs such as PIT, FIB, CS in the process using them"""
+
+import os
+import threading
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class PiCNOwnedDataStructFactory(object):
+    """Owned Datastruct Factory for PiCN. Has the same interface as the PiCNSyncDataStructFactory, but the datastructs
+    are plain objects of the creating process, so that layers running in this process (see the in-process mode of the
+    LayerStack) access them without IPC. Other processes (e.g. Mgmt) reach them through remote datastructs, which
+    send the method calls to a server thread of the owning process.
+    """
+
+    def __init__(self):
+        self.manager = None
+        self.names = []
+        self._types: Dict[str, Any] = {}
+        self._server: DataStructServer = None
+
+    def register(self, name: str, data_struct, method_to_typeid: Dict[str, str] = None):
+        """register a new data_struct to the factory
+        :param name: name of the datastruct under which it should be callable
+        :param data_struct: data_structure to be added, None for a type which is only returned by methods of other
+        datastructs
+        :param method_to_typeid: ignored, objects returned by methods are owned by the process as well
+        """
+        if name in self.names:
+            return
+        if data_struct is not None:
+            self._types[name] = data_struct
+        self.names.append(name)
+
+    def create_manager(self):
+        """create the manager creating the datastructs. call is after all data structs are registered"""
+        self.manager = _OwnedDataStructManager(self._types)
+
+    def get_manager(self):
+        """get or create and get a Manager
+        :return: the Manager to create the datastructures
+        """
+        if self.manager is None:
+            self.create_manager()
+        return self.manager
+
+    def remote(self, data_struct) -> 'RemoteDataStruct':
+        """Create a handle to a datastruct of this process, which can be used by other processes. Starts the server
+        thread serving the method calls of other processes if required.
+        :param data_struct: a datastruct created by the manager of this factory
+        :return: the remote datastruct
+        """
+        if self._server is None:
+            self._server = DataStructServer()
+            self._server.start()
+        return self._server.register(data_struct)
+
+    def set_executor(self, executor: Callable):
+        """Set the function the server runs the method calls of other processes with, e.g. to serialize them with the
+        layers using the datastructs
+        :param executor: function called with a function and its arguments
+        """
+        if self._server is None:
+            self._server = DataStructServer()
+            self._server.start()
+        self._server.executor = executor
+
+    def shutdown(self):
+        """stop serving other processes"""
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+
+
+class _OwnedDataStructManager(object):
+    """Creates the registered datastructs as attributes named like the registered types"""
+
+    def __init__(self, types: Dict[str, Any]):
+        for name, data_struct in types.items():
+            setattr(self, name, data_struct)
+
+
+class DataStructServer(object):
+    """Serves method calls of other processes on datastructs of this process. A connection sends a batch of calls
+    [(object id, method, args, kwargs), ...] and receives the list of results, one round trip for the batch. The calls
+    of a batch are executed at once by the executor.
+    """
+
+    def __init__(self):
+        self._authkey: bytes = os.urandom(32)
+        self._listener = Listener(authkey=self._authkey)
+        self._objects: Dict[int, Any] = {}
+        self._stopped: bool = False
+        self._lock = threading.Lock()
+        self.executor: Callable = self._run_locked
+
+    @property
+    def address(self):
+        return self._listener.address
+
+    def register(self, data_struct) -> 'RemoteDataStruct':
+        """
+        Serve the method calls of a datastruct
+        :param data_struct: the datastruct
+        :return: the remote datastruct for other processes
+        """
+        self._objects[id(data_struct)] = data_struct
+        return RemoteDataStruct(self._listener.address, self._authkey, id(data_struct))
+
+    def start(self):
+        thread = threading.Thread(target=self._accept, daemon=True)
+        thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._listener.close()
+
+    def _accept(self):
+        while not self._stopped:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                continue
+            thread = threading.Thread(target=self._serve, args=[conn], daemon=True)
+            thread.start()
+
+    def _serve(self, conn: Connection):
+        try:
+            while not self._stopped:
+                calls = conn.recv()
+                conn.send(self.executor(self._execute, calls))
+        except (OSError, EOFError):
+            pass
+        finally:
+            conn.close()
+
+    def _run_locked(self, func: Callable, *args):
+        with self._lock:
+            return func(*args)
+
+    def _execute(self, calls: List[Tuple[int, str, tuple, dict]]) -> List[Tuple[bool, Any]]:
+        results = []
+        for oid, method, args, kwargs in calls:
+            try:
+                results.append((True, getattr(self._objects[oid], method)(*args, **kwargs)))
+            except Exception as e:
+                results.append((False, e))
+        return results
+
+
+class RemoteDataStruct(object):
+    """Handle to a datastruct of another process, forwarding method calls to its DataStructServer. The handle can be
+    passed to other processes, each process opens a connection of its own.
+    """
+
+    def __init__(self, address, authkey: bytes, oid: int):
+        self._address = address
+        self._authkey = authkey
+        self._oid = oid
+        self._conn: Connection = None
+        self._pid: int = None
+        self._lock = threading.Lock()
+
+    def call_batch(self, calls: List[Tuple[str, tuple, dict]]) -> List[Any]:
+        """
+        Call several methods of the datastruct in a single round trip
+        :param calls: list of (method, args, kwargs)
+        :return: the list of results
+        :raise: the exception of the first failed call
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.send([(self._oid, method, args, kwargs) for method, args, kwargs in calls])
+            replies = conn.recv()
+        results = []
+        for ok, result in replies:
+            if not ok:
+                raise result
+            results.append(result)
+        return results
+
+    def __getattr__(self, method: str):
+        if method.startswith('_'):
+            raise AttributeError(method)
+        return lambda *args, **kwargs: self.call_batch([(method, args, kwargs)])[0]
+
+    def __getstate__(self):
+        return {'_address': self._address, '_authkey': self._authkey, '_oid': self._oid}
+
+    def __setstate__(self, state):
+        self.__init__(state['_address'], state['_authkey'], state['_oid'])
+
+    def _connection(self) -> Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = Client(self._address, authkey=self._authkey)
+            self._pid = os.getpid()
+        return self._conn
@@ -1,6 +1,7 @@
 """Sync Datastruct Factory for PICN to create synced Datastructs such as PIT, FIB, CS"""
 
 from multiprocessing.managers import BaseManager
+from typing import Dict
 
 class PiCNSyncDataStructFactory(object):
     """Sync Datastruct Factory for PICN to create synced Datastructs such as PIT, FIB, CS"""
@@ -10,14 +11,18 @@ class PiCNSyncDataStructFactory(object):
         self.names = []
         pass
 
-    def register(self, name: str, data_struct):
+    def register(self, name: str, data_struct, method_to_typeid: Dict[str, str] = None):
         """register a new data_struct to the manager
         :param name: name of the datastruct under which it should be callable
-        :param data_struct: data_structure to be added to the
+        :param data_struct: data_structure to be added to the, None for a type which is only returned by methods of
+        other datastructs
+        :param method_to_typeid: methods of the datastruct returning objects which should be shared by the manager
+        as well, mapped to the name these objects are registered with
         """
         if name in self.names:
             return
-        BaseManager.register(name, data_struct)
+        BaseManager.register(name, data_struct, method_to_typeid=method_to_typeid,
+                             create_method=data_struct is not None)
         self.names.append(name)
 
     def create_manager(self):
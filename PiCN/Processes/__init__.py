@@ -1,5 +1,8 @@
 """Abstract superclasses for PiCN"""
 
 from .PiCNProcess import PiCNProcess
+from .PacketBatch import PacketBatch, BatchWriter
+from .AsyncioRuntime import AsyncioRuntime
 from .LayerProcess import LayerProcess
 from .PiCNSyncDataStructFactory import PiCNSyncDataStructFactory
+from .PiCNOwnedDataStructFactory import PiCNOwnedDataStructFactory, RemoteDataStruct
@@ -2,8 +2,11 @@
 
 import unittest
 
+import asyncio
+import threading
+import time
 from multiprocessing import Queue
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, PacketBatch, AsyncioRuntime
 
 class LayerMock(LayerProcess):
     """ Mock implementation of a LayerProcess """
@@ -16,6 +19,22 @@ class LayerMock(LayerProcess):
     def data_from_higher(self, to_lower: Queue, to_higher: Queue, data):
         to_lower.put(data)
 
+class AsyncLayerMock(LayerMock):
+    """ Mock implementation of a LayerProcess with coroutine handlers """
+
+    async def data_from_lower(self, to_lower: Queue, to_higher: Queue, data):
+        await asyncio.sleep(0.01)
+        to_higher.put(data)
+
+class TimerLayerMock(LayerMock):
+    """ Mock implementation of a LayerProcess starting a timer while it handles data """
+
+    def data_from_higher(self, to_lower: Queue, to_higher: Queue, data):
+        if data == 0:
+            self.schedule(0, lambda: self.queue_to_lower.put("timer"))
+        time.sleep(0.05)
+        to_lower.put(data)
+
 class TestLayerProcess(unittest.TestCase):
     """Test the Abstract Class LayerProcess"""
 
@@ -47,3 +66,74 @@ class TestLayerProcess(unittest.TestCase):
         self.q2_fromLower.put("Testdata")
         output = self.q3_toHigher.get()
         self.assertEqual(output, "Testdata")
+
+    def test_batches(self):
+        """ Test that the data available at a wakeup is sent as one batch"""
+        self.layer.max_batch_size = 10
+        self.layer.batch_to_lower = True
+        for i in range(0, 5):
+            self.q1_fromHiger.put(i)
+        time.sleep(0.2)
+        self.layer.start_process()
+        output = self.q4_toLower.get(timeout=2.0)
+        self.assertIsInstance(output, PacketBatch)
+        while len(output) < 5:
+            output.extend(self.q4_toLower.get(timeout=2.0))
+        self.assertEqual(output, [0, 1, 2, 3, 4])
+
+    def test_receive_batch(self):
+        """ Test that received batches are handled item by item"""
+        self.layer.start_process()
+        self.q2_fromLower.put(PacketBatch(["Testdata1", "Testdata2"]))
+        self.assertEqual(self.q3_toHigher.get(timeout=2.0), "Testdata1")
+        self.assertEqual(self.q3_toHigher.get(timeout=2.0), "Testdata2")
+
+    def test_asyncio(self):
+        """ Test handling data and timers on an asyncio event loop"""
+        self.layer.use_asyncio = True
+        self.layer.start_process()
+        self.q1_fromHiger.put("Testdata1")
+        self.q2_fromLower.put(PacketBatch(["Testdata2", "Testdata3"]))
+        self.assertEqual(self.q4_toLower.get(timeout=2.0), "Testdata1")
+        self.assertEqual(self.q3_toHigher.get(timeout=2.0), "Testdata2")
+        self.assertEqual(self.q3_toHigher.get(timeout=2.0), "Testdata3")
+
+    def test_asyncio_runtime(self):
+        """ Test coroutine handlers and scheduled callbacks on an AsyncioRuntime"""
+        layer = AsyncLayerMock()
+        runtime = AsyncioRuntime()
+        runtime.add_layer(layer, self.q2_fromLower, self.q1_fromHiger, self.q4_toLower, self.q3_toHigher)
+        fired = []
+        layer.schedule(0.05, lambda: fired.append(runtime.in_loop()))
+        cancelled = layer.schedule(0.05, lambda: fired.append('cancelled'))
+        cancelled.cancel()
+        thread = threading.Thread(target=runtime.run, daemon=True)
+        thread.start()
+        try:
+            self.q2_fromLower.put("Testdata")
+            self.assertEqual(self.q3_toHigher.get(timeout=2.0), "Testdata")
+            self.assertEqual(runtime.run_exclusive(lambda x: x + 1, 1), 2)
+            time.sleep(0.1)
+            self.assertEqual(fired, [True])
+        finally:
+            runtime.stop()
+            thread.join(timeout=2.0)
+        self.assertFalse(thread.is_alive())
+
+    def test_spurious_wakeup(self):
+        """ Test that handling a queue does not block if it is empty"""
+        self.layer._handle_queue(self.q1_fromHiger, self.q4_toLower, self.q3_toHigher, self.layer.data_from_higher)
+        self.assertTrue(self.q4_toLower.empty())
+
+    def test_timer_after_flush(self):
+        """ Test that a timer callback runs after the batch of the data being handled was flushed"""
+        layer = TimerLayerMock()
+        layer.queue_to_lower = self.q4_toLower
+        layer.max_batch_size = 10
+        layer.batch_to_lower = True
+        for i in range(0, 3):
+            self.q1_fromHiger.put(i)
+        time.sleep(0.2)
+        layer._handle_queue(self.q1_fromHiger, self.q4_toLower, self.q3_toHigher, layer.data_from_higher)
+        self.assertEqual(self.q4_toLower.get(timeout=2.0), [0, 1, 2])
+        self.assertEqual(self.q4_toLower.get(timeout=2.0), "timer")
@@ -0,0 +1,72 @@
+"""Test the Owned Datastruct Factory"""
+
+import multiprocessing
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Packets import Content, Name
+from PiCN.Processes import PiCNOwnedDataStructFactory
+
+
+def add_entries(fib, cs, results: multiprocessing.Queue):
+    """runs in another process"""
+    fib.add_fib_entry(Name("/test"), [1], True)
+    results.put(fib.call_batch([("find_fib_entry", (Name("/test/data"),), {}),
+                                ("find_fib_entry", (Name("/other"),), {})]))
+    cs.add_content_object(Content("/test/data", "HelloWorld"), static=True)
+    try:
+        fib.no_such_method()
+        results.put(None)
+    except Exception as e:
+        results.put(type(e).__name__)
+
+
+class test_PiCNOwnedDataStructFactory(unittest.TestCase):
+    """Test the Owned Datastruct Factory"""
+
+    def setUp(self):
+        self.factory = PiCNOwnedDataStructFactory()
+        self.factory.register("cs", ContentStoreMemoryExact)
+        self.factory.register("fib", ForwardingInformationBaseMemoryPrefix)
+        self.factory.create_manager()
+
+    def tearDown(self):
+        self.factory.shutdown()
+
+    def test_native_data_structs(self):
+        """Test that the datastructs are objects of the creating process"""
+        cs = self.factory.manager.cs()
+        self.assertIsInstance(cs, ContentStoreMemoryExact)
+        self.assertIsNot(cs, self.factory.manager.cs())
+
+    def test_remote_data_structs(self):
+        """Test that another process calls methods of the datastructs, single and batched"""
+        fib = self.factory.manager.fib()
+        cs = self.factory.manager.cs()
+        results = multiprocessing.Queue()
+        p = multiprocessing.Process(target=add_entries,
+                                    args=[self.factory.remote(fib), self.factory.remote(cs), results])
+        p.start()
+        found, not_found = results.get(timeout=5.0)
+        error = results.get(timeout=5.0)
+        p.join()
+        self.assertEqual(found.name, Name("/test"))
+        self.assertIsNone(not_found)
+        self.assertEqual(fib.find_fib_entry(Name("/test/data")).faceid, [1])
+        self.assertEqual(cs.find_content_object(Name("/test/data")).content.content, "HelloWorld")
+        self.assertEqual(error, "AttributeError")
+
+    def test_executor(self):
+        """Test that the method calls of other processes are run by the executor"""
+        executed = []
+
+        def executor(func, *args):
+            executed.append(args)
+            return func(*args)
+        self.factory.set_executor(executor)
+        fib = self.factory.manager.fib()
+        remote = self.factory.remote(fib)
+        remote.add_fib_entry(Name("/test"), [1], True)
+        self.assertEqual(len(executed), 1)
+        self.assertIsNotNone(fib.find_fib_entry(Name("/test")))
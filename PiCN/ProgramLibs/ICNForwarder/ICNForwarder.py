@@ -7,16 +7,19 @@ from typing import List
 from PiCN.LayerStack.LayerStack import LayerStack
 from PiCN.Layers.ICNLayer import BasicICNLayer
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
-from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact
+from PiCN.Layers.ICNLayer.ForwardingStrategy import BaseForwardingStrategy
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact, PendingInterestTableMemoryHashed
+from PiCN.Layers.ICNLayer.NameTree import NameTree
 from PiCN.Layers.RoutingLayer import BasicRoutingLayer
+from PiCN.Layers.ShardingLayer import BasicShardingLayer, ShardedContentStore
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import TreeRoutingInformationBase
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
 
 from PiCN.Layers.AutoconfigLayer import AutoconfigServerLayer
 
-from PiCN.Processes import PiCNSyncDataStructFactory
+from PiCN.Processes import PiCNSyncDataStructFactory, PiCNOwnedDataStructFactory
 
-from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact, BaseAdmissionPolicy
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo, BaseInterface
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
@@ -28,13 +31,33 @@ from PiCN.Packets import Name
 
 
 class ICNForwarder(object):
-    """A ICN Forwarder using PiCN"""
+    """A ICN Forwarder using PiCN
+    :param name_tree: if true, CS, PIT and FIB share a name tree and received interests are looked up in a single call
+    :param hashed_pit: if true, the PIT is a PendingInterestTableMemoryHashed instead of a PendingInterstTableMemoryExact
+    :param forwarding_strategy: decides to which face of a FIB entry an interest is sent, defaults to the least
+    occupied face
+    :param in_process: if true, all layers run in the forwarder process instead of a process per layer. The forwarder
+    process then owns CS, PIT, FIB and face table, the layers access them without IPC, the mgmt process remotely
+    :param use_asyncio: if true, the layers run on asyncio event loops, see AsyncioRuntime
+    :param shards: number of ICN layer processes, each with a CS and PIT of its own, handling the packets of the names
+    assigned to it by a BasicShardingLayer. FIB and face table are shared. icnlayer is the first of icnlayers then
+    :param shard_prefix_components: number of leading name components deciding the shard, 0 for the whole name
+    :param face_idle_timeout: time in seconds after which faces without activity are removed from the face table and
+    the PITs, None to keep them until the face table is full
+    """
 
     def __init__(self, port=9000, log_level=255, encoder: BasicEncoder=None, routing: bool=False, peers=None,
-                 autoconfig: bool=False, interfaces: List[BaseInterface] = None, ageing_interval: int=3):
+                 autoconfig: bool=False, interfaces: List[BaseInterface] = None, ageing_interval: int=3,
+                 admission_policy: BaseAdmissionPolicy=None, name_tree: bool=False,
+                 forwarding_strategy: BaseForwardingStrategy=None, in_process: bool=False,
+                 use_asyncio: bool=False, shards: int=1, shard_prefix_components: int=0,
+                 face_idle_timeout: float=None, hashed_pit: bool=False):
         # debug level
         logger = Logger("ICNForwarder", log_level)
 
+        if shards > 1 and (in_process or name_tree):
+            raise ValueError("Sharding requires a process per layer and separate data structures per shard")
+
         # packet encoder
         if encoder is None:
             self.encoder = SimpleStringEncoder(log_level=log_level)
@@ -43,17 +66,38 @@ class ICNForwarder(object):
             self.encoder = encoder
 
         # setup data structures
-        synced_data_struct_factory = PiCNSyncDataStructFactory()
+        if in_process:
+            synced_data_struct_factory = PiCNOwnedDataStructFactory()
+        else:
+            synced_data_struct_factory = PiCNSyncDataStructFactory()
+        self.data_struct_factory = synced_data_struct_factory
         synced_data_struct_factory.register("cs", ContentStoreMemoryExact)
         synced_data_struct_factory.register("fib", ForwardingInformationBaseMemoryPrefix)
-        synced_data_struct_factory.register("pit", PendingInterstTableMemoryExact)
+        synced_data_struct_factory.register("pit", PendingInterestTableMemoryHashed if hashed_pit
+                                            else PendingInterstTableMemoryExact)
         synced_data_struct_factory.register("rib", TreeRoutingInformationBase)
         synced_data_struct_factory.register("faceidtable", FaceIDDict)
+        if name_tree:
+            synced_data_struct_factory.register("name_tree", NameTree,
+                                                method_to_typeid={"get_cs": "name_tree_cs", "get_pit": "name_tree_pit",
+                                                                  "get_fib": "name_tree_fib"})
+            synced_data_struct_factory.register("name_tree_cs", None)
+            synced_data_struct_factory.register("name_tree_pit", None)
+            synced_data_struct_factory.register("name_tree_fib", None)
         synced_data_struct_factory.create_manager()
 
-        cs = synced_data_struct_factory.manager.cs()
-        fib = synced_data_struct_factory.manager.fib()
-        pit = synced_data_struct_factory.manager.pit()
+        if name_tree:
+            tree = synced_data_struct_factory.manager.name_tree()
+            cs = tree.get_cs()
+            fib = tree.get_fib()
+            pit = tree.get_pit()
+        else:
+            tree = None
+            cs = synced_data_struct_factory.manager.cs()
+            fib = synced_data_struct_factory.manager.fib()
+            pit = synced_data_struct_factory.manager.pit()
+        shard_cs = [cs] + [synced_data_struct_factory.manager.cs() for _ in range(1, shards)]
+        shard_pit = [pit] + [synced_data_struct_factory.manager.pit() for _ in range(1, shards)]
         if routing:
             rib = synced_data_struct_factory.manager.rib()
         faceidtable = synced_data_struct_factory.manager.faceidtable()
@@ -67,15 +111,27 @@ class ICNForwarder(object):
             mgmt_port = interfaces[0].get_port()
 
         # initialize layers
-        self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level)
+        self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level,
+                                        face_idle_timeout=face_idle_timeout)
+        self.linklayer.pits = shard_pit
         self.packetencodinglayer = BasicPacketEncodingLayer(self.encoder, log_level=log_level)
-        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+        self.icnlayers: List[BasicICNLayer] = [BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval,
+                                                             admission_policy=admission_policy, name_tree=tree,
+                                                             forwarding_strategy=forwarding_strategy)
+                                               for _ in range(0, shards)]
+        self.icnlayer = self.icnlayers[0]
+        if shards > 1:
+            self.shardinglayer = BasicShardingLayer(self.icnlayers, prefix_components=shard_prefix_components,
+                                                    log_level=log_level)
+            toplayer = self.shardinglayer
+        else:
+            toplayer = self.icnlayer
 
         self.lstack: LayerStack = LayerStack([
-            self.icnlayer,
+            toplayer,
             self.packetencodinglayer,
             self.linklayer
-        ])
+        ], in_process=in_process, use_asyncio=use_asyncio)
 
         if autoconfig:
             self.autoconfiglayer: AutoconfigServerLayer = AutoconfigServerLayer(linklayer=self.linklayer,
@@ -83,15 +139,16 @@ class ICNForwarder(object):
                                                                                 registration_prefixes=
                                                                                 [(Name('/testnetwork/repos'), True)],
                                                                                 log_level=log_level)
-            self.lstack.insert(self.autoconfiglayer, below_of=self.icnlayer)
+            self.lstack.insert(self.autoconfiglayer, below_of=toplayer)
 
         if routing:
             self.routinglayer = BasicRoutingLayer(self.linklayer, peers=peers, log_level=log_level)
-            self.lstack.insert(self.routinglayer, below_of=self.icnlayer)
+            self.lstack.insert(self.routinglayer, below_of=toplayer)
 
-        self.icnlayer.cs = cs
-        self.icnlayer.fib = fib
-        self.icnlayer.pit = pit
+        for icnlayer, icnlayer_cs, icnlayer_pit in zip(self.icnlayers, shard_cs, shard_pit):
+            icnlayer.cs = icnlayer_cs
+            icnlayer.fib = fib
+            icnlayer.pit = icnlayer_pit
         if autoconfig:
             self.autoconfiglayer.fib = fib
         if routing:
@@ -99,13 +156,21 @@ class ICNForwarder(object):
             self.routinglayer.fib = fib
 
         # mgmt
-        self.mgmt = Mgmt(cs, fib, pit, self.linklayer, mgmt_port, self.stop_forwarder,
-                         log_level=log_level)
+        if in_process:
+            synced_data_struct_factory.set_executor(self.lstack.run_exclusive)
+            self.mgmt = Mgmt(synced_data_struct_factory.remote(cs), synced_data_struct_factory.remote(fib),
+                             synced_data_struct_factory.remote(pit), self.linklayer, mgmt_port, self.stop_forwarder,
+                             log_level=log_level, faceidtable=synced_data_struct_factory.remote(faceidtable))
+        else:
+            mgmt_cs = ShardedContentStore(shard_cs, shard_prefix_components) if shards > 1 else cs
+            self.mgmt = Mgmt(mgmt_cs, fib, pit, self.linklayer, mgmt_port, self.stop_forwarder,
+                             log_level=log_level)
 
     def start_forwarder(self):
         # start processes
         self.lstack.start_all()
-        self.icnlayer.ageing()
+        for icnlayer in self.icnlayers:
+            self.lstack.run_exclusive(icnlayer.ageing)
         self.mgmt.start_process()
 
     def stop_forwarder(self):
@@ -115,3 +180,5 @@ class ICNForwarder(object):
         if self.mgmt.process:
             self.mgmt.stop_process()
         self.lstack.close_all()
+        if isinstance(self.data_struct_factory, PiCNOwnedDataStructFactory):
+            self.data_struct_factory.shutdown()
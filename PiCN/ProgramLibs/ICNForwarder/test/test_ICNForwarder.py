@@ -5,7 +5,9 @@ import socket
 import time
 import unittest
 
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Mgmt import MgmtClient
 from PiCN.Packets import Content, Interest, Name
 from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
@@ -13,14 +15,20 @@ from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 class cases_ICNForwarder(object):
     """Test the ICN Forwarder"""
 
+    in_process = False
+    use_asyncio = False
+    hashed_pit = False
+
     @abc.abstractmethod
     def get_encoder(self):
         """returns the encoder to be used """
 
     def setUp(self):
         self.encoder = self.get_encoder()
-        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255)
-        self.forwarder2 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255)
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, in_process=self.in_process,
+                                       use_asyncio=self.use_asyncio, hashed_pit=self.hashed_pit)
+        self.forwarder2 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, in_process=self.in_process,
+                                       use_asyncio=self.use_asyncio, hashed_pit=self.hashed_pit)
         self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
         self.forwarder2_port = self.forwarder2.linklayer.interfaces[0].get_port()
 
@@ -130,4 +138,137 @@ class test_ICNForwarder_SimplePacketEncoder(cases_ICNForwarder, unittest.TestCas
 class test_ICNForwarder_NDNTLVPacketEncoder(cases_ICNForwarder, unittest.TestCase):
     """Runs tests with the NDNTLVPacketEncoder"""
     def get_encoder(self):
-        return NdnTlvEncoder()
\ No newline at end of file
+        return NdnTlvEncoder()
+
+class test_ICNForwarder_InProcess(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with all layers in the forwarder process"""
+    in_process = True
+
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def test_ICNForwarder_owned_data_structs(self):
+        """Test that the forwarder process owns the data structures and mgmt changes them remotely"""
+        self.forwarder1.start_forwarder()
+        self.assertIsInstance(self.forwarder1.icnlayer.fib, ForwardingInformationBaseMemoryPrefix)
+        mgmt = MgmtClient(self.forwarder1_port)
+        mgmt.add_face("127.0.0.1", self.forwarder2_port, 0)
+        mgmt.add_forwarding_rule(Name("/test"), [0])
+        self.assertEqual(self.forwarder1.icnlayer.fib.find_fib_entry(Name("/test/data")).faceid, [0])
+        self.assertEqual(self.forwarder1.linklayer.faceidtable.get_address_info(0).address,
+                         ("127.0.0.1", self.forwarder2_port))
+
+    def test_ICNForwarder_ageing_alongside_traffic(self):
+        """Test that ageing runs exclusively with the handlers while the forwarder serves traffic"""
+        self.forwarder1.stop_forwarder()
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, in_process=True,
+                                       ageing_interval=0.01)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder1.start_forwarder()
+        self.forwarder2.start_forwarder()
+        cs_fwd2 = self.forwarder2.icnlayer.cs
+        for i in range(0, 100):
+            content = Content(Name("/test/data/" + str(i)), content="HelloWorld" + str(i))
+            self.forwarder2.lstack.run_exclusive(cs_fwd2.add_content_object, content)
+        mgmt = MgmtClient(self.forwarder1_port)
+        mgmt.add_face("127.0.0.1", self.forwarder2_port, 0)
+        mgmt.add_forwarding_rule(Name("/test"), [0])
+
+        self.testSock.settimeout(5.0)
+        for i in range(0, 100):
+            self.testSock.sendto(self.encoder.encode(Interest("/test/data/" + str(i))),
+                                 ("127.0.0.1", self.forwarder1_port))
+            # interests without content stay in the PIT of the forwarders and are retransmitted by the ageing
+            self.testSock.sendto(self.encoder.encode(Interest("/test/missing/" + str(i))),
+                                 ("127.0.0.1", self.forwarder1_port))
+        received = set()
+        while len(received) < 100:
+            packet = self.encoder.decode(self.testSock.recvfrom(8192)[0])
+            if isinstance(packet, Content):
+                received.add(packet.name.to_string())
+        self.assertEqual(received, {"/test/data/" + str(i) for i in range(0, 100)})
+
+class test_ICNForwarder_Asyncio(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with each layer on an asyncio event loop in its own process"""
+    use_asyncio = True
+
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+class test_ICNForwarder_InProcessAsyncio(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with all layers on a single asyncio event loop in the forwarder process"""
+    in_process = True
+    use_asyncio = True
+
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+class test_ICNForwarder_HashedPit(cases_ICNForwarder, unittest.TestCase):
+    """Runs tests with the PendingInterestTableMemoryHashed"""
+    hashed_pit = True
+
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+    def test_ICNForwarder_hashed_pit(self):
+        """Test that the forwarder uses the hashed PIT"""
+        self.forwarder1.icnlayer.pit.add_pit_entry(Name("/test/data"), 1, 2)
+        self.assertIsNotNone(self.forwarder1.icnlayer.pit.get_next_deadline())
+
+class test_ICNForwarder_Sharded(unittest.TestCase):
+    """Test an ICN Forwarder distributing the names over several ICN layer processes"""
+
+    def setUp(self):
+        self.encoder = NdnTlvEncoder()
+        self.forwarder1 = ICNForwarder(0, encoder=NdnTlvEncoder(), log_level=255, shards=4)
+        self.forwarder2 = ICNForwarder(0, encoder=NdnTlvEncoder(), log_level=255)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder2_port = self.forwarder2.linklayer.interfaces[0].get_port()
+        self.testSock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.testSock.bind(("0.0.0.0", 0))
+        self.testSock.settimeout(5.0)
+
+    def tearDown(self):
+        self.testSock.close()
+        self.forwarder1.stop_forwarder()
+        self.forwarder2.stop_forwarder()
+
+    def test_ICNForwarder_sharded_find_content_two_nodes(self):
+        """Test that each shard forwards the interests of its names and caches the content"""
+        self.forwarder1.start_forwarder()
+        self.forwarder2.start_forwarder()
+        mgmt1 = MgmtClient(self.forwarder1_port)
+        mgmt1.add_face("127.0.0.1", self.forwarder2_port, 0)
+        mgmt1.add_forwarding_rule(Name("/test/data"), [0])
+        mgmt2 = MgmtClient(self.forwarder2_port)
+        names = [Name("/test/data/object" + str(i)) for i in range(0, 12)]
+        for name in names:
+            mgmt2.add_new_content(name, "HelloWorld" + name.components[-1].decode())
+        self.assertEqual(len(set([self.forwarder1.shardinglayer.shard_of(name) for name in names])), 4)
+
+        for name in names:
+            self.testSock.sendto(self.encoder.encode(Interest(name)), ("127.0.0.1", self.forwarder1_port))
+            encoded_content, addr = self.testSock.recvfrom(8192)
+            content = self.encoder.decode(encoded_content)
+            self.assertEqual(content.name, name)
+            self.assertEqual(content.content, "HelloWorld" + name.components[-1].decode())
+        time.sleep(1)
+        for name in names:
+            shard = self.forwarder1.icnlayers[self.forwarder1.shardinglayer.shard_of(name)]
+            self.assertEqual(shard.cs.find_content_object(name).content.name, name)
+        for shard in self.forwarder1.icnlayers:
+            self.assertEqual(shard.pit.get_container_size(), 0)
+
+    def test_ICNForwarder_sharded_mgmt_content(self):
+        """Test that content added by mgmt is stored and served by the shard of its name"""
+        self.forwarder1.start_forwarder()
+        mgmt1 = MgmtClient(self.forwarder1_port)
+        names = [Name("/test/data/object" + str(i)) for i in range(0, 8)]
+        for name in names:
+            mgmt1.add_new_content(name, "HelloWorld")
+        for name in names:
+            shard = self.forwarder1.icnlayers[self.forwarder1.shardinglayer.shard_of(name)]
+            self.assertIsNotNone(shard.cs.find_content_object(name))
+            self.testSock.sendto(self.encoder.encode(Interest(name)), ("127.0.0.1", self.forwarder1_port))
+            encoded_content, addr = self.testSock.recvfrom(8192)
+            self.assertEqual(self.encoder.decode(encoded_content), Content(name, "HelloWorld"))
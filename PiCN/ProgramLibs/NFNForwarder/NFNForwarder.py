@@ -13,7 +13,8 @@ from PiCN.Layers.LinkLayer import BasicLinkLayer
 
 from PiCN.Layers.ChunkLayer.Chunkifyer import SimpleContentChunkifyer
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
-from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact
+from PiCN.Layers.ICNLayer.ForwardingStrategy import BaseForwardingStrategy
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterstTableMemoryExact, PendingInterestTableMemoryHashed
 from PiCN.Layers.NFNLayer.R2C import TimeoutR2CHandler
 from PiCN.Layers.NFNLayer.NFNExecutor import NFNPythonExecutor, BaseNFNExecutor
 from PiCN.Layers.NFNLayer.NFNComputationTable import NFNComputationList
@@ -24,7 +25,7 @@ from PiCN.Layers.NFNLayer.Parser import DefaultNFNParser
 from PiCN.Layers.ThunkLayer import BasicThunkLayer
 from PiCN.Logger import Logger
 from PiCN.Mgmt import Mgmt
-from PiCN.Processes import PiCNSyncDataStructFactory
+from PiCN.Processes import PiCNSyncDataStructFactory, PiCNOwnedDataStructFactory
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo, BaseInterface
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
@@ -33,10 +34,15 @@ from PiCN.Layers.ThunkLayer.ThunkTable import ThunkList
 from PiCN.Layers.NFNLayer.NFNOptimizer import ThunkPlanExecutor
 
 class NFNForwarder(object):
-    """NFN Forwarder for PICN"""
+    """NFN Forwarder for PICN
+    :param in_process: if true, all layers run in the forwarder process instead of a process per layer. The forwarder
+    process then owns the data structures, the layers access them without IPC, the mgmt process remotely
+    :param hashed_pit: if true, the PIT is a PendingInterestTableMemoryHashed instead of a PendingInterstTableMemoryExact
+    """
     # TODO add chunking layer
     def __init__(self, port=9000, log_level=255, encoder: BasicEncoder=None, interfaces: List[BaseInterface]=None,
-                 executors: BaseNFNExecutor = None, ageing_interval: int = 3, use_thunks=False):
+                 executors: BaseNFNExecutor = None, ageing_interval: int = 3, use_thunks=False,
+                 forwarding_strategy: BaseForwardingStrategy=None, in_process: bool=False, hashed_pit: bool=False):
         # debug level
         logger = Logger("NFNForwarder", log_level)
         logger.info("Start PiCN NFN Forwarder on port " + str(port))
@@ -49,10 +55,15 @@ class NFNForwarder(object):
             self.encoder = encoder
 
        # setup data structures
-        synced_data_struct_factory = PiCNSyncDataStructFactory()
+        if in_process:
+            synced_data_struct_factory = PiCNOwnedDataStructFactory()
+        else:
+            synced_data_struct_factory = PiCNSyncDataStructFactory()
+        self.data_struct_factory = synced_data_struct_factory
         synced_data_struct_factory.register("cs", ContentStoreMemoryExact)
         synced_data_struct_factory.register("fib", ForwardingInformationBaseMemoryPrefix)
-        synced_data_struct_factory.register("pit", PendingInterstTableMemoryExact)
+        synced_data_struct_factory.register("pit", PendingInterestTableMemoryHashed if hashed_pit
+                                            else PendingInterstTableMemoryExact)
         synced_data_struct_factory.register("faceidtable", FaceIDDict)
 
         synced_data_struct_factory.register("computation_table", NFNComputationList)
@@ -87,7 +98,8 @@ class NFNForwarder(object):
         # initialize layers
         self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level)
         self.packetencodinglayer = BasicPacketEncodingLayer(self.encoder, log_level=log_level)
-        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval,
+                                      forwarding_strategy=forwarding_strategy)
         self.chunklayer = BasicChunkLayer(self.chunkifier, log_level=log_level)
 
         # setup nfn
@@ -115,7 +127,7 @@ class NFNForwarder(object):
                 self.icnlayer,
                 self.packetencodinglayer,
                 self.linklayer
-            ])
+            ], in_process=in_process)
         else:
             self.lstack: LayerStack = LayerStack([
                 self.nfnlayer,
@@ -124,22 +136,28 @@ class NFNForwarder(object):
                 self.icnlayer,
                 self.packetencodinglayer,
                 self.linklayer
-            ])
+            ], in_process=in_process)
 
         self.icnlayer.cs = cs
         self.icnlayer.fib = fib
         self.icnlayer.pit = pit
 
         # mgmt
-        self.mgmt = Mgmt(self.icnlayer.cs, self.icnlayer.fib, self.icnlayer.pit, self.linklayer,
-                         mgmt_port, self.stop_forwarder,
-                         log_level=log_level)
+        if in_process:
+            synced_data_struct_factory.set_executor(self.lstack.run_exclusive)
+            self.mgmt = Mgmt(synced_data_struct_factory.remote(cs), synced_data_struct_factory.remote(fib),
+                             synced_data_struct_factory.remote(pit), self.linklayer, mgmt_port, self.stop_forwarder,
+                             log_level=log_level, faceidtable=synced_data_struct_factory.remote(faceidtable))
+        else:
+            self.mgmt = Mgmt(self.icnlayer.cs, self.icnlayer.fib, self.icnlayer.pit, self.linklayer,
+                             mgmt_port, self.stop_forwarder,
+                             log_level=log_level)
 
     def start_forwarder(self):
         # start processes
         self.lstack.start_all()
-        self.icnlayer.ageing()
-        self.timeoutpreventionlayer.ageing()
+        self.lstack.run_exclusive(self.icnlayer.ageing)
+        self.lstack.run_exclusive(self.timeoutpreventionlayer.ageing)
         self.mgmt.start_process()
 
     def stop_forwarder(self):
@@ -149,3 +167,5 @@ class NFNForwarder(object):
         if self.mgmt.process:
             self.mgmt.stop_process()
         self.lstack.close_all()
+        if isinstance(self.data_struct_factory, PiCNOwnedDataStructFactory):
+            self.data_struct_factory.shutdown()
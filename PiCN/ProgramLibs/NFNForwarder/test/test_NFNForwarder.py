@@ -13,14 +13,19 @@ from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo
 class cases_NFNForwarder(object):
     """Test the ICN Forwarder"""
 
+    in_process = False
+    hashed_pit = False
+
     @abc.abstractmethod
     def get_encoder(self):
         """returns the encoder to be used """
 
     def setUp(self):
         self.encoder = self.get_encoder()
-        self.forwarder1 = NFNForwarder(0, encoder=self.get_encoder(), log_level=255)
-        self.forwarder2 = NFNForwarder(0, encoder=self.get_encoder(), log_level=255)
+        self.forwarder1 = NFNForwarder(0, encoder=self.get_encoder(), log_level=255, in_process=self.in_process,
+                                       hashed_pit=self.hashed_pit)
+        self.forwarder2 = NFNForwarder(0, encoder=self.get_encoder(), log_level=255, in_process=self.in_process,
+                                       hashed_pit=self.hashed_pit)
         self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
         self.forwarder2_port = self.forwarder2.linklayer.interfaces[0].get_port()
 
@@ -343,4 +348,18 @@ class test_NFNForwarder_SimplePacketEncoder(cases_NFNForwarder, unittest.TestCas
 class test_NFNForwarder_NDNTLVPacketEncoder(cases_NFNForwarder, unittest.TestCase):
     """Runs tests with the NDNTLVPacketEncoder"""
     def get_encoder(self):
-        return NdnTlvEncoder()
\ No newline at end of file
+        return NdnTlvEncoder()
+
+class test_NFNForwarder_InProcess(cases_NFNForwarder, unittest.TestCase):
+    """Runs tests with all layers in the forwarder process"""
+    in_process = True
+
+    def get_encoder(self):
+        return NdnTlvEncoder()
+
+class test_NFNForwarder_HashedPit(cases_NFNForwarder, unittest.TestCase):
+    """Runs tests with the PendingInterestTableMemoryHashed"""
+    hashed_pit = True
+
+    def get_encoder(self):
+        return NdnTlvEncoder()
@@ -0,0 +1,105 @@
+"""Simulate a multipath scenario with the adaptive forwarding strategy.
+
+Scenario consists of an ICN forwarder with two paths to replicas of the same repository. The path to Repo2 is slow.
+Goal of the simulation is that the forwarder measures both paths and converges on the path with the lowest latency.
+The slow path uses a bus of its own, since a simulation bus delays all packets while it delivers a delayed packet.
+
+Client <--------> ICN0 <-*-----------> Repo1
+                         \\--(slow)----> Repo2
+"""
+
+import os
+import shutil
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy import AdaptiveForwardingStrategy
+from PiCN.Layers.LinkLayer.Interfaces import SimulationBus
+from PiCN.ProgramLibs.Fetch import Fetch
+from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
+from PiCN.ProgramLibs.ICNDataRepository import ICNDataRepository
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder, SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Packets import Name
+from PiCN.Mgmt import MgmtClient
+
+
+class AdaptiveForwardingStrategySimulation(unittest.TestCase):
+    """Simulate a multipath scenario with the adaptive forwarding strategy"""
+
+    def get_encoder(self) -> BasicEncoder:
+        return SimpleStringEncoder
+
+    def setUp(self):
+        self.path = "/tmp/repo_adaptive"
+        self.delay = 0.3
+        self.setup_repo()
+        self.encoder_type = self.get_encoder()
+        self.simulation_bus = SimulationBus(packetencoder=self.encoder_type())
+        self.slow_simulation_bus = SimulationBus(packetencoder=self.encoder_type())
+
+        self.fetch_tool = Fetch("icn0", None, 255, self.encoder_type(),
+                                interfaces=[self.simulation_bus.add_interface("fetchtool")])
+        self.strategy = AdaptiveForwardingStrategy(probe_interval=0.5)
+        self.icn0 = ICNForwarder(port=0, encoder=self.encoder_type(), log_level=255,
+                                 interfaces=[self.simulation_bus.add_interface("icn0"),
+                                             self.slow_simulation_bus.add_interface("icn0")],
+                                 forwarding_strategy=self.strategy)
+        self.repo1 = ICNDataRepository(self.path, Name("/repo"), 0, 255, self.encoder_type(), False, False,
+                                       [self.simulation_bus.add_interface("repo1")])
+        self.repo2 = ICNDataRepository(self.path, Name("/repo"), 0, 255, self.encoder_type(), False, False,
+                                       [self.slow_simulation_bus.add_interface("repo2",
+                                                                               delay_func=lambda packet: self.delay)])
+        self.mgmt_client0 = MgmtClient(self.icn0.mgmt.mgmt_sock.getsockname()[1])
+
+    def tearDown(self):
+        self.icn0.stop_forwarder()
+        self.repo1.stop_repo()
+        self.repo2.stop_repo()
+        self.fetch_tool.stop_fetch()
+        self.simulation_bus.stop_process()
+        self.slow_simulation_bus.stop_process()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def setup_repo(self):
+        os.makedirs(self.path, exist_ok=True)
+        for i in range(0, 10):
+            with open(self.path + "/data" + str(i), 'w+') as content_file:
+                content_file.write("data" + str(i))
+
+    def setup_faces_and_connections(self):
+        self.icn0.start_forwarder()
+        self.repo1.start_repo()
+        self.repo2.start_repo()
+        self.simulation_bus.start_process()
+        self.slow_simulation_bus.start_process()
+        time.sleep(1)
+
+        # the slow path is configured first, so that it is tried first as long as no path is measured
+        self.mgmt_client0.add_face("repo2", None, 1)
+        self.mgmt_client0.add_face("repo1", None, 0)
+        self.mgmt_client0.add_forwarding_rule(Name("/repo"), [0, 1])
+
+    def test_converge_on_fastest_path(self):
+        """Test that the interests are answered by the fast path, while the slow path is still probed"""
+        self.setup_faces_and_connections()
+        durations = []
+        for i in range(0, 10):
+            start = time.time()
+            res = self.fetch_tool.fetch_data(Name("/repo/data" + str(i)), timeout=5)
+            durations.append(time.time() - start)
+            self.assertEqual(res, "data" + str(i))
+            time.sleep(0.2)
+        for duration in durations:
+            self.assertLess(duration, self.delay)
+
+
+class AdaptiveForwardingStrategySimulationSimplePacketEncoder(AdaptiveForwardingStrategySimulation):
+    """Run the adaptive forwarding strategy simulation using the simple packet encoder"""
+    def get_encoder(self):
+        return SimpleStringEncoder
+
+
+class AdaptiveForwardingStrategySimulationNDNPacketEncoder(AdaptiveForwardingStrategySimulation):
+    """Run the adaptive forwarding strategy simulation using the NDN packet encoder"""
+    def get_encoder(self):
+        return NdnTlvEncoder